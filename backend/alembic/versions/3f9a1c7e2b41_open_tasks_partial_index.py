@@ -0,0 +1,35 @@
+"""Partial index for open production tasks
+
+Revision ID: 3f9a1c7e2b41
+Revises: d10052303d49
+Create Date: 2026-01-12 09:14:27.503118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a1c7e2b41"
+down_revision: Union[str, Sequence[str], None] = "d10052303d49"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_production_tasks_open",
+        "production_tasks",
+        ["department_id", "employee_id"],
+        unique=False,
+        postgresql_where=sa.text("ended_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_production_tasks_open", table_name="production_tasks")
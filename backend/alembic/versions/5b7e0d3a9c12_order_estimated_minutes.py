@@ -0,0 +1,121 @@
+"""Maintained estimated_minutes on production orders
+
+Revision ID: 5b7e0d3a9c12
+Revises: 8c2d5e91a7f3
+Create Date: 2026-02-02 10:21:48.093517
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7e0d3a9c12"
+down_revision: Union[str, Sequence[str], None] = "8c2d5e91a7f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "production_orders",
+        sa.Column(
+            "estimated_minutes", sa.DECIMAL(precision=12, scale=2), nullable=True
+        ),
+    )
+
+    # Nykyisten tilausten arviot
+    op.execute(
+        """
+        UPDATE production_orders o
+        SET estimated_minutes = ROUND(
+            o.quantity * pr.standard_time_minutes
+                * COALESCE(c.efficiency_multiplier, 1),
+            2
+        )
+        FROM products pr
+        LEFT JOIN product_categories c ON c.code = pr.category_code
+        WHERE pr.id = o.product_id
+    """
+    )
+
+    op.create_index(
+        op.f("ix_production_orders_estimated_minutes"),
+        "production_orders",
+        ["estimated_minutes"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_production_orders_week_estimate",
+        "production_orders",
+        ["year", "week_number", "estimated_minutes"],
+        unique=False,
+    )
+
+    # Tilauksen oma muutos lasketaan triggerillä, jotta myös suorat
+    # tietokantakirjoitukset (importit) saavat arvion
+    op.execute(
+        """
+        CREATE FUNCTION production_orders_estimate() RETURNS trigger AS $$
+        BEGIN
+            SELECT ROUND(
+                NEW.quantity * pr.standard_time_minutes
+                    * COALESCE(c.efficiency_multiplier, 1),
+                2
+            )
+            INTO NEW.estimated_minutes
+            FROM products pr
+            LEFT JOIN product_categories c ON c.code = pr.category_code
+            WHERE pr.id = NEW.product_id;
+
+            IF TG_OP = 'UPDATE'
+                AND NEW.estimated_minutes IS DISTINCT FROM OLD.estimated_minutes
+            THEN
+                UPDATE weekly_plan_items
+                SET estimated_hours = ROUND(NEW.estimated_minutes / 60, 2)
+                WHERE production_order_id = NEW.id;
+            END IF;
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_production_orders_estimate
+        BEFORE INSERT OR UPDATE OF quantity, product_id ON production_orders
+        FOR EACH ROW EXECUTE FUNCTION production_orders_estimate()
+    """
+    )
+
+    # Suunnitelmarivit samaan arvioon
+    op.execute(
+        """
+        UPDATE weekly_plan_items i
+        SET estimated_hours = ROUND(o.estimated_minutes / 60, 2)
+        FROM production_orders o
+        WHERE o.id = i.production_order_id
+            AND o.estimated_minutes IS NOT NULL
+    """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_production_orders_estimate ON production_orders"
+    )
+    op.execute("DROP FUNCTION IF EXISTS production_orders_estimate()")
+    op.drop_index(
+        "ix_production_orders_week_estimate", table_name="production_orders"
+    )
+    op.drop_index(
+        op.f("ix_production_orders_estimated_minutes"),
+        table_name="production_orders",
+    )
+    op.drop_column("production_orders", "estimated_minutes")
@@ -0,0 +1,71 @@
+"""Efficiency rollup dirty tracking and indexes
+
+Revision ID: 8c2d5e91a7f3
+Revises: 3f9a1c7e2b41
+Create Date: 2026-01-19 13:42:05.771902
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c2d5e91a7f3"
+down_revision: Union[str, Sequence[str], None] = "3f9a1c7e2b41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "efficiency_dirty_days",
+        sa.Column("department_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column(
+            "marked_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["department_id"], ["departments.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("department_id", "day"),
+    )
+    op.create_index(
+        "ix_production_tasks_department_ended",
+        "production_tasks",
+        ["department_id", "ended_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_efficiency_items_efficiency_summary_id"),
+        "efficiency_items",
+        ["efficiency_summary_id"],
+        unique=False,
+    )
+    # Kuukausitason upsert tarvitsee oman partial unique indeksin
+    op.execute(
+        """
+        CREATE UNIQUE INDEX uq_efficiency_monthly
+        ON efficiency_summaries (period_type, department_id, month, year)
+        WHERE period_type = 'MONTHLY'
+    """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS uq_efficiency_monthly")
+    op.drop_index(
+        op.f("ix_efficiency_items_efficiency_summary_id"),
+        table_name="efficiency_items",
+    )
+    op.drop_index(
+        "ix_production_tasks_department_ended", table_name="production_tasks"
+    )
+    op.drop_table("efficiency_dirty_days")
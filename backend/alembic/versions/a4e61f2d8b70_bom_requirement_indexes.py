@@ -0,0 +1,41 @@
+"""Indexes for material requirement aggregation
+
+Revision ID: a4e61f2d8b70
+Revises: 5b7e0d3a9c12
+Create Date: 2026-02-09 13:05:12.614208
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4e61f2d8b70"
+down_revision: Union[str, Sequence[str], None] = "5b7e0d3a9c12"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # BOM-rivit haetaan aina tuotteittain (tarvelaskenta, BOM-välimuisti)
+    op.create_index(
+        op.f("ix_bom_items_product_id"), "bom_items", ["product_id"], unique=False
+    )
+    # Tarvelaskenta toimituspäivävälille
+    op.create_index(
+        op.f("ix_production_orders_ship_date"),
+        "production_orders",
+        ["ship_date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_production_orders_ship_date"), table_name="production_orders"
+    )
+    op.drop_index(op.f("ix_bom_items_product_id"), table_name="bom_items")
@@ -0,0 +1,72 @@
+"""BOM cache version counters
+
+Revision ID: b2f8d4c6e013
+Revises: e7b3c5a1d942
+Create Date: 2026-03-09 14:05:12.418530
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b2f8d4c6e013"
+down_revision: Union[str, Sequence[str], None] = "e7b3c5a1d942"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "bom_cache_versions",
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column(
+            "version", sa.BigInteger(), server_default=sa.text("0"), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.execute(
+        "INSERT INTO bom_cache_versions (name) VALUES ('bom'), ('item_numbers')"
+    )
+
+    # Lausetason triggerit: kattavat myös COPY:n, massapäivitykset ja
+    # TRUNCATEn. Laskuri näkyy muille vasta commitin jälkeen, joten
+    # välimuisti ei voi ladata vanhaa dataa uudella versiolla.
+    op.execute(
+        """
+        CREATE FUNCTION bump_bom_cache_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE bom_cache_versions
+            SET version = version + 1
+            WHERE name = TG_ARGV[0];
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER bom_items_cache_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON bom_items
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_bom_cache_version('bom')
+    """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER products_cache_version
+        AFTER INSERT OR UPDATE OF item_number OR DELETE OR TRUNCATE ON products
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_bom_cache_version('item_numbers')
+    """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS products_cache_version ON products")
+    op.execute("DROP TRIGGER IF EXISTS bom_items_cache_version ON bom_items")
+    op.execute("DROP FUNCTION IF EXISTS bump_bom_cache_version()")
+    op.drop_table("bom_cache_versions")
@@ -0,0 +1,44 @@
+"""DAILY efficiency summaries use the ISO week-numbering year
+
+Revision ID: c5e1a9f3b726
+Revises: b2f8d4c6e013
+Create Date: 2026-03-16 10:27:41.902215
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e1a9f3b726"
+down_revision: Union[str, Sequence[str], None] = "b2f8d4c6e013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # year kuuluu DAILY-upsertin konfliktiavaimeen: vanhat vuodenvaihteen
+    # rivit on korjattava, muuten rollup lisäisi niiden rinnalle uudet
+    op.execute(
+        """
+        UPDATE efficiency_summaries
+        SET year = EXTRACT(ISOYEAR FROM date)::int
+        WHERE period_type = 'DAILY'
+            AND year <> EXTRACT(ISOYEAR FROM date)::int
+    """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        """
+        UPDATE efficiency_summaries
+        SET year = EXTRACT(YEAR FROM date)::int
+        WHERE period_type = 'DAILY'
+            AND year <> EXTRACT(YEAR FROM date)::int
+    """
+    )
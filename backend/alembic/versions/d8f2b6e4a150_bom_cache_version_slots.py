@@ -0,0 +1,93 @@
+"""BOM cache version counters striped over slots
+
+Revision ID: d8f2b6e4a150
+Revises: c5e1a9f3b726
+Create Date: 2026-03-23 09:12:36.570184
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d8f2b6e4a150"
+down_revision: Union[str, Sequence[str], None] = "c5e1a9f3b726"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Laskuririvejä per nimi; oltava sama kuin funktion modulo
+SLOTS = 16
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "bom_cache_versions",
+        sa.Column(
+            "slot", sa.SmallInteger(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    op.drop_constraint("bom_cache_versions_pkey", "bom_cache_versions", type_="primary")
+    op.create_primary_key(
+        "bom_cache_versions_pkey", "bom_cache_versions", ["name", "slot"]
+    )
+    op.execute(
+        f"""
+        INSERT INTO bom_cache_versions (name, slot)
+        SELECT v.name, s.slot
+        FROM bom_cache_versions v
+        CROSS JOIN generate_series(1, {SLOTS - 1}) AS s(slot)
+    """
+    )
+
+    # Yksi laskuririvi lukitsi kaikki kirjoittajat toistensa perään commitiin
+    # asti. Rivi valitaan nyt backendin mukaan, joten rinnakkaiset
+    # transaktiot päivittävät eri rivejä. Lukijat summaavat rivit; summa näkyy
+    # muille vasta commitin jälkeen, toisin kuin sekvenssin nextval.
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION bump_bom_cache_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE bom_cache_versions
+            SET version = version + 1
+            WHERE name = TG_ARGV[0] AND slot = pg_backend_pid() % {SLOTS};
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_bom_cache_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE bom_cache_versions
+            SET version = version + 1
+            WHERE name = TG_ARGV[0];
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+    )
+    op.execute(
+        """
+        UPDATE bom_cache_versions v
+        SET version = t.version
+        FROM (
+            SELECT name, SUM(version) AS version
+            FROM bom_cache_versions
+            GROUP BY name
+        ) t
+        WHERE v.name = t.name AND v.slot = 0
+    """
+    )
+    op.execute("DELETE FROM bom_cache_versions WHERE slot <> 0")
+    op.drop_constraint("bom_cache_versions_pkey", "bom_cache_versions", type_="primary")
+    op.create_primary_key("bom_cache_versions_pkey", "bom_cache_versions", ["name"])
+    op.drop_column("bom_cache_versions", "slot")
@@ -0,0 +1,38 @@
+"""Trigram index for employee name search
+
+Revision ID: e7b3c5a1d942
+Revises: a4e61f2d8b70
+Create Date: 2026-02-12 09:44:27.381054
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b3c5a1d942"
+down_revision: Union[str, Sequence[str], None] = "a4e61f2d8b70"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Nimihaku (ILIKE '%...%' ja samankaltaisuus %) päätteiltä
+    op.create_index(
+        "ix_employees_full_name_trgm",
+        "employees",
+        ["full_name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"full_name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # pg_trgm jätetään paikalleen, muut objektit voivat käyttää sitä
+    op.drop_index("ix_employees_full_name_trgm", table_name="employees")
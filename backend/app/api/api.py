@@ -1,13 +1,103 @@
-from fastapi import APIRouter
-from app.api.endpoints import products_endpoints, department_endpoints
+from fastapi import APIRouter, Depends
+from app.api.deps import (
+    get_current_superuser,
+    get_current_user,
+    get_current_user_from_query,
+)
+from app.core.config import settings
+from app.api.endpoints import (
+    auth_endpoints,
+    products_endpoints,
+    department_endpoints,
+    task_endpoints,
+    orders_endpoints,
+    events_endpoints,
+    efficiency_endpoints,
+    weekly_plan_endpoints,
+    materials_endpoints,
+    employees_endpoints,
+    debug_endpoints,
+)
+
+# Async-versiot vaativat asyncpg:n ja greenletin, joten ne tuodaan vain
+# kun ne on otettu käyttöön
+if settings.ASYNC_ENDPOINTS:
+    from app.api.endpoints import (
+        products_async_endpoints as products_endpoints,
+        department_async_endpoints as department_endpoints,
+    )
 
 api_router = APIRouter()
 
+# Kirjautuminen on ainoa reitti ilman tokenia
+api_router.include_router(auth_endpoints.router, prefix="/auth", tags=["auth"])
+
+# Kaikki muut reitit vaativat kirjautuneen käyttäjän
+protected = [Depends(get_current_user)]
+
 # Register endpoints
 api_router.include_router(
-    products_endpoints.router, prefix="/products", tags=["products"]
+    products_endpoints.router,
+    prefix="/products",
+    tags=["products"],
+    dependencies=protected,
+)
+
+api_router.include_router(
+    department_endpoints.router,
+    prefix="/departments",
+    tags=["departments"],
+    dependencies=protected,
+)
+
+api_router.include_router(
+    task_endpoints.router, prefix="/tasks", tags=["tasks"], dependencies=protected
+)
+
+api_router.include_router(
+    orders_endpoints.router, prefix="/orders", tags=["orders"], dependencies=protected
+)
+
+# EventSource ei voi lähettää otsakkeita: token myös ?access_token=
+api_router.include_router(
+    events_endpoints.router,
+    prefix="/events",
+    tags=["events"],
+    dependencies=[Depends(get_current_user_from_query)],
+)
+
+api_router.include_router(
+    efficiency_endpoints.router,
+    prefix="/efficiency",
+    tags=["efficiency"],
+    dependencies=protected,
+)
+
+api_router.include_router(
+    weekly_plan_endpoints.router,
+    prefix="/weekly-plans",
+    tags=["weekly-plans"],
+    dependencies=protected,
+)
+
+api_router.include_router(
+    materials_endpoints.router,
+    prefix="/materials",
+    tags=["materials"],
+    dependencies=protected,
+)
+
+api_router.include_router(
+    employees_endpoints.router,
+    prefix="/employees",
+    tags=["employees"],
+    dependencies=protected,
 )
 
+# Diagnostiikka vain pääkäyttäjille
 api_router.include_router(
-    department_endpoints.router, prefix="/departments", tags=["departments"]
+    debug_endpoints.router,
+    prefix="/debug",
+    tags=["debug"],
+    dependencies=[Depends(get_current_superuser)],
 )
@@ -0,0 +1,76 @@
+"""
+API-reittien viivästetty rekisteröinti
+
+Endpoint-moduulit tuovat mukanaan CRUD-luokat, palvelut, skeemat ja NumPyn,
+ja ne ovat suurin osa käynnistysajasta. Sovellus voi käynnistyä ilman niitä:
+lifespan lataa reitit taustasäikeessä, ja API-polun pyynnöt odottavat
+latauksen valmistumista. /metrics vastaa heti ja /health 503:lla kunnes
+reitit on ladattu.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable
+
+from fastapi import FastAPI
+from starlette.routing import NoMatchFound
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up(app: FastAPI) -> None:
+    """
+    Rakenna sisällytettyjen routereiden reitit ja niiden validaattorit heti
+    eikä ensimmäisellä pyynnöllä. OpenAPI-skeema jää ensimmäiseen hakuun.
+    """
+    try:
+        # Reittihaku käy läpi kaikki reitit ja materialisoi ne
+        app.url_path_for("__warm_up__")
+    except NoMatchFound:
+        pass
+
+
+class DeferredLoader:
+    """Kertaalleen ajettava synkroninen lataus, jota pyynnöt voivat odottaa"""
+
+    def __init__(self, load: Callable[[], None]):
+        self._load = load
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.duration_seconds = 0.0
+
+    def load(self) -> None:
+        """Aja lataus (idempotentti; rinnakkaiset kutsujat odottavat)"""
+        with self._lock:
+            if self.loaded:
+                return
+            started = time.perf_counter()
+            self._load()
+            self.duration_seconds = time.perf_counter() - started
+            self.loaded = True
+        logger.info("API-reitit ladattu (%.2fs)", self.duration_seconds)
+
+    async def wait(self) -> None:
+        if not self.loaded:
+            await asyncio.to_thread(self.load)
+
+
+class DeferredRoutesMiddleware:
+    """Pidättää prefix-polkujen pyynnöt kunnes reitit on ladattu"""
+
+    def __init__(self, app: ASGIApp, loader: DeferredLoader, prefix: str):
+        self.app = app
+        self.loader = loader
+        self.prefix = prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            not self.loader.loaded
+            and scope["type"] in ("http", "websocket")
+            and scope["path"].startswith(self.prefix)
+        ):
+            await self.loader.wait()
+        await self.app(scope, receive, send)
@@ -0,0 +1,99 @@
+"""
+API:n yhteiset riippuvuudet (autentikointi)
+
+Riippuvuudet ovat async-funktioita: token tarkistetaan event loopissa
+ilman säiepoolin kautta kulkemista, ja tietokantaa käytetään vain kun
+käyttäjän tila puuttuu välimuistista.
+"""
+
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import OAuth2PasswordBearer
+
+from app.core.config import settings
+from app.core.security import UserStatus, decode_access_token, user_status_cache
+from app.db.base import SessionLocal
+from app.models.user import User
+
+oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.API_V1_STR}/auth/login", auto_error=False
+)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Kirjautuminen vaaditaan tai token on vanhentunut",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def load_user_status(user_id: int) -> Optional[UserStatus]:
+    """Käyttäjän tila tietokannasta (välimuistin ohitus)"""
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            return None
+        return UserStatus(
+            id=user.id,
+            email=user.email,
+            is_active=bool(user.is_active),
+            is_superuser=bool(user.is_superuser),
+        )
+    finally:
+        db.close()
+
+
+async def _resolve_user(token: Optional[str]) -> UserStatus:
+    user_id = decode_access_token(token) if token else None
+    if user_id is None:
+        raise _credentials_exception()
+
+    generation = user_status_cache.generation
+    user = user_status_cache.get(user_id)
+    if user is None:
+        user = await run_in_threadpool(load_user_status, user_id)
+        if user is None:
+            raise _credentials_exception()
+        user_status_cache.set(user_id, user, generation)
+
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Käyttäjätunnus ei ole aktiivinen",
+        )
+    return user
+
+
+async def get_current_user(
+    token: Optional[str] = Depends(oauth2_scheme),
+) -> UserStatus:
+    """Kirjautunut, aktiivinen käyttäjä (Authorization: Bearer <token>)"""
+    return await _resolve_user(token)
+
+
+async def get_current_user_from_query(
+    token: Optional[str] = Depends(oauth2_scheme),
+    access_token: Optional[str] = Query(None, include_in_schema=False),
+) -> UserStatus:
+    """
+    Kuten get_current_user, mutta token kelpaa myös ?access_token=
+    -parametrina. Vain SSE-virralle: selaimen EventSource ei voi asettaa
+    otsakkeita.
+    """
+    return await _resolve_user(token or access_token)
+
+
+async def get_current_superuser(
+    current_user: UserStatus = Depends(get_current_user),
+) -> UserStatus:
+    """Pääkäyttäjä"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Toiminto vaatii pääkäyttäjän oikeudet",
+        )
+    return current_user
@@ -0,0 +1,87 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.core.security import (
+    DUMMY_PASSWORD_HASH,
+    UserStatus,
+    create_access_token,
+    user_status_cache,
+    verify_password_async,
+)
+from app.crud import user as crud_user
+from app.db.base import SessionLocal, get_db
+from app.schemas.auth_schema import Token, User
+
+router = APIRouter()
+
+
+def _get_user_by_email(email: str):
+    db = SessionLocal()
+    try:
+        return crud_user.get_by_email(db, email)
+    finally:
+        db.close()
+
+
+@router.post("/login", response_model=Token)
+async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+    """
+    Kirjaudu sisään ja hae access token.
+
+    - **username**: Sähköpostiosoite
+    - **password**: Salasana
+    """
+    db_user = await run_in_threadpool(_get_user_by_email, form_data.username)
+
+    # Tuntemattomalle käyttäjälle tehdään sama bcrypt-vertailu, jotta
+    # vastausaika ei paljasta onko tunnus olemassa
+    hashed_password = db_user.hashed_password if db_user else DUMMY_PASSWORD_HASH
+    valid = await verify_password_async(form_data.password, hashed_password)
+    if db_user is None or not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Virheellinen sähköposti tai salasana",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not db_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Käyttäjätunnus ei ole aktiivinen",
+        )
+
+    # Ensimmäiset pyynnöt tokenilla eivät tarvitse tietokantaa
+    user_status_cache.set(
+        db_user.id,
+        UserStatus(
+            id=db_user.id,
+            email=db_user.email,
+            is_active=True,
+            is_superuser=bool(db_user.is_superuser),
+        ),
+    )
+    return Token(
+        access_token=create_access_token(db_user.id),
+        token_type="bearer",
+        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
+
+
+@router.get("/me", response_model=User)
+def read_current_user(
+    current_user: UserStatus = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Hae kirjautuneen käyttäjän tiedot.
+    """
+    db_user = crud_user.get(db, current_user.id)
+    if db_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Käyttäjää ei löytynyt",
+        )
+    return db_user
@@ -0,0 +1,69 @@
+import os
+from typing import Optional
+from fastapi import APIRouter, Query
+
+from app.db.pool import CHECKOUT_BUCKETS, pool_stats
+from app.schemas.debug_schema import HistogramBucket, PoolReport, PoolStatus
+
+router = APIRouter()
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+def _quantile(buckets: list[int], total: int, q: float) -> Optional[float]:
+    """Lokeron yläraja jonka kohdalla kumulatiivinen osuus ylittää q:n"""
+    if total == 0:
+        return None
+    cumulative = 0
+    for bound, count in zip(CHECKOUT_BUCKETS + (None,), buckets):
+        cumulative += count
+        if cumulative >= q * total:
+            return bound
+    return None
+
+
+def _pool_status(data: dict) -> PoolStatus:
+    buckets, count = data["buckets"], data["checkouts"]
+    histogram, cumulative = [], 0
+    for bound, bucket_count in zip(CHECKOUT_BUCKETS + (None,), buckets):
+        cumulative += bucket_count
+        histogram.append(HistogramBucket(le_ms=_ms(bound), count=cumulative))
+
+    return PoolStatus(
+        name=data["name"],
+        size=data.get("size"),
+        checked_out=data.get("checked_out"),
+        checked_in=data.get("checked_in"),
+        overflow=data.get("overflow"),
+        max_overflow=data.get("max_overflow"),
+        timeout_seconds=data.get("timeout_seconds"),
+        recycle_seconds=data.get("recycle_seconds"),
+        checkouts=count,
+        timeouts=data["timeouts"],
+        checkout_ms_mean=_ms(data["checkout_seconds_sum"] / count) if count else None,
+        checkout_ms_max=_ms(data["checkout_seconds_max"]),
+        checkout_ms_p50=_ms(_quantile(buckets, count, 0.5)),
+        checkout_ms_p99=_ms(_quantile(buckets, count, 0.99)),
+        histogram=histogram,
+    )
+
+
+@router.get("/pool", response_model=PoolReport)
+def get_pool_status(
+    reset: bool = Query(False, description="Nollaa laskurit raportin jälkeen"),
+):
+    """
+    Yhteyspoolien käyttö tässä prosessissa (yksi uvicorn worker).
+
+    - **checked_out** / **overflow**: Lainassa olevat yhteydet nyt
+    - **histogram**: connect()-ajat (odotus poolista, uusi yhteys, pre-ping)
+    - **timeouts**: Pyynnöt jotka eivät saaneet yhteyttä pool_timeoutissa
+    """
+    pools = []
+    for stats in list(pool_stats.values()):
+        pools.append(_pool_status(stats.snapshot()))
+        if reset:
+            stats.reset()
+    return PoolReport(pid=os.getpid(), pools=pools)
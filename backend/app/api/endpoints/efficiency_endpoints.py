@@ -0,0 +1,129 @@
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.db.base import get_db, get_primary_db
+from app.models.efficiency import EfficiencyPeriodType
+from app.models.product import ProductCategory
+from app.schemas.efficiency_schema import (
+    EfficiencySeries,
+    ProductivityReport,
+    WhatIfRequest,
+    WhatIfResponse,
+)
+from app.services.efficiency_series import SeriesRequest, get_series
+from app.services.efficiency_whatif import get_history, simulate
+from app.services.productivity import get_report
+
+router = APIRouter()
+
+
+@router.get("/series", response_model=EfficiencySeries)
+def get_efficiency_series(
+    # Tulos tallennetaan prosessin välimuistiin: replikan viive jäisi sinne
+    db: Session = Depends(get_primary_db),
+    start: date = Query(..., description="Alkupäivä"),
+    end: date = Query(..., description="Loppupäivä (mukaan lukien)"),
+    department_id: Optional[List[int]] = Query(
+        None, description="Osastot (oletuksena kaikki joilla on dataa)"
+    ),
+    resolution: Optional[EfficiencyPeriodType] = Query(
+        None, description="Pakota jaksotyyppi (oletuksena valitaan automaattisesti)"
+    ),
+    max_points: int = Query(
+        500, ge=10, le=5000, description="Pisteiden enimmäismäärä per osasto"
+    ),
+):
+    """
+    Hae tehokkuuden aikasarja sarakkeittain.
+
+    - **start** / **end**: Aikaväli
+    - **department_id**: Voi antaa useamman kerran
+    - **resolution**: DAILY, WEEKLY tai MONTHLY
+    - **max_points**: Jos jaksoja on enemmän, ne yhdistetään ämpäreiksi
+    """
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Loppupäivä ei voi olla ennen alkupäivää",
+        )
+
+    request = SeriesRequest(
+        start=start,
+        end=end,
+        department_ids=tuple(sorted(set(department_id))) if department_id else None,
+        resolution=resolution,
+        max_points=max_points,
+    )
+    return get_series(db, request)
+
+
+@router.post("/what-if", response_model=WhatIfResponse)
+def simulate_efficiency(
+    request: WhatIfRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Simuloi miten kategorioiden kertoimien muutos olisi vaikuttanut
+    osastojen tavoitetehokkuuteen. Ei kirjoita tietokantaan.
+
+    - **scenarios**: Esim. [{"name": "C 1.25", "multipliers": {"C": 1.25}}]
+    - Baseline lasketaan nykyisillä kertoimilla
+    """
+    if request.end < request.start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Loppupäivä ei voi olla ennen alkupäivää",
+        )
+
+    current = {
+        code: float(multiplier if multiplier is not None else 1)
+        for code, multiplier in db.query(
+            ProductCategory.code, ProductCategory.efficiency_multiplier
+        )
+    }
+
+    unknown = sorted(
+        {code for s in request.scenarios for code in s.multipliers} - current.keys()
+    )
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tuntemattomat kategoriat: {', '.join(unknown)}",
+        )
+
+    department_ids = (
+        tuple(sorted(set(request.department_ids))) if request.department_ids else None
+    )
+    history = get_history(db, request.start, request.end, department_ids)
+
+    return simulate(
+        history,
+        current,
+        [
+            (s.name, {code: float(m) for code, m in s.multipliers.items()})
+            for s in request.scenarios
+        ],
+    )
+
+
+@router.get("/productivity", response_model=ProductivityReport)
+def get_productivity(
+    # Tulos tallennetaan prosessin välimuistiin: replikan viive jäisi sinne
+    db: Session = Depends(get_primary_db),
+    start: date = Query(..., description="Alkupäivä"),
+    end: date = Query(..., description="Loppupäivä (mukaan lukien)"),
+):
+    """
+    Hae tuottavuus puuna: kokonaissumma -> osasto -> työvaihe -> työntekijä.
+
+    Kaikki tasot palautetaan kerralla, joten solmujen avaaminen ei vaadi
+    uusia kutsuja. Tehtävä kohdistetaan jaksolle ended_at-ajan mukaan.
+    """
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Loppupäivä ei voi olla ennen alkupäivää",
+        )
+    return get_report(db, start, end)
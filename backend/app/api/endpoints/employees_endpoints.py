@@ -0,0 +1,195 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.db.base import get_db, get_primary_db
+from app.crud import employee as crud_employee
+from app.crud import department as crud_department
+from app.schemas.employee_schema import (
+    Employee,
+    EmployeeBadge,
+    EmployeeCreate,
+    EmployeeUpdate,
+    EmployeeListResponse,
+)
+from app.services.employee_badges import badge_registry
+
+router = APIRouter()
+
+
+@router.get("/", response_model=EmployeeListResponse)
+def get_employees(
+    db: Session = Depends(get_db),
+    skip: int = Query(0, ge=0, description="Sivutuksen offset"),
+    limit: int = Query(100, ge=1, le=500, description="Tulosten määrä per sivu"),
+    search: Optional[str] = Query(
+        None, min_length=2, description="Nimihaku (myös kirjoitusvirheet) tai numero"
+    ),
+    department_id: Optional[int] = Query(None, description="Suodata pääosastolla"),
+    is_active: Optional[bool] = Query(None, description="Suodata aktiivisuuden mukaan"),
+):
+    """
+    Hae työntekijöitä suodattimilla ja paginaatiolla.
+
+    - **search**: Osa nimestä tai samankaltainen nimi; hakutulokset
+      järjestetään osuvuuden mukaan
+    - **department_id**: Näytä vain pääosaston työntekijät
+    - **is_active**: Näytä vain aktiiviset tai ei-aktiiviset
+    """
+    employees, total = crud_employee.get_multi(
+        db,
+        skip=skip,
+        limit=limit,
+        search=search,
+        department_id=department_id,
+        is_active=is_active,
+    )
+
+    page = (skip // limit) + 1 if limit > 0 else 1
+
+    return EmployeeListResponse(
+        items=employees,
+        total=total,
+        page=page,
+        page_size=limit,
+    )
+
+
+@router.get("/badge/{employee_number}", response_model=EmployeeBadge)
+def scan_badge(
+    employee_number: str,
+    # Ohitus täyttää prosessin kortinlukukartan: replikan viive jäisi sinne
+    db: Session = Depends(get_primary_db),
+):
+    """
+    Tunnista aktiivinen työntekijä kortin numerolla (päätteiden kortinluku).
+    Vastaus tulee prosessin muistista; tietokantaa käytetään vain ohituksissa.
+    """
+    entry = badge_registry.lookup(db, employee_number.strip())
+    if entry is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Aktiivista työntekijää numerolla '{employee_number}' ei löytynyt",
+        )
+    return entry
+
+
+@router.get("/{employee_id}", response_model=Employee)
+def get_employee(
+    employee_id: int,
+    db: Session = Depends(get_db),
+):
+    """
+    Hae yksittäinen työntekijä ID:llä.
+    """
+    employee = crud_employee.get(db, id=employee_id)
+    if not employee:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Työntekijää ID:llä {employee_id} ei löytynyt",
+        )
+    return employee
+
+
+def _check_department(db: Session, department_id: Optional[int]) -> None:
+    if department_id is not None and not crud_department.get(db, id=department_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Osastoa ID:llä {department_id} ei löytynyt",
+        )
+
+
+@router.post("/", response_model=Employee, status_code=status.HTTP_201_CREATED)
+def create_employee(
+    employee_in: EmployeeCreate,
+    db: Session = Depends(get_db),
+):
+    """
+    Luo uusi työntekijä.
+    """
+    # Tarkista ettei numero ole jo käytössä
+    existing = crud_employee.get_by_number(
+        db, employee_number=employee_in.employee_number
+    )
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Työntekijänumero '{employee_in.employee_number}' on jo käytössä",
+        )
+    _check_department(db, employee_in.primary_department_id)
+
+    employee = crud_employee.create(db, obj_in=employee_in)
+    return employee
+
+
+@router.put("/{employee_id}", response_model=Employee)
+def update_employee(
+    employee_id: int,
+    employee_in: EmployeeUpdate,
+    db: Session = Depends(get_db),
+):
+    """
+    Päivitä olemassa oleva työntekijä.
+    """
+    employee = crud_employee.get(db, id=employee_id)
+    if not employee:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Työntekijää ID:llä {employee_id} ei löytynyt",
+        )
+
+    # Tarkista numeron uniikkius jos päivitetään
+    if (
+        employee_in.employee_number
+        and employee_in.employee_number != employee.employee_number
+    ):
+        existing = crud_employee.get_by_number(
+            db, employee_number=employee_in.employee_number
+        )
+        if existing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Työntekijänumero '{employee_in.employee_number}' on jo käytössä",
+            )
+    _check_department(db, employee_in.primary_department_id)
+
+    employee = crud_employee.update(db, db_obj=employee, obj_in=employee_in)
+    return employee
+
+
+@router.post("/{employee_id}/deactivate", response_model=Employee)
+def deactivate_employee(
+    employee_id: int,
+    db: Session = Depends(get_db),
+):
+    """
+    Deaktivoi työntekijä (soft delete). Kortti lakkaa toimimasta heti.
+    """
+    employee = crud_employee.get(db, id=employee_id)
+    if not employee:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Työntekijää ID:llä {employee_id} ei löytynyt",
+        )
+
+    employee = crud_employee.deactivate(db, id=employee_id)
+    return employee
+
+
+@router.post("/{employee_id}/activate", response_model=Employee)
+def activate_employee(
+    employee_id: int,
+    db: Session = Depends(get_db),
+):
+    """
+    Aktivoi työntekijä uudelleen.
+    """
+    employee = crud_employee.get(db, id=employee_id)
+    if not employee:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Työntekijää ID:llä {employee_id} ei löytynyt",
+        )
+
+    employee = crud_employee.activate(db, id=employee_id)
+    return employee
@@ -0,0 +1,53 @@
+import asyncio
+from typing import List, Optional
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.services.event_broker import event_broker
+
+router = APIRouter()
+
+# Keep-alive -kommentin väli (pitää proxyt ja selaimen yhteyden auki)
+HEARTBEAT_SECONDS = 15
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    department_id: Optional[List[int]] = Query(
+        None, description="Tilaa vain näiden osastojen tapahtumat"
+    ),
+):
+    """
+    Server-Sent Events -virta muutostapahtumista.
+
+    Tapahtumat: order.status, order.moved, task.started, task.ended,
+    task.deleted, product.*, product_category.*, department.* sekä
+    resync (asiakkaan tulee hakea tila uudelleen).
+
+    - **department_id**: Osastosuodatin (voi antaa useamman kerran)
+    """
+    subscription = event_broker.subscribe(department_id)
+
+    async def event_stream():
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield b": keep-alive\n\n"
+                    continue
+                yield message
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
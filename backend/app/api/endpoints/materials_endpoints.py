@@ -0,0 +1,129 @@
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_superuser
+from app.db.base import get_db, get_primary_db
+from app.crud import weekly_plan as crud_weekly_plan
+from app.schemas.bom_schema import (
+    BOMImportResult,
+    MaterialRequirements,
+    MaterialWhatIfRequest,
+)
+from app.services.bom_import import BOMImportError, import_bom
+from app.services.event_broker import event_broker
+from app.services.material_requirements import (
+    BOMCycleError,
+    requirements_for_lines,
+    requirements_for_plan,
+    requirements_for_range,
+    invalidate_products,
+)
+
+router = APIRouter()
+
+
+@router.get("/requirements", response_model=MaterialRequirements)
+def get_material_requirements(
+    # multi_level täyttää BOM-välimuistit: replikan viive jäisi niihin
+    db: Session = Depends(get_primary_db),
+    weekly_plan_id: Optional[int] = Query(None, description="Viikkosuunnitelma"),
+    from_date: Optional[date] = Query(
+        None, alias="from", description="Toimituspäivä alkaen"
+    ),
+    to_date: Optional[date] = Query(
+        None, alias="to", description="Toimituspäivä asti (mukaan lukien)"
+    ),
+    multi_level: bool = Query(False, description="Pura alikokoonpanot rekursiivisesti"),
+):
+    """
+    Laske materiaalitarpeet Σ(tilausmäärä × BOM-määrä) materiaaleittain.
+
+    Anna joko **weekly_plan_id** tai **from** ja **to** (tilausten ship_date).
+
+    - **multi_level**: BOM-rivi jonka material_code on tuotteen item_number
+      korvataan kyseisen tuotteen materiaaleilla (rekursiivisesti)
+    """
+    if weekly_plan_id is not None:
+        if from_date is not None or to_date is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Anna joko weekly_plan_id tai päiväväli, ei molempia",
+            )
+        if not crud_weekly_plan.get(db, weekly_plan_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Viikkosuunnitelmaa ID:llä {weekly_plan_id} ei löytynyt",
+            )
+        try:
+            return requirements_for_plan(db, weekly_plan_id, multi_level=multi_level)
+        except BOMCycleError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if from_date is None or to_date is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Anna weekly_plan_id tai molemmat from ja to",
+        )
+    if to_date < from_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Loppupäivä ei voi olla ennen alkupäivää",
+        )
+    try:
+        return requirements_for_range(db, from_date, to_date, multi_level=multi_level)
+    except BOMCycleError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/requirements/what-if", response_model=MaterialRequirements)
+def simulate_material_requirements(
+    request: MaterialWhatIfRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Laske materiaalitarpeet kuvitelluille tilausriveille. Ei kirjoita
+    tietokantaan. BOM-rivit luetaan tuotekohtaisesta välimuistista.
+
+    - **lines**: Esim. [{"product_id": 12, "quantity": 40}]
+    - Tuntematon tuote lasketaan riviksi ilman BOM:ia
+    - **multi_level**: Alikokoonpanot puretaan rekursiivisesti
+    """
+    try:
+        return requirements_for_lines(
+            db,
+            ((line.product_id, line.quantity) for line in request.lines),
+            multi_level=request.multi_level,
+        )
+    except BOMCycleError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post(
+    "/bom/import",
+    response_model=BOMImportResult,
+    dependencies=[Depends(get_current_superuser)],
+)
+def import_bom_file(
+    file: UploadFile = File(..., description="CSV tai xlsx"),
+    dry_run: bool = Query(False, description="Laske erot kirjoittamatta"),
+):
+    """
+    Tuo BOM-rivit tiedostosta. Tiedostossa olevien tuotteiden BOM korvataan
+    kokonaan; muut tuotteet jäävät ennalleen. Vaatii pääkäyttäjän.
+
+    - Sarakkeet: item_number, material_code, material_name, quantity, unit
+    - **diffs**: Vain tuotteet joiden BOM muuttui
+    """
+    try:
+        result = import_bom(file.file, file.filename or "", dry_run=dry_run)
+    except BOMImportError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if result.diffs and not dry_run:
+        invalidate_products(diff.product_id for diff in result.diffs)
+        event_broker.publish(
+            "bom.imported", {"products_changed": result.products_changed}
+        )
+    return result
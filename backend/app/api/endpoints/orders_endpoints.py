@@ -0,0 +1,141 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.db.base import get_db
+from app.crud import department as crud_department
+from app.crud import production_order as crud_order
+from app.schemas.production_order_schema import (
+    OrderDepartmentStatus,
+    OrderDepartmentStatusUpdate,
+    ProductionOrder,
+    ProductionOrderListResponse,
+    ProductionOrderMove,
+)
+
+router = APIRouter()
+
+
+@router.get("/", response_model=ProductionOrderListResponse)
+def get_orders(
+    db: Session = Depends(get_db),
+    skip: int = Query(0, ge=0, description="Sivutuksen offset"),
+    limit: int = Query(100, ge=1, le=500, description="Tilausten määrä per sivu"),
+    search: Optional[str] = Query(None, description="Haku tilausnumerosta"),
+    department_id: Optional[int] = Query(
+        None, description="Suodata nykyisen osaston mukaan"
+    ),
+):
+    """
+    Hae tilauksia suodattimilla ja paginaatiolla.
+
+    - **skip**: Montako tulosta ohitetaan (paginaatio)
+    - **limit**: Montako tulosta palautetaan
+    - **search**: Hae tilausnumerosta
+    - **department_id**: Näytä vain osaston jonossa olevat tilaukset
+    """
+    orders, total = crud_order.get_multi(
+        db,
+        skip=skip,
+        limit=limit,
+        search=search,
+        department_id=department_id,
+    )
+
+    page = (skip // limit) + 1 if limit > 0 else 1
+
+    return ProductionOrderListResponse(
+        items=orders,
+        total=total,
+        page=page,
+        page_size=limit,
+    )
+
+
+@router.get("/largest", response_model=List[ProductionOrder])
+def get_largest_orders(
+    db: Session = Depends(get_db),
+    year: int = Query(..., description="Vuosi"),
+    week_number: int = Query(..., ge=1, le=53, description="Viikko"),
+    limit: int = Query(20, ge=1, le=200),
+):
+    """
+    Hae viikon suurimmat tilaukset työmääräarvion (estimated_minutes) mukaan.
+    """
+    return crud_order.get_largest(
+        db, year=year, week_number=week_number, limit=limit
+    )
+
+
+@router.get("/{order_id}", response_model=ProductionOrder)
+def get_order(
+    order_id: int,
+    db: Session = Depends(get_db),
+):
+    """
+    Hae yksittäinen tilaus ID:llä.
+    """
+    order = crud_order.get(db, id=order_id)
+    if not order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tilausta ID:llä {order_id} ei löytynyt",
+        )
+    return order
+
+
+@router.post("/{order_id}/move", response_model=ProductionOrder)
+def move_order(
+    order_id: int,
+    move_in: ProductionOrderMove,
+    db: Session = Depends(get_db),
+):
+    """
+    Siirrä tilaus osastolle tai uuteen kohtaan osaston jonossa.
+    """
+    order = crud_order.get(db, id=order_id)
+    if not order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tilausta ID:llä {order_id} ei löytynyt",
+        )
+
+    if not crud_department.get(db, id=move_in.department_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Osastoa ID:llä {move_in.department_id} ei löytynyt",
+        )
+
+    order = crud_order.move(db, db_obj=order, obj_in=move_in)
+    return order
+
+
+@router.put(
+    "/{order_id}/departments/{department_id}/status",
+    response_model=OrderDepartmentStatus,
+)
+def update_order_department_status(
+    order_id: int,
+    department_id: int,
+    status_in: OrderDepartmentStatusUpdate,
+    db: Session = Depends(get_db),
+):
+    """
+    Päivitä tilauksen tila ja valmistunut määrä osastossa.
+    """
+    order = crud_order.get(db, id=order_id)
+    if not order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tilausta ID:llä {order_id} ei löytynyt",
+        )
+
+    if not crud_department.get(db, id=department_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Osastoa ID:llä {department_id} ei löytynyt",
+        )
+
+    return crud_order.set_department_status(
+        db, db_obj=order, department_id=department_id, obj_in=status_in
+    )
@@ -0,0 +1,265 @@
+"""
+Tuote-endpointit async-versiona (ASYNC_ENDPOINTS)
+"""
+
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.async_base import get_async_db
+from app.crud import product_async as crud_product
+from app.crud import product_category_async as crud_product_category
+from app.schemas.product_schema import (
+    Product,
+    ProductCreate,
+    ProductUpdate,
+    ProductListResponse,
+)
+
+router = APIRouter()
+
+
+@router.get("/", response_model=ProductListResponse)
+async def get_products(
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = Query(0, ge=0, description="Sivutuksen offset"),
+    limit: int = Query(100, ge=1, le=500, description="Tuotteiden määrä per sivu"),
+    search: Optional[str] = Query(
+        None, description="Haku tuotenumerosta tai kuvauksesta"
+    ),
+    category_code: Optional[str] = Query(None, description="Suodata kategorian mukaan"),
+    is_active: Optional[bool] = Query(None, description="Suodata aktiivisuuden mukaan"),
+):
+    """
+    Hae tuotteita suodattimilla ja paginaatiolla.
+
+    - **skip**: Montako tulosta ohitetaan (paginaatio)
+    - **limit**: Montako tulosta palautetaan
+    - **search**: Hae tuotenumerosta tai kuvauksesta
+    - **category_code**: Näytä vain tietyn kategorian tuotteet
+    - **is_active**: Näytä vain aktiiviset tai ei-aktiiviset
+    """
+    products, total = await crud_product.get_multi(
+        db,
+        skip=skip,
+        limit=limit,
+        search=search,
+        category_code=category_code,
+        is_active=is_active,
+    )
+
+    page = (skip // limit) + 1 if limit > 0 else 1
+
+    return ProductListResponse(
+        items=products,
+        total=total,
+        page=page,
+        page_size=limit,
+    )
+
+
+@router.get("/active", response_model=List[Product])
+async def get_active_products(
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = Query(100, ge=1, le=500),
+):
+    """
+    Hae kaikki aktiiviset tuotteet.
+    Hyödyllinen esim. dropdown-listoihin.
+    """
+    products, _ = await crud_product.get_active(db, skip=0, limit=limit)
+    return products
+
+
+@router.get("/search", response_model=List[Product])
+async def search_products(
+    db: AsyncSession = Depends(get_async_db),
+    q: str = Query(..., min_length=1, description="Hakutermi"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Pikahaku tuotteille (autocomplete).
+    Hakee tuotenumeroista alkaen hakutermillä.
+    """
+    products = await crud_product.search_by_number(
+        db,
+        search_term=q,
+        limit=limit,
+    )
+    return products
+
+
+@router.get("/stats")
+async def get_product_stats(db: AsyncSession = Depends(get_async_db)):
+    """
+    Hae tuotetilastot.
+    """
+    return await crud_product.get_stats(db)
+
+
+@router.get("/{product_id}", response_model=Product)
+async def get_product(
+    product_id: int,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Hae yksittäinen tuote ID:llä.
+    """
+    product = await crud_product.get(db, id=product_id)
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tuotetta ID:llä {product_id} ei löytynyt",
+        )
+    return product
+
+
+@router.get("/by-number/{item_number}", response_model=Product)
+async def get_product_by_number(
+    item_number: str,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Hae tuote tuotenumerolla.
+    """
+    product = await crud_product.get_by_item_number(db, item_number=item_number)
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tuotetta numerolla '{item_number}' ei löytynyt",
+        )
+    return product
+
+
+@router.post("/", response_model=Product, status_code=status.HTTP_201_CREATED)
+async def create_product(
+    product_in: ProductCreate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Luo uusi tuote.
+    """
+    # Tarkista ettei tuotenumero ole jo käytössä
+    existing = await crud_product.get_by_item_number(
+        db, item_number=product_in.item_number
+    )
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tuotenumero '{product_in.item_number}' on jo käytössä",
+        )
+
+    # Tarkista että kategoria on olemassa jos määritelty
+    if product_in.category_code:
+        category = await crud_product_category.get_by_code(
+            db, code=product_in.category_code
+        )
+        if not category:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Kategoriaa koodilla '{product_in.category_code}' ei löytynyt",
+            )
+
+    product = await crud_product.create(db, obj_in=product_in)
+    return product
+
+
+@router.put("/{product_id}", response_model=Product)
+async def update_product(
+    product_id: int,
+    product_in: ProductUpdate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Päivitä olemassa oleva tuote.
+    """
+    product = await crud_product.get(db, id=product_id)
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tuotetta ID:llä {product_id} ei löytynyt",
+        )
+
+    # Tarkista tuotenumeron uniiккius jos päivitetään
+    if product_in.item_number and product_in.item_number != product.item_number:
+        existing = await crud_product.get_by_item_number(
+            db, item_number=product_in.item_number
+        )
+        if existing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Tuotenumero '{product_in.item_number}' on jo käytössä",
+            )
+
+    # Tarkista kategoria jos päivitetään
+    if product_in.category_code:
+        category = await crud_product_category.get_by_code(
+            db, code=product_in.category_code
+        )
+        if not category:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Kategoriaa koodilla '{product_in.category_code}' ei löytynyt",
+            )
+
+    product = await crud_product.update(db, db_obj=product, obj_in=product_in)
+    return product
+
+
+@router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_product(
+    product_id: int,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Poista tuote (hard delete).
+    Huom: Suositellaan käyttämään deactivate-endpointia sen sijaan!
+    """
+    product = await crud_product.get(db, id=product_id)
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tuotetta ID:llä {product_id} ei löytynyt",
+        )
+
+    await crud_product.delete(db, id=product_id)
+    return None
+
+
+@router.post("/{product_id}/deactivate", response_model=Product)
+async def deactivate_product(
+    product_id: int,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Deaktivoi tuote (soft delete).
+    Suositeltu tapa "poistaa" tuotteita.
+    """
+    product = await crud_product.get(db, id=product_id)
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tuotetta ID:llä {product_id} ei löytynyt",
+        )
+
+    product = await crud_product.deactivate(db, id=product_id)
+    return product
+
+
+@router.post("/{product_id}/activate", response_model=Product)
+async def activate_product(
+    product_id: int,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Aktivoi tuote uudelleen.
+    """
+    product = await crud_product.get(db, id=product_id)
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tuotetta ID:llä {product_id} ei löytynyt",
+        )
+
+    product = await crud_product.activate(db, id=product_id)
+    return product
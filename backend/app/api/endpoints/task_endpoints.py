@@ -0,0 +1,130 @@
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.db.base import get_db, get_primary_db
+from app.crud import production_task as crud_task
+from app.services.open_task_registry import open_task_registry
+from app.schemas.production_task_schema import (
+    ProductionTask,
+    ProductionTaskStart,
+    ProductionTaskEnd,
+    OpenTask,
+    OpenTaskListResponse,
+)
+
+router = APIRouter()
+
+
+@router.get("/open", response_model=OpenTaskListResponse)
+def get_open_tasks(
+    # Rekisteri rakennetaan primarystä: replikan viive hukkaisi aloituksia
+    db: Session = Depends(get_primary_db),
+    department_id: Optional[int] = Query(None, description="Suodata osaston mukaan"),
+):
+    """
+    Hae avoimet tehtävät ("kuka tekee mitä").
+    Palvellaan muistissa olevasta rekisteristä, ei tietokantakyselyä.
+
+    - **department_id**: Näytä vain tietyn osaston tehtävät
+    """
+    # Lataus epäonnistui käynnistyksessä tai toisen workerin muutokset
+    open_task_registry.refresh(db)
+
+    entries = open_task_registry.list(department_id)
+    now = datetime.now(timezone.utc)
+
+    items = [
+        OpenTask(
+            task_id=entry.task_id,
+            production_order_id=entry.production_order_id,
+            order_number=entry.order_number,
+            employee_id=entry.employee_id,
+            employee_name=entry.employee_name,
+            department_id=entry.department_id,
+            work_phase_id=entry.work_phase_id,
+            work_phase_name=entry.work_phase_name,
+            started_at=entry.started_at,
+            elapsed_minutes=round((now - entry.started_at).total_seconds() / 60, 1),
+        )
+        for entry in entries
+    ]
+
+    return OpenTaskListResponse(items=items, total=len(items))
+
+
+@router.get("/{task_id}", response_model=ProductionTask)
+def get_task(
+    task_id: int,
+    db: Session = Depends(get_db),
+):
+    """
+    Hae yksittäinen tehtävä ID:llä.
+    """
+    task = crud_task.get(db, id=task_id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tehtävää ID:llä {task_id} ei löytynyt",
+        )
+    return task
+
+
+@router.post(
+    "/start", response_model=ProductionTask, status_code=status.HTTP_201_CREATED
+)
+def start_task(
+    task_in: ProductionTaskStart,
+    db: Session = Depends(get_db),
+):
+    """
+    Aloita uusi tehtävä.
+    """
+    task = crud_task.start(db, obj_in=task_in)
+    return task
+
+
+@router.post("/{task_id}/end", response_model=ProductionTask)
+def end_task(
+    task_id: int,
+    task_in: ProductionTaskEnd,
+    db: Session = Depends(get_db),
+):
+    """
+    Päätä käynnissä oleva tehtävä ja kirjaa valmistunut määrä.
+    """
+    task = crud_task.get(db, id=task_id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tehtävää ID:llä {task_id} ei löytynyt",
+        )
+
+    if task.ended_at is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tehtävä {task_id} on jo päätetty",
+        )
+
+    task = crud_task.end(db, db_obj=task, obj_in=task_in)
+    return task
+
+
+@router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_task(
+    task_id: int,
+    db: Session = Depends(get_db),
+):
+    """
+    Poista tehtävä (esim. virheellinen kirjaus).
+    """
+    task = crud_task.get(db, id=task_id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tehtävää ID:llä {task_id} ei löytynyt",
+        )
+
+    crud_task.delete(db, id=task_id)
+    return None
@@ -0,0 +1,264 @@
+from datetime import date, datetime
+from typing import List
+from zoneinfo import ZoneInfo
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.base import get_db, get_primary_db
+from app.crud import weekly_plan as crud_weekly_plan
+from app.models.production_order import ProductionOrder
+from app.models.weekly_plan import WeeklyPlan
+from app.schemas.weekly_plan_schema import (
+    WeeklyPlanBuildRequest,
+    WeeklyPlanBuildResult,
+    WeeklyPlanBuildWeek,
+    WeeklyPlanSequenceRequest,
+    WeeklyPlanSequenceResult,
+    WeeklyLoadMatrix,
+    WeeklyPlanItem,
+    WeeklyPlanGridSync,
+    WeeklyPlanGridSyncResult,
+    WeeklyPlanRolloverResult,
+)
+from app.services.plan_builder import build_plans
+from app.services.plan_sequencer import sequence_plan
+from app.services.weekly_load import get_load, load_cache
+
+router = APIRouter()
+
+# Kuormitusnäkymän enimmäispituus
+MAX_LOAD_DAYS = 2 * 366
+
+
+@router.get("/load", response_model=WeeklyLoadMatrix)
+def get_weekly_load(
+    # Tulos tallennetaan prosessin välimuistiin: replikan viive jäisi sinne
+    db: Session = Depends(get_primary_db),
+    from_date: date = Query(
+        ..., alias="from", description="Ensimmäisen viikon päivä"
+    ),
+    to_date: date = Query(..., alias="to", description="Viimeisen viikon päivä"),
+    history_days: int = Query(
+        365, ge=7, le=3650, description="Osastojakauman historiajakso"
+    ),
+):
+    """
+    Hae suunniteltu työ, kapasiteetti ja kuormitus-% viikoittain ja osastoittain.
+
+    - **from** / **to**: Päivämäärät; mukaan tulevat niiden ISO-viikot
+    """
+    if to_date < from_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Loppupäivä ei voi olla ennen alkupäivää",
+        )
+    if (to_date - from_date).days > MAX_LOAD_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Aikaväli voi olla enintään kaksi vuotta",
+        )
+
+    return get_load(db, from_date, to_date, history_days=history_days)
+
+
+@router.post("/build", response_model=WeeklyPlanBuildResult)
+def build_weekly_plans(
+    request: WeeklyPlanBuildRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Täytä tulevat viikkosuunnitelmat avoimilla tilauksilla kapasiteetin mukaan.
+
+    - **start_year** / **start_week**: Ensimmäinen viikko (oletuksena kuluva)
+    - **weeks**: Horisontin pituus viikkoina
+    - **replace**: Suunnittele horisontti kokonaan uudelleen
+    - **dry_run**: Palauta tulos tallentamatta
+    """
+    if (request.start_year is None) != (request.start_week is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Anna sekä start_year että start_week tai ei kumpaakaan",
+        )
+
+    if request.start_year is None:
+        today = datetime.now(ZoneInfo(settings.TIMEZONE)).date()
+        start_year, start_week, _ = today.isocalendar()
+    else:
+        start_year, start_week = request.start_year, request.start_week
+
+    try:
+        date.fromisocalendar(start_year, start_week, 1)
+    except ValueError:
+        # Viikkoa 53 ei ole kaikkina vuosina
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Virheellinen viikko {start_year}-W{start_week:02d}",
+        )
+
+    result = build_plans(
+        db,
+        start_year=start_year,
+        start_week=start_week,
+        weeks=request.weeks,
+        replace=request.replace,
+        dry_run=request.dry_run,
+    )
+    if not request.dry_run:
+        load_cache.invalidate()
+
+    return WeeklyPlanBuildResult(
+        weeks=[
+            WeeklyPlanBuildWeek(
+                weekly_plan_id=w.weekly_plan_id,
+                year=w.year,
+                week_number=w.week_number,
+                capacity_hours=round(w.capacity_hours, 2),
+                planned_hours=round(w.planned_hours, 2),
+                orders_added=w.orders_added,
+            )
+            for w in result.weeks
+        ],
+        missing_weeks=[f"{year}-W{week:02d}" for year, week in result.missing_weeks],
+        planned_orders=result.planned_orders,
+        unplanned_order_ids=result.unplanned_order_ids,
+        duration_seconds=round(result.duration_seconds, 3),
+    )
+
+
+@router.post("/{weekly_plan_id}/sequence", response_model=WeeklyPlanSequenceResult)
+def sequence_weekly_plan(
+    weekly_plan_id: int,
+    request: WeeklyPlanSequenceRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Optimoi viikkosuunnitelman rivien järjestys (planned_sequence) niin,
+    että kaikkien osastojen läpimenoaika ja odotus minimoituvat.
+
+    - **time_budget_ms**: Kauanko haku saa kestää
+    - **history_days**: Aika-arvioiden historiajakso
+    - **dry_run**: Palauta tulos tallentamatta
+    """
+    plan = db.query(WeeklyPlan.id).filter(WeeklyPlan.id == weekly_plan_id).first()
+    if plan is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Viikkosuunnitelmaa ID:llä {weekly_plan_id} ei löytynyt",
+        )
+
+    sequencing = sequence_plan(
+        db,
+        weekly_plan_id,
+        time_budget_seconds=request.time_budget_ms / 1000,
+        history_days=request.history_days,
+        dry_run=request.dry_run,
+    )
+    if sequencing is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Suunnitelmassa ei ole rivejä tai aktiivisia osastoja",
+        )
+
+    result = sequencing.result
+    return WeeklyPlanSequenceResult(
+        weekly_plan_id=weekly_plan_id,
+        item_ids=sequencing.item_ids,
+        department_ids=sequencing.department_ids,
+        makespan_hours_before=round(result.initial.makespan / 60, 2),
+        makespan_hours_after=round(result.schedule.makespan / 60, 2),
+        idle_hours_before=[round(v / 60, 2) for v in result.initial.idle.tolist()],
+        idle_hours_after=[round(v / 60, 2) for v in result.schedule.idle.tolist()],
+        iterations=result.iterations,
+        duration_seconds=round(result.duration_seconds, 3),
+    )
+
+
+@router.get("/{weekly_plan_id}/items", response_model=List[WeeklyPlanItem])
+def get_weekly_plan_items(
+    weekly_plan_id: int,
+    db: Session = Depends(get_db),
+):
+    """
+    Hae suunnitelman rivit järjestyksessä (ruudukon lataus).
+    """
+    if crud_weekly_plan.get(db, weekly_plan_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Viikkosuunnitelmaa ID:llä {weekly_plan_id} ei löytynyt",
+        )
+    return crud_weekly_plan.get_items(db, weekly_plan_id)
+
+
+@router.put("/{weekly_plan_id}/items", response_model=WeeklyPlanGridSyncResult)
+def sync_weekly_plan_items(
+    weekly_plan_id: int,
+    grid: WeeklyPlanGridSync,
+    db: Session = Depends(get_db),
+):
+    """
+    Tallenna koko ruudukko kerralla.
+    Palvelin laskee eron nykyisiin riveihin ja kirjoittaa vain muutokset.
+
+    - Listasta puuttuvat rivit poistetaan
+    - Uudet tilaukset lisätään, muuttuneet rivit päivitetään
+    """
+    db_plan = crud_weekly_plan.get(db, weekly_plan_id)
+    if db_plan is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Viikkosuunnitelmaa ID:llä {weekly_plan_id} ei löytynyt",
+        )
+
+    order_ids = {item.production_order_id for item in grid.items}
+    if order_ids:
+        found = {
+            row.id
+            for row in db.query(ProductionOrder.id).filter(
+                ProductionOrder.id.in_(order_ids)
+            )
+        }
+        missing = sorted(order_ids - found)
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Tilauksia ei löytynyt: {', '.join(map(str, missing))}",
+            )
+
+    inserted, updated, deleted = crud_weekly_plan.sync_items(
+        db, db_obj=db_plan, items_in=grid.items
+    )
+    return WeeklyPlanGridSyncResult(
+        inserted=inserted,
+        updated=updated,
+        deleted=deleted,
+        items=crud_weekly_plan.get_items(db, weekly_plan_id),
+    )
+
+
+@router.post("/{weekly_plan_id}/rollover", response_model=WeeklyPlanRolloverResult)
+def rollover_weekly_plan(
+    weekly_plan_id: int,
+    db: Session = Depends(get_db),
+):
+    """
+    Siirrä keskeneräiset rivit seuraavan viikon suunnitelmaan.
+    Kohdeviikon suunnitelma luodaan tarvittaessa samalla kapasiteetilla.
+    """
+    db_plan = crud_weekly_plan.get(db, weekly_plan_id)
+    if db_plan is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Viikkosuunnitelmaa ID:llä {weekly_plan_id} ei löytynyt",
+        )
+
+    target, created, moved, inserted = crud_weekly_plan.rollover(db, db_obj=db_plan)
+    return WeeklyPlanRolloverResult(
+        source_plan_id=weekly_plan_id,
+        target_plan_id=target.id,
+        target_year=target.year,
+        target_week_number=target.week_number,
+        target_created=created,
+        moved=moved,
+        inserted=inserted,
+    )
@@ -0,0 +1,92 @@
+"""
+Prosessin sisäinen välimuisti (LRU + vanhenemisaika)
+
+Jokainen välimuisti rekisteröityy nimellä, jotta osuma- ja ohitustilastot
+saadaan kerättyä yhdestä paikasta. Moniprosessiajossa (useampi uvicorn
+worker) jokaisella prosessilla on oma välimuistinsa, joten TTL rajaa
+kuinka vanhaa dataa toinen prosessi voi palauttaa invalidoinnin jälkeen.
+
+invalidate() kasvattaa sukupolvilaskuria. Arvo joka laskettiin ennen
+invalidointia alkanutta lukua vasten jätetään tallentamatta (set(...,
+generation=)), jotta kirjoitusta edeltänyt tulos ei jää voimaan TTL:n ajaksi.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+# Kaikki luodut välimuistit nimen mukaan
+caches: Dict[str, "TTLCache"] = {}
+
+
+class TTLCache:
+    """Säieturvallinen LRU-välimuisti vanhenemisajalla"""
+
+    def __init__(self, name: str, *, maxsize: int = 128, ttl_seconds: float = 300):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        caches[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Hae arvo; vanhentunut arvo poistetaan ja tulkitaan ohitukseksi"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(
+        self, key: Hashable, value: Any, generation: Optional[int] = None
+    ) -> None:
+        """
+        Tallenna arvo. generation: self.generation ennen arvon laskemista;
+        jos välimuisti on invalidoitu sen jälkeen, arvoa ei tallenneta.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Palauta välimuistista tai laske factory():lla ja tallenna.
+        factory ajetaan lukon ulkopuolella, joten samaa avainta voidaan
+        laskea rinnakkain - viimeisin tulos jää voimaan. Laskennan aikana
+        tapahtunut invalidointi estää tallennuksen.
+        """
+        generation = self.generation
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value, generation)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Poista yksi avain tai (ilman avainta) koko sisältö"""
+        with self._lock:
+            self.generation += 1
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
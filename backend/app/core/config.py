@@ -5,16 +5,81 @@ from typing import Optional
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    # Async-reitit (asyncpg); oletuksena DATABASE_URL asyncpg-ajurilla
+    ASYNC_ENDPOINTS: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Pyyntökohtainen SQL-instrumentointi (Server-Timing, N+1-varoitus)
+    SQL_INSTRUMENTATION: bool = True
+    # Sama lausemuoto useammin kuin tämän verran yhdessä pyynnössä (0 = pois)
+    SQL_REPEAT_THRESHOLD: int = 20
+    # Toisto on virhe eikä pelkkä varoitus (testit ja benchmarkit)
+    SQL_REPEAT_RAISE: bool = False
+
+    # Prometheus /metrics
+    METRICS_ENABLED: bool = True
+    # Moniprosessiajossa workerien yhteinen hakemisto (tyhjennä ennen käynnistystä)
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_FLUSH_SECONDS: float = 5
+
+    # Lukureplikat GET-pyynnöille (pilkulla eroteltu, tyhjä = vain primary)
+    DATABASE_REPLICA_URLS: str = ""
+    # Kirjoituksen jälkeen sama asiakas lukee primarystä näin kauan
+    REPLICA_STICKY_SECONDS: float = 5
+
+    # Yhteyspooli (per prosessi ja engine; async-engine saa omansa)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    # Yhteydet avataan uudelleen tämän jälkeen (-1 = ei koskaan)
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Palvelimen statement_timeout jokaiselle yhteydelle (0 = ei rajaa);
+    # massa-ajot ohittavat sen (DISABLE_STATEMENT_TIMEOUT)
+    DB_STATEMENT_TIMEOUT_MS: int = 0
 
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Käyttäjän tila (is_active / is_superuser) välimuistissa tokenin rinnalla
+    AUTH_USER_CACHE_TTL_SECONDS: int = 30
+    AUTH_USER_CACHE_MAXSIZE: int = 1024
+    # Rinnakkaiset bcrypt-tarkistukset (kirjautuminen)
+    AUTH_PASSWORD_WORKERS: int = 2
 
     # App
     PROJECT_NAME: str = "ERP 2.0"
     VERSION: str = "2.0.0"
     API_V1_STR: str = "/api/v1"
+    TIMEZONE: str = "Europe/Helsinki"
+    # True = API-reitit ladataan käynnistyksen jälkeen taustasäikeessä, API-
+    # pyynnöt odottavat latausta ja /health vastaa 503 kunnes se on valmis;
+    # False = reitit ladataan jo create_app():ssa
+    DEFER_API_ROUTES: bool = False
+
+    # Efficiency rollup (0 = taustaprosessi pois päältä)
+    EFFICIENCY_ROLLUP_INTERVAL_SECONDS: int = 300
+    EFFICIENCY_SERIES_CACHE_TTL_SECONDS: int = 300
+    EFFICIENCY_WHATIF_CACHE_TTL_SECONDS: int = 900
+    PRODUCTIVITY_CACHE_TTL_SECONDS: int = 300
+
+    # Viikkosuunnitelmien kuormitusmatriisi
+    WEEKLY_LOAD_CACHE_TTL_SECONDS: int = 300
+
+    # Kortinlukukartan enimmäisikä (muiden workerien muutokset)
+    EMPLOYEE_BADGE_MAX_AGE_SECONDS: int = 60
+
+    # Avoimien tehtävien rekisterin enimmäisikä (muiden workerien aloitukset
+    # ja lopetukset)
+    OPEN_TASK_MAX_AGE_SECONDS: int = 15
+
+    # Tuotekohtainen BOM-välimuisti (materiaalitarpeiden what-if)
+    BOM_CACHE_TTL_SECONDS: int = 3600
+    BOM_CACHE_MAXSIZE: int = 20000
+    # Toisen prosessin BOM-muutokset huomataan viimeistään tämän ajan kuluttua
+    # (muutoslaskuri luetaan tietokannasta; 0 = jokaisella kutsulla)
+    BOM_CACHE_VERSION_CHECK_SECONDS: float = 1.0
 
     class Config:
         env_file = ".env"
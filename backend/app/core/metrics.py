@@ -0,0 +1,402 @@
+"""
+Prometheus-muotoiset mittarit (/metrics)
+
+Kevyet laskurit, mittarit ja histogrammit prosessin muistissa; pyyntöä
+kohden kirjataan muutama sanakirjapäivitys lukon alla. Poolien ja
+välimuistien luvut luetaan vasta scrapessa niiden omista tilastoista.
+
+Moniprosessiajo (uvicorn --workers N): kun METRICS_MULTIPROC_DIR on
+asetettu, jokainen worker kirjoittaa tilannekuvansa hakemistoon
+METRICS_FLUSH_SECONDS välein, ja scrapen käsittelevä worker summaa kaikki
+tiedostot. Laskurit ja histogrammit säilyvät päättyneiltäkin workereilta;
+mittarit (gauge) vain elossa olevilta. Hakemisto tyhjennetään ennen
+palvelimen käynnistystä.
+"""
+
+import asyncio
+import bisect
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from app.core.cache import caches
+from app.core.config import settings
+from app.db.instrumentation import current_stats
+from app.db.pool import CHECKOUT_BUCKETS, pool_stats
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+# Kaikki mittarit nimen mukaan (esitysjärjestys = luontijärjestys)
+registry: Dict[str, "_Metric"] = {}
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.values: dict = {}
+        self._lock = threading.Lock()
+        registry[name] = self
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            values = [
+                [list(labels), self._copy(value)]
+                for labels, value in self.values.items()
+            ]
+        return {
+            "kind": self.kind,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "values": values,
+        }
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def set(self, labels: tuple, value: float) -> None:
+        """Peilaa toisen komponentin oma laskuri (scrapessa)"""
+        with self._lock:
+            self.values[labels] = value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dec(self, labels: tuple = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+    def set(self, labels: tuple, value: float) -> None:
+        with self._lock:
+            self.values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), *, buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, labels: tuple, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self.values.get(labels)
+            if entry is None:
+                # lokerot (ei kumulatiivisia) + [summa]
+                entry = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            entry[index] += 1
+            entry[-1] += value
+
+    def set(self, labels: tuple, counts: list, total: float) -> None:
+        """Peilaa valmis histogrammi samoilla lokeroilla (scrapessa)"""
+        with self._lock:
+            self.values[labels] = list(counts) + [total]
+
+    @staticmethod
+    def _copy(value):
+        return list(value)
+
+    def snapshot(self) -> dict:
+        data = super().snapshot()
+        data["buckets"] = list(self.buckets)
+        return data
+
+
+# ============================================================================
+# Metrics
+# ============================================================================
+
+http_requests = Counter(
+    "http_requests_total", "HTTP requests", ("method", "route", "status")
+)
+http_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route"),
+)
+http_in_progress = Gauge(
+    "http_requests_in_progress", "HTTP requests being served", ("method",)
+)
+db_queries = Counter(
+    "db_queries_total", "SQL statements executed per route", ("method", "route")
+)
+db_query_seconds = Counter(
+    "db_query_seconds_total", "Time spent in SQL per route", ("method", "route")
+)
+db_pool_size = Gauge("db_pool_size", "Configured pool size", ("pool",))
+db_pool_checked_out = Gauge(
+    "db_pool_checked_out", "Connections currently checked out", ("pool",)
+)
+db_pool_overflow = Gauge(
+    "db_pool_overflow", "Overflow connections currently open", ("pool",)
+)
+db_pool_timeouts = Counter(
+    "db_pool_timeouts_total", "Checkouts that hit pool_timeout", ("pool",)
+)
+db_pool_checkout = Histogram(
+    "db_pool_checkout_seconds",
+    "Connection checkout latency",
+    ("pool",),
+    buckets=CHECKOUT_BUCKETS,
+)
+cache_hits = Counter("cache_hits_total", "In-process cache hits", ("cache",))
+cache_misses = Counter("cache_misses_total", "In-process cache misses", ("cache",))
+cache_entries = Gauge("cache_entries", "Entries in in-process cache", ("cache",))
+job_duration = Histogram(
+    "background_job_duration_seconds",
+    "Background job run time",
+    ("job",),
+    buckets=JOB_BUCKETS,
+)
+job_failures = Counter(
+    "background_job_failures_total", "Background job runs that raised", ("job",)
+)
+
+
+@contextmanager
+def track_job(name: str) -> Iterator[None]:
+    """Kirjaa taustatyön kesto (ja epäonnistuminen)"""
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        job_failures.inc((name,))
+        raise
+    finally:
+        job_duration.observe((name,), time.perf_counter() - started)
+
+
+def _collect() -> None:
+    """Päivitä poolien ja välimuistien luvut niiden omista tilastoista"""
+    for name, stats in list(pool_stats.items()):
+        data = stats.snapshot()
+        labels = (name,)
+        if "size" in data:
+            db_pool_size.set(labels, data["size"])
+            db_pool_checked_out.set(labels, data["checked_out"])
+            db_pool_overflow.set(labels, data["overflow"])
+        db_pool_timeouts.set(labels, data["timeouts"])
+        db_pool_checkout.set(labels, data["buckets"], data["checkout_seconds_sum"])
+
+    for name, cache in list(caches.items()):
+        labels = (name,)
+        cache_hits.set(labels, cache.hits)
+        cache_misses.set(labels, cache.misses)
+        cache_entries.set(labels, len(cache))
+
+
+def snapshot() -> dict:
+    _collect()
+    return {name: metric.snapshot() for name, metric in registry.items()}
+
+
+# ============================================================================
+# Multi-worker aggregation
+# ============================================================================
+
+
+def _snapshot_path(pid: int) -> str:
+    return os.path.join(settings.METRICS_MULTIPROC_DIR, f"metrics_{pid}.json")
+
+
+def write_snapshot() -> None:
+    """Kirjoita tämän workerin tilannekuva (atominen korvaus)"""
+    path = _snapshot_path(os.getpid())
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump({"pid": os.getpid(), "metrics": snapshot()}, f)
+    os.replace(temporary, path)
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _merge(snapshots: list[tuple[bool, dict]]) -> dict:
+    """Summaa workerien tilannekuvat (gauget vain eläviltä)"""
+    merged: dict = {}
+    for alive, metrics in snapshots:
+        for name, data in metrics.items():
+            if data["kind"] == "gauge" and not alive:
+                continue
+            target = merged.setdefault(name, {**data, "values": {}})
+            for labels, value in data["values"]:
+                key = tuple(labels)
+                if isinstance(value, list):
+                    current = target["values"].get(key)
+                    target["values"][key] = (
+                        [a + b for a, b in zip(current, value)] if current else value
+                    )
+                else:
+                    target["values"][key] = target["values"].get(key, 0) + value
+    for data in merged.values():
+        data["values"] = list(data["values"].items())
+    return merged
+
+
+def collect_all() -> dict:
+    """Kaikkien workerien mittarit (tai vain tämän prosessin)"""
+    if not settings.METRICS_MULTIPROC_DIR:
+        return snapshot()
+
+    write_snapshot()
+    snapshots = []
+    pattern = os.path.join(settings.METRICS_MULTIPROC_DIR, "metrics_*.json")
+    for path in glob.glob(pattern):
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue  # kirjoitus kesken tai tiedosto poistettu
+        snapshots.append((_is_alive(data["pid"]), data["metrics"]))
+    return _merge(snapshots)
+
+
+async def flush_loop(interval_seconds: float) -> None:
+    """Taustaprosessi: kirjoita tilannekuva säännöllisesti"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(write_snapshot)
+        except OSError:
+            logger.warning("Mittarien kirjoitus epäonnistui", exc_info=True)
+
+
+# ============================================================================
+# Exposition
+# ============================================================================
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _labels(names, values, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(metrics: Optional[dict] = None) -> str:
+    """Prometheus text format 0.0.4"""
+    metrics = collect_all() if metrics is None else metrics
+    lines = []
+    for name, data in metrics.items():
+        if not data["values"]:
+            continue
+        lines.append(f"# HELP {name} {data['help']}")
+        lines.append(f"# TYPE {name} {data['kind']}")
+        names = data["labelnames"]
+        for labels, value in sorted(data["values"], key=lambda item: list(item[0])):
+            if data["kind"] != "histogram":
+                lines.append(f"{name}{_labels(names, labels)} {_number(value)}")
+                continue
+            cumulative = 0
+            bounds = [*data["buckets"], float("inf")]
+            for bound, count in zip(bounds, value[:-1]):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{name}_bucket{_labels(names, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, labels)} {_number(value[-1])}")
+            lines.append(f"{name}_count{_labels(names, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+# ============================================================================
+# Middleware
+# ============================================================================
+
+
+def route_template(scope) -> str:
+    """
+    Reitin polkupohja (/products/{product_id}); rajaa label-kardinaliteetin.
+    Pohja on reitin oma polku; pyyntöpolusta säilytetään vain sen edeltävä
+    osa (esim. mountin etuliite), joten arvoa ei korvata väärästä kohdasta.
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return "unmatched"
+    segments = scope["path"].split("/")
+    template_segments = template.split("/")
+    # {x:path} voi kattaa useita segmenttejä: etuliitettä ei voi kohdistaa
+    if ":path}" in template or len(segments) < len(template_segments):
+        return template
+    prefix = segments[: len(segments) - len(template_segments) + 1]
+    return "/".join(prefix + template_segments[1:])
+
+
+class MetricsMiddleware:
+    """ASGI-middleware: latenssi, käynnissä olevat pyynnöt ja SQL per reitti"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        started = time.perf_counter()
+        http_in_progress.inc((method,))
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_in_progress.dec((method,))
+            route = route_template(scope)
+            http_requests.inc((method, route, str(status)))
+            http_duration.observe((method, route), elapsed)
+
+            stats = current_stats()
+            if stats is not None and stats.count:
+                db_queries.inc((method, route), stats.count)
+                db_query_seconds.inc((method, route), stats.seconds)
@@ -0,0 +1,107 @@
+"""
+Salasanat ja JWT-tokenit
+
+Tokenin tarkistus on pelkkää kryptografiaa (allekirjoitus + exp), eikä se
+koske tietokantaan. Käyttäjän tila (is_active / is_superuser) luetaan
+lyhytikäisestä välimuistista, joten deaktivointi astuu voimaan viimeistään
+AUTH_USER_CACHE_TTL_SECONDS kuluttua.
+
+bcrypt on tarkoituksella hidas (~0.3 s), joten tarkistus ajetaan omassa
+rajatussa säiepoolissaan: kirjautumiset eivät varaa event loopia eivätkä
+FastAPI:n yleistä säiepoolia, jota synkroniset endpointit käyttävät.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import bcrypt
+from jose import JWTError, jwt
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# bcrypt käsittelee vain 72 ensimmäistä tavua
+_BCRYPT_MAX_BYTES = 72
+
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.AUTH_PASSWORD_WORKERS, thread_name_prefix="bcrypt"
+)
+
+user_status_cache = TTLCache(
+    "auth_user_status",
+    maxsize=settings.AUTH_USER_CACHE_MAXSIZE,
+    ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
+
+
+@dataclass(frozen=True)
+class UserStatus:
+    """Tokenin käyttäjä sellaisena kuin riippuvuudet sen näkevät"""
+
+    id: int
+    email: str
+    is_active: bool
+    is_superuser: bool
+
+
+def _encode(password: str) -> bytes:
+    return password.encode("utf-8")[:_BCRYPT_MAX_BYTES]
+
+
+def hash_password(password: str) -> str:
+    """bcrypt-tiiviste tallennettavaksi User.hashed_password -kenttään"""
+    return bcrypt.hashpw(_encode(password), bcrypt.gensalt()).decode("ascii")
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    """Tarkista salasana (synkroninen, hidas)"""
+    try:
+        return bcrypt.checkpw(_encode(password), hashed_password.encode("ascii"))
+    except ValueError:
+        # Virheellinen tiiviste tietokannassa
+        return False
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    """verify_password rajatussa säiepoolissa"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor, verify_password, password, hashed_password
+    )
+
+
+# Tiiviste jota verrataan kun käyttäjää ei löydy, jotta vastausaika ei
+# paljasta onko sähköposti olemassa (valmiiksi laskettu, ei hidasta käynnistystä)
+DUMMY_PASSWORD_HASH = "$2b$12$Y5Y3C6KCkL.uTMWi6lK8lOH1uEV/KjxI77dbNGKAOvql2y/m9NSqm"
+
+
+def create_access_token(user_id: int, expires_delta: Optional[timedelta] = None) -> str:
+    """Allekirjoitettu access token (sub = käyttäjän id)"""
+    now = datetime.now(timezone.utc)
+    expires = now + (
+        expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    return jwt.encode(
+        {"sub": str(user_id), "iat": now, "exp": expires},
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+
+
+def decode_access_token(token: str) -> Optional[int]:
+    """Käyttäjän id voimassa olevasta tokenista, muuten None"""
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+        return int(payload["sub"])
+    except (JWTError, KeyError, TypeError, ValueError):
+        return None
+
+
+def invalidate_user(user_id: Optional[int] = None) -> None:
+    """Käyttäjän tila muuttui (ilman argumenttia kaikki)"""
+    user_status_cache.invalidate(user_id)
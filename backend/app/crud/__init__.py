@@ -4,9 +4,24 @@ CRUD operations for database models
 
 from app.crud.product_crud import product, product_category
 from app.crud.department_crud import department
+from app.crud.production_task_crud import production_task
+from app.crud.production_order_crud import production_order
+from app.crud.weekly_plan_crud import weekly_plan
+from app.crud.employee_crud import employee
+from app.crud.user_crud import user
+from app.crud.product_async_crud import product_async, product_category_async
+from app.crud.department_async_crud import department_async
 
 __all__ = [
     "product",
     "product_category",
     "department",
+    "production_task",
+    "production_order",
+    "weekly_plan",
+    "employee",
+    "user",
+    "product_async",
+    "product_category_async",
+    "department_async",
 ]
\ No newline at end of file
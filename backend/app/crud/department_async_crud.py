@@ -0,0 +1,204 @@
+"""
+Async-versio osasto-CRUDista (ASYNC_ENDPOINTS)
+"""
+
+from typing import TYPE_CHECKING, Optional, List
+from sqlalchemy import select
+from app.crud.department_crud import (
+    count_departments,
+    department_filters,
+    select_department_by_code,
+    select_department_counts,
+    select_department_stats,
+    select_departments,
+)
+from app.models.department import Department
+from app.schemas.department_schema import (
+    DepartmentCreate,
+    DepartmentUpdate,
+)
+from app.services.event_broker import event_broker
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# ============================================================================
+# Department CRUD Operations (async)
+# ============================================================================
+
+
+class CRUDDepartmentAsync:
+    """Async CRUD operaatiot Department-mallille"""
+
+    async def get(self, db: "AsyncSession", id: int) -> Optional[Department]:
+        """Hae osasto ID:llä"""
+        return await db.get(Department, id)
+
+    async def get_by_code(self, db: "AsyncSession", code: str) -> Optional[Department]:
+        """Hae osasto koodilla"""
+        return await db.scalar(select_department_by_code(code))
+
+    async def get_multi(
+        self,
+        db: "AsyncSession",
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        is_active: Optional[bool] = None,
+    ) -> tuple[List[Department], int]:
+        """
+        Hae useita osastoja
+        Palauttaa: (osastot, total_count)
+        """
+        filters = department_filters(search, is_active)
+        total = await db.scalar(count_departments(*filters))
+        result = await db.scalars(
+            select_departments(*filters).offset(skip).limit(limit)
+        )
+        return list(result), total
+
+    async def get_active(
+        self,
+        db: "AsyncSession",
+        *,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> tuple[List[Department], int]:
+        """Hae vain aktiiviset osastot"""
+        return await self.get_multi(db, skip=skip, limit=limit, is_active=True)
+
+    async def get_all_active_ordered(self, db: "AsyncSession") -> List[Department]:
+        """
+        Hae kaikki aktiiviset osastot oikeassa järjestyksessä
+        (Käyttöön esim. dropdown-listoihin)
+        """
+        result = await db.scalars(select_departments(Department.is_active == True))
+        return list(result)
+
+    async def create(
+        self, db: "AsyncSession", *, obj_in: DepartmentCreate
+    ) -> Department:
+        """Luo uusi osasto"""
+        db_obj = Department(
+            code=obj_in.code,
+            name=obj_in.name,
+            display_order=obj_in.display_order,
+            color=obj_in.color,
+            is_active=obj_in.is_active,
+        )
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+
+        event_broker.publish("department.created", {"id": db_obj.id})
+        return db_obj
+
+    async def update(
+        self,
+        db: "AsyncSession",
+        *,
+        db_obj: Department,
+        obj_in: DepartmentUpdate,
+    ) -> Department:
+        """Päivitä olemassa oleva osasto"""
+        update_data = obj_in.model_dump(exclude_unset=True)
+
+        for field, value in update_data.items():
+            setattr(db_obj, field, value)
+
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+
+        event_broker.publish("department.updated", {"id": db_obj.id})
+        return db_obj
+
+    async def delete(self, db: "AsyncSession", *, id: int) -> Department:
+        """Poista osasto"""
+        obj = await db.get(Department, id)
+        await db.delete(obj)
+        await db.commit()
+
+        event_broker.publish("department.deleted", {"id": id})
+        return obj
+
+    async def _set_active(self, db: "AsyncSession", id: int, is_active: bool):
+        obj = await db.get(Department, id)
+        obj.is_active = is_active
+        db.add(obj)
+        await db.commit()
+        await db.refresh(obj)
+
+        event_broker.publish("department.updated", {"id": id, "is_active": is_active})
+        return obj
+
+    async def deactivate(self, db: "AsyncSession", *, id: int) -> Department:
+        """Deaktivoi osasto (soft delete)"""
+        return await self._set_active(db, id, False)
+
+    async def activate(self, db: "AsyncSession", *, id: int) -> Department:
+        """Aktivoi osasto"""
+        return await self._set_active(db, id, True)
+
+    async def get_with_stats(self, db: "AsyncSession", id: int) -> Optional[dict]:
+        """
+        Hae osasto tilastotietojen kera
+        Palauttaa: dict jossa department + stats
+        """
+        dept = await self.get(db, id)
+        if not dept:
+            return None
+
+        work_phase_count, active_orders_count = (
+            await db.execute(select_department_counts(id))
+        ).one()
+
+        return {
+            "department": dept,
+            "work_phase_count": work_phase_count,
+            "active_orders_count": active_orders_count,
+        }
+
+    async def reorder(
+        self, db: "AsyncSession", *, department_orders: dict[int, int]
+    ) -> List[Department]:
+        """
+        Päivitä osastojen järjestys
+        department_orders: {department_id: new_display_order}
+        """
+        result = await db.scalars(
+            select(Department).where(Department.id.in_(department_orders))
+        )
+        found = {dept.id: dept for dept in result}
+        updated_departments = [
+            found[dept_id] for dept_id in department_orders if dept_id in found
+        ]
+        for dept in updated_departments:
+            dept.display_order = department_orders[dept.id]
+            db.add(dept)
+
+        await db.commit()
+
+        for dept in updated_departments:
+            await db.refresh(dept)
+
+        event_broker.publish(
+            "department.reordered", {"ids": [d.id for d in updated_departments]}
+        )
+        return updated_departments
+
+    async def get_stats(self, db: "AsyncSession") -> dict:
+        """Hae osastotilastot"""
+        total, active = (await db.execute(select_department_stats())).one()
+
+        return {
+            "total": total,
+            "active": active,
+            "inactive": total - active,
+        }
+
+
+# Luo singleton-instanssi
+department_async = CRUDDepartmentAsync()
@@ -1,6 +1,6 @@
 from typing import Optional, List
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy import Select, or_, func, select
 from app.models.department import Department
 from app.models.work_phase import WorkPhase
 from app.models.production_order import ProductionOrder
@@ -8,6 +8,67 @@ from app.schemas.department_schema import (
     DepartmentCreate,
     DepartmentUpdate,
 )
+from app.services.event_broker import event_broker
+
+
+# ============================================================================
+# Department Queries (yhteiset sync- ja async-versioille)
+# ============================================================================
+
+
+def department_filters(
+    search: Optional[str] = None, is_active: Optional[bool] = None
+) -> list:
+    """get_multi-haun suodattimet"""
+    filters = []
+    if search:
+        search_filter = f"%{search}%"
+        filters.append(
+            or_(
+                Department.code.ilike(search_filter),
+                Department.name.ilike(search_filter),
+            )
+        )
+    if is_active is not None:
+        filters.append(Department.is_active == is_active)
+    return filters
+
+
+def select_departments(*filters) -> Select:
+    """Osastot järjestyksessä (display_order, sitten nimi)"""
+    return (
+        select(Department)
+        .where(*filters)
+        .order_by(Department.display_order.nullslast(), Department.name)
+    )
+
+
+def count_departments(*filters) -> Select:
+    return select(func.count(Department.id)).where(*filters)
+
+
+def select_department_by_code(code: str) -> Select:
+    return select(Department).where(Department.code == code)
+
+
+def select_department_counts(id: int) -> Select:
+    """Työvaiheiden ja osastossa olevien tilausten määrä yhdellä kyselyllä"""
+    return select(
+        select(func.count(WorkPhase.id))
+        .where(WorkPhase.department_id == id)
+        .scalar_subquery(),
+        select(func.count(ProductionOrder.id))
+        .where(ProductionOrder.current_department_id == id)
+        .scalar_subquery(),
+    )
+
+
+def select_department_stats() -> Select:
+    """(kaikki, aktiiviset)"""
+    return select(
+        func.count(Department.id),
+        func.count(Department.id).filter(Department.is_active == True),
+    )
 
 
 # ============================================================================
@@ -24,7 +85,7 @@ class CRUDDepartment:
 
     def get_by_code(self, db: Session, code: str) -> Optional[Department]:
         """Hae osasto koodilla"""
-        return db.query(Department).filter(Department.code == code).first()
+        return db.scalar(select_department_by_code(code))
 
     def get_multi(
         self,
@@ -39,31 +100,11 @@ class CRUDDepartment:
         Hae useita osastoja
         Palauttaa: (osastot, total_count)
         """
-        query = db.query(Department)
-
-        # Suodattimet
-        if search:
-            search_filter = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Department.code.ilike(search_filter),
-                    Department.name.ilike(search_filter),
-                )
-            )
-
-        if is_active is not None:
-            query = query.filter(Department.is_active == is_active)
-
-        # Laske total ennen paginaatiota
-        total = query.count()
-
-        # Paginaatio ja järjestys (display_order, sitten nimi)
-        departments = (
-            query.order_by(Department.display_order.nullslast(), Department.name)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        filters = department_filters(search, is_active)
+        total = db.scalar(count_departments(*filters))
+        departments = db.scalars(
+            select_departments(*filters).offset(skip).limit(limit)
+        ).all()
 
         return departments, total
 
@@ -82,12 +123,7 @@ class CRUDDepartment:
         Hae kaikki aktiiviset osastot oikeassa järjestyksessä
         (Käyttöön esim. dropdown-listoihin)
         """
-        return (
-            db.query(Department)
-            .filter(Department.is_active == True)
-            .order_by(Department.display_order.nullslast(), Department.name)
-            .all()
-        )
+        return db.scalars(select_departments(Department.is_active == True)).all()
 
     def create(self, db: Session, *, obj_in: DepartmentCreate) -> Department:
         """Luo uusi osasto"""
@@ -101,6 +137,8 @@ class CRUDDepartment:
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+
+        event_broker.publish("department.created", {"id": db_obj.id})
         return db_obj
 
     def update(
@@ -119,6 +157,8 @@ class CRUDDepartment:
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+
+        event_broker.publish("department.updated", {"id": db_obj.id})
         return db_obj
 
     def delete(self, db: Session, *, id: int) -> Department:
@@ -126,6 +166,8 @@ class CRUDDepartment:
         obj = db.query(Department).get(id)
         db.delete(obj)
         db.commit()
+
+        event_broker.publish("department.deleted", {"id": id})
         return obj
 
     def deactivate(self, db: Session, *, id: int) -> Department:
@@ -135,6 +177,8 @@ class CRUDDepartment:
         db.add(obj)
         db.commit()
         db.refresh(obj)
+
+        event_broker.publish("department.updated", {"id": id, "is_active": False})
         return obj
 
     def activate(self, db: Session, *, id: int) -> Department:
@@ -144,6 +188,8 @@ class CRUDDepartment:
         db.add(obj)
         db.commit()
         db.refresh(obj)
+
+        event_broker.publish("department.updated", {"id": id, "is_active": True})
         return obj
 
     def get_with_stats(self, db: Session, id: int) -> Optional[dict]:
@@ -155,19 +201,9 @@ class CRUDDepartment:
         if not dept:
             return None
 
-        # Laske työvaiheiden määrä
-        work_phase_count = (
-            db.query(func.count(WorkPhase.id))
-            .filter(WorkPhase.department_id == id)
-            .scalar()
-        )
-
-        # Laske aktiivisten tilausten määrä tässä osastossa
-        active_orders_count = (
-            db.query(func.count(ProductionOrder.id))
-            .filter(ProductionOrder.current_department_id == id)
-            .scalar()
-        )
+        work_phase_count, active_orders_count = db.execute(
+            select_department_counts(id)
+        ).one()
 
         return {
             "department": dept,
@@ -196,16 +232,14 @@ class CRUDDepartment:
         for dept in updated_departments:
             db.refresh(dept)
 
+        event_broker.publish(
+            "department.reordered", {"ids": [d.id for d in updated_departments]}
+        )
         return updated_departments
 
     def get_stats(self, db: Session) -> dict:
         """Hae osastotilastot"""
-        total = db.query(func.count(Department.id)).scalar()
-        active = (
-            db.query(func.count(Department.id))
-            .filter(Department.is_active == True)
-            .scalar()
-        )
+        total, active = db.execute(select_department_stats()).one()
 
         return {
             "total": total,
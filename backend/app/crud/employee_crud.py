@@ -0,0 +1,139 @@
+from typing import Optional, List
+from sqlalchemy.orm import Session
+from sqlalchemy import or_, func
+from app.models.employee import Employee
+from app.schemas.employee_schema import EmployeeCreate, EmployeeUpdate
+from app.services.employee_badges import badge_registry
+from app.services.event_broker import event_broker
+
+
+# ============================================================================
+# Employee CRUD Operations
+# ============================================================================
+
+
+class CRUDEmployee:
+    """CRUD operaatiot Employee-mallille"""
+
+    def get(self, db: Session, id: int) -> Optional[Employee]:
+        """Hae työntekijä ID:llä"""
+        return db.query(Employee).filter(Employee.id == id).first()
+
+    def get_by_number(self, db: Session, employee_number: str) -> Optional[Employee]:
+        """Hae työntekijä numerolla"""
+        return (
+            db.query(Employee)
+            .filter(Employee.employee_number == employee_number)
+            .first()
+        )
+
+    def get_multi(
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        department_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+    ) -> tuple[List[Employee], int]:
+        """
+        Hae useita työntekijöitä. Nimihaku käyttää trigram-indeksiä
+        (osittainen osuma tai samankaltainen nimi, esim. kirjoitusvirhe),
+        ja tulokset järjestetään samankaltaisuuden mukaan.
+        Palauttaa: (työntekijät, total_count)
+        """
+        query = db.query(Employee)
+
+        # Suodattimet
+        if search:
+            search = search.strip()
+            query = query.filter(
+                or_(
+                    Employee.full_name.ilike(f"%{search}%"),
+                    Employee.full_name.op("%")(search),
+                    Employee.employee_number == search,
+                )
+            )
+
+        if department_id is not None:
+            query = query.filter(Employee.primary_department_id == department_id)
+
+        if is_active is not None:
+            query = query.filter(Employee.is_active == is_active)
+
+        # Laske total ennen paginaatiota
+        total = query.count()
+
+        if search:
+            query = query.order_by(
+                func.similarity(Employee.full_name, search).desc(),
+                Employee.full_name,
+            )
+        else:
+            query = query.order_by(Employee.last_name, Employee.first_name)
+
+        employees = query.offset(skip).limit(limit).all()
+
+        return employees, total
+
+    def create(self, db: Session, *, obj_in: EmployeeCreate) -> Employee:
+        """Luo uusi työntekijä"""
+        db_obj = Employee(**obj_in.model_dump())
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+
+        badge_registry.put(db_obj)
+        event_broker.publish("employee.created", {"id": db_obj.id})
+        return db_obj
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: Employee,
+        obj_in: EmployeeUpdate,
+    ) -> Employee:
+        """Päivitä olemassa oleva työntekijä"""
+        update_data = obj_in.model_dump(exclude_unset=True)
+
+        for field, value in update_data.items():
+            setattr(db_obj, field, value)
+
+        db.add(db_obj)
+        db.commit()
+        # full_name on generoitu sarake - luetaan uudelleen
+        db.refresh(db_obj)
+
+        badge_registry.put(db_obj)
+        event_broker.publish("employee.updated", {"id": db_obj.id})
+        return db_obj
+
+    def deactivate(self, db: Session, *, id: int) -> Employee:
+        """Deaktivoi työntekijä (soft delete)"""
+        obj = db.query(Employee).get(id)
+        obj.is_active = False
+        db.add(obj)
+        db.commit()
+        db.refresh(obj)
+
+        badge_registry.remove(id)
+        event_broker.publish("employee.updated", {"id": id, "is_active": False})
+        return obj
+
+    def activate(self, db: Session, *, id: int) -> Employee:
+        """Aktivoi työntekijä"""
+        obj = db.query(Employee).get(id)
+        obj.is_active = True
+        db.add(obj)
+        db.commit()
+        db.refresh(obj)
+
+        badge_registry.put(obj)
+        event_broker.publish("employee.updated", {"id": id, "is_active": True})
+        return obj
+
+
+# Luo singleton-instanssi
+employee = CRUDEmployee()
@@ -0,0 +1,306 @@
+"""
+Async-versiot tuote- ja kategoria-CRUDista (ASYNC_ENDPOINTS)
+
+Sama toiminnallisuus kuin product_crud.py:ssä, mutta AsyncSessionilla.
+Suhteet ladataan aina kyselyssä, koska async-sessio ei salli laiskaa
+latausta. Synkroniset palvelut (arvioiden uudelleenlaskenta) ajetaan
+run_sync:llä samassa transaktiossa.
+"""
+
+from typing import TYPE_CHECKING, Optional, List
+from sqlalchemy.orm import joinedload
+from app.crud.product_crud import (
+    category_filters,
+    count_categories,
+    count_products,
+    product_filters,
+    select_categories,
+    select_category_by_code,
+    select_product_stats,
+    select_products,
+)
+from app.models.product import Product, ProductCategory
+from app.schemas.product_schema import (
+    ProductCreate,
+    ProductUpdate,
+    ProductCategoryCreate,
+    ProductCategoryUpdate,
+)
+from app.services.efficiency_whatif import history_cache
+from app.services.event_broker import event_broker
+from app.services.material_requirements import (
+    invalidate_item_numbers,
+    invalidate_products,
+)
+from app.services.order_estimates import (
+    recompute_for_category,
+    recompute_for_products,
+)
+from app.services.weekly_load import load_cache
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# ============================================================================
+# ProductCategory CRUD Operations (async)
+# ============================================================================
+
+
+class CRUDProductCategoryAsync:
+    """Async CRUD operaatiot ProductCategory-mallille"""
+
+    async def get(self, db: "AsyncSession", id: int) -> Optional[ProductCategory]:
+        """Hae kategoria ID:llä"""
+        return await db.get(ProductCategory, id)
+
+    async def get_by_code(
+        self, db: "AsyncSession", code: str
+    ) -> Optional[ProductCategory]:
+        """Hae kategoria koodilla"""
+        return await db.scalar(select_category_by_code(code))
+
+    async def get_multi(
+        self,
+        db: "AsyncSession",
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+    ) -> tuple[List[ProductCategory], int]:
+        """
+        Hae useita kategorioita
+        Palauttaa: (kategoriat, total_count)
+        """
+        filters = category_filters(search)
+        total = await db.scalar(count_categories(*filters))
+        result = await db.scalars(select_categories(*filters).offset(skip).limit(limit))
+        return list(result), total
+
+    async def create(
+        self, db: "AsyncSession", *, obj_in: ProductCategoryCreate
+    ) -> ProductCategory:
+        """Luo uusi kategoria"""
+        db_obj = ProductCategory(
+            code=obj_in.code,
+            name=obj_in.name,
+            efficiency_multiplier=obj_in.efficiency_multiplier,
+        )
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+
+        event_broker.publish("product_category.created", {"code": db_obj.code})
+        return db_obj
+
+    async def update(
+        self,
+        db: "AsyncSession",
+        *,
+        db_obj: ProductCategory,
+        obj_in: ProductCategoryUpdate,
+    ) -> ProductCategory:
+        """Päivitä olemassa oleva kategoria"""
+        update_data = obj_in.model_dump(exclude_unset=True)
+
+        for field, value in update_data.items():
+            setattr(db_obj, field, value)
+
+        db.add(db_obj)
+        plan_items_changed = 0
+        if "efficiency_multiplier" in update_data:
+            await db.flush()
+            _, plan_items_changed = await db.run_sync(
+                recompute_for_category, db_obj.code
+            )
+        await db.commit()
+        await db.refresh(db_obj)
+
+        if plan_items_changed:
+            load_cache.invalidate()
+
+        event_broker.publish("product_category.updated", {"code": db_obj.code})
+        return db_obj
+
+    async def delete(self, db: "AsyncSession", *, id: int) -> ProductCategory:
+        """Poista kategoria"""
+        obj = await db.get(ProductCategory, id)
+        code = obj.code
+        await db.delete(obj)
+        await db.commit()
+
+        event_broker.publish("product_category.deleted", {"code": code})
+        return obj
+
+
+# ============================================================================
+# Product CRUD Operations (async)
+# ============================================================================
+
+
+class CRUDProductAsync:
+    """Async CRUD operaatiot Product-mallille"""
+
+    async def get(self, db: "AsyncSession", id: int) -> Optional[Product]:
+        """Hae tuote ID:llä (eager load category)"""
+        return await db.get(Product, id, options=[joinedload(Product.category)])
+
+    async def get_by_item_number(
+        self, db: "AsyncSession", item_number: str
+    ) -> Optional[Product]:
+        """Hae tuote tuotenumerolla"""
+        return await db.scalar(select_products(Product.item_number == item_number))
+
+    async def get_multi(
+        self,
+        db: "AsyncSession",
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        category_code: Optional[str] = None,
+        is_active: Optional[bool] = None,
+    ) -> tuple[List[Product], int]:
+        """
+        Hae useita tuotteita suodattimilla
+        Palauttaa: (tuotteet, total_count)
+        """
+        filters = product_filters(search, category_code, is_active)
+        total = await db.scalar(count_products(*filters))
+        result = await db.scalars(select_products(*filters).offset(skip).limit(limit))
+        return list(result), total
+
+    async def get_active(
+        self,
+        db: "AsyncSession",
+        *,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> tuple[List[Product], int]:
+        """Hae vain aktiiviset tuotteet"""
+        return await self.get_multi(db, skip=skip, limit=limit, is_active=True)
+
+    async def create(self, db: "AsyncSession", *, obj_in: ProductCreate) -> Product:
+        """Luo uusi tuote"""
+        db_obj = Product(
+            item_number=obj_in.item_number,
+            description=obj_in.description,
+            category_code=obj_in.category_code,
+            standard_time_minutes=obj_in.standard_time_minutes,
+            is_active=obj_in.is_active,
+        )
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+
+        # Lataa kategoria
+        await db.refresh(db_obj, ["category"])
+
+        # Uusi item_number voi tehdä BOM-materiaalista alikokoonpanon
+        invalidate_item_numbers()
+
+        event_broker.publish("product.created", {"id": db_obj.id})
+        return db_obj
+
+    async def update(
+        self,
+        db: "AsyncSession",
+        *,
+        db_obj: Product,
+        obj_in: ProductUpdate,
+    ) -> Product:
+        """Päivitä olemassa oleva tuote"""
+        update_data = obj_in.model_dump(exclude_unset=True)
+
+        for field, value in update_data.items():
+            setattr(db_obj, field, value)
+
+        db.add(db_obj)
+        plan_items_changed = 0
+        if update_data.keys() & {"standard_time_minutes", "category_code"}:
+            await db.flush()
+            _, plan_items_changed = await db.run_sync(
+                recompute_for_products, [db_obj.id]
+            )
+        await db.commit()
+        await db.refresh(db_obj)
+
+        if plan_items_changed:
+            load_cache.invalidate()
+        if update_data.keys() & {"standard_time_minutes", "category_code"}:
+            # What-if -historian standardiajat ja kategoriat
+            history_cache.invalidate()
+        if "item_number" in update_data:
+            invalidate_item_numbers()
+
+        # Lataa kategoria
+        await db.refresh(db_obj, ["category"])
+
+        event_broker.publish("product.updated", {"id": db_obj.id})
+        return db_obj
+
+    async def delete(self, db: "AsyncSession", *, id: int) -> Product:
+        """Poista tuote (soft delete suositeltavaa!)"""
+        obj = await db.get(Product, id)
+        await db.delete(obj)
+        await db.commit()
+
+        # BOM-rivit poistuivat cascadella
+        invalidate_products([id])
+        invalidate_item_numbers()
+
+        event_broker.publish("product.deleted", {"id": id})
+        return obj
+
+    async def _set_active(self, db: "AsyncSession", id: int, is_active: bool):
+        obj = await db.get(Product, id)
+        obj.is_active = is_active
+        db.add(obj)
+        await db.commit()
+        await db.refresh(obj)
+        await db.refresh(obj, ["category"])
+
+        event_broker.publish("product.updated", {"id": id, "is_active": is_active})
+        return obj
+
+    async def deactivate(self, db: "AsyncSession", *, id: int) -> Product:
+        """Deaktivoi tuote (soft delete)"""
+        return await self._set_active(db, id, False)
+
+    async def activate(self, db: "AsyncSession", *, id: int) -> Product:
+        """Aktivoi tuote"""
+        return await self._set_active(db, id, True)
+
+    async def search_by_number(
+        self,
+        db: "AsyncSession",
+        *,
+        search_term: str,
+        limit: int = 10,
+    ) -> List[Product]:
+        """
+        Etsi tuotteita tuotenumerolla (autocomplete-tyylinen)
+        Esim. "ABC" löytää "ABC-001", "ABC-002", jne.
+        """
+        search_filter = f"{search_term}%"
+        result = await db.scalars(
+            select_products(
+                Product.item_number.ilike(search_filter), Product.is_active == True
+            ).limit(limit)
+        )
+        return list(result)
+
+    async def get_stats(self, db: "AsyncSession") -> dict:
+        """Hae tuotetilastot"""
+        total, active = (await db.execute(select_product_stats())).one()
+
+        return {
+            "total": total,
+            "active": active,
+            "inactive": total - active,
+        }
+
+
+# Luo singleton-instanssit
+product_category_async = CRUDProductCategoryAsync()
+product_async = CRUDProductAsync()
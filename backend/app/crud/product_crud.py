@@ -1,6 +1,6 @@
 from typing import Optional, List
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, func
+from sqlalchemy import Select, or_, func, select
 from app.models.product import Product, ProductCategory
 from app.schemas.product_schema import (
     ProductCreate,
@@ -8,6 +8,91 @@ from app.schemas.product_schema import (
     ProductCategoryCreate,
     ProductCategoryUpdate,
 )
+from app.services.efficiency_whatif import history_cache
+from app.services.event_broker import event_broker
+from app.services.material_requirements import (
+    invalidate_item_numbers,
+    invalidate_products,
+)
+from app.services.order_estimates import (
+    recompute_for_category,
+    recompute_for_products,
+)
+from app.services.weekly_load import load_cache
+
+
+# ============================================================================
+# Product Queries (yhteiset sync- ja async-versioille)
+# ============================================================================
+
+
+def category_filters(search: Optional[str] = None) -> list:
+    """Kategorioiden get_multi-haun suodattimet"""
+    if not search:
+        return []
+    search_filter = f"%{search}%"
+    return [
+        or_(
+            ProductCategory.code.ilike(search_filter),
+            ProductCategory.name.ilike(search_filter),
+        )
+    ]
+
+
+def select_categories(*filters) -> Select:
+    return select(ProductCategory).where(*filters).order_by(ProductCategory.code)
+
+
+def count_categories(*filters) -> Select:
+    return select(func.count(ProductCategory.id)).where(*filters)
+
+
+def select_category_by_code(code: str) -> Select:
+    return select(ProductCategory).where(ProductCategory.code == code)
+
+
+def product_filters(
+    search: Optional[str] = None,
+    category_code: Optional[str] = None,
+    is_active: Optional[bool] = None,
+) -> list:
+    """Tuotteiden get_multi-haun suodattimet"""
+    filters = []
+    if search:
+        search_filter = f"%{search}%"
+        filters.append(
+            or_(
+                Product.item_number.ilike(search_filter),
+                Product.description.ilike(search_filter),
+            )
+        )
+    if category_code:
+        filters.append(Product.category_code == category_code)
+    if is_active is not None:
+        filters.append(Product.is_active == is_active)
+    return filters
+
+
+def select_products(*filters) -> Select:
+    """Tuotteet kategorioineen tuotenumeron mukaan järjestettynä"""
+    return (
+        select(Product)
+        .options(joinedload(Product.category))
+        .where(*filters)
+        .order_by(Product.item_number)
+    )
+
+
+def count_products(*filters) -> Select:
+    return select(func.count(Product.id)).where(*filters)
+
+
+def select_product_stats() -> Select:
+    """(kaikki, aktiiviset)"""
+    return select(
+        func.count(Product.id),
+        func.count(Product.id).filter(Product.is_active == True),
+    )
 
 
 # ============================================================================
@@ -24,7 +109,7 @@ class CRUDProductCategory:
 
     def get_by_code(self, db: Session, code: str) -> Optional[ProductCategory]:
         """Hae kategoria koodilla"""
-        return db.query(ProductCategory).filter(ProductCategory.code == code).first()
+        return db.scalar(select_category_by_code(code))
 
     def get_multi(
         self,
@@ -38,25 +123,11 @@ class CRUDProductCategory:
         Hae useita kategorioita
         Palauttaa: (kategoriat, total_count)
         """
-        query = db.query(ProductCategory)
-
-        # Haku
-        if search:
-            search_filter = f"%{search}%"
-            query = query.filter(
-                or_(
-                    ProductCategory.code.ilike(search_filter),
-                    ProductCategory.name.ilike(search_filter),
-                )
-            )
-
-        # Laske total ennen paginaatiota
-        total = query.count()
-
-        # Paginaatio
-        categories = (
-            query.order_by(ProductCategory.code).offset(skip).limit(limit).all()
-        )
+        filters = category_filters(search)
+        total = db.scalar(count_categories(*filters))
+        categories = db.scalars(
+            select_categories(*filters).offset(skip).limit(limit)
+        ).all()
 
         return categories, total
 
@@ -70,6 +141,8 @@ class CRUDProductCategory:
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+
+        event_broker.publish("product_category.created", {"code": db_obj.code})
         return db_obj
 
     def update(
@@ -86,15 +159,27 @@ class CRUDProductCategory:
             setattr(db_obj, field, value)
 
         db.add(db_obj)
+        plan_items_changed = 0
+        if "efficiency_multiplier" in update_data:
+            db.flush()
+            _, plan_items_changed = recompute_for_category(db, db_obj.code)
         db.commit()
         db.refresh(db_obj)
+
+        if plan_items_changed:
+            load_cache.invalidate()
+
+        event_broker.publish("product_category.updated", {"code": db_obj.code})
         return db_obj
 
     def delete(self, db: Session, *, id: int) -> ProductCategory:
         """Poista kategoria"""
         obj = db.query(ProductCategory).get(id)
+        code = obj.code
         db.delete(obj)
         db.commit()
+
+        event_broker.publish("product_category.deleted", {"code": code})
         return obj
 
 
@@ -117,12 +202,7 @@ class CRUDProduct:
 
     def get_by_item_number(self, db: Session, item_number: str) -> Optional[Product]:
         """Hae tuote tuotenumerolla"""
-        return (
-            db.query(Product)
-            .options(joinedload(Product.category))
-            .filter(Product.item_number == item_number)
-            .first()
-        )
+        return db.scalar(select_products(Product.item_number == item_number))
 
     def get_multi(
         self,
@@ -138,29 +218,9 @@ class CRUDProduct:
         Hae useita tuotteita suodattimilla
         Palauttaa: (tuotteet, total_count)
         """
-        query = db.query(Product).options(joinedload(Product.category))
-
-        # Suodattimet
-        if search:
-            search_filter = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Product.item_number.ilike(search_filter),
-                    Product.description.ilike(search_filter),
-                )
-            )
-
-        if category_code:
-            query = query.filter(Product.category_code == category_code)
-
-        if is_active is not None:
-            query = query.filter(Product.is_active == is_active)
-
-        # Laske total ennen paginaatiota
-        total = query.count()
-
-        # Paginaatio ja järjestys
-        products = query.order_by(Product.item_number).offset(skip).limit(limit).all()
+        filters = product_filters(search, category_code, is_active)
+        total = db.scalar(count_products(*filters))
+        products = db.scalars(select_products(*filters).offset(skip).limit(limit)).all()
 
         return products, total
 
@@ -189,6 +249,11 @@ class CRUDProduct:
 
         # Lataa kategoria
         db.refresh(db_obj, ["category"])
+
+        # Uusi item_number voi tehdä BOM-materiaalista alikokoonpanon
+        invalidate_item_numbers()
+
+        event_broker.publish("product.created", {"id": db_obj.id})
         return db_obj
 
     def update(
@@ -205,11 +270,25 @@ class CRUDProduct:
             setattr(db_obj, field, value)
 
         db.add(db_obj)
+        plan_items_changed = 0
+        if update_data.keys() & {"standard_time_minutes", "category_code"}:
+            db.flush()
+            _, plan_items_changed = recompute_for_products(db, [db_obj.id])
         db.commit()
         db.refresh(db_obj)
 
+        if plan_items_changed:
+            load_cache.invalidate()
+        if update_data.keys() & {"standard_time_minutes", "category_code"}:
+            # What-if -historian standardiajat ja kategoriat
+            history_cache.invalidate()
+        if "item_number" in update_data:
+            invalidate_item_numbers()
+
         # Lataa kategoria
         db.refresh(db_obj, ["category"])
+
+        event_broker.publish("product.updated", {"id": db_obj.id})
         return db_obj
 
     def delete(self, db: Session, *, id: int) -> Product:
@@ -217,6 +296,12 @@ class CRUDProduct:
         obj = db.query(Product).get(id)
         db.delete(obj)
         db.commit()
+
+        # BOM-rivit poistuivat cascadella
+        invalidate_products([id])
+        invalidate_item_numbers()
+
+        event_broker.publish("product.deleted", {"id": id})
         return obj
 
     def deactivate(self, db: Session, *, id: int) -> Product:
@@ -226,6 +311,8 @@ class CRUDProduct:
         db.add(obj)
         db.commit()
         db.refresh(obj)
+
+        event_broker.publish("product.updated", {"id": id, "is_active": False})
         return obj
 
     def activate(self, db: Session, *, id: int) -> Product:
@@ -235,6 +322,8 @@ class CRUDProduct:
         db.add(obj)
         db.commit()
         db.refresh(obj)
+
+        event_broker.publish("product.updated", {"id": id, "is_active": True})
         return obj
 
     def search_by_number(
@@ -249,22 +338,15 @@ class CRUDProduct:
         Esim. "ABC" löytää "ABC-001", "ABC-002", jne.
         """
         search_filter = f"{search_term}%"
-        return (
-            db.query(Product)
-            .options(joinedload(Product.category))
-            .filter(Product.item_number.ilike(search_filter))
-            .filter(Product.is_active == True)
-            .order_by(Product.item_number)
-            .limit(limit)
-            .all()
-        )
+        return db.scalars(
+            select_products(
+                Product.item_number.ilike(search_filter), Product.is_active == True
+            ).limit(limit)
+        ).all()
 
     def get_stats(self, db: Session) -> dict:
         """Hae tuotetilastot"""
-        total = db.query(func.count(Product.id)).scalar()
-        active = (
-            db.query(func.count(Product.id)).filter(Product.is_active == True).scalar()
-        )
+        total, active = db.execute(select_product_stats()).one()
 
         return {
             "total": total,
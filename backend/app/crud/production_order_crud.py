@@ -0,0 +1,194 @@
+from datetime import datetime, timezone
+from typing import Optional, List
+from sqlalchemy.orm import Session, selectinload
+from app.models.production_order import ProductionOrder
+from app.models.order_status import OrderDepartmentStatus, OrderStatusEnum
+from app.schemas.production_order_schema import (
+    OrderDepartmentStatusUpdate,
+    ProductionOrderMove,
+)
+from app.services.event_broker import event_broker
+
+
+# ============================================================================
+# ProductionOrder CRUD Operations
+# ============================================================================
+
+
+class CRUDProductionOrder:
+    """CRUD operaatiot ProductionOrder-mallille"""
+
+    def get(self, db: Session, id: int) -> Optional[ProductionOrder]:
+        """Hae tilaus ID:llä (eager load osastotilat)"""
+        return (
+            db.query(ProductionOrder)
+            .options(selectinload(ProductionOrder.department_statuses))
+            .filter(ProductionOrder.id == id)
+            .first()
+        )
+
+    def get_multi(
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        department_id: Optional[int] = None,
+    ) -> tuple[List[ProductionOrder], int]:
+        """
+        Hae useita tilauksia
+        Palauttaa: (tilaukset, total_count)
+        """
+        query = db.query(ProductionOrder)
+
+        # Suodattimet
+        if search:
+            query = query.filter(ProductionOrder.order_number.ilike(f"%{search}%"))
+
+        if department_id is not None:
+            query = query.filter(ProductionOrder.current_department_id == department_id)
+
+        # Laske total ennen paginaatiota
+        total = query.count()
+
+        # Paginaatio ja järjestys (jonon sijainti, sitten tilausnumero)
+        orders = (
+            query.options(selectinload(ProductionOrder.department_statuses))
+            .order_by(ProductionOrder.queue_position, ProductionOrder.order_number)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+        return orders, total
+
+    def get_largest(
+        self,
+        db: Session,
+        *,
+        year: int,
+        week_number: int,
+        limit: int = 20,
+    ) -> List[ProductionOrder]:
+        """
+        Hae viikon suurimmat tilaukset työmääräarvion mukaan
+        (indeksi ix_production_orders_week_estimate, ei joineja tuotteisiin)
+        """
+        return (
+            db.query(ProductionOrder)
+            .options(selectinload(ProductionOrder.department_statuses))
+            .filter(
+                ProductionOrder.year == year,
+                ProductionOrder.week_number == week_number,
+                ProductionOrder.estimated_minutes.isnot(None),
+            )
+            .order_by(ProductionOrder.estimated_minutes.desc())
+            .limit(limit)
+            .all()
+        )
+
+    def move(
+        self,
+        db: Session,
+        *,
+        db_obj: ProductionOrder,
+        obj_in: ProductionOrderMove,
+    ) -> ProductionOrder:
+        """Siirrä tilaus osastolle / uuteen jonopaikkaan"""
+        from_department_id = db_obj.current_department_id
+
+        db_obj.current_department_id = obj_in.department_id
+        db_obj.queue_position = obj_in.queue_position
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+
+        event_broker.publish(
+            "order.moved",
+            {
+                "id": db_obj.id,
+                "from_department_id": from_department_id,
+                "to_department_id": db_obj.current_department_id,
+                "queue_position": db_obj.queue_position,
+            },
+            department_ids=(from_department_id, db_obj.current_department_id),
+        )
+        return db_obj
+
+    def set_department_status(
+        self,
+        db: Session,
+        *,
+        db_obj: ProductionOrder,
+        department_id: int,
+        obj_in: OrderDepartmentStatusUpdate,
+    ) -> OrderDepartmentStatus:
+        """
+        Päivitä tilauksen tila osastossa (luodaan tarvittaessa).
+        Jos tilaa ei anneta, se päätellään valmistuneesta määrästä.
+        """
+        dept_status = (
+            db.query(OrderDepartmentStatus)
+            .filter(
+                OrderDepartmentStatus.production_order_id == db_obj.id,
+                OrderDepartmentStatus.department_id == department_id,
+            )
+            .first()
+        )
+        if dept_status is None:
+            dept_status = OrderDepartmentStatus(
+                production_order_id=db_obj.id,
+                department_id=department_id,
+                status=OrderStatusEnum.NOT_STARTED,
+                quantity_completed=0,
+            )
+
+        if obj_in.quantity_completed is not None:
+            dept_status.quantity_completed = obj_in.quantity_completed
+
+        new_status = obj_in.status
+        if new_status is None and obj_in.quantity_completed is not None:
+            new_status = self._status_for_quantity(
+                obj_in.quantity_completed, db_obj.quantity
+            )
+
+        if new_status is not None:
+            now = datetime.now(timezone.utc)
+            if new_status != OrderStatusEnum.NOT_STARTED and not dept_status.started_at:
+                dept_status.started_at = now
+            if new_status in (OrderStatusEnum.COMPLETED, OrderStatusEnum.OVER_QUANTITY):
+                dept_status.completed_at = dept_status.completed_at or now
+            else:
+                dept_status.completed_at = None
+            dept_status.status = new_status
+
+        db.add(dept_status)
+        db.commit()
+        db.refresh(dept_status)
+
+        event_broker.publish(
+            "order.status",
+            {
+                "id": db_obj.id,
+                "department_id": department_id,
+                "status": dept_status.status,
+                "quantity_completed": dept_status.quantity_completed,
+            },
+            department_ids=(department_id,),
+        )
+        return dept_status
+
+    @staticmethod
+    def _status_for_quantity(completed: int, quantity: int) -> OrderStatusEnum:
+        if completed <= 0:
+            return OrderStatusEnum.NOT_STARTED
+        if completed < quantity:
+            return OrderStatusEnum.IN_PROGRESS
+        if completed == quantity:
+            return OrderStatusEnum.COMPLETED
+        return OrderStatusEnum.OVER_QUANTITY
+
+
+# Luo singleton-instanssi
+production_order = CRUDProductionOrder()
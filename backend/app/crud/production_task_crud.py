@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy.orm import Session, joinedload
+from app.models.production_task import ProductionTask
+from app.schemas.production_task_schema import (
+    ProductionTaskStart,
+    ProductionTaskEnd,
+)
+from app.services.efficiency_rollup import mark_dirty
+from app.services.event_broker import event_broker
+from app.services.open_task_registry import open_task_registry
+
+
+# ============================================================================
+# ProductionTask CRUD Operations
+# ============================================================================
+
+
+class CRUDProductionTask:
+    """CRUD operaatiot ProductionTask-mallille"""
+
+    def get(self, db: Session, id: int) -> Optional[ProductionTask]:
+        """Hae tehtävä ID:llä (eager load työntekijä, tilaus ja työvaihe)"""
+        return (
+            db.query(ProductionTask)
+            .options(
+                joinedload(ProductionTask.employee),
+                joinedload(ProductionTask.production_order),
+                joinedload(ProductionTask.work_phase),
+            )
+            .filter(ProductionTask.id == id)
+            .first()
+        )
+
+    def start(self, db: Session, *, obj_in: ProductionTaskStart) -> ProductionTask:
+        """Aloita uusi tehtävä ja lisää se avoimien tehtävien rekisteriin"""
+        db_obj = ProductionTask(
+            production_order_id=obj_in.production_order_id,
+            employee_id=obj_in.employee_id,
+            department_id=obj_in.department_id,
+            work_phase_id=obj_in.work_phase_id,
+            batch_uuid=obj_in.batch_uuid,
+            started_at=obj_in.started_at or datetime.now(timezone.utc),
+            comment=obj_in.comment,
+        )
+        db.add(db_obj)
+        db.commit()
+
+        task = self.get(db, db_obj.id)
+        open_task_registry.add(task)
+
+        event_broker.publish(
+            "task.started",
+            {
+                "id": task.id,
+                "production_order_id": task.production_order_id,
+                "employee_id": task.employee_id,
+            },
+            department_ids=(task.department_id,),
+        )
+        return task
+
+    def end(
+        self,
+        db: Session,
+        *,
+        db_obj: ProductionTask,
+        obj_in: ProductionTaskEnd,
+    ) -> ProductionTask:
+        """Päätä tehtävä ja poista se avoimien tehtävien rekisteristä"""
+        db_obj.ended_at = obj_in.ended_at or datetime.now(timezone.utc)
+        db_obj.quantity_completed = obj_in.quantity_completed
+        if obj_in.comment is not None:
+            db_obj.comment = obj_in.comment
+
+        db.add(db_obj)
+        mark_dirty(db, db_obj.department_id, db_obj.ended_at)
+        db.commit()
+        db.refresh(db_obj)
+
+        open_task_registry.remove(db_obj.id)
+
+        event_broker.publish(
+            "task.ended",
+            {
+                "id": db_obj.id,
+                "production_order_id": db_obj.production_order_id,
+                "quantity_completed": db_obj.quantity_completed,
+            },
+            department_ids=(db_obj.department_id,),
+        )
+        return db_obj
+
+    def delete(self, db: Session, *, id: int) -> ProductionTask:
+        """Poista tehtävä"""
+        obj = db.query(ProductionTask).get(id)
+        production_order_id, department_id = obj.production_order_id, obj.department_id
+        mark_dirty(db, department_id, obj.ended_at)
+        db.delete(obj)
+        db.commit()
+
+        open_task_registry.remove(id)
+
+        event_broker.publish(
+            "task.deleted",
+            {"id": id, "production_order_id": production_order_id},
+            department_ids=(department_id,),
+        )
+        return obj
+
+
+# Luo singleton-instanssi
+production_task = CRUDProductionTask()
@@ -0,0 +1,58 @@
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.core.security import hash_password, invalidate_user
+from app.models.user import User
+from app.schemas.auth_schema import UserCreate
+
+
+# ============================================================================
+# User CRUD Operations
+# ============================================================================
+
+
+class CRUDUser:
+    """CRUD operaatiot User-mallille"""
+
+    def get(self, db: Session, id: int) -> Optional[User]:
+        """Hae käyttäjä ID:llä"""
+        return db.query(User).filter(User.id == id).first()
+
+    def get_by_email(self, db: Session, email: str) -> Optional[User]:
+        """Hae käyttäjä sähköpostilla (kirjautumistunnus, ei kirjainkokoa)"""
+        return db.query(User).filter(User.email == email.strip().lower()).first()
+
+    def create(self, db: Session, *, obj_in: UserCreate) -> User:
+        """Luo käyttäjä (salasana tallennetaan bcrypt-tiivisteenä)"""
+        db_obj = User(
+            email=obj_in.email.strip().lower(),
+            hashed_password=hash_password(obj_in.password),
+            full_name=obj_in.full_name,
+            is_active=True,
+            is_superuser=obj_in.is_superuser,
+        )
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
+    def set_password(self, db: Session, *, db_obj: User, password: str) -> User:
+        """Vaihda salasana"""
+        db_obj.hashed_password = hash_password(password)
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
+    def set_active(self, db: Session, *, db_obj: User, is_active: bool) -> User:
+        """Aktivoi tai deaktivoi käyttäjä"""
+        db_obj.is_active = is_active
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+
+        invalidate_user(db_obj.id)
+        return db_obj
+
+
+# Luo singleton-instanssi
+user = CRUDUser()
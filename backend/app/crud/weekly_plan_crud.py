@@ -0,0 +1,231 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Optional, List
+from sqlalchemy import delete, insert, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.models.weekly_plan import WeeklyPlan, WeeklyPlanItem
+from app.schemas.weekly_plan_schema import WeeklyPlanItemSync
+from app.services.event_broker import event_broker
+from app.services.weekly_load import load_cache
+
+
+# Siirretään keskeneräiset rivit (tilaus ei valmis viimeisellä aktiivisella
+# osastolla). Siirretyt rivit menevät kohdeviikon alkuun ja kohdeviikon
+# nykyisiä rivejä siirretään eteenpäin. Jos tilaus on jo kohdeviikolla
+# (uq_plan_order), lähdeviikon rivi vain poistetaan.
+_ROLLOVER = """
+WITH last_department AS (
+    SELECT id FROM departments
+    WHERE is_active
+    ORDER BY display_order DESC NULLS LAST
+    LIMIT 1
+),
+moved AS (
+    DELETE FROM weekly_plan_items i
+    WHERE i.weekly_plan_id = :source_id
+        AND NOT EXISTS (
+            SELECT 1 FROM order_department_status ods
+            JOIN last_department d ON d.id = ods.department_id
+            WHERE ods.production_order_id = i.production_order_id
+                AND ods.status IN ('COMPLETED', 'OVER_QUANTITY')
+        )
+    RETURNING i.production_order_id, i.planned_sequence, i.estimated_hours, i.priority
+),
+incoming AS (
+    SELECT
+        m.*,
+        ROW_NUMBER() OVER (
+            ORDER BY m.planned_sequence NULLS LAST, m.production_order_id
+        ) AS sequence
+    FROM moved m
+    WHERE NOT EXISTS (
+        SELECT 1 FROM weekly_plan_items t
+        WHERE t.weekly_plan_id = :target_id
+            AND t.production_order_id = m.production_order_id
+    )
+),
+shifted AS (
+    UPDATE weekly_plan_items t
+    SET planned_sequence = t.planned_sequence + (SELECT COUNT(*) FROM incoming)
+    WHERE t.weekly_plan_id = :target_id
+        AND t.planned_sequence IS NOT NULL
+),
+inserted AS (
+    INSERT INTO weekly_plan_items (
+        weekly_plan_id, production_order_id, planned_sequence,
+        estimated_hours, priority
+    )
+    SELECT :target_id, production_order_id, sequence, estimated_hours, priority
+    FROM incoming
+    RETURNING id
+)
+SELECT (SELECT COUNT(*) FROM moved), (SELECT COUNT(*) FROM inserted)
+"""
+
+_UPDATE_ITEMS = """
+UPDATE weekly_plan_items i
+SET
+    planned_sequence = u.planned_sequence,
+    estimated_hours = u.estimated_hours,
+    priority = u.priority
+FROM unnest(
+    CAST(:ids AS integer[]),
+    CAST(:planned_sequences AS integer[]),
+    CAST(:estimated_hours AS numeric[]),
+    CAST(:priorities AS integer[])
+) AS u(id, planned_sequence, estimated_hours, priority)
+WHERE i.id = u.id
+"""
+
+# Kentät joita ruudukosta voi muokata
+_GRID_FIELDS = ("planned_sequence", "estimated_hours", "priority")
+
+
+# ============================================================================
+# WeeklyPlan CRUD Operations
+# ============================================================================
+
+
+class CRUDWeeklyPlan:
+    """CRUD operaatiot WeeklyPlan- ja WeeklyPlanItem-malleille"""
+
+    def get(self, db: Session, id: int) -> Optional[WeeklyPlan]:
+        """Hae viikkosuunnitelma ID:llä"""
+        return db.query(WeeklyPlan).filter(WeeklyPlan.id == id).first()
+
+    def get_items(self, db: Session, weekly_plan_id: int) -> List[WeeklyPlanItem]:
+        """Hae suunnitelman rivit järjestyksessä"""
+        return (
+            db.query(WeeklyPlanItem)
+            .filter(WeeklyPlanItem.weekly_plan_id == weekly_plan_id)
+            .order_by(
+                WeeklyPlanItem.planned_sequence.nullslast(), WeeklyPlanItem.id
+            )
+            .all()
+        )
+
+    def get_or_create_week(
+        self, db: Session, *, year: int, week_number: int, template: WeeklyPlan
+    ) -> tuple[WeeklyPlan, bool]:
+        """
+        Hae viikon suunnitelma tai luo se mallisuunnitelman kapasiteetilla.
+        Ei committaa. Palauttaa: (suunnitelma, luotiinko)
+        """
+        created_id = db.execute(
+            pg_insert(WeeklyPlan)
+            .values(
+                year=year,
+                week_number=week_number,
+                num_workers=template.num_workers,
+                work_days_per_week=template.work_days_per_week,
+                hours_per_day=template.hours_per_day,
+            )
+            .on_conflict_do_nothing(constraint="uq_weekly_plan")
+            .returning(WeeklyPlan.id)
+        ).scalar()
+
+        plan = (
+            db.query(WeeklyPlan)
+            .filter(WeeklyPlan.year == year, WeeklyPlan.week_number == week_number)
+            .one()
+        )
+        return plan, created_id is not None
+
+    def rollover(
+        self, db: Session, *, db_obj: WeeklyPlan
+    ) -> tuple[WeeklyPlan, bool, int, int]:
+        """
+        Siirrä keskeneräiset rivit seuraavan viikon suunnitelmaan yhdellä
+        lauseella (kohdesuunnitelma luodaan tarvittaessa).
+        Palauttaa: (kohdesuunnitelma, luotiinko, siirretyt, lisätyt)
+        """
+        next_monday = date.fromisocalendar(db_obj.year, db_obj.week_number, 1)
+        next_year, next_week, _ = (next_monday + timedelta(weeks=1)).isocalendar()
+
+        target, created = self.get_or_create_week(
+            db, year=next_year, week_number=next_week, template=db_obj
+        )
+        moved, inserted = db.execute(
+            text(_ROLLOVER), {"source_id": db_obj.id, "target_id": target.id}
+        ).one()
+        db.commit()
+        db.refresh(target)
+
+        load_cache.invalidate()
+        event_broker.publish(
+            "weekly_plan.updated", {"ids": [db_obj.id, target.id]}
+        )
+        return target, created, moved, inserted
+
+    def sync_items(
+        self,
+        db: Session,
+        *,
+        db_obj: WeeklyPlan,
+        items_in: List[WeeklyPlanItemSync],
+    ) -> tuple[int, int, int]:
+        """
+        Synkronoi suunnitelman rivit koko ruudukon mukaisiksi.
+        Lasketaan minimaalinen ero nykyisiin riveihin ja kirjoitetaan se
+        bulk-operaatioina (insert / update / delete).
+        Palauttaa: (lisätyt, päivitetyt, poistetut)
+        """
+        current = {
+            item.production_order_id: item
+            for item in db.query(WeeklyPlanItem).filter(
+                WeeklyPlanItem.weekly_plan_id == db_obj.id
+            )
+        }
+        wanted = {item.production_order_id: item for item in items_in}
+
+        to_insert = [
+            {"weekly_plan_id": db_obj.id, **item.model_dump()}
+            for order_id, item in wanted.items()
+            if order_id not in current
+        ]
+        to_update = [
+            (current[order_id].id, item)
+            for order_id, item in wanted.items()
+            if order_id in current
+            and any(
+                _normalize(getattr(current[order_id], field))
+                != _normalize(getattr(item, field))
+                for field in _GRID_FIELDS
+            )
+        ]
+        to_delete = [
+            item.id for order_id, item in current.items() if order_id not in wanted
+        ]
+
+        if to_delete:
+            db.execute(delete(WeeklyPlanItem).where(WeeklyPlanItem.id.in_(to_delete)))
+        if to_update:
+            db.execute(
+                text(_UPDATE_ITEMS),
+                {
+                    "ids": [item_id for item_id, _ in to_update],
+                    "planned_sequences": [i.planned_sequence for _, i in to_update],
+                    "estimated_hours": [i.estimated_hours for _, i in to_update],
+                    "priorities": [i.priority for _, i in to_update],
+                },
+            )
+        if to_insert:
+            db.execute(insert(WeeklyPlanItem), to_insert)
+        db.commit()
+
+        if to_insert or to_update or to_delete:
+            load_cache.invalidate()
+            event_broker.publish("weekly_plan.updated", {"ids": [db_obj.id]})
+        return len(to_insert), len(to_update), len(to_delete)
+
+
+def _normalize(value):
+    # DECIMAL(10, 2) vs. clientin lähettämä arvo
+    if isinstance(value, (Decimal, float)):
+        return round(Decimal(str(value)), 2)
+    return value
+
+
+# Luo singleton-instanssi
+weekly_plan = CRUDWeeklyPlan()
@@ -0,0 +1,51 @@
+"""
+Async-tietokantayhteydet (asyncpg)
+
+Käytössä vain kun ASYNC_ENDPOINTS on päällä: async-reitit eivät varaa
+Starletten säiepoolin paikkaa pyynnön ajaksi, joten rinnakkaisuutta
+rajoittaa yhteyspooli eikä säiepoolin koko. Moduuli tuodaan vasta
+tarvittaessa, koska sqlalchemy.ext.asyncio vaatii greenlet-paketin.
+
+Async-reitit käyttävät aina primarya: lukureplikoille ei ole async-engineä,
+ja async-reitit ovat lyhyitä CRUD-kutsuja, joissa replikan viive näkyisi
+heti. Kirjoitukset merkitsevät asiakkaan kuten get_db, jotta sen
+synkroniset GET-pyynnöt eivät lue muutosta vanhempaa replikaa.
+"""
+
+from fastapi import Request, Response
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+from app.db.base import mark_primary_sticky
+from app.db.pool import engine_options
+
+
+def async_database_url() -> str:
+    """ASYNC_DATABASE_URL tai DATABASE_URL asyncpg-ajurilla"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+
+_url = async_database_url()
+async_engine = create_async_engine(
+    _url, **engine_options(_url, "async", AsyncAdaptedQueuePool)
+)
+
+# expire_on_commit=False: vastauksen serialisointi ei saa laukaista
+# laiskaa latausta commitin jälkeen (async-sessiossa se on virhe)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+# Dependency
+async def get_async_db(request: Request, response: Response):
+    mark_primary_sticky(request, response)
+    async with AsyncSessionLocal() as db:
+        yield db
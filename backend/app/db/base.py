@@ -1,16 +1,183 @@
+import itertools
+import logging
+import math
+import threading
+import time
+from typing import Optional
+
+from fastapi import Request, Response
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.db.pool import engine_options
+
+logger = logging.getLogger(__name__)
+
+# Enginet luodaan ensimmäisellä käytöllä: mallien, Alembicin ja skriptien
+# tuonti ei lataa tietokanta-ajuria eikä luo poolia
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> Engine:
+    """Primary-engine (luodaan ensimmäisellä kutsulla)"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(
+                    settings.DATABASE_URL,
+                    **engine_options(settings.DATABASE_URL, "primary"),
+                )
+    return _engine
+
+
+class PrimarySession(Session):
+    """Sessio joka sidotaan primary-engineen vasta kun se luodaan"""
+
+    def __init__(self, bind=None, **kwargs):
+        super().__init__(bind=bind or get_engine(), **kwargs)
+
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=PrimarySession, autocommit=False, autoflush=False)
 
 Base = declarative_base()
 
 
+# ============================================================================
+# Read replicas
+# ============================================================================
+
+# Lukureplikat (DATABASE_REPLICA_URLS, pilkulla eroteltu); tyhjä = vain primary
+replica_urls = [
+    url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()
+]
+_replica_sessions: Optional[list[sessionmaker]] = None
+_replica_counter = itertools.count()
+
+
+def replica_sessionmakers() -> list[sessionmaker]:
+    """Replikoiden sessiotehtaat (enginet luodaan ensimmäisellä kutsulla)"""
+    global _replica_sessions
+    if _replica_sessions is None:
+        with _engine_lock:
+            if _replica_sessions is None:
+                _replica_sessions = [
+                    sessionmaker(
+                        autocommit=False,
+                        autoflush=False,
+                        bind=create_engine(url, **engine_options(url, f"replica{i}")),
+                    )
+                    for i, url in enumerate(replica_urls)
+                ]
+    return _replica_sessions
+
+
+# Replika jonka yhteys epäonnistui ohitetaan hetkeksi
+_unavailable_until = [0.0] * len(replica_urls)
+REPLICA_RETRY_SECONDS = 30
+
+# Kirjoittaneet asiakkaat lukevat primarystä REPLICA_STICKY_SECONDS ajan,
+# jotta ne näkevät omat muutoksensa replikoinnin viiveestä huolimatta.
+# Avain on Authorization-otsake (tai IP); eväste kattaa muut workerit.
+sticky_clients = TTLCache(
+    "replica_sticky",
+    maxsize=10000,
+    ttl_seconds=settings.REPLICA_STICKY_SECONDS,
+)
+STICKY_COOKIE = "db_primary"
+
+READ_METHODS = ("GET", "HEAD")
+
+
+def _client_key(request: Request) -> str:
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return authorization
+    return request.client.host if request.client else ""
+
+
+def _mark_sticky(request: Request, response: Response) -> None:
+    sticky_clients.set(_client_key(request), True)
+    response.set_cookie(
+        STICKY_COOKIE,
+        "1",
+        max_age=math.ceil(settings.REPLICA_STICKY_SECONDS),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def _is_sticky(request: Request) -> bool:
+    return STICKY_COOKIE in request.cookies or sticky_clients.get(
+        _client_key(request), False
+    )
+
+
+def mark_primary_sticky(request: Request, response: Response) -> None:
+    """Kirjoittava pyyntö: asiakas lukee primarystä REPLICA_STICKY_SECONDS ajan"""
+    if replica_urls and request.method not in READ_METHODS:
+        _mark_sticky(request, response)
+
+
+def replica_session():
+    """
+    Sessio seuraavaan käytettävissä olevaan replikaan (round-robin),
+    None jos yhtään ei ole tai kaikki ovat alhaalla.
+    """
+    now = time.monotonic()
+    sessions = replica_sessionmakers()
+    for _ in range(len(sessions)):
+        index = next(_replica_counter) % len(sessions)
+        if _unavailable_until[index] > now:
+            continue
+        db = sessions[index]()
+        try:
+            # Yhteys heti, jotta alhaalla oleva replika huomataan ennen
+            # endpointia eikä kesken sen
+            db.connection()
+            return db
+        except OperationalError:
+            db.close()
+            _unavailable_until[index] = now + REPLICA_RETRY_SECONDS
+            logger.warning(
+                "Lukureplika %d ei vastaa, ohitetaan %d s",
+                index,
+                REPLICA_RETRY_SECONDS,
+                exc_info=True,
+            )
+    return None
+
+
 # Dependency
-def get_db():
+def get_db(request: Request, response: Response):
+    """
+    Sessio pyynnön metodin mukaan: GET/HEAD lukureplikaan, muut primaryyn.
+    Ilman replikoita kaikki menee primaryyn.
+    """
+    db = None
+    if replica_urls and request.method in READ_METHODS and not _is_sticky(request):
+        db = replica_session()
+    mark_primary_sticky(request, response)
+
+    if db is None:
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_primary_db():
+    """
+    Sessio aina primaryyn: lukupyynnöt jotka eivät siedä replikan viivettä,
+    kuten prosessin välimuisteja täyttävät raportit (välimuistiin jäänyt
+    replikan tulos näkyisi kaikille TTL:n ajan, myös sticky-asiakkaille).
+    """
     db = SessionLocal()
     try:
         yield db
@@ -0,0 +1,195 @@
+"""
+Pyyntökohtainen SQL-instrumentointi
+
+SQLAlchemyn cursor-tapahtumat laskevat jokaisen lauseen ja sen keston
+pyynnön QueryStats-olioon (ContextVar, joka periytyy myös säiepooliin
+ajettaviin synkronisiin endpointeihin). Middleware lisää vastaukseen
+Server-Timing-otsakkeen ja kirjaa yhteenvedon debug-lokiin.
+
+N+1-tunnistus: lauseet ryhmitellään muodon mukaan (parametrit ja IN-listat
+yhdistetty), ja kun sama muoto toistuu yli SQL_REPEAT_THRESHOLD kertaa
+yhdessä pyynnössä, siitä varoitetaan - tai SQL_REPEAT_RAISE=true (testit,
+benchmarkit) tekee siitä virheen.
+
+Raakayhteydet (engine.raw_connection, COPY) ohittavat tapahtumat.
+"""
+
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Parametrilista (psycopg2 %(x)s, asyncpg $1, sqlite ?) ja toistuvat rivit
+_PARAM = r"\s*(?:%\(\w+\)s|\$\d+|\?)\s*"
+_PARAM_LIST = re.compile(rf"\((?:{_PARAM},)*{_PARAM}\)")
+_ROW_LIST = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RepeatedQueryError(RuntimeError):
+    """Sama lausemuoto toistui pyynnössä liian monta kertaa (N+1)"""
+
+
+@lru_cache(maxsize=2048)
+def statement_shape(statement: str) -> str:
+    """Lause ilman parametrien määrästä riippuvia osia"""
+    shape = _PARAM_LIST.sub("(?)", statement)
+    shape = _ROW_LIST.sub("(?), ...", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """Yhden pyynnön (tai capture_queries-lohkon) SQL-lauseet"""
+
+    __slots__ = ("count", "seconds", "shapes", "repeated")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        # muoto -> [määrä, sekunnit]
+        self.shapes: dict[str, list] = {}
+        self.repeated: list[str] = []
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        shape = statement_shape(statement)
+        entry = self.shapes.get(shape)
+        if entry is None:
+            entry = self.shapes[shape] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+
+        threshold = settings.SQL_REPEAT_THRESHOLD
+        if threshold and entry[0] == threshold + 1:
+            self.repeated.append(shape)
+            if settings.SQL_REPEAT_RAISE:
+                raise RepeatedQueryError(
+                    f"Lause toistui yli {threshold} kertaa: {shape[:300]}"
+                )
+
+    def top(self, limit: int = 5) -> list[tuple[str, int, float]]:
+        """Toistuvimmat muodot (muoto, määrä, sekunnit)"""
+        ranked = sorted(self.shapes.items(), key=lambda item: -item[1][0])
+        return [(shape, count, seconds) for shape, (count, seconds) in ranked[:limit]]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("sql_query_stats", default=None)
+
+
+def current_stats() -> Optional[QueryStats]:
+    """Käynnissä olevan pyynnön tilastot (None instrumentoinnin ulkopuolella)"""
+    return _current.get()
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryStats]:
+    """Laske lohkon lauseet (skriptit, testit ja benchmarkit)"""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+# ============================================================================
+# SQLAlchemy events
+# ============================================================================
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if started:
+        elapsed = time.perf_counter() - started.pop()
+        stats = _current.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # Epäonnistunut lause ei saa jättää aloitusaikaa pinoon
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+# ============================================================================
+# Middleware
+# ============================================================================
+
+
+class SQLInstrumentationMiddleware:
+    """ASGI-middleware: QueryStats jokaiselle HTTP-pyynnölle"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - started) * 1000
+                timing = (
+                    f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries", '
+                    f"app;dur={total_ms:.2f}"
+                )
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", timing.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._log(scope, stats, time.perf_counter() - started)
+
+    @staticmethod
+    def _log(scope, stats: QueryStats, seconds: float) -> None:
+        for shape in stats.repeated:
+            logger.warning(
+                "Mahdollinen N+1: %s %s toisti lausetta %d kertaa: %s",
+                scope["method"],
+                scope["path"],
+                stats.shapes[shape][0],
+                shape[:300],
+            )
+        if stats.count and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "%s %s: %d kyselyä, %.1f ms tietokannassa / %.1f ms yhteensä; %s",
+                scope["method"],
+                scope["path"],
+                stats.count,
+                stats.seconds * 1000,
+                seconds * 1000,
+                "; ".join(
+                    f"{count}x {seconds * 1000:.1f} ms {shape[:120]}"
+                    for shape, count, seconds in stats.top(3)
+                ),
+            )
@@ -0,0 +1,154 @@
+"""
+Yhteyspoolin asetukset ja mittarit
+
+Pooli aliluokitetaan niin, että jokainen connect() (odotus vapaaseen
+yhteyteen, tarvittaessa uuden avaus ja pre-ping) ajastetaan ja kirjataan
+histogrammiin. Mittarit rekisteröityvät nimellä kuten välimuistit, joten
+/debug/pool voi raportoida kaikki poolit yhdestä paikasta.
+"""
+
+import bisect
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.core.config import settings
+
+# Histogrammin ylärajat sekunteina (viimeinen lokero on +Inf)
+CHECKOUT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Kaikki poolien mittarit nimen mukaan
+pool_stats: Dict[str, "PoolStats"] = {}
+
+
+class PoolStats:
+    """Yhteyksien checkout-ajat ja aikakatkaisut yhdelle poolille"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Optional[Pool] = None
+        self._lock = threading.Lock()
+        self.reset()
+        pool_stats[name] = self
+
+    def reset(self) -> None:
+        with self._lock:
+            self.count = 0
+            self.timeouts = 0
+            self.sum_seconds = 0.0
+            self.max_seconds = 0.0
+            self.buckets = [0] * (len(CHECKOUT_BUCKETS) + 1)
+
+    def record(self, seconds: float) -> None:
+        index = bisect.bisect_left(CHECKOUT_BUCKETS, seconds)
+        with self._lock:
+            self.count += 1
+            self.sum_seconds += seconds
+            if seconds > self.max_seconds:
+                self.max_seconds = seconds
+            self.buckets[index] += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        """Laskurit ja poolin nykytila yhtenäisenä kopiona"""
+        with self._lock:
+            data = {
+                "name": self.name,
+                "checkouts": self.count,
+                "timeouts": self.timeouts,
+                "checkout_seconds_sum": self.sum_seconds,
+                "checkout_seconds_max": self.max_seconds,
+                "buckets": list(self.buckets),
+            }
+        pool = self.pool
+        if isinstance(pool, QueuePool):
+            data.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+                max_overflow=pool._max_overflow,
+                timeout_seconds=pool.timeout(),
+            )
+        if pool is not None:
+            data["recycle_seconds"] = pool._recycle
+        return data
+
+
+def timed_pool_class(base: type, stats: PoolStats) -> type:
+    """
+    Poolin aliluokka joka kirjaa connect()-ajat statsiin. Luokka-attribuutti
+    säilyy myös kun pooli luodaan uudelleen (engine.dispose / recreate).
+    """
+
+    def __init__(self, *args, **kwargs):
+        base.__init__(self, *args, **kwargs)
+        stats.pool = self
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = base.connect(self)
+        except exc.TimeoutError:
+            stats.record_timeout()
+            raise
+        stats.record(time.perf_counter() - started)
+        return connection
+
+    return type(
+        f"Timed{base.__name__}",
+        (base,),
+        {"__init__": __init__, "connect": connect, "stats": stats},
+    )
+
+
+# Massa-ajot (datan generointi, backfill, BOM-tuonti, rollup) ohittavat
+# DB_STATEMENT_TIMEOUT_MS-rajan. Voimassa transaktion loppuun, joten poolin
+# yhteys palaa rajan kanssa; ajetaan jokaisen transaktion alussa.
+DISABLE_STATEMENT_TIMEOUT = "SET LOCAL statement_timeout = 0"
+
+
+def engine_options(url: str, name: str, base: type = QueuePool) -> dict:
+    """create_engine / create_async_engine -argumentit asetuksista"""
+    options = {
+        "poolclass": timed_pool_class(base, PoolStats(name)),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+    timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+    if timeout_ms > 0:
+        # Asetetaan jokaiselle yhteydelle sen avautuessa
+        driver = make_url(url).get_driver_name()
+        if driver == "asyncpg":
+            options["connect_args"] = {
+                "server_settings": {"statement_timeout": str(timeout_ms)}
+            }
+        elif driver in ("psycopg2", "psycopg"):
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+    return options
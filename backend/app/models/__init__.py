@@ -8,10 +8,11 @@ from app.models.order_status import OrderDepartmentStatus, OrderStatusEnum
 from app.models.order_phase_value import OrderPhaseValue
 from app.models.employee import Employee
 from app.models.production_task import ProductionTask
-from app.models.bom import BOMItem
+from app.models.bom import BOMItem, BOMCacheVersion
 from app.models.efficiency import (
     EfficiencySummary,
     EfficiencyItem,
     EfficiencyPeriodType,
+    EfficiencyDirtyDay,
 )
 from app.models.weekly_plan import WeeklyPlan, WeeklyPlanItem
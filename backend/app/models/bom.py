@@ -1,4 +1,12 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DECIMAL
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Integer,
+    SmallInteger,
+    String,
+    ForeignKey,
+    DECIMAL,
+)
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -8,7 +16,10 @@ class BOMItem(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(
-        Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False
+        Integer,
+        ForeignKey("products.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     material_code = Column(String(100), nullable=False)
     material_name = Column(String(255))
@@ -17,3 +28,15 @@ class BOMItem(Base):
 
     # Relationships
     product = relationship("Product", back_populates="bom_items")
+
+
+# Muutoslaskurit prosessikohtaisille BOM-välimuisteille; triggerit kasvattavat
+# laskuria kun bom_items tai tuotteiden item_numberit muuttuvat. Laskuri on
+# jaettu riveihin (slot = backendin pid % 16), jotta rinnakkaiset kirjoittajat
+# eivät jonouta saman rivin lukkoon; versio on rivien summa.
+class BOMCacheVersion(Base):
+    __tablename__ = "bom_cache_versions"
+
+    name = Column(String(50), primary_key=True)
+    slot = Column(SmallInteger, primary_key=True, server_default="0")
+    version = Column(BigInteger, nullable=False, server_default="0")
@@ -9,6 +9,7 @@ from sqlalchemy import (
     UniqueConstraint,
     Enum as SQLEnum,
     Index,
+    PrimaryKeyConstraint,
 )
 from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
@@ -80,6 +81,7 @@ class EfficiencyItem(Base):
         Integer,
         ForeignKey("efficiency_summaries.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     production_order_id = Column(Integer, ForeignKey("production_orders.id"))
 
@@ -97,3 +99,16 @@ class EfficiencyItem(Base):
     production_order = relationship(
         "ProductionOrder", back_populates="efficiency_items"
     )
+
+
+# (osasto, päivä) -parit joiden DAILY-yhteenveto on laskettava uudelleen
+class EfficiencyDirtyDay(Base):
+    __tablename__ = "efficiency_dirty_days"
+
+    department_id = Column(
+        Integer, ForeignKey("departments.id", ondelete="CASCADE"), nullable=False
+    )
+    day = Column(Date, nullable=False)
+    marked_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
+    __table_args__ = (PrimaryKeyConstraint("department_id", "day"),)
@@ -7,6 +7,7 @@ from sqlalchemy import (
     ForeignKey,
     TIMESTAMP,
     Computed,
+    Index,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -31,3 +32,13 @@ class Employee(Base):
     # Relationships
     primary_department = relationship("Department")
     production_tasks = relationship("ProductionTask", back_populates="employee")
+
+    __table_args__ = (
+        # Nimihaku (pg_trgm): ILIKE '%...%' ja samankaltaisuus
+        Index(
+            "ix_employees_full_name_trgm",
+            "full_name",
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+        ),
+    )
@@ -1,4 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey, TIMESTAMP
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    Date,
+    ForeignKey,
+    TIMESTAMP,
+    DECIMAL,
+    Index,
+)
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -13,7 +23,10 @@ class ProductionOrder(Base):
     product_id = Column(Integer, ForeignKey("products.id"))
 
     quantity = Column(Integer, nullable=False)
-    ship_date = Column(Date)
+    # quantity * standard_time_minutes * efficiency_multiplier
+    # (trigger + app.services.order_estimates)
+    estimated_minutes = Column(DECIMAL(12, 2), index=True)
+    ship_date = Column(Date, index=True)
     week_number = Column(Integer, index=True)
     year = Column(Integer, index=True)
 
@@ -48,3 +61,12 @@ class ProductionOrder(Base):
         "WeeklyPlanItem", back_populates="production_order"
     )
     efficiency_items = relationship("EfficiencyItem", back_populates="production_order")
+
+    __table_args__ = (
+        Index(
+            "ix_production_orders_week_estimate",
+            "year",
+            "week_number",
+            "estimated_minutes",
+        ),
+    )
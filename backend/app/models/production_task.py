@@ -7,9 +7,10 @@ from sqlalchemy import (
     TIMESTAMP,
     DECIMAL,
     Computed,
+    Index,
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 import uuid
@@ -48,3 +49,15 @@ class ProductionTask(Base):
     employee = relationship("Employee", back_populates="production_tasks")
     department = relationship("Department", back_populates="production_tasks")
     work_phase = relationship("WorkPhase", back_populates="production_tasks")
+
+    __table_args__ = (
+        # Avoimet tehtävät (ended_at IS NULL) - "kuka tekee mitä" -näkymä
+        Index(
+            "ix_production_tasks_open",
+            "department_id",
+            "employee_id",
+            postgresql_where=text("ended_at IS NULL"),
+        ),
+        # Päättyneet tehtävät osastoittain (tehokkuuden rollup)
+        Index("ix_production_tasks_department_ended", "department_id", "ended_at"),
+    )
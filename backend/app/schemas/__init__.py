@@ -1,3 +1,9 @@
+from app.schemas.auth_schema import (
+    Token,
+    UserCreate,
+    User,
+)
+
 from app.schemas.product_schema import (
     ProductCategoryBase,
     ProductCategoryCreate,
@@ -11,6 +17,17 @@ from app.schemas.product_schema import (
     ProductListResponse,
 )
 
+from app.schemas.bom_schema import (
+    BOMItemBase,
+    BOMItem,
+    MaterialRequirement,
+    MaterialRequirements,
+    MaterialWhatIfLine,
+    MaterialWhatIfRequest,
+    BOMProductDiff,
+    BOMImportResult,
+)
+
 from app.schemas.department_schema import (
     DepartmentBase,
     DepartmentCreate,
@@ -20,7 +37,67 @@ from app.schemas.department_schema import (
     DepartmentListResponse,
 )
 
+from app.schemas.employee_schema import (
+    EmployeeBase,
+    EmployeeCreate,
+    EmployeeUpdate,
+    Employee,
+    EmployeeBadge,
+    EmployeeListResponse,
+)
+
+from app.schemas.production_task_schema import (
+    ProductionTaskStart,
+    ProductionTaskEnd,
+    ProductionTask,
+    OpenTask,
+    OpenTaskListResponse,
+)
+
+from app.schemas.production_order_schema import (
+    OrderDepartmentStatus,
+    OrderDepartmentStatusUpdate,
+    ProductionOrderMove,
+    ProductionOrder,
+    ProductionOrderListResponse,
+)
+
+from app.schemas.efficiency_schema import (
+    EfficiencySeriesDepartment,
+    EfficiencySeries,
+    WhatIfScenario,
+    WhatIfRequest,
+    WhatIfScenarioResult,
+    WhatIfResponse,
+    ProductivityNode,
+    ProductivityReport,
+)
+
+from app.schemas.weekly_plan_schema import (
+    WeeklyPlanBuildRequest,
+    WeeklyPlanBuildWeek,
+    WeeklyPlanBuildResult,
+    WeeklyPlanSequenceRequest,
+    WeeklyPlanSequenceResult,
+    WeeklyLoadMatrix,
+    WeeklyPlanItem,
+    WeeklyPlanItemSync,
+    WeeklyPlanGridSync,
+    WeeklyPlanGridSyncResult,
+    WeeklyPlanRolloverResult,
+)
+
+from app.schemas.debug_schema import (
+    HistogramBucket,
+    PoolStatus,
+    PoolReport,
+)
+
 __all__ = [
+    # Auth
+    "Token",
+    "UserCreate",
+    "User",
     # Product Category
     "ProductCategoryBase",
     "ProductCategoryCreate",
@@ -33,6 +110,15 @@ __all__ = [
     "Product",
     "ProductWithBOM",
     "ProductListResponse",
+    # BOM
+    "BOMItemBase",
+    "BOMItem",
+    "MaterialRequirement",
+    "MaterialRequirements",
+    "MaterialWhatIfLine",
+    "MaterialWhatIfRequest",
+    "BOMProductDiff",
+    "BOMImportResult",
     # Department
     "DepartmentBase",
     "DepartmentCreate",
@@ -40,4 +126,48 @@ __all__ = [
     "Department",
     "DepartmentWithStats",
     "DepartmentListResponse",
+    # Employee
+    "EmployeeBase",
+    "EmployeeCreate",
+    "EmployeeUpdate",
+    "Employee",
+    "EmployeeBadge",
+    "EmployeeListResponse",
+    # Production Task
+    "ProductionTaskStart",
+    "ProductionTaskEnd",
+    "ProductionTask",
+    "OpenTask",
+    "OpenTaskListResponse",
+    # Production Order
+    "OrderDepartmentStatus",
+    "OrderDepartmentStatusUpdate",
+    "ProductionOrderMove",
+    "ProductionOrder",
+    "ProductionOrderListResponse",
+    # Efficiency
+    "EfficiencySeriesDepartment",
+    "EfficiencySeries",
+    "WhatIfScenario",
+    "WhatIfRequest",
+    "WhatIfScenarioResult",
+    "WhatIfResponse",
+    "ProductivityNode",
+    "ProductivityReport",
+    # Weekly Plan
+    "WeeklyPlanBuildRequest",
+    "WeeklyPlanBuildWeek",
+    "WeeklyPlanBuildResult",
+    "WeeklyPlanSequenceRequest",
+    "WeeklyPlanSequenceResult",
+    "WeeklyLoadMatrix",
+    "WeeklyPlanItem",
+    "WeeklyPlanItemSync",
+    "WeeklyPlanGridSync",
+    "WeeklyPlanGridSyncResult",
+    "WeeklyPlanRolloverResult",
+    # Debug
+    "HistogramBucket",
+    "PoolStatus",
+    "PoolReport",
 ]
@@ -0,0 +1,38 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional
+from datetime import datetime
+
+
+# ============================================================================
+# Auth Schemas
+# ============================================================================
+
+
+class Token(BaseModel):
+    """Kirjautumisen vastaus"""
+
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int = Field(..., description="Voimassaoloaika sekunteina")
+
+
+class UserCreate(BaseModel):
+    """Schema käyttäjän luomiseen"""
+
+    email: str = Field(..., max_length=255, description="Kirjautumistunnus")
+    password: str = Field(..., min_length=8, max_length=72)
+    full_name: Optional[str] = Field(None, max_length=255)
+    is_superuser: bool = False
+
+
+class User(BaseModel):
+    """Schema käyttäjän palauttamiseen API:sta"""
+
+    id: int
+    email: str
+    full_name: Optional[str] = None
+    is_active: bool
+    is_superuser: bool
+    created_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
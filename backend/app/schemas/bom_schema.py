@@ -0,0 +1,118 @@
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from typing import List, Optional
+from datetime import date
+from decimal import Decimal
+
+
+# ============================================================================
+# BOM Schemas
+# ============================================================================
+
+
+class BOMItemBase(BaseModel):
+    """BOM-rivi - yhteiset kentät"""
+
+    material_code: str = Field(..., max_length=100, description="Materiaalikoodi")
+    material_name: Optional[str] = Field(None, max_length=255)
+    quantity: Decimal = Field(
+        ..., ge=0, max_digits=10, decimal_places=2, description="Määrä per tuote"
+    )
+    unit: Optional[str] = Field(None, max_length=50)
+
+
+class BOMItem(BOMItemBase):
+    """Schema BOM-rivin palauttamiseen API:sta"""
+
+    id: int
+    product_id: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# ============================================================================
+# Material Requirement Schemas
+# ============================================================================
+
+
+class MaterialRequirement(BaseModel):
+    """Yhden materiaalin kokonaistarve"""
+
+    material_code: str
+    material_name: Optional[str] = None
+    unit: Optional[str] = None
+    quantity: Decimal = Field(..., description="Σ(tilausmäärä × BOM-määrä)")
+    order_count: int = Field(..., description="Montako tilausta materiaalia tarvitsee")
+
+
+class MaterialRequirements(BaseModel):
+    """Materiaalitarpeet rajaukselle (suunnitelma, päiväväli tai what-if)"""
+
+    weekly_plan_id: Optional[int] = None
+    start: Optional[date] = None
+    end: Optional[date] = None
+    order_count: int = Field(..., description="Rajauksen tilaukset")
+    orders_without_bom: int = Field(
+        ..., description="Tilaukset joiden tuotteella ei ole BOM-rivejä"
+    )
+    items: List[MaterialRequirement]
+
+
+class MaterialWhatIfLine(BaseModel):
+    """Kuviteltu tilausrivi"""
+
+    product_id: int
+    quantity: int = Field(..., gt=0)
+
+
+class MaterialWhatIfRequest(BaseModel):
+    """Schema materiaalitarpeen laskemiseen annetuille riveille"""
+
+    lines: List[MaterialWhatIfLine] = Field(..., max_length=100000)
+    multi_level: bool = Field(
+        False, description="Pura alikokoonpanot rekursiivisesti lehtimateriaaleiksi"
+    )
+
+    @field_validator("lines")
+    @classmethod
+    def validate_not_empty(
+        cls, v: List[MaterialWhatIfLine]
+    ) -> List[MaterialWhatIfLine]:
+        if not v:
+            raise ValueError("Anna vähintään yksi rivi")
+        return v
+
+
+# ============================================================================
+# BOM Import Schemas
+# ============================================================================
+
+
+class BOMProductDiff(BaseModel):
+    """Tuotteen BOM-muutos tuonnissa (material_code -tasolla)"""
+
+    product_id: int
+    item_number: str
+    added: int = Field(..., description="Uudet materiaalikoodit")
+    removed: int = Field(..., description="Poistuneet materiaalikoodit")
+    changed: int = Field(..., description="Määrä, nimi tai yksikkö muuttui")
+    old_lines: int
+    new_lines: int
+
+
+class BOMImportResult(BaseModel):
+    """BOM-tuonnin tulos (diffs sisältää vain muuttuneet tuotteet)"""
+
+    dry_run: bool
+    lines: int = Field(..., description="Tiedoston datarivit")
+    imported_lines: int
+    skipped_lines: int
+    unknown_item_numbers: int = Field(
+        ..., description="Tuotenumerot joita ei löydy tuotteista"
+    )
+    products: int = Field(..., description="Tiedoston tuotteet")
+    products_changed: int
+    deleted_lines: int
+    inserted_lines: int
+    errors: List[str] = Field(..., description="Ensimmäiset hylätyt rivit")
+    diffs: List[BOMProductDiff]
+    duration_seconds: float
@@ -0,0 +1,43 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+# ============================================================================
+# Connection Pool Schemas
+# ============================================================================
+
+
+class HistogramBucket(BaseModel):
+    """Kumulatiivinen histogrammin lokero"""
+
+    le_ms: Optional[float] = Field(..., description="Yläraja (null = +Inf)")
+    count: int
+
+
+class PoolStatus(BaseModel):
+    """Yhden yhteyspoolin tila ja checkout-tilastot"""
+
+    name: str
+    size: Optional[int] = None
+    checked_out: Optional[int] = None
+    checked_in: Optional[int] = None
+    overflow: Optional[int] = None
+    max_overflow: Optional[int] = None
+    timeout_seconds: Optional[float] = None
+    recycle_seconds: Optional[int] = None
+    checkouts: int = Field(..., description="Onnistuneet checkoutit")
+    timeouts: int = Field(..., description="Poolin aikakatkaisut (pool_timeout)")
+    checkout_ms_mean: Optional[float] = None
+    checkout_ms_max: float
+    checkout_ms_p50: Optional[float] = Field(
+        None, description="Arvio histogrammista (lokeron yläraja)"
+    )
+    checkout_ms_p99: Optional[float] = None
+    histogram: List[HistogramBucket]
+
+
+class PoolReport(BaseModel):
+    """Kaikki prosessin yhteyspoolit"""
+
+    pid: int
+    pools: List[PoolStatus]
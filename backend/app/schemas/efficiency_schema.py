@@ -0,0 +1,127 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, List, Optional
+from datetime import date
+from decimal import Decimal
+
+from app.models.efficiency import EfficiencyPeriodType
+
+
+# ============================================================================
+# Efficiency Series Schemas
+# ============================================================================
+
+
+class EfficiencySeriesDepartment(BaseModel):
+    """Yhden osaston arvot sarakkeittain (indeksit vastaavat timestamps-listaa)"""
+
+    department_id: int
+    efficiency_actual: List[Optional[float]] = Field(
+        ..., description="Toteutunut tehokkuus-% (null = ei dataa)"
+    )
+    efficiency_target: List[Optional[float]] = Field(
+        ..., description="Tavoitetehokkuus-%"
+    )
+    planned_work_hours: List[Optional[float]]
+    actual_work_hours: List[Optional[float]]
+
+
+class EfficiencySeries(BaseModel):
+    """Tehokkuuden aikasarja dashboardeille"""
+
+    resolution: EfficiencyPeriodType = Field(
+        ..., description="Käytetty jaksotyyppi"
+    )
+    bucket_size: int = Field(
+        ..., description="Montako jaksoa on yhdistetty yhteen pisteeseen"
+    )
+    timestamps: List[date] = Field(..., description="Pisteiden alkupäivät")
+    series: List[EfficiencySeriesDepartment]
+
+
+# ============================================================================
+# Efficiency What-If Schemas
+# ============================================================================
+
+
+class WhatIfScenario(BaseModel):
+    """Yksi skenaario: muutetut kertoimet kategoriakoodeittain"""
+
+    name: str = Field(..., max_length=100, description="Skenaarion nimi")
+    multipliers: Dict[str, Decimal] = Field(
+        ..., description="Kategoriakoodi -> efficiency_multiplier (esim. {'C': 1.25})"
+    )
+
+    @field_validator("multipliers")
+    @classmethod
+    def validate_multipliers(cls, v: Dict[str, Decimal]) -> Dict[str, Decimal]:
+        if any(value < 0 for value in v.values()):
+            raise ValueError("Kerroin ei voi olla negatiivinen")
+        return v
+
+
+class WhatIfRequest(BaseModel):
+    """Schema what-if -simulointiin"""
+
+    start: date
+    end: date
+    department_ids: Optional[List[int]] = Field(
+        None, description="Osastot (oletuksena kaikki)"
+    )
+    scenarios: List[WhatIfScenario] = Field(..., min_length=1, max_length=20)
+
+
+class WhatIfScenarioResult(BaseModel):
+    """Skenaarion tavoitetehokkuus (indeksit vastaavat department_ids/months)"""
+
+    name: str
+    multipliers: Dict[str, float] = Field(
+        ..., description="Käytetyt kertoimet kaikille historian kategorioille"
+    )
+    efficiency_target: List[Optional[float]] = Field(
+        ..., description="Tavoitetehokkuus-% osastoittain koko jaksolta"
+    )
+    monthly_efficiency_target: List[List[Optional[float]]] = Field(
+        ..., description="Tavoitetehokkuus-% [osasto][kuukausi]"
+    )
+
+
+class WhatIfResponse(BaseModel):
+    """What-if -simuloinnin tulos; baseline = nykyiset kertoimet"""
+
+    department_ids: List[int]
+    months: List[date]
+    efficiency_actual: List[Optional[float]] = Field(
+        ..., description="Toteutunut tehokkuus-% osastoittain (ei riipu kertoimista)"
+    )
+    baseline: WhatIfScenarioResult
+    scenarios: List[WhatIfScenarioResult]
+
+
+# ============================================================================
+# Productivity Schemas
+# ============================================================================
+
+
+class ProductivityNode(BaseModel):
+    """Puun solmu: kokonaissumma, osasto, työvaihe tai työntekijä"""
+
+    id: Optional[int] = Field(
+        None, description="Osaston, työvaiheen tai työntekijän id (null = puuttuu)"
+    )
+    name: Optional[str] = None
+    tasks: int
+    quantity: float
+    worked_hours: float
+    std_hours: float = Field(..., description="Ansaittu standardiaika tunteina")
+    efficiency: Optional[float] = Field(
+        None, description="std_hours / worked_hours * 100"
+    )
+    children: List["ProductivityNode"] = []
+
+
+class ProductivityReport(BaseModel):
+    """Tuottavuus osasto -> työvaihe -> työntekijä"""
+
+    start: date
+    end: date
+    total: ProductivityNode
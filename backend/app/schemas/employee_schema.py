@@ -0,0 +1,70 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional
+from datetime import date, datetime
+
+
+# ============================================================================
+# Employee Schemas
+# ============================================================================
+
+
+class EmployeeBase(BaseModel):
+    """Perus Employee schema - yhteiset kentät"""
+
+    employee_number: str = Field(
+        ..., min_length=1, max_length=50, description="Kulkukortin numero"
+    )
+    first_name: Optional[str] = Field(None, max_length=100)
+    last_name: Optional[str] = Field(None, max_length=100)
+    primary_department_id: Optional[int] = Field(None, description="Pääosasto")
+    hire_date: Optional[date] = None
+    is_active: bool = Field(default=True, description="Onko työntekijä aktiivinen")
+
+
+class EmployeeCreate(EmployeeBase):
+    """Schema työntekijän luomiseen"""
+
+    pass
+
+
+class EmployeeUpdate(BaseModel):
+    """Schema työntekijän päivittämiseen - kaikki kentät optionaalisia"""
+
+    employee_number: Optional[str] = Field(None, min_length=1, max_length=50)
+    first_name: Optional[str] = Field(None, max_length=100)
+    last_name: Optional[str] = Field(None, max_length=100)
+    primary_department_id: Optional[int] = None
+    hire_date: Optional[date] = None
+    is_active: Optional[bool] = None
+
+
+class Employee(EmployeeBase):
+    """Schema työntekijän palauttamiseen API:sta"""
+
+    id: int
+    full_name: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class EmployeeBadge(BaseModel):
+    """Kortinluvun vastaus (aktiivinen työntekijä)"""
+
+    id: int
+    employee_number: str
+    full_name: Optional[str] = None
+    primary_department_id: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class EmployeeListResponse(BaseModel):
+    """Schema työntekijälistauksen palauttamiseen"""
+
+    items: list[Employee]
+    total: int
+    page: int
+    page_size: int
+
+    model_config = ConfigDict(from_attributes=True)
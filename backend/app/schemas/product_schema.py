@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
+from app.schemas.bom_schema import BOMItem
 
 
 class ProductCategoryBase(BaseModel):
@@ -79,10 +80,9 @@ class Product(ProductBase):
 
 
 class ProductWithBOM(Product):
-    """Tuote BOM-tietojen kera (tulee myöhemmin kun BOM schemas on tehty)"""
+    """Tuote BOM-tietojen kera"""
 
-    # bom_items: List[BOMItem] = []
-    pass
+    bom_items: List[BOMItem] = []
 
 
 class ProductListResponse(BaseModel):
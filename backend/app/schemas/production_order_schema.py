@@ -0,0 +1,81 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.models.order_status import OrderStatusEnum
+
+
+# ============================================================================
+# OrderDepartmentStatus Schemas
+# ============================================================================
+
+
+class OrderDepartmentStatus(BaseModel):
+    """Tilauksen tila yhdessä osastossa"""
+
+    id: int
+    department_id: int
+    status: OrderStatusEnum
+    quantity_completed: int = 0
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class OrderDepartmentStatusUpdate(BaseModel):
+    """Schema osastotilan päivittämiseen - kaikki kentät optionaalisia"""
+
+    status: Optional[OrderStatusEnum] = Field(
+        None, description="Uusi tila (oletuksena päätellään määrästä)"
+    )
+    quantity_completed: Optional[int] = Field(
+        None, ge=0, description="Osastossa valmistunut määrä"
+    )
+
+
+# ============================================================================
+# ProductionOrder Schemas
+# ============================================================================
+
+
+class ProductionOrderMove(BaseModel):
+    """Schema tilauksen siirtoon osaston jonossa"""
+
+    department_id: int = Field(..., description="Kohdeosaston ID")
+    queue_position: int = Field(0, ge=0, description="Sijainti osaston jonossa")
+
+
+class ProductionOrder(BaseModel):
+    """Schema tuotantotilauksen palauttamiseen API:sta"""
+
+    id: int
+    order_number: str
+    reference_number: Optional[str] = None
+    product_id: Optional[int] = None
+    quantity: int
+    estimated_minutes: Optional[Decimal] = None
+    ship_date: Optional[date] = None
+    week_number: Optional[int] = None
+    year: Optional[int] = None
+    current_department_id: Optional[int] = None
+    queue_position: Optional[int] = None
+    notes: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    department_statuses: list[OrderDepartmentStatus] = []
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductionOrderListResponse(BaseModel):
+    """Schema tilauslistauksen palauttamiseen"""
+
+    items: list[ProductionOrder]
+    total: int
+    page: int
+    page_size: int
+
+    model_config = ConfigDict(from_attributes=True)
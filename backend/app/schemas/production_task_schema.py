@@ -0,0 +1,79 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+
+# ============================================================================
+# ProductionTask Schemas
+# ============================================================================
+
+
+class ProductionTaskStart(BaseModel):
+    """Schema tehtävän aloittamiseen (terminaali)"""
+
+    production_order_id: int = Field(..., description="Tuotantotilauksen ID")
+    employee_id: Optional[int] = Field(None, description="Työntekijän ID")
+    department_id: Optional[int] = Field(None, description="Osaston ID")
+    work_phase_id: Optional[int] = Field(None, description="Työvaiheen ID")
+    batch_uuid: Optional[UUID] = Field(None, description="Eräryhmän tunniste")
+    started_at: Optional[datetime] = Field(
+        None, description="Aloitusaika (oletuksena nykyhetki)"
+    )
+    comment: Optional[str] = None
+
+
+class ProductionTaskEnd(BaseModel):
+    """Schema tehtävän päättämiseen"""
+
+    quantity_completed: Decimal = Field(
+        default=Decimal("0"), ge=0, description="Valmistunut määrä"
+    )
+    ended_at: Optional[datetime] = Field(
+        None, description="Lopetusaika (oletuksena nykyhetki)"
+    )
+    comment: Optional[str] = None
+
+
+class ProductionTask(BaseModel):
+    """Schema tehtävän palauttamiseen API:sta"""
+
+    id: int
+    task_uuid: UUID
+    production_order_id: int
+    employee_id: Optional[int] = None
+    department_id: Optional[int] = None
+    work_phase_id: Optional[int] = None
+    batch_uuid: Optional[UUID] = None
+    started_at: datetime
+    ended_at: Optional[datetime] = None
+    duration_minutes: Optional[int] = None
+    quantity_completed: Optional[Decimal] = None
+    comment: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class OpenTask(BaseModel):
+    """Avoin tehtävä "kuka tekee mitä" -näkymään"""
+
+    task_id: int
+    production_order_id: int
+    order_number: Optional[str] = None
+    employee_id: Optional[int] = None
+    employee_name: Optional[str] = None
+    department_id: Optional[int] = None
+    work_phase_id: Optional[int] = None
+    work_phase_name: Optional[str] = None
+    started_at: datetime
+    elapsed_minutes: float = Field(..., description="Kulunut aika minuutteina")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class OpenTaskListResponse(BaseModel):
+    """Schema avointen tehtävien listaukseen"""
+
+    items: list[OpenTask]
+    total: int
@@ -0,0 +1,169 @@
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from typing import List, Optional
+from decimal import Decimal
+
+
+# ============================================================================
+# Weekly Plan Builder Schemas
+# ============================================================================
+
+
+class WeeklyPlanBuildRequest(BaseModel):
+    """Schema viikkosuunnitelmien automaattiseen täyttöön"""
+
+    start_year: Optional[int] = Field(
+        None, ge=2000, le=2100, description="ISO-vuosi (oletuksena kuluva viikko)"
+    )
+    start_week: Optional[int] = Field(None, ge=1, le=53, description="ISO-viikko")
+    weeks: int = Field(12, ge=1, le=52, description="Montako viikkoa täytetään")
+    replace: bool = Field(
+        False, description="Poista horisontin nykyiset rivit ja suunnittele alusta"
+    )
+    dry_run: bool = Field(False, description="Laske tulos kirjoittamatta")
+
+
+class WeeklyPlanBuildWeek(BaseModel):
+    """Yhden viikon täyttö"""
+
+    weekly_plan_id: int
+    year: int
+    week_number: int
+    capacity_hours: float
+    planned_hours: float
+    orders_added: int
+
+
+class WeeklyPlanBuildResult(BaseModel):
+    """Viikkosuunnitelmien täytön tulos"""
+
+    weeks: List[WeeklyPlanBuildWeek]
+    missing_weeks: List[str] = Field(
+        ..., description="Viikot joilla ei ole suunnitelmaa (YYYY-Www)"
+    )
+    planned_orders: int
+    unplanned_order_ids: List[int] = Field(
+        ..., description="Tilaukset jotka eivät mahtuneet horisonttiin"
+    )
+    duration_seconds: float
+
+
+# ============================================================================
+# Weekly Plan Sequencing Schemas
+# ============================================================================
+
+
+class WeeklyPlanSequenceRequest(BaseModel):
+    """Schema planned_sequence -järjestyksen optimointiin"""
+
+    time_budget_ms: int = Field(
+        2000, ge=100, le=30000, description="Paikallishaun aikabudjetti"
+    )
+    history_days: int = Field(
+        365, ge=7, le=3650, description="Montako päivää historiaa aika-arvioihin"
+    )
+    dry_run: bool = Field(False, description="Laske tulos kirjoittamatta")
+
+
+class WeeklyPlanSequenceResult(BaseModel):
+    """Optimoinnin tulos (idle-listat vastaavat department_ids-järjestystä)"""
+
+    weekly_plan_id: int
+    item_ids: List[int] = Field(..., description="Rivit uudessa järjestyksessä")
+    department_ids: List[int]
+    makespan_hours_before: float
+    makespan_hours_after: float
+    idle_hours_before: List[float] = Field(
+        ..., description="Osastojen odotusaika nykyisellä järjestyksellä"
+    )
+    idle_hours_after: List[float]
+    iterations: int
+    duration_seconds: float
+
+
+# ============================================================================
+# Weekly Load Schemas
+# ============================================================================
+
+
+class WeeklyLoadMatrix(BaseModel):
+    """Kuormitus viikoittain ja osastoittain ([viikko][osasto])"""
+
+    weeks: List[str] = Field(..., description="ISO-viikot (YYYY-Www)")
+    department_ids: List[int]
+    planned_hours: List[List[float]] = Field(
+        ..., description="Suunniteltu työ tunteina"
+    )
+    capacity_hours: List[List[float]] = Field(
+        ..., description="Käytettävissä olevat tunnit"
+    )
+    utilization: List[List[Optional[float]]] = Field(
+        ..., description="Kuormitus-% (null = ei kapasiteettia)"
+    )
+
+
+# ============================================================================
+# Weekly Plan Item Schemas
+# ============================================================================
+
+
+class WeeklyPlanItem(BaseModel):
+    """Schema suunnitelmarivin palauttamiseen API:sta"""
+
+    id: int
+    weekly_plan_id: int
+    production_order_id: int
+    planned_sequence: Optional[int] = None
+    estimated_hours: Optional[Decimal] = None
+    priority: Optional[int] = 0
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class WeeklyPlanItemSync(BaseModel):
+    """Yksi ruudukon rivi synkronointiin"""
+
+    production_order_id: int
+    planned_sequence: Optional[int] = Field(None, ge=0)
+    estimated_hours: Optional[Decimal] = Field(
+        None, ge=0, max_digits=10, decimal_places=2
+    )
+    priority: int = 0
+
+
+class WeeklyPlanGridSync(BaseModel):
+    """Koko ruudukko: rivit joita ei ole listassa poistetaan"""
+
+    items: List[WeeklyPlanItemSync]
+
+    @field_validator("items")
+    @classmethod
+    def validate_unique_orders(
+        cls, v: List[WeeklyPlanItemSync]
+    ) -> List[WeeklyPlanItemSync]:
+        order_ids = [item.production_order_id for item in v]
+        if len(order_ids) != len(set(order_ids)):
+            raise ValueError("Sama tilaus voi esiintyä suunnitelmassa vain kerran")
+        return v
+
+
+class WeeklyPlanGridSyncResult(BaseModel):
+    """Synkronoinnin tulos"""
+
+    inserted: int
+    updated: int
+    deleted: int
+    items: List[WeeklyPlanItem]
+
+
+class WeeklyPlanRolloverResult(BaseModel):
+    """Keskeneräisten rivien siirron tulos"""
+
+    source_plan_id: int
+    target_plan_id: int
+    target_year: int
+    target_week_number: int
+    target_created: bool = Field(..., description="Luotiinko kohdeviikon suunnitelma")
+    moved: int = Field(..., description="Lähdeviikolta poistetut keskeneräiset rivit")
+    inserted: int = Field(
+        ..., description="Kohdeviikolle lisätyt rivit (loput olivat jo siellä)"
+    )
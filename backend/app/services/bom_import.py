@@ -0,0 +1,325 @@
+"""
+BOM-rivien massatuonti (CSV / xlsx)
+
+Sarakkeet: item_number, material_code, material_name, quantity, unit.
+Tiedosto luetaan rivi kerrallaan ja kirjoitetaan COPY:lla chunkeittain
+väliaikaistauluun, joten muistinkäyttö ei riipu tiedoston koosta.
+item_number -> product_id haetaan kerran etukäteen koko tuotetaulusta.
+
+Väliaikaistaulusta lasketaan tuotekohtainen ero nykyisiin BOM-riveihin
+(material_code -tasolla), ja vain muuttuneiden tuotteiden BOM korvataan
+kokonaan yhdellä DELETE- ja yhdellä INSERT-lauseella. Kaikki tapahtuu
+yhdessä transaktiossa, joten tuotteen BOM ei ole koskaan puolittain
+tuotu. Tuotteet joita tiedostossa ei ole jäävät ennalleen.
+"""
+
+import csv
+import io
+import time
+from typing import BinaryIO, Iterator, Optional
+
+from app.db.base import get_engine
+from app.db.pool import DISABLE_STATEMENT_TIMEOUT
+from app.schemas.bom_schema import BOMImportResult, BOMProductDiff
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Virheellisistä riveistä raportoidaan enintään näin monta
+MAX_REPORTED_ERRORS = 100
+
+COLUMNS = ("item_number", "material_code", "material_name", "quantity", "unit")
+REQUIRED_COLUMNS = ("item_number", "material_code", "quantity")
+
+# DECIMAL(10, 2)
+MAX_QUANTITY = 10**8
+
+_CREATE_STAGING = """
+CREATE TEMP TABLE bom_import (
+    line integer,
+    product_id integer,
+    material_code varchar(100),
+    material_name varchar(255),
+    quantity numeric(10, 2),
+    unit varchar(50)
+) ON COMMIT DROP
+"""
+
+# Ero material_code -tasolla: lisätyt, poistetut ja muuttuneet koodit
+_CREATE_DIFF = """
+CREATE TEMP TABLE bom_import_diff ON COMMIT DROP AS
+WITH new_lines AS (
+    SELECT
+        product_id,
+        material_code,
+        SUM(quantity) AS quantity,
+        MAX(material_name) AS material_name,
+        MAX(unit) AS unit,
+        COUNT(*) AS lines
+    FROM bom_import
+    GROUP BY product_id, material_code
+),
+old_lines AS (
+    SELECT
+        b.product_id,
+        b.material_code,
+        SUM(b.quantity) AS quantity,
+        MAX(b.material_name) AS material_name,
+        MAX(b.unit) AS unit,
+        COUNT(*) AS lines
+    FROM bom_items b
+    WHERE b.product_id IN (SELECT DISTINCT product_id FROM bom_import)
+    GROUP BY b.product_id, b.material_code
+)
+SELECT
+    COALESCE(n.product_id, o.product_id) AS product_id,
+    COUNT(*) FILTER (WHERE o.product_id IS NULL) AS added,
+    COUNT(*) FILTER (WHERE n.product_id IS NULL) AS removed,
+    COUNT(*) FILTER (
+        WHERE n.product_id IS NOT NULL
+            AND o.product_id IS NOT NULL
+            AND (n.quantity, n.material_name, n.unit, n.lines)
+                IS DISTINCT FROM (o.quantity, o.material_name, o.unit, o.lines)
+    ) AS changed,
+    COALESCE(SUM(o.lines), 0) AS old_lines,
+    COALESCE(SUM(n.lines), 0) AS new_lines
+FROM new_lines n
+FULL JOIN old_lines o
+    ON o.product_id = n.product_id AND o.material_code = n.material_code
+GROUP BY COALESCE(n.product_id, o.product_id)
+"""
+
+_CHANGED = "d.added + d.removed + d.changed > 0"
+
+_DELETE_CHANGED = f"""
+DELETE FROM bom_items b
+USING bom_import_diff d
+WHERE b.product_id = d.product_id AND {_CHANGED}
+"""
+
+_INSERT_CHANGED = f"""
+INSERT INTO bom_items (product_id, material_code, material_name, quantity, unit)
+SELECT s.product_id, s.material_code, s.material_name, s.quantity, s.unit
+FROM bom_import s
+JOIN bom_import_diff d ON d.product_id = s.product_id
+WHERE {_CHANGED}
+ORDER BY s.line
+"""
+
+_SELECT_DIFFS = f"""
+SELECT d.product_id, p.item_number, d.added, d.removed, d.changed,
+    d.old_lines, d.new_lines
+FROM bom_import_diff d
+JOIN products p ON p.id = d.product_id
+WHERE {_CHANGED}
+ORDER BY p.item_number
+"""
+
+
+class BOMImportError(ValueError):
+    """Tiedostoa ei voi tuoda (muoto tai otsikkorivi)"""
+
+
+def _normalize_header(value) -> str:
+    return str(value or "").strip().lower().replace(" ", "_")
+
+
+def _column_indexes(header) -> list[Optional[int]]:
+    names = [_normalize_header(value) for value in header]
+    missing = [column for column in REQUIRED_COLUMNS if column not in names]
+    if missing:
+        raise BOMImportError(f"Pakolliset sarakkeet puuttuvat: {', '.join(missing)}")
+    return [names.index(column) if column in names else None for column in COLUMNS]
+
+
+def _csv_rows(file: BinaryIO) -> Iterator[tuple]:
+    text_file = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        # Excelin suomenkielinen CSV käyttää puolipistettä
+        header = text_file.readline()
+        text_file.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(header, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        yield from csv.reader(text_file, dialect)
+    finally:
+        # Kutsuja omistaa tiedoston, joten sitä ei suljeta tässä
+        text_file.detach()
+
+
+def _xlsx_rows(file: BinaryIO) -> Iterator[tuple]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise BOMImportError("xlsx-tiedostojen tuonti vaatii openpyxl-paketin")
+
+    # read_only: rivit luetaan virtana eikä koko taulukkoa ladata muistiin
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_rows(file: BinaryIO, filename: str) -> Iterator[tuple]:
+    """
+    Tiedoston rivit (rivinumero, item_number, material_code, material_name,
+    quantity, unit) raakoina arvoina otsikkorivin sarakejärjestyksestä
+    riippumatta.
+    """
+    if filename.lower().endswith((".xlsx", ".xlsm")):
+        rows = _xlsx_rows(file)
+    elif filename.lower().endswith((".csv", ".txt")):
+        rows = _csv_rows(file)
+    else:
+        raise BOMImportError("Tuetut tiedostomuodot: .csv ja .xlsx")
+
+    header = next(rows, None)
+    if header is None:
+        raise BOMImportError("Tiedosto on tyhjä")
+    indexes = _column_indexes(header)
+
+    for line, row in enumerate(rows, start=2):
+        yield (line,) + tuple(
+            row[i] if i is not None and i < len(row) else None for i in indexes
+        )
+
+
+def _clean(value) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _parse_quantity(value) -> Optional[str]:
+    """Määrä tekstinä COPY:lle (desimaalipilkku sallittu), None jos virheellinen"""
+    if isinstance(value, (int, float)):
+        number = float(value)
+        text_value = repr(number)
+    else:
+        text_value = (_clean(value) or "").replace(",", ".").replace(" ", "")
+        try:
+            number = float(text_value)
+        except ValueError:
+            return None
+    if not 0 <= number < MAX_QUANTITY:
+        return None
+    return text_value
+
+
+def _copy_chunk(cursor, buffer: io.StringIO) -> None:
+    buffer.seek(0)
+    cursor.copy_expert("COPY bom_import FROM STDIN WITH (FORMAT csv)", buffer)
+    buffer.seek(0)
+    buffer.truncate()
+
+
+def import_bom(
+    file: BinaryIO,
+    filename: str,
+    *,
+    dry_run: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> BOMImportResult:
+    """
+    Tuo BOM-rivit tiedostosta ja korvaa muuttuneiden tuotteiden BOM.
+    dry_run laskee erot ja peruu transaktion.
+    """
+    started = time.perf_counter()
+    lines = imported = skipped = 0
+    unknown: set[str] = set()
+    errors: list[str] = []
+
+    def reject(line: int, message: str) -> None:
+        nonlocal skipped
+        skipped += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append(f"Rivi {line}: {message}")
+
+    connection = get_engine().raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(DISABLE_STATEMENT_TIMEOUT)
+            cursor.execute("SELECT item_number, id FROM products")
+            product_ids = dict(cursor.fetchall())
+
+            cursor.execute(_CREATE_STAGING)
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            pending = 0
+            for line, item_number, code, name, quantity, unit in read_rows(
+                file, filename
+            ):
+                item_number, code = _clean(item_number), _clean(code)
+                if item_number is None and code is None and _clean(quantity) is None:
+                    continue  # tyhjä rivi
+                lines += 1
+                if item_number is None or code is None:
+                    reject(line, "item_number ja material_code ovat pakollisia")
+                    continue
+                product_id = product_ids.get(item_number)
+                if product_id is None:
+                    if item_number not in unknown:
+                        unknown.add(item_number)
+                        reject(line, f"tuntematon tuote {item_number}")
+                    else:
+                        skipped += 1
+                    continue
+                parsed = _parse_quantity(quantity)
+                if parsed is None:
+                    reject(line, f"virheellinen määrä {quantity!r}")
+                    continue
+                name, unit = _clean(name), _clean(unit)
+                if len(code) > 100 or len(name or "") > 255 or len(unit or "") > 50:
+                    reject(line, "liian pitkä arvo")
+                    continue
+
+                writer.writerow((line, product_id, code, name, parsed, unit))
+                imported += 1
+                pending += 1
+                if pending >= chunk_size:
+                    _copy_chunk(cursor, buffer)
+                    pending = 0
+            if pending:
+                _copy_chunk(cursor, buffer)
+
+            # Väliaikaistaulua ei analysoida automaattisesti
+            cursor.execute("ANALYZE bom_import")
+            cursor.execute(_CREATE_DIFF)
+            cursor.execute("SELECT COUNT(*) FROM bom_import_diff")
+            products = cursor.fetchone()[0]
+
+            cursor.execute(_DELETE_CHANGED)
+            deleted = cursor.rowcount
+            cursor.execute(_INSERT_CHANGED)
+            inserted = cursor.rowcount
+
+            cursor.execute(_SELECT_DIFFS)
+            columns = [column.name for column in cursor.description]
+            diffs = [BOMProductDiff(**dict(zip(columns, row))) for row in cursor]
+
+        if dry_run:
+            connection.rollback()
+        else:
+            connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+    return BOMImportResult(
+        dry_run=dry_run,
+        lines=lines,
+        imported_lines=imported,
+        skipped_lines=skipped,
+        unknown_item_numbers=len(unknown),
+        products=products,
+        products_changed=len(diffs),
+        deleted_lines=deleted,
+        inserted_lines=inserted,
+        errors=errors,
+        diffs=diffs,
+        duration_seconds=round(time.perf_counter() - started, 3),
+    )
@@ -0,0 +1,610 @@
+"""
+Synteettinen tehdasdata kapasiteettitestaukseen
+
+Kaikki rivit johdetaan siemenestä. Jokainen osa (chunk) saa oman
+satunnaislukuvirtansa np.random.default_rng([seed, taulu, osa]), joten
+tulos ei riipu prosessien määrästä eikä suoritusjärjestyksestä.
+Tuotteiden, työntekijöiden ja tilausten id:t annetaan itse nykyisen
+maksimin jälkeen, jotta osat voivat viitata toisiinsa ilman paluuhakuja;
+sekvenssit siirretään lopuksi.
+
+Osat kirjoitetaan COPY:lla rinnakkaisissa prosesseissa, kukin omassa
+transaktiossaan: ensin tuotteet ja BOM, sitten tilaukset osastotiloineen,
+vaihearvoineen ja tehtävineen. Keskeytynyt ajo jättää valmiit osat
+tietokantaan, joten generointi kannattaa ajaa erilliseen kantaan.
+
+Tilauksen osastot käsitellään display_order-järjestyksessä, yksi osasto
+arkipäivää kohden ennen toimituspäivää. Osasto on valmis, jos sen päivä
+on ennen as_of-päivää; tehtävät luodaan vain valmiille osastoille.
+"""
+
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.db.base import get_engine
+from app.db.pool import DISABLE_STATEMENT_TIMEOUT
+
+PRODUCT_CHUNK = 50_000
+ORDER_CHUNK = 20_000
+
+# Satunnaislukuvirrat
+_EMPLOYEES, _PRODUCTS, _ORDERS = 0, 1, 2
+
+# Kategoria, tehokkuuskerroin ja osuus tuotteista
+CATEGORIES = (
+    ("A", 1.00, 0.16),
+    ("B", 1.10, 0.16),
+    ("C", 1.20, 0.14),
+    ("D", 1.30, 0.12),
+    ("E", 1.40, 0.10),
+    ("F", 1.50, 0.08),
+    ("G", 1.60, 0.06),
+    ("H", 1.70, 0.04),
+    ("AA", 0.90, 0.08),
+    ("AAA", 0.80, 0.06),
+)
+
+MATERIALS = 20_000
+UNITS = np.array(["kpl", "m", "kg", "m2"])
+
+FIRST_NAMES = np.array([
+    "Matti", "Maija", "Pekka", "Liisa", "Kalle", "Anna", "Juha", "Sanna",
+    "Mikko", "Tiina", "Jari", "Päivi", "Timo", "Heidi", "Antti", "Katja",
+])  # fmt: skip
+LAST_NAMES = np.array([
+    "Virtanen", "Korhonen", "Mäkinen", "Nieminen", "Mäkelä", "Hämäläinen",
+    "Laine", "Heikkinen", "Koskinen", "Järvinen", "Lehtonen", "Lehtinen",
+    "Saarinen", "Salminen", "Heinonen", "Niemi", "Kinnunen", "Salonen",
+])  # fmt: skip
+
+# Tilaukset toimitetaan enintään näin monta päivää as_of-päivän jälkeen
+OPEN_HORIZON_DAYS = 28
+
+NULL = "\\N"
+
+RESET_TABLES = """
+TRUNCATE weekly_plan_items, weekly_plans, efficiency_items, efficiency_summaries,
+    efficiency_dirty_days, production_tasks, order_phase_values,
+    order_department_status, production_orders, bom_items, products, employees
+    RESTART IDENTITY CASCADE
+"""
+
+_INSERT_CATEGORIES = """
+INSERT INTO product_categories (code, name, efficiency_multiplier)
+VALUES (%s, %s, %s)
+ON CONFLICT (code) DO NOTHING
+"""
+
+_SET_SEQUENCE = """
+SELECT setval(
+    pg_get_serial_sequence('{table}', 'id'),
+    GREATEST((SELECT MAX(id) FROM {table}), 1)
+)
+"""
+
+
+class GeneratorError(ValueError):
+    """Generointia ei voi aloittaa (esim. etuliite on jo käytössä)"""
+
+
+@dataclass(frozen=True)
+class GeneratorConfig:
+    """Generoitavat määrät; sama config ja siemen tuottavat saman datan"""
+
+    as_of: date
+    seed: int = 42
+    products: int = 200_000
+    employees: int = 500
+    orders: int = 1_000_000
+    years: float = 3.0
+    tasks_per_department: float = 1.5
+    prefix: str = "SYN"
+
+
+@dataclass
+class GeneratorResult:
+    rows: dict[str, int] = field(default_factory=dict)
+    duration_seconds: float = 0.0
+
+    def merge(self, rows: dict[str, int]) -> None:
+        for table, count in rows.items():
+            self.rows[table] = self.rows.get(table, 0) + count
+
+
+@dataclass
+class _Context:
+    """Prosesseille jaettu tila (asetetaan _init_worker:ssa)"""
+
+    config: GeneratorConfig
+    product_base: int = 0
+    order_base: int = 0
+    department_ids: Optional[np.ndarray] = None
+    # Osaston (indeksi department_ids:ssä) työvaiheet ja työntekijät
+    # yhdistettyinä taulukkoina: ryhmä i = values[start[i]:start[i] + count[i]]
+    phase_ids: Optional[np.ndarray] = None
+    phase_start: Optional[np.ndarray] = None
+    phase_count: Optional[np.ndarray] = None
+    staff_ids: Optional[np.ndarray] = None
+    staff_start: Optional[np.ndarray] = None
+    staff_count: Optional[np.ndarray] = None
+    product_ids: Optional[np.ndarray] = None
+    product_minutes: Optional[np.ndarray] = None
+
+
+_context: Optional[_Context] = None
+
+
+def _numbered(prefix: str, numbers: np.ndarray, width: int) -> np.ndarray:
+    return np.char.add(prefix, np.char.zfill(numbers.astype("U"), width))
+
+
+def _text(values: np.ndarray) -> list[str]:
+    return values.tolist() if values.dtype.kind == "U" else values.astype("U").tolist()
+
+
+def _copy(cursor, table: str, columns: dict[str, np.ndarray]) -> int:
+    """COPY sarakkeet tekstimuodossa; palauttaa rivimäärän"""
+    if not len(next(iter(columns.values()))):
+        return 0
+    rows = zip(*(_text(values) for values in columns.values()))
+    buffer = io.StringIO("\n".join(map("\t".join, rows)) + "\n")
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+    return len(next(iter(columns.values())))
+
+
+def _groups(keys: np.ndarray, values: np.ndarray, size: int):
+    """Ryhmittele values avaimen (0..size-1) mukaan yhdistetyksi taulukoksi"""
+    order = np.argsort(keys, kind="stable")
+    count = np.bincount(keys, minlength=size)
+    start = np.concatenate(([0], np.cumsum(count)[:-1]))
+    return values[order], start, count
+
+
+def _pick(rng, group: np.ndarray, values, start, count) -> np.ndarray:
+    """Satunnainen arvo kunkin rivin ryhmästä"""
+    offset = (rng.random(len(group)) * count[group]).astype(np.int64)
+    return values[start[group] + offset]
+
+
+def _timestamps(days: np.ndarray, seconds: np.ndarray) -> np.ndarray:
+    return (days.astype("M8[s]") + seconds.astype("m8[s]")).astype("U19")
+
+
+def _connection():
+    connection = get_engine().raw_connection()
+    with connection.cursor() as cursor:
+        # Kellonajat generoidaan tehtaan paikallisessa ajassa; asetus on
+        # voimassa transaktion loppuun, joten poolin yhteys ei muutu
+        cursor.execute("SELECT set_config('TimeZone', %s, true)", (settings.TIMEZONE,))
+        cursor.execute(DISABLE_STATEMENT_TIMEOUT)
+    return connection
+
+
+def _run_chunk(function, index: int) -> dict[str, int]:
+    connection = _connection()
+    try:
+        with connection.cursor() as cursor:
+            rows = function(cursor, _context, index)
+        connection.commit()
+        return rows
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+# ============================================================================
+# Tuotteet ja BOM
+# ============================================================================
+
+
+def _product_chunk(cursor, context: _Context, index: int) -> dict[str, int]:
+    config = context.config
+    rng = np.random.default_rng([config.seed, _PRODUCTS, index])
+    first = index * PRODUCT_CHUNK
+    numbers = np.arange(first, min(first + PRODUCT_CHUNK, config.products)) + 1
+    n = len(numbers)
+    ids = context.product_base + numbers
+
+    codes = np.array([code for code, _, _ in CATEGORIES])
+    shares = np.array([share for _, _, share in CATEGORIES])
+    minutes = np.clip(rng.lognormal(np.log(6.0), 0.7, n), 0.1, 240).round(2)
+    products = _copy(
+        cursor,
+        "products",
+        {
+            "id": ids,
+            "item_number": _numbered(f"{config.prefix}-P", numbers, 7),
+            "description": np.char.add("Synteettinen tuote ", numbers.astype("U")),
+            "category_code": codes[rng.choice(len(codes), n, p=shares / shares.sum())],
+            "standard_time_minutes": minutes,
+            "is_active": rng.random(n) > 0.03,
+        },
+    )
+
+    # 3-12 materiaalia; suosituimmat materiaalit toistuvat useimmin
+    lines = rng.integers(3, 13, n)
+    material = (MATERIALS * rng.random(lines.sum()) ** 2).astype(np.int64)
+    line_product = np.repeat(ids, lines)
+    code = _numbered(f"{config.prefix}-M", material, 5)
+    name = np.char.add("Materiaali ", material.astype("U"))
+    quantity = np.clip(rng.lognormal(0.0, 1.0, len(material)), 0.01, 9999).round(2)
+    unit = UNITS[material % len(UNITS)]
+
+    # Alikokoonpano aiemmasta tuotteesta, joten BOM ei voi olla syklinen
+    sub = (rng.random(n) < 0.05) & (numbers > 1)
+    parent = (rng.random(sub.sum()) * (numbers[sub] - 1)).astype(np.int64) + 1
+    bom_items = _copy(
+        cursor,
+        "bom_items",
+        {
+            "product_id": np.concatenate((line_product, ids[sub])),
+            "material_code": np.concatenate(
+                (code, _numbered(f"{config.prefix}-P", parent, 7))
+            ),
+            "material_name": np.concatenate((name, np.full(sub.sum(), NULL))),
+            "quantity": np.concatenate((quantity, rng.integers(1, 5, sub.sum()))),
+            "unit": np.concatenate((unit, np.full(sub.sum(), "kpl"))),
+        },
+    )
+    return {"products": products, "bom_items": bom_items}
+
+
+# ============================================================================
+# Tilaukset, osastotilat, vaihearvot ja tehtävät
+# ============================================================================
+
+
+def _order_chunk(cursor, context: _Context, index: int) -> dict[str, int]:
+    config = context.config
+    rng = np.random.default_rng([config.seed, _ORDERS, index])
+    first = index * ORDER_CHUNK
+    numbers = np.arange(first, min(first + ORDER_CHUNK, config.orders)) + 1
+    n, departments = len(numbers), len(context.department_ids)
+    ids = context.order_base + numbers
+
+    # Toimituspäivät arkipäiville tasaisesti koko jaksolle
+    as_of = np.datetime64(config.as_of, "D")
+    span_start = np.busday_offset(
+        as_of - np.timedelta64(int(config.years * 365), "D"), 0, roll="forward"
+    )
+    span = np.busday_count(span_start, as_of + np.timedelta64(OPEN_HORIZON_DAYS, "D"))
+    ship = np.busday_offset(span_start, rng.integers(0, span, n))
+    ship_days = ship.astype(date).tolist()
+    iso = [day.isocalendar() for day in ship_days]
+
+    product = rng.integers(0, len(context.product_ids), n)
+    quantity = np.clip(rng.lognormal(np.log(50), 1.0, n), 1, 5000).astype(np.int64)
+
+    # Osasto p käsittelee tilauksen arkipäivänä ship - (osastoja - p)
+    position = np.arange(departments)
+    day = np.busday_offset(ship[:, None], position - departments, roll="backward")
+    completed = day < as_of
+    in_progress = day == as_of
+    progress = completed.sum(axis=1)
+    current = context.department_ids[np.minimum(progress, departments - 1)]
+
+    orders = _copy(
+        cursor,
+        "production_orders",
+        {
+            "id": ids,
+            "order_number": _numbered(f"{config.prefix}-O", numbers, 8),
+            "reference_number": _numbered("REF-", numbers % 100_000, 5),
+            "product_id": context.product_ids[product],
+            "quantity": quantity,
+            "ship_date": ship,
+            "week_number": np.array([week for _, week, _ in iso]),
+            "year": np.array([year for year, _, _ in iso]),
+            "current_department_id": current,
+            "queue_position": numbers % 1000,
+        },
+    )
+
+    # Tehtävät valmiille osastoille: vähintään yksi, keskimäärin
+    # tasks_per_department, kesto tuotteen standardiajan mukaan
+    group = np.flatnonzero(completed.ravel())
+    group_order, group_position = np.divmod(group, departments)
+    tasks = 1 + rng.poisson(max(config.tasks_per_department - 1, 0), len(group))
+    task_order = np.repeat(group_order, tasks)
+    task_position = np.repeat(group_position, tasks)
+    expected = (
+        quantity[task_order]
+        * context.product_minutes[product[task_order]]
+        / departments
+        / np.repeat(tasks, tasks)
+    )
+    duration = np.clip(rng.gamma(3.0, np.maximum(expected, 1) / 3), 2, 600) * 60
+    start_seconds = 6 * 3600 + rng.integers(0, 8 * 3600, len(task_order))
+    task_day = day[task_order, task_position]
+    end_seconds = start_seconds + duration.astype(np.int64)
+    employee = _pick(
+        rng, task_position, context.staff_ids, context.staff_start, context.staff_count
+    )
+    phase = _pick(
+        rng, task_position, context.phase_ids, context.phase_start, context.phase_count
+    )
+    # UUID4: satunnaiset tavut, versio- ja varianttibitit paikoilleen
+    raw = rng.bytes(16 * len(task_order))
+    uuid_bytes = np.frombuffer(raw, np.uint8).reshape(-1, 16).copy()
+    uuid_bytes[:, 6] = uuid_bytes[:, 6] & 0x0F | 0x40
+    uuid_bytes[:, 8] = uuid_bytes[:, 8] & 0x3F | 0x80
+    uuid_hex = np.frombuffer(uuid_bytes.tobytes().hex().encode(), "S32")
+    production_tasks = _copy(
+        cursor,
+        "production_tasks",
+        {
+            "task_uuid": uuid_hex.astype("U32"),
+            "production_order_id": ids[task_order],
+            "employee_id": employee,
+            "department_id": context.department_ids[task_position],
+            "work_phase_id": phase,
+            "started_at": _timestamps(task_day, start_seconds),
+            "ended_at": _timestamps(task_day, end_seconds),
+            "quantity_completed": (
+                quantity[task_order] / np.repeat(tasks, tasks)
+            ).round(2),
+        },
+    )
+
+    # Osastotila jokaiselle osastolle; aikaleimat tehtävistä
+    group_first = np.concatenate(([0], np.cumsum(tasks)[:-1]))
+    started = np.full(n * departments, NULL, dtype="U19")
+    finished = np.full(n * departments, NULL, dtype="U19")
+    if len(group):
+        started[group] = _timestamps(
+            day.ravel()[group], np.minimum.reduceat(start_seconds, group_first)
+        )
+        finished[group] = _timestamps(
+            day.ravel()[group],
+            np.maximum.reduceat(end_seconds, group_first),
+        )
+    active = np.flatnonzero(in_progress.ravel())
+    started[active] = _timestamps(day.ravel()[active], np.full(len(active), 6 * 3600))
+    status = np.where(
+        completed, "COMPLETED", np.where(in_progress, "IN_PROGRESS", "NOT_STARTED")
+    )
+    quantity_done = np.where(
+        completed, quantity[:, None], np.where(in_progress, quantity[:, None] // 2, 0)
+    )
+    statuses = _copy(
+        cursor,
+        "order_department_status",
+        {
+            "production_order_id": np.repeat(ids, departments),
+            "department_id": np.tile(context.department_ids, n),
+            "status": status.ravel(),
+            "quantity_completed": quantity_done.ravel(),
+            "started_at": started,
+            "completed_at": finished,
+        },
+    )
+
+    # Kaksi eri työvaihetta satunnaiselta osastolta (uq_order_phase)
+    phase_department = rng.integers(0, departments, n)
+    count = context.phase_count[phase_department]
+    first_phase = (rng.random(n) * count).astype(np.int64)
+    second = count > 1
+    second_phase = (
+        first_phase[second]
+        + 1
+        + (rng.random(second.sum()) * (count[second] - 1)).astype(np.int64)
+    ) % count[second]
+    start = context.phase_start[phase_department]
+    phase_values = _copy(
+        cursor,
+        "order_phase_values",
+        {
+            "production_order_id": np.concatenate((ids, ids[second])),
+            "work_phase_id": np.concatenate(
+                (
+                    context.phase_ids[start + first_phase],
+                    context.phase_ids[start[second] + second_phase],
+                )
+            ),
+            "value": rng.integers(1, 100, n + second.sum()),
+        },
+    )
+
+    return {
+        "production_orders": orders,
+        "order_department_status": statuses,
+        "order_phase_values": phase_values,
+        "production_tasks": production_tasks,
+    }
+
+
+# ============================================================================
+# Ajo
+# ============================================================================
+
+
+def _init_worker(context: _Context) -> None:
+    global _context
+    # Forkattu prosessi ei saa käyttää vanhemman yhteyspoolin yhteyksiä
+    get_engine().dispose(close=False)
+    _context = context
+
+
+def _run_chunks(function, chunks: int, context: _Context, workers: int):
+    global _context
+    if workers > 1 and chunks > 1:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(context,)
+        ) as executor:
+            yield from executor.map(_run_chunk, [function] * chunks, range(chunks))
+    else:
+        _context = context
+        for index in range(chunks):
+            yield _run_chunk(function, index)
+
+
+def _prepare(cursor, config: GeneratorConfig) -> _Context:
+    """Kategoriat, työntekijät ja id-lähtöpisteet (yksi transaktio)"""
+    cursor.execute(
+        "SELECT EXISTS (SELECT 1 FROM products WHERE item_number LIKE %s) "
+        "OR EXISTS (SELECT 1 FROM employees WHERE employee_number LIKE %s)",
+        (f"{config.prefix}-P%", f"{config.prefix}-E%"),
+    )
+    if cursor.fetchone()[0]:
+        raise GeneratorError(
+            f"Etuliite {config.prefix} on jo käytössä: tyhjennä taulut tai vaihda "
+            "etuliitettä"
+        )
+
+    cursor.executemany(
+        _INSERT_CATEGORIES,
+        [(code, f"Kategoria {code}", multiplier) for code, multiplier, _ in CATEGORIES],
+    )
+    cursor.execute(
+        "SELECT id FROM departments WHERE is_active ORDER BY display_order, id"
+    )
+    department_ids = np.array([row[0] for row in cursor.fetchall()], dtype=np.int64)
+    if not len(department_ids):
+        raise GeneratorError("Aktiivisia osastoja ei ole")
+    position = {dept_id: i for i, dept_id in enumerate(department_ids.tolist())}
+
+    cursor.execute("SELECT department_id, id FROM work_phases ORDER BY id")
+    phases = [
+        (position[dept_id], phase_id)
+        for dept_id, phase_id in cursor.fetchall()
+        if dept_id in position
+    ]
+    phase_keys = np.array([key for key, _ in phases], dtype=np.int64)
+    phase_ids, phase_start, phase_count = _groups(
+        phase_keys, np.array([v for _, v in phases], dtype=np.int64), len(position)
+    )
+    if (phase_count == 0).any():
+        raise GeneratorError("Jokaisella aktiivisella osastolla pitää olla työvaihe")
+
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM employees")
+    employee_base = cursor.fetchone()[0]
+    rng = np.random.default_rng([config.seed, _EMPLOYEES])
+    numbers = np.arange(1, config.employees + 1)
+    hired = np.datetime64(config.as_of, "D") - rng.integers(0, 3650, config.employees)
+    _copy(
+        cursor,
+        "employees",
+        {
+            "id": employee_base + numbers,
+            "employee_number": _numbered(f"{config.prefix}-E", numbers, 5),
+            "first_name": FIRST_NAMES[rng.integers(0, len(FIRST_NAMES), len(numbers))],
+            "last_name": LAST_NAMES[rng.integers(0, len(LAST_NAMES), len(numbers))],
+            "primary_department_id": department_ids[
+                rng.integers(0, len(department_ids), len(numbers))
+            ],
+            "hire_date": hired,
+            "is_active": np.full(len(numbers), True),
+        },
+    )
+
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM products")
+    product_base = cursor.fetchone()[0]
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM production_orders")
+    order_base = cursor.fetchone()[0]
+    return _Context(
+        config=config,
+        product_base=product_base,
+        order_base=order_base,
+        department_ids=department_ids,
+        phase_ids=phase_ids,
+        phase_start=phase_start,
+        phase_count=phase_count,
+    )
+
+
+def _load_references(cursor, context: _Context) -> None:
+    """Tilausten viittaamat tuotteet ja osastojen työntekijät"""
+    cursor.execute(
+        "SELECT id, COALESCE(standard_time_minutes, 0) FROM products ORDER BY id"
+    )
+    products = np.array(cursor.fetchall(), dtype=np.float64).reshape(-1, 2)
+    if not len(products):
+        raise GeneratorError("Tuotteita ei ole")
+    context.product_ids = products[:, 0].astype(np.int64)
+    context.product_minutes = products[:, 1]
+
+    position = {dept_id: i for i, dept_id in enumerate(context.department_ids.tolist())}
+    cursor.execute(
+        "SELECT id, primary_department_id FROM employees WHERE is_active ORDER BY id"
+    )
+    employees = cursor.fetchall()
+    if not employees:
+        raise GeneratorError("Aktiivisia työntekijöitä ei ole")
+    # Osasto ilman omaa henkilöstöä lainaa kaikista työntekijöistä
+    keys, values = [], []
+    for dept_id, i in position.items():
+        staff = [e for e, d in employees if d == dept_id] or [e for e, _ in employees]
+        keys += [i] * len(staff)
+        values += staff
+    context.staff_ids, context.staff_start, context.staff_count = _groups(
+        np.array(keys, dtype=np.int64), np.array(values, dtype=np.int64), len(position)
+    )
+
+
+def generate(config: GeneratorConfig, *, workers: int = 1) -> GeneratorResult:
+    """Generoi ja kirjoita koko data; sama config tuottaa saman datan"""
+    started = time.perf_counter()
+    result = GeneratorResult()
+
+    connection = _connection()
+    try:
+        with connection.cursor() as cursor:
+            context = _prepare(cursor, config)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    result.merge({"employees": config.employees})
+
+    chunks = -(-config.products // PRODUCT_CHUNK)
+    for rows in _run_chunks(_product_chunk, chunks, context, workers):
+        result.merge(rows)
+
+    connection = _connection()
+    try:
+        with connection.cursor() as cursor:
+            _load_references(cursor, context)
+    finally:
+        connection.close()
+
+    chunks = -(-config.orders // ORDER_CHUNK)
+    for rows in _run_chunks(_order_chunk, chunks, context, workers):
+        result.merge(rows)
+
+    connection = _connection()
+    try:
+        # Itse annetut id:t: sekvenssit maksimin perään
+        with connection.cursor() as cursor:
+            for table in ("products", "employees", "production_orders"):
+                cursor.execute(_SET_SEQUENCE.format(table=table))
+            for table in result.rows:
+                cursor.execute(f"ANALYZE {table}")
+        connection.commit()
+    finally:
+        connection.close()
+
+    result.duration_seconds = time.perf_counter() - started
+    return result
+
+
+def reset_tables() -> None:
+    """Tyhjennä tuotteet, tilaukset, tehtävät ja niistä johdetut taulut"""
+    connection = _connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(RESET_TABLES)
+        connection.commit()
+    finally:
+        connection.close()
+
@@ -0,0 +1,359 @@
+"""
+Historiallisten tehokkuusyhteenvetojen massalaskenta (backfill)
+
+Tehtävät luetaan server-side cursorilla sarakkeittaisina chunkkeina,
+metriikat lasketaan NumPy-operaatioina (app.services.efficiency_kernels)
+ja DAILY-rivit sekä itemit kirjoitetaan COPY:lla väliaikaistauluihin,
+joista ne upsertataan partial unique -indeksejä vasten. WEEKLY ja
+MONTHLY johdetaan lopuksi DAILY-riveistä kuten inkrementaalisessa rollupissa.
+"""
+
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Iterable, Optional
+
+import numpy as np
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.base import SessionLocal, get_engine
+from app.db.pool import DISABLE_STATEMENT_TIMEOUT
+from app.services.efficiency_kernels import (
+    DailyAccumulator,
+    TaskColumns,
+    efficiency,
+)
+from app.services.efficiency_rollup import DEFAULT_HOURS_PER_DAY, recompute_periods
+from app.services.efficiency_series import series_cache
+from app.services.efficiency_whatif import history_cache
+from app.services.productivity import productivity_cache
+
+EPOCH = date(1970, 1, 1)
+
+DEFAULT_CHUNK_SIZE = 200_000
+
+_TASK_DTYPE = np.dtype(
+    [
+        ("department_id", np.int64),
+        ("day", np.int64),
+        ("employee_id", np.int64),
+        ("production_order_id", np.int64),
+        ("duration_minutes", np.float64),
+        ("quantity_completed", np.float64),
+        ("standard_time_minutes", np.float64),
+        ("efficiency_multiplier", np.float64),
+    ]
+)
+
+_SELECT_TASKS = """
+SELECT
+    t.department_id,
+    (t.ended_at AT TIME ZONE %(tz)s)::date - DATE '1970-01-01',
+    COALESCE(t.employee_id, -1),
+    t.production_order_id,
+    COALESCE(t.duration_minutes, 0)::float8,
+    COALESCE(t.quantity_completed, 0)::float8,
+    COALESCE(pr.standard_time_minutes, 0)::float8,
+    COALESCE(c.efficiency_multiplier, 1)::float8
+FROM production_tasks t
+JOIN production_orders o ON o.id = t.production_order_id
+LEFT JOIN products pr ON pr.id = o.product_id
+LEFT JOIN product_categories c ON c.code = pr.category_code
+WHERE t.ended_at IS NOT NULL
+    AND t.department_id IS NOT NULL
+    AND t.ended_at >= make_timestamptz(%(start_year)s, 1, 1, 0, 0, 0, %(tz)s)
+    AND t.ended_at < make_timestamptz(%(stop_year)s, 1, 1, 0, 0, 0, %(tz)s)
+    AND (%(department_id)s::int IS NULL OR t.department_id = %(department_id)s)
+"""
+
+_CREATE_STAGING = """
+CREATE TEMP TABLE backfill_daily (
+    department_id integer,
+    day integer,
+    num_workers integer,
+    actual_hours numeric,
+    std_hours numeric,
+    target_hours numeric,
+    efficiency_actual numeric,
+    efficiency_target numeric
+) ON COMMIT DROP;
+CREATE TEMP TABLE backfill_items (
+    department_id integer,
+    day integer,
+    production_order_id integer,
+    quantity_completed numeric,
+    std_minutes numeric,
+    target_minutes numeric
+) ON COMMIT DROP;
+"""
+
+# Rajaus: vuodet [start_year, stop_year) ja valinnainen osasto
+_SCOPE = """
+    s.period_type = 'DAILY'
+    AND s.date >= make_date(%(start_year)s, 1, 1)
+    AND s.date < make_date(%(stop_year)s, 1, 1)
+    AND (%(department_id)s::int IS NULL OR s.department_id = %(department_id)s)
+"""
+
+_DELETE_STALE_DAILY = f"""
+DELETE FROM efficiency_summaries s
+WHERE {_SCOPE}
+    AND NOT EXISTS (
+        SELECT 1 FROM backfill_daily b
+        WHERE b.department_id = s.department_id
+            AND DATE '1970-01-01' + b.day = s.date
+    )
+RETURNING s.department_id, s.date
+"""
+
+_UPSERT_DAILY = """
+INSERT INTO efficiency_summaries (
+    period_type, department_id, date, week_number, month, year,
+    planned_work_hours, actual_work_hours, total_std_time, total_target_time,
+    efficiency_actual, efficiency_target, num_workers, num_work_days
+)
+SELECT
+    'DAILY',
+    b.department_id,
+    d.day,
+    EXTRACT(WEEK FROM d.day)::int,
+    EXTRACT(MONTH FROM d.day)::int,
+    -- ISO-viikon vuosi, jotta (year, week_number) vastaa WEEKLY-riviä
+    EXTRACT(ISOYEAR FROM d.day)::int,
+    ROUND(b.num_workers * COALESCE(wp.hours_per_day, %(default_hours)s), 2),
+    ROUND(b.actual_hours, 2),
+    ROUND(b.std_hours, 2),
+    ROUND(b.target_hours, 2),
+    b.efficiency_actual,
+    b.efficiency_target,
+    b.num_workers,
+    1
+FROM backfill_daily b
+CROSS JOIN LATERAL (SELECT DATE '1970-01-01' + b.day AS day) d
+LEFT JOIN weekly_plans wp
+    ON wp.year = EXTRACT(ISOYEAR FROM d.day)
+    AND wp.week_number = EXTRACT(WEEK FROM d.day)
+ON CONFLICT (period_type, department_id, date, year) WHERE period_type = 'DAILY'
+DO UPDATE SET
+    week_number = EXCLUDED.week_number,
+    month = EXCLUDED.month,
+    planned_work_hours = EXCLUDED.planned_work_hours,
+    actual_work_hours = EXCLUDED.actual_work_hours,
+    total_std_time = EXCLUDED.total_std_time,
+    total_target_time = EXCLUDED.total_target_time,
+    efficiency_actual = EXCLUDED.efficiency_actual,
+    efficiency_target = EXCLUDED.efficiency_target,
+    num_workers = EXCLUDED.num_workers,
+    num_work_days = EXCLUDED.num_work_days,
+    updated_at = now()
+"""
+
+_DELETE_ITEMS = f"""
+DELETE FROM efficiency_items i
+USING efficiency_summaries s
+WHERE i.efficiency_summary_id = s.id AND {_SCOPE}
+"""
+
+_INSERT_ITEMS = """
+INSERT INTO efficiency_items (
+    efficiency_summary_id, production_order_id, quantity_completed,
+    quantity_target, standard_time_minutes, actual_std_time, target_std_time,
+    status
+)
+SELECT
+    s.id,
+    b.production_order_id,
+    ROUND(b.quantity_completed)::int,
+    o.quantity,
+    pr.standard_time_minutes,
+    ROUND(b.std_minutes, 2),
+    ROUND(b.target_minutes, 2),
+    ods.status::text
+FROM backfill_items b
+JOIN efficiency_summaries s
+    ON s.period_type = 'DAILY'
+    AND s.department_id = b.department_id
+    AND s.date = DATE '1970-01-01' + b.day
+JOIN production_orders o ON o.id = b.production_order_id
+LEFT JOIN products pr ON pr.id = o.product_id
+LEFT JOIN order_department_status ods
+    ON ods.production_order_id = b.production_order_id
+    AND ods.department_id = b.department_id
+"""
+
+
+@dataclass(frozen=True)
+class Partition:
+    """Backfill-osa: vuosiväli ja valinnainen osasto"""
+
+    start_year: int
+    stop_year: int
+    department_id: Optional[int] = None
+
+    def params(self) -> dict:
+        return {
+            "tz": settings.TIMEZONE,
+            "start_year": self.start_year,
+            "stop_year": self.stop_year,
+            "department_id": self.department_id,
+            "default_hours": DEFAULT_HOURS_PER_DAY,
+        }
+
+
+@dataclass
+class BackfillResult:
+    tasks: int = 0
+    daily_rows: int = 0
+    item_rows: int = 0
+    weeks: int = 0
+    months: int = 0
+    duration_seconds: float = 0.0
+    department_days: set[tuple[int, date]] = field(default_factory=set)
+
+    def merge(self, other: "BackfillResult") -> None:
+        self.tasks += other.tasks
+        self.daily_rows += other.daily_rows
+        self.item_rows += other.item_rows
+        self.department_days |= other.department_days
+
+
+def _copy(cursor, table: str, arrays: list[np.ndarray], fmt: list[str]) -> None:
+    """COPY sarakkeet väliaikaistauluun (NaN -> NULL)"""
+    buffer = io.StringIO()
+    np.savetxt(buffer, np.column_stack(arrays), fmt=fmt, delimiter="\t")
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} FROM STDIN WITH (NULL 'nan')", buffer)
+
+
+def backfill_partition(
+    partition: Partition, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> BackfillResult:
+    """Laske ja kirjoita yhden osan DAILY-yhteenvedot ja itemit"""
+    result = BackfillResult()
+    params = partition.params()
+    accumulator = DailyAccumulator()
+
+    connection = get_engine().raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(DISABLE_STATEMENT_TIMEOUT)
+
+        # Server-side cursor: rivit haetaan chunk kerrallaan
+        with connection.cursor(name="efficiency_backfill") as cursor:
+            cursor.itersize = chunk_size
+            cursor.execute(_SELECT_TASKS, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                columns = np.array(rows, dtype=_TASK_DTYPE)
+                accumulator.add(
+                    TaskColumns(
+                        **{name: columns[name] for name in _TASK_DTYPE.names}
+                    )
+                )
+
+        daily = accumulator.daily()
+        items = accumulator.items()
+
+        with connection.cursor() as cursor:
+            cursor.execute(_CREATE_STAGING)
+            _copy(
+                cursor,
+                "backfill_daily",
+                [
+                    daily.department_id,
+                    daily.day,
+                    daily.num_workers,
+                    daily.actual_hours,
+                    daily.std_hours,
+                    daily.target_hours,
+                    efficiency(daily.std_hours, daily.actual_hours),
+                    efficiency(daily.target_hours, daily.actual_hours),
+                ],
+                ["%d", "%d", "%d", "%.4f", "%.4f", "%.4f", "%.2f", "%.2f"],
+            )
+            _copy(
+                cursor,
+                "backfill_items",
+                [
+                    items.department_id,
+                    items.day,
+                    items.production_order_id,
+                    items.quantity_completed,
+                    items.std_minutes,
+                    items.target_minutes,
+                ],
+                ["%d", "%d", "%d", "%.4f", "%.4f", "%.4f"],
+            )
+            cursor.execute(_DELETE_STALE_DAILY, params)
+            # Poistettujen päivien viikot ja kuukaudet lasketaan myös
+            # uudelleen (tai poistetaan, jos niillä ei ole enää päiviä)
+            deleted_days = set(cursor.fetchall())
+            cursor.execute(_UPSERT_DAILY, params)
+            cursor.execute(_DELETE_ITEMS, params)
+            cursor.execute(_INSERT_ITEMS, params)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+    result.tasks = accumulator.rows
+    result.daily_rows = len(daily.day)
+    result.item_rows = len(items.day)
+    result.department_days = deleted_days | {
+        (int(dept_id), EPOCH + timedelta(days=int(day)))
+        for dept_id, day in zip(daily.department_id, daily.day)
+    }
+    return result
+
+
+def _init_worker() -> None:
+    # Forkattu prosessi ei saa käyttää vanhemman yhteyspoolin yhteyksiä
+    get_engine().dispose(close=False)
+
+
+def run_backfill(
+    partitions: Iterable[Partition],
+    *,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> BackfillResult:
+    """
+    Aja backfill osittain (valinnaisesti rinnakkain prosesseissa) ja johda
+    lopuksi WEEKLY- ja MONTHLY-rivit kaikista lasketuista päivistä.
+    """
+    started = time.perf_counter()
+    partitions = list(partitions)
+    result = BackfillResult()
+
+    if workers > 1 and len(partitions) > 1:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker
+        ) as executor:
+            for partial in executor.map(
+                backfill_partition, partitions, [chunk_size] * len(partitions)
+            ):
+                result.merge(partial)
+    else:
+        for partition in partitions:
+            result.merge(backfill_partition(partition, chunk_size))
+
+    db = SessionLocal()
+    try:
+        db.execute(text(DISABLE_STATEMENT_TIMEOUT))
+        result.weeks, result.months = recompute_periods(db, result.department_days)
+        db.commit()
+    finally:
+        db.close()
+    series_cache.invalidate()
+    history_cache.invalidate()
+    productivity_cache.invalidate()
+
+    result.duration_seconds = time.perf_counter() - started
+    return result
@@ -0,0 +1,228 @@
+"""
+NumPy-laskenta tehokkuusmetriikoille (backfill ja what-if -simulointi)
+
+Kaavat ovat samat kuin app.services.efficiency_rollup -moduulissa, mutta
+ne lasketaan sarakkeittaisille taulukoille ORM-olioiden sijaan.
+Päivät ovat kokonaislukuja (päiviä 1970-01-01 jälkeen).
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+# Efficiency-sarakkeet ovat DECIMAL(5, 2)
+MAX_EFFICIENCY = 999.99
+
+# Avainten pakkaus int64:ksi: osasto < 2^10, päivä < 2^17, tilaus < 2^36
+_DEPARTMENT_BITS = 10
+_DAY_BITS = 17
+_ORDER_BITS = 36
+_EMPLOYEE_BITS = 21
+
+# Osasummat yhdistetään kun chunkkeja on kertynyt näin monta
+_COMPACT_EVERY = 16
+
+
+@dataclass
+class TaskColumns:
+    """Yksi chunk tehtäviä sarakkeittain"""
+
+    department_id: np.ndarray  # int64
+    day: np.ndarray  # int64
+    employee_id: np.ndarray  # int64, -1 = ei työntekijää
+    production_order_id: np.ndarray  # int64
+    duration_minutes: np.ndarray  # float64
+    quantity_completed: np.ndarray  # float64
+    standard_time_minutes: np.ndarray  # float64
+    efficiency_multiplier: np.ndarray  # float64
+
+    def __len__(self) -> int:
+        return len(self.department_id)
+
+
+@dataclass
+class DailyArrays:
+    """(osasto, päivä) -tason summat"""
+
+    department_id: np.ndarray
+    day: np.ndarray
+    num_workers: np.ndarray
+    actual_hours: np.ndarray
+    std_hours: np.ndarray
+    target_hours: np.ndarray
+
+
+@dataclass
+class ItemArrays:
+    """(osasto, päivä, tilaus) -tason summat"""
+
+    department_id: np.ndarray
+    day: np.ndarray
+    production_order_id: np.ndarray
+    quantity_completed: np.ndarray
+    std_minutes: np.ndarray
+    target_minutes: np.ndarray
+
+
+def task_std_minutes(
+    quantity: np.ndarray, standard_time: np.ndarray, multiplier: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """actual_std_time = määrä * standardiaika, target_std_time = actual * kerroin"""
+    std = quantity * standard_time
+    return std, std * multiplier
+
+
+def efficiency(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Tehokkuus-% (NaN kun nimittäjä on 0), rajattu sarakkeen maksimiin"""
+    out = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return np.minimum(np.round(out * 100, 2), MAX_EFFICIENCY)
+
+
+def to_optional_list(values: np.ndarray) -> list:
+    """Taulukko JSON-listaksi (NaN -> None, 2 desimaalia)"""
+    return [None if math.isnan(v) else round(v, 2) for v in values.tolist()]
+
+
+def _check_bits(name: str, values: np.ndarray, bits: int) -> None:
+    """Liian suuret arvot menisivät pakatussa avaimessa päällekkäin"""
+    if len(values) and (values.min() < 0 or values.max() >= 1 << bits):
+        raise ValueError(
+            f"{name} ei mahdu pakattuun avaimeen "
+            f"(arvot {values.min()}..{values.max()}, sallittu 0..{(1 << bits) - 1})"
+        )
+
+
+def _day_key(department_id: np.ndarray, day: np.ndarray) -> np.ndarray:
+    _check_bits("department_id", department_id, _DEPARTMENT_BITS)
+    _check_bits("day", day, _DAY_BITS)
+    return (department_id << _DAY_BITS) | day
+
+
+def _unpack_day_key(key: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    return key >> _DAY_BITS, key & ((1 << _DAY_BITS) - 1)
+
+
+def _unique(values: np.ndarray) -> np.ndarray:
+    """Järjestetyt uniikit arvot (lajittelu on nopeampi kuin hash-pohjainen unique)"""
+    ordered = np.sort(values)
+    keep = np.empty(len(ordered), dtype=bool)
+    keep[:1] = True
+    np.not_equal(ordered[1:], ordered[:-1], out=keep[1:])
+    return ordered[keep]
+
+
+def _grouped_sums(
+    key: np.ndarray, *values: np.ndarray
+) -> tuple[np.ndarray, list[np.ndarray]]:
+    """Summat avaimittain; palauttaa järjestetyt uniikit avaimet ja summat"""
+    if not len(key):
+        return key, [np.empty(0) for _ in values]
+
+    low, high = int(key.min()), int(key.max())
+    if high - low <= 4 * len(key):
+        # Tiheä avainväli (esim. osasto x päivä): O(n) bincount ilman lajittelua
+        offset = key - low
+        present = np.flatnonzero(np.bincount(offset))
+        return present + low, [np.bincount(offset, weights=v)[present] for v in values]
+
+    unique, inverse = np.unique(key, return_inverse=True)
+    return unique, [
+        np.bincount(inverse, weights=v, minlength=len(unique)) for v in values
+    ]
+
+
+class DailyAccumulator:
+    """
+    Kerää tehtävächunkeista osasummat ja yhdistää ne lopuksi.
+    Muistinkäyttö riippuu ryhmien (päivät, tilaukset) määrästä, ei riveistä.
+    """
+
+    def __init__(self) -> None:
+        self._daily: list[tuple[np.ndarray, list[np.ndarray]]] = []
+        self._workers: list[np.ndarray] = []
+        self._items: list[tuple[np.ndarray, list[np.ndarray]]] = []
+        self.rows = 0
+
+    def add(self, tasks: TaskColumns) -> None:
+        if not len(tasks):
+            return
+        self.rows += len(tasks)
+
+        std, target = task_std_minutes(
+            tasks.quantity_completed,
+            tasks.standard_time_minutes,
+            tasks.efficiency_multiplier,
+        )
+        day_key = _day_key(tasks.department_id, tasks.day)
+
+        self._daily.append(
+            _grouped_sums(day_key, tasks.duration_minutes, std, target)
+        )
+
+        has_employee = tasks.employee_id >= 0
+        employee_id = tasks.employee_id[has_employee]
+        _check_bits("employee_id", employee_id, _EMPLOYEE_BITS)
+        self._workers.append(
+            _unique((day_key[has_employee] << _EMPLOYEE_BITS) | employee_id)
+        )
+
+        _check_bits("production_order_id", tasks.production_order_id, _ORDER_BITS)
+        item_key = (day_key << _ORDER_BITS) | tasks.production_order_id
+        self._items.append(
+            _grouped_sums(item_key, tasks.quantity_completed, std, target)
+        )
+
+        if len(self._items) >= _COMPACT_EVERY:
+            self._daily = [self._merge(self._daily, 3)]
+            self._items = [self._merge(self._items, 3)]
+            self._workers = [_unique(np.concatenate(self._workers))]
+
+    def daily(self) -> DailyArrays:
+        """Yhdistä (osasto, päivä) -summat"""
+        keys, (duration, std, target) = self._merge(self._daily, 3)
+
+        worker_keys = (
+            _unique(np.concatenate(self._workers))
+            if self._workers
+            else np.empty(0, np.int64)
+        )
+        # Avaimet ovat järjestyksessä, joten saman päivän työntekijät ovat peräkkäin
+        worker_day = worker_keys >> _EMPLOYEE_BITS
+        num_workers = np.searchsorted(worker_day, keys, side="right") - np.searchsorted(
+            worker_day, keys, side="left"
+        )
+
+        department_id, day = _unpack_day_key(keys)
+        return DailyArrays(
+            department_id=department_id,
+            day=day,
+            num_workers=num_workers,
+            actual_hours=duration / 60,
+            std_hours=std / 60,
+            target_hours=target / 60,
+        )
+
+    def items(self) -> ItemArrays:
+        """Yhdistä (osasto, päivä, tilaus) -summat"""
+        keys, (quantity, std, target) = self._merge(self._items, 3)
+        department_id, day = _unpack_day_key(keys >> _ORDER_BITS)
+        return ItemArrays(
+            department_id=department_id,
+            day=day,
+            production_order_id=keys & ((1 << _ORDER_BITS) - 1),
+            quantity_completed=quantity,
+            std_minutes=std,
+            target_minutes=target,
+        )
+
+    @staticmethod
+    def _merge(
+        partials: list[tuple[np.ndarray, list[np.ndarray]]], width: int
+    ) -> tuple[np.ndarray, list[np.ndarray]]:
+        if not partials:
+            return np.empty(0, np.int64), [np.empty(0) for _ in range(width)]
+        keys = np.concatenate([p[0] for p in partials])
+        values = [np.concatenate([p[1][i] for p in partials]) for i in range(width)]
+        return _grouped_sums(keys, *values)
@@ -0,0 +1,514 @@
+"""
+Tehokkuusyhteenvetojen inkrementaalinen laskenta (DAILY -> WEEKLY/MONTHLY)
+
+Laskentakaavat (tehtävä kohdistetaan päivälle ended_at-ajan mukaan):
+    actual_std_time = quantity_completed * standard_time_minutes
+    target_std_time = actual_std_time * efficiency_multiplier
+    total_std_time / total_target_time = summa (tunteina)
+    actual_work_hours = tehtävien kesto (tunteina)
+    planned_work_hours = työntekijät * viikkosuunnitelman hours_per_day
+    efficiency_actual = total_std_time / actual_work_hours * 100
+    efficiency_target = total_target_time / actual_work_hours * 100
+
+Task-kirjoitukset merkitsevät (osasto, päivä) -parin likaiseksi samassa
+transaktiossa (efficiency_dirty_days). Rollup laskee vain likaiset päivät
+ja johtaa WEEKLY- ja MONTHLY-rivit DAILY-riveistä, ei raakatehtävistä.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import track_job
+from app.db.base import SessionLocal
+from app.db.pool import DISABLE_STATEMENT_TIMEOUT
+from app.models.efficiency import EfficiencyDirtyDay
+from app.services.efficiency_series import series_cache
+from app.services.efficiency_whatif import history_cache
+from app.services.productivity import productivity_cache
+
+logger = logging.getLogger(__name__)
+
+# WeeklyPlan.hours_per_day oletus, jos viikolle ei ole suunnitelmaa
+DEFAULT_HOURS_PER_DAY = 7.5
+
+# Montako likaista päivää käsitellään yhdellä kyselyllä
+CLAIM_BATCH_SIZE = 500
+
+# Efficiency-sarakkeet ovat DECIMAL(5, 2)
+MAX_EFFICIENCY = 999.99
+
+
+def _efficiency(numerator: str, denominator: str) -> str:
+    return (
+        f"CASE WHEN {denominator} > 0 THEN "
+        f"LEAST(ROUND({numerator} / {denominator} * 100, 2), {MAX_EFFICIENCY}) END"
+    )
+
+
+# Likaisten parien tehtävät; päivän rajat lasketaan paikallisessa aikavyöhykkeessä
+_TASKS_CTE = """
+pairs AS (
+    SELECT * FROM unnest(
+        CAST(:department_ids AS integer[]), CAST(:days AS date[])
+    ) AS p(department_id, day)
+),
+tasks AS (
+    SELECT
+        p.department_id,
+        p.day,
+        t.employee_id,
+        t.production_order_id,
+        o.quantity AS order_quantity,
+        pr.standard_time_minutes,
+        COALESCE(t.duration_minutes, 0) AS duration_minutes,
+        COALESCE(t.quantity_completed, 0) AS quantity_completed,
+        COALESCE(t.quantity_completed, 0)
+            * COALESCE(pr.standard_time_minutes, 0) AS std_minutes,
+        COALESCE(t.quantity_completed, 0)
+            * COALESCE(pr.standard_time_minutes, 0)
+            * COALESCE(c.efficiency_multiplier, 1) AS target_minutes
+    FROM pairs p
+    JOIN production_tasks t
+        ON t.department_id = p.department_id
+        AND t.ended_at >= (p.day::timestamp AT TIME ZONE :tz)
+        AND t.ended_at < ((p.day + 1)::timestamp AT TIME ZONE :tz)
+    JOIN production_orders o ON o.id = t.production_order_id
+    LEFT JOIN products pr ON pr.id = o.product_id
+    LEFT JOIN product_categories c ON c.code = pr.category_code
+)
+"""
+
+_UPSERT_DAILY = f"""
+WITH {_TASKS_CTE},
+daily AS (
+    SELECT
+        department_id,
+        day,
+        COUNT(DISTINCT employee_id) AS num_workers,
+        SUM(duration_minutes) / 60.0 AS actual_hours,
+        SUM(std_minutes) / 60.0 AS std_hours,
+        SUM(target_minutes) / 60.0 AS target_hours
+    FROM tasks
+    GROUP BY department_id, day
+)
+INSERT INTO efficiency_summaries (
+    period_type, department_id, date, week_number, month, year,
+    planned_work_hours, actual_work_hours, total_std_time, total_target_time,
+    efficiency_actual, efficiency_target, num_workers, num_work_days
+)
+SELECT
+    'DAILY',
+    d.department_id,
+    d.day,
+    EXTRACT(WEEK FROM d.day)::int,
+    EXTRACT(MONTH FROM d.day)::int,
+    -- ISO-viikon vuosi, jotta (year, week_number) vastaa WEEKLY-riviä
+    EXTRACT(ISOYEAR FROM d.day)::int,
+    ROUND(d.num_workers * COALESCE(wp.hours_per_day, :default_hours), 2),
+    ROUND(d.actual_hours, 2),
+    ROUND(d.std_hours, 2),
+    ROUND(d.target_hours, 2),
+    {_efficiency("d.std_hours", "d.actual_hours")},
+    {_efficiency("d.target_hours", "d.actual_hours")},
+    d.num_workers,
+    1
+FROM daily d
+LEFT JOIN weekly_plans wp
+    ON wp.year = EXTRACT(ISOYEAR FROM d.day)
+    AND wp.week_number = EXTRACT(WEEK FROM d.day)
+ON CONFLICT (period_type, department_id, date, year) WHERE period_type = 'DAILY'
+DO UPDATE SET
+    week_number = EXCLUDED.week_number,
+    month = EXCLUDED.month,
+    planned_work_hours = EXCLUDED.planned_work_hours,
+    actual_work_hours = EXCLUDED.actual_work_hours,
+    total_std_time = EXCLUDED.total_std_time,
+    total_target_time = EXCLUDED.total_target_time,
+    efficiency_actual = EXCLUDED.efficiency_actual,
+    efficiency_target = EXCLUDED.efficiency_target,
+    num_workers = EXCLUDED.num_workers,
+    num_work_days = EXCLUDED.num_work_days,
+    updated_at = now()
+RETURNING id
+"""
+
+# Parit joilta tehtävät ovat poistuneet kokonaan
+_DELETE_STALE_DAILY = """
+DELETE FROM efficiency_summaries s
+USING unnest(CAST(:department_ids AS integer[]), CAST(:days AS date[]))
+    AS p(department_id, day)
+WHERE s.period_type = 'DAILY'
+    AND s.department_id = p.department_id
+    AND s.date = p.day
+    AND s.id <> ALL(CAST(:keep_ids AS integer[]))
+"""
+
+_REPLACE_DAILY_ITEMS = f"""
+WITH deleted AS (
+    DELETE FROM efficiency_items
+    WHERE efficiency_summary_id = ANY(CAST(:keep_ids AS integer[]))
+),
+{_TASKS_CTE}
+INSERT INTO efficiency_items (
+    efficiency_summary_id, production_order_id, quantity_completed,
+    quantity_target, standard_time_minutes, actual_std_time, target_std_time,
+    status
+)
+SELECT
+    s.id,
+    t.production_order_id,
+    ROUND(SUM(t.quantity_completed))::int,
+    t.order_quantity,
+    t.standard_time_minutes,
+    ROUND(SUM(t.std_minutes), 2),
+    ROUND(SUM(t.target_minutes), 2),
+    ods.status::text
+FROM tasks t
+JOIN efficiency_summaries s
+    ON s.period_type = 'DAILY'
+    AND s.department_id = t.department_id
+    AND s.date = t.day
+LEFT JOIN order_department_status ods
+    ON ods.production_order_id = t.production_order_id
+    AND ods.department_id = t.department_id
+GROUP BY
+    s.id, t.production_order_id, t.order_quantity, t.standard_time_minutes,
+    ods.status
+"""
+
+
+def _rollup_from_daily(period: str, periods_cte: str, conflict: str) -> str:
+    """WEEKLY/MONTHLY upsert DAILY-riveistä (periods: dept, year, num, start, stop)"""
+    return f"""
+WITH periods AS ({periods_cte}),
+agg AS (
+    SELECT
+        p.department_id,
+        p.year,
+        p.num,
+        SUM(s.planned_work_hours) AS planned_hours,
+        SUM(s.actual_work_hours) AS actual_hours,
+        SUM(s.total_std_time) AS std_hours,
+        SUM(s.total_target_time) AS target_hours,
+        MAX(s.num_workers) AS num_workers,
+        COUNT(*) AS num_work_days
+    FROM periods p
+    JOIN efficiency_summaries s
+        ON s.period_type = 'DAILY'
+        AND s.department_id = p.department_id
+        AND s.date >= p.start
+        AND s.date < p.stop
+    GROUP BY p.department_id, p.year, p.num
+)
+INSERT INTO efficiency_summaries (
+    period_type, department_id, week_number, month, year,
+    planned_work_hours, actual_work_hours, total_std_time, total_target_time,
+    efficiency_actual, efficiency_target, num_workers, num_work_days
+)
+SELECT
+    '{period}',
+    a.department_id,
+    {"a.num" if period == "WEEKLY" else "NULL"},
+    {"a.num" if period == "MONTHLY" else "NULL"},
+    a.year,
+    a.planned_hours,
+    a.actual_hours,
+    a.std_hours,
+    a.target_hours,
+    {_efficiency("a.std_hours", "a.actual_hours")},
+    {_efficiency("a.target_hours", "a.actual_hours")},
+    a.num_workers,
+    a.num_work_days
+FROM agg a
+ON CONFLICT {conflict}
+DO UPDATE SET
+    planned_work_hours = EXCLUDED.planned_work_hours,
+    actual_work_hours = EXCLUDED.actual_work_hours,
+    total_std_time = EXCLUDED.total_std_time,
+    total_target_time = EXCLUDED.total_target_time,
+    efficiency_actual = EXCLUDED.efficiency_actual,
+    efficiency_target = EXCLUDED.efficiency_target,
+    num_workers = EXCLUDED.num_workers,
+    num_work_days = EXCLUDED.num_work_days,
+    updated_at = now()
+RETURNING id
+"""
+
+
+_WEEKS_CTE = """
+    SELECT
+        w.department_id,
+        w.year,
+        w.num,
+        to_date(w.year || '-' || w.num, 'IYYY-IW') AS start,
+        to_date(w.year || '-' || w.num, 'IYYY-IW') + 7 AS stop
+    FROM unnest(
+        CAST(:department_ids AS integer[]),
+        CAST(:years AS integer[]),
+        CAST(:nums AS integer[])
+    ) AS w(department_id, year, num)
+"""
+
+_MONTHS_CTE = """
+    SELECT
+        m.department_id,
+        m.year,
+        m.num,
+        make_date(m.year, m.num, 1) AS start,
+        (make_date(m.year, m.num, 1) + INTERVAL '1 month')::date AS stop
+    FROM unnest(
+        CAST(:department_ids AS integer[]),
+        CAST(:years AS integer[]),
+        CAST(:nums AS integer[])
+    ) AS m(department_id, year, num)
+"""
+
+_UPSERT_WEEKLY = _rollup_from_daily(
+    "WEEKLY",
+    _WEEKS_CTE,
+    "(period_type, department_id, week_number, year) WHERE period_type = 'WEEKLY'",
+)
+
+_UPSERT_MONTHLY = _rollup_from_daily(
+    "MONTHLY",
+    _MONTHS_CTE,
+    "(period_type, department_id, month, year) WHERE period_type = 'MONTHLY'",
+)
+
+
+
+def _delete_stale_periods(period: str, column: str) -> str:
+    """Poista WEEKLY/MONTHLY-rivit joiden jaksolla ei ole enää DAILY-rivejä"""
+    return f"""
+DELETE FROM efficiency_summaries s
+USING unnest(
+    CAST(:department_ids AS integer[]),
+    CAST(:years AS integer[]),
+    CAST(:nums AS integer[])
+) AS p(department_id, year, num)
+WHERE s.period_type = '{period}'
+    AND s.department_id = p.department_id
+    AND s.year = p.year
+    AND s.{column} = p.num
+    AND s.id <> ALL(CAST(:keep_ids AS integer[]))
+"""
+
+
+_DELETE_STALE_WEEKLY = _delete_stale_periods("WEEKLY", "week_number")
+
+_DELETE_STALE_MONTHLY = _delete_stale_periods("MONTHLY", "month")
+
+_CLAIM_DIRTY = """
+DELETE FROM efficiency_dirty_days
+WHERE (department_id, day) IN (
+    SELECT department_id, day
+    FROM efficiency_dirty_days
+    ORDER BY day
+    LIMIT :limit
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING department_id, day
+"""
+
+_MARK_ALL_DIRTY = """
+INSERT INTO efficiency_dirty_days (department_id, day)
+SELECT DISTINCT department_id, (ended_at AT TIME ZONE :tz)::date
+FROM production_tasks
+WHERE ended_at IS NOT NULL
+    AND department_id IS NOT NULL
+    AND (
+        CAST(:since AS date) IS NULL
+        OR ended_at >= (CAST(:since AS date)::timestamp AT TIME ZONE :tz)
+    )
+ON CONFLICT DO NOTHING
+"""
+
+
+@dataclass
+class RollupResult:
+    """Yhden rollup-ajon yhteenveto"""
+
+    days: int = 0
+    weeks: int = 0
+    months: int = 0
+    duration_seconds: float = 0.0
+
+
+def local_day(moment: datetime) -> date:
+    """Päivä jolle tehtävä kohdistetaan (naiivi aika tulkitaan UTC:ksi)"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(ZoneInfo(settings.TIMEZONE)).date()
+
+
+def mark_dirty(
+    db: Session, department_id: Optional[int], moment: Optional[datetime]
+) -> None:
+    """
+    Merkitse (osasto, päivä) laskettavaksi uudelleen.
+    Ei committaa - kutsutaan samassa transaktiossa kuin tehtävän muutos.
+    """
+    if department_id is None or moment is None:
+        return
+
+    db.execute(
+        pg_insert(EfficiencyDirtyDay)
+        .values(department_id=department_id, day=local_day(moment))
+        .on_conflict_do_nothing()
+    )
+
+
+def mark_all_dirty(db: Session, *, since: Optional[date] = None) -> int:
+    """Merkitse kaikki päivät joilla on päättyneitä tehtäviä (täysi uudelleenlaskenta)"""
+    db.execute(text(DISABLE_STATEMENT_TIMEOUT))
+    result = db.execute(
+        text(_MARK_ALL_DIRTY), {"tz": settings.TIMEZONE, "since": since}
+    )
+    db.commit()
+    return result.rowcount
+
+
+def run_rollup(db: Session, *, batch_size: int = CLAIM_BATCH_SIZE) -> RollupResult:
+    """
+    Laske likaiset päivät uudelleen ja johda niistä viikot ja kuukaudet.
+    Useampi prosessi voi ajaa rinnakkain (FOR UPDATE SKIP LOCKED).
+
+    Jokainen otettu erä ja sen jaksot commitoidaan erikseen, jotta
+    tehtävien mark_dirty ei jää odottamaan koko ajon lukkoja.
+    """
+    started = time.perf_counter()
+    result = RollupResult()
+    weeks: set[tuple[int, int, int]] = set()
+    months: set[tuple[int, int, int]] = set()
+
+    try:
+        while True:
+            # Jokainen erä on oma transaktionsa
+            db.execute(text(DISABLE_STATEMENT_TIMEOUT))
+            pairs = db.execute(text(_CLAIM_DIRTY), {"limit": batch_size}).all()
+            if not pairs:
+                break
+
+            _recompute_days(db, pairs)
+            batch_weeks, batch_months = _period_keys(
+                (p.department_id, p.day) for p in pairs
+            )
+            _recompute_period_keys(db, batch_weeks, batch_months)
+            db.commit()
+
+            result.days += len(pairs)
+            weeks |= batch_weeks
+            months |= batch_months
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        # Myös osittain valmis ajo on jo commitoitu
+        if result.days:
+            series_cache.invalidate()
+            history_cache.invalidate()
+            productivity_cache.invalidate()
+
+    result.weeks, result.months = len(weeks), len(months)
+    result.duration_seconds = time.perf_counter() - started
+    return result
+
+
+def recompute_periods(
+    db: Session, department_days: Iterable[tuple[int, date]]
+) -> tuple[int, int]:
+    """
+    Johda WEEKLY- ja MONTHLY-rivit DAILY-riveistä annettujen päivien jaksoille.
+    Ei committaa. Palauttaa: (viikkojen määrä, kuukausien määrä)
+    """
+    weeks, months = _period_keys(department_days)
+    _recompute_period_keys(db, weeks, months)
+    return len(weeks), len(months)
+
+
+def _period_keys(
+    department_days: Iterable[tuple[int, date]],
+) -> tuple[set[tuple[int, int, int]], set[tuple[int, int, int]]]:
+    """(osasto, ISO-vuosi, viikko) ja (osasto, vuosi, kuukausi) päivien jaksoille"""
+    weeks: set[tuple[int, int, int]] = set()
+    months: set[tuple[int, int, int]] = set()
+    for department_id, day in department_days:
+        iso_year, iso_week, _ = day.isocalendar()
+        weeks.add((department_id, iso_year, iso_week))
+        months.add((department_id, day.year, day.month))
+    return weeks, months
+
+
+def _recompute_period_keys(
+    db: Session, weeks: set[tuple[int, int, int]], months: set[tuple[int, int, int]]
+) -> None:
+    if weeks:
+        _recompute_periods(db, _UPSERT_WEEKLY, _DELETE_STALE_WEEKLY, weeks)
+    if months:
+        _recompute_periods(db, _UPSERT_MONTHLY, _DELETE_STALE_MONTHLY, months)
+
+
+def _recompute_days(db: Session, pairs) -> None:
+    params = {
+        "department_ids": [p.department_id for p in pairs],
+        "days": [p.day for p in pairs],
+        "tz": settings.TIMEZONE,
+        "default_hours": DEFAULT_HOURS_PER_DAY,
+    }
+
+    keep_ids = list(db.execute(text(_UPSERT_DAILY), params).scalars())
+    params["keep_ids"] = keep_ids
+
+    db.execute(text(_DELETE_STALE_DAILY), params)
+    db.execute(text(_REPLACE_DAILY_ITEMS), params)
+
+
+def _recompute_periods(
+    db: Session, upsert_sql: str, delete_sql: str, keys: set[tuple[int, int, int]]
+) -> None:
+    params = {
+        "department_ids": [k[0] for k in keys],
+        "years": [k[1] for k in keys],
+        "nums": [k[2] for k in keys],
+    }
+
+    params["keep_ids"] = list(db.execute(text(upsert_sql), params).scalars())
+    db.execute(text(delete_sql), params)
+
+
+def run_rollup_job() -> RollupResult:
+    """Aja rollup omalla sessiolla (CLI ja taustaprosessi)"""
+    db = SessionLocal()
+    try:
+        return run_rollup(db)
+    finally:
+        db.close()
+
+
+async def rollup_loop(interval_seconds: int) -> None:
+    """Taustaprosessi: aja rollup säännöllisesti threadpoolissa"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            with track_job("efficiency_rollup"):
+                result = await asyncio.to_thread(run_rollup_job)
+            if result.days:
+                logger.info(
+                    "Efficiency rollup: %d päivää, %d viikkoa, %d kuukautta (%.2fs)",
+                    result.days,
+                    result.weeks,
+                    result.months,
+                    result.duration_seconds,
+                )
+        except Exception:
+            logger.exception("Efficiency rollup epäonnistui")
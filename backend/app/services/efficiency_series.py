@@ -0,0 +1,185 @@
+"""
+Tehokkuuden aikasarjat dashboardeille (sarakkeittain, pistebudjetilla)
+
+Resoluutioksi valitaan tarkin jaksotyyppi (DAILY -> WEEKLY -> MONTHLY),
+jonka pistemäärä mahtuu budjettiin. Jos kuukausitasokaan ei mahdu (tai
+resoluutio on pyydetty), peräkkäiset jaksot yhdistetään ämpäreiksi.
+Ämpärin tehokkuus lasketaan summatuista tunneista, ei prosenttien
+keskiarvona, jolloin tulos vastaa saman jakson rollup-laskentaa.
+
+Välimuisti tyhjennetään kun rollup tai backfill on kirjoittanut rivejä.
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Optional, Sequence
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.efficiency import EfficiencyPeriodType
+from app.schemas.efficiency_schema import EfficiencySeries, EfficiencySeriesDepartment
+from app.services.efficiency_kernels import efficiency, to_optional_list
+
+series_cache = TTLCache(
+    "efficiency_series",
+    maxsize=256,
+    ttl_seconds=settings.EFFICIENCY_SERIES_CACHE_TTL_SECONDS,
+)
+
+# Jaksotyypit tarkimmasta karkeimpaan
+_RESOLUTIONS = (
+    EfficiencyPeriodType.DAILY,
+    EfficiencyPeriodType.WEEKLY,
+    EfficiencyPeriodType.MONTHLY,
+)
+
+# Jakson alkupäivä kullekin jaksotyypille
+_PERIOD_START = {
+    EfficiencyPeriodType.DAILY: "s.date",
+    EfficiencyPeriodType.WEEKLY: "to_date(s.year || '-' || s.week_number, 'IYYY-IW')",
+    EfficiencyPeriodType.MONTHLY: "make_date(s.year, s.month, 1)",
+}
+
+
+def _select_summaries(period: EfficiencyPeriodType) -> str:
+    start = _PERIOD_START[period]
+    return f"""
+SELECT
+    s.department_id,
+    {start} AS period_start,
+    s.planned_work_hours::float8,
+    s.actual_work_hours::float8,
+    s.total_std_time::float8,
+    s.total_target_time::float8
+FROM efficiency_summaries s
+WHERE s.period_type = '{period.value}'
+    AND s.year BETWEEN :first_year AND :last_year
+    AND {start} >= :start
+    AND {start} <= :end
+    AND (CAST(:department_ids AS integer[]) IS NULL
+        OR s.department_id = ANY(CAST(:department_ids AS integer[])))
+"""
+
+
+_SELECT_SUMMARIES = {period: _select_summaries(period) for period in _RESOLUTIONS}
+
+
+@dataclass(frozen=True)
+class SeriesRequest:
+    """Aikasarjapyyntö; toimii myös välimuistin avaimena"""
+
+    start: date
+    end: date
+    department_ids: Optional[tuple[int, ...]] = None
+    resolution: Optional[EfficiencyPeriodType] = None
+    max_points: int = 500
+
+
+def period_axis(period: EfficiencyPeriodType, start: date, end: date) -> list[date]:
+    """Kaikkien väliin osuvien jaksojen alkupäivät (myös tyhjät jaksot)"""
+    if period == EfficiencyPeriodType.DAILY:
+        first, step = start, timedelta(days=1)
+    elif period == EfficiencyPeriodType.WEEKLY:
+        first, step = start - timedelta(days=start.weekday()), timedelta(days=7)
+    else:
+        axis = []
+        year, month = start.year, start.month
+        while date(year, month, 1) <= end:
+            axis.append(date(year, month, 1))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return axis
+
+    return [first + step * i for i in range((end - first) // step + 1)]
+
+
+def choose_resolution(
+    request: SeriesRequest,
+) -> tuple[EfficiencyPeriodType, list[date], int]:
+    """Valitse jaksotyyppi ja ämpärikoko. Palauttaa: (jakso, akseli, ämpärikoko)"""
+    candidates = (request.resolution,) if request.resolution else _RESOLUTIONS
+    for period in candidates:
+        axis = period_axis(period, request.start, request.end)
+        if len(axis) <= request.max_points:
+            return period, axis, 1
+
+    # Karkeinkaan jakso ei mahdu budjettiin: yhdistetään peräkkäisiä jaksoja
+    return period, axis, math.ceil(len(axis) / request.max_points)
+
+
+def _bucket_sum(values: np.ndarray, bucket_size: int) -> np.ndarray:
+    """Summaa (osastot x jaksot) -taulukon jaksot ämpäreittäin (tyhjä ämpäri = NaN)"""
+    departments, periods = values.shape
+    padded = math.ceil(periods / bucket_size) * bucket_size
+    values = np.pad(
+        values, ((0, 0), (0, padded - periods)), constant_values=np.nan
+    ).reshape(departments, -1, bucket_size)
+    sums = np.nansum(values, axis=2)
+    sums[np.isnan(values).all(axis=2)] = np.nan
+    return sums
+
+
+def build_series(db: Session, request: SeriesRequest) -> EfficiencySeries:
+    """Hae yhteenvedot yhdellä kyselyllä ja muodosta sarakkeittainen vastaus"""
+    period, axis, bucket_size = choose_resolution(request)
+
+    rows = db.execute(
+        text(_SELECT_SUMMARIES[period]),
+        {
+            "start": axis[0],
+            "end": request.end,
+            # WEEKLY-rivin vuosi on ISO-vuosi, joka voi poiketa kalenterivuodesta
+            "first_year": axis[0].year - 1,
+            "last_year": request.end.year + 1,
+            "department_ids": (
+                list(request.department_ids) if request.department_ids else None
+            ),
+        },
+    ).all()
+
+    department_ids: Sequence[int] = request.department_ids or sorted(
+        {row[0] for row in rows}
+    )
+    department_index = {dept_id: i for i, dept_id in enumerate(department_ids)}
+    period_index = {start: i for i, start in enumerate(axis)}
+
+    # Sarakkeet: planned, actual, std, target; puuttuva jakso = NaN
+    values = np.full((4, len(department_ids), len(axis)), np.nan)
+    for dept_id, start, *hours in rows:
+        column = period_index.get(start)
+        if column is not None:
+            values[:, department_index[dept_id], column] = [
+                np.nan if h is None else h for h in hours
+            ]
+
+    if bucket_size > 1:
+        values = np.stack([_bucket_sum(v, bucket_size) for v in values])
+    planned, actual, std, target = values
+
+    efficiency_actual = efficiency(std, actual)
+    efficiency_target = efficiency(target, actual)
+
+    return EfficiencySeries(
+        resolution=period,
+        bucket_size=bucket_size,
+        timestamps=axis[::bucket_size],
+        series=[
+            EfficiencySeriesDepartment(
+                department_id=dept_id,
+                efficiency_actual=to_optional_list(efficiency_actual[i]),
+                efficiency_target=to_optional_list(efficiency_target[i]),
+                planned_work_hours=to_optional_list(planned[i]),
+                actual_work_hours=to_optional_list(actual[i]),
+            )
+            for i, dept_id in enumerate(department_ids)
+        ],
+    )
+
+
+def get_series(db: Session, request: SeriesRequest) -> EfficiencySeries:
+    """build_series välimuistin kautta"""
+    return series_cache.get_or_set(request, lambda: build_series(db, request))
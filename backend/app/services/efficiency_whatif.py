@@ -0,0 +1,197 @@
+"""
+What-if -simulointi kategorioiden tehokkuuskertoimille (vain luku)
+
+Historia ladataan kerran (osasto, kuukausi, kategoria) -tason
+summiksi ja pidetään välimuistissa NumPy-taulukkoina. Koska
+target_std_time = actual_std_time * efficiency_multiplier, skenaarion
+tavoitetehokkuus saadaan kertomalla standardiajat kategorian kertoimella
+ja summaamalla - kaikki skenaariot lasketaan samalla vektoroidulla
+ajolla eikä tietokantaan kirjoiteta mitään.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Mapping, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.schemas.efficiency_schema import WhatIfResponse, WhatIfScenarioResult
+from app.services.efficiency_kernels import efficiency, to_optional_list
+
+history_cache = TTLCache(
+    "efficiency_whatif",
+    maxsize=16,
+    ttl_seconds=settings.EFFICIENCY_WHATIF_CACHE_TTL_SECONDS,
+)
+
+_SELECT_HISTORY = """
+SELECT
+    t.department_id,
+    date_trunc('month', t.ended_at AT TIME ZONE :tz)::date AS month,
+    c.code,
+    SUM(COALESCE(t.duration_minutes, 0))::float8,
+    SUM(
+        COALESCE(t.quantity_completed, 0) * COALESCE(pr.standard_time_minutes, 0)
+    )::float8
+FROM production_tasks t
+JOIN production_orders o ON o.id = t.production_order_id
+LEFT JOIN products pr ON pr.id = o.product_id
+LEFT JOIN product_categories c ON c.code = pr.category_code
+WHERE t.ended_at >= (CAST(:start AS date)::timestamp AT TIME ZONE :tz)
+    AND t.ended_at < ((CAST(:end AS date) + 1)::timestamp AT TIME ZONE :tz)
+    AND t.department_id IS NOT NULL
+    AND (CAST(:department_ids AS integer[]) IS NULL
+        OR t.department_id = ANY(CAST(:department_ids AS integer[])))
+GROUP BY 1, 2, 3
+"""
+
+
+@dataclass(frozen=True)
+class WhatIfHistory:
+    """
+    Toteutuneet summat (osasto x kuukausi) -soluittain sekä standardiajat
+    kategorioittain. Viimeinen kategoriasarake on tuotteet ilman
+    kategoriaa, joiden kerroin on aina 1.
+    """
+
+    department_ids: list[int]
+    months: list[date]
+    categories: list[str]
+    duration_minutes: np.ndarray  # (osastot, kuukaudet)
+    std_minutes: np.ndarray  # (osastot, kuukaudet)
+    std_by_category: np.ndarray  # (osastot * kuukaudet, kategoriat + 1)
+
+    def multiplier_matrix(
+        self, scenarios: Sequence[Mapping[str, float]]
+    ) -> np.ndarray:
+        """Skenaarioiden kertoimet matriisiksi (skenaariot, kategoriat + 1)"""
+        matrix = np.ones((len(scenarios), len(self.categories) + 1))
+        for row, multipliers in enumerate(scenarios):
+            for column, code in enumerate(self.categories):
+                matrix[row, column] = multipliers.get(code, 1.0)
+        return matrix
+
+    def target_minutes(self, multipliers: np.ndarray) -> np.ndarray:
+        """Tavoiteminuutit kaikille skenaarioille: (skenaariot, osastot, kuukaudet)"""
+        cells = self.std_by_category @ multipliers.T
+        return cells.T.reshape(len(multipliers), *self.duration_minutes.shape)
+
+    def efficiency_actual(self) -> np.ndarray:
+        """Toteutunut tehokkuus osastoittain (ei riipu kertoimista)"""
+        return efficiency(
+            self.std_minutes.sum(axis=1), self.duration_minutes.sum(axis=1)
+        )
+
+    def evaluate(
+        self, multipliers: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Tavoitetehokkuus skenaarioittain.
+        Palauttaa: (osastoittain (s, d), osastoittain ja kuukausittain (s, d, m))
+        """
+        target = self.target_minutes(multipliers)
+        total = efficiency(target.sum(axis=2), self.duration_minutes.sum(axis=1))
+        monthly = efficiency(target, self.duration_minutes)
+        return total, monthly
+
+
+def load_history(
+    db: Session,
+    start: date,
+    end: date,
+    department_ids: Optional[tuple[int, ...]] = None,
+) -> WhatIfHistory:
+    """Lataa historia yhdellä aggregaattikyselyllä"""
+    rows = db.execute(
+        text(_SELECT_HISTORY),
+        {
+            "start": start,
+            "end": end,
+            "tz": settings.TIMEZONE,
+            "department_ids": list(department_ids) if department_ids else None,
+        },
+    ).all()
+
+    dept_list = sorted({row[0] for row in rows})
+    month_list = sorted({row[1] for row in rows})
+    category_list = sorted({row[2] for row in rows if row[2] is not None})
+
+    dept_index = {dept_id: i for i, dept_id in enumerate(dept_list)}
+    month_index = {month: i for i, month in enumerate(month_list)}
+    category_index = {code: i for i, code in enumerate(category_list)}
+    uncategorized = len(category_list)
+
+    shape = (len(dept_list), len(month_list))
+    duration = np.zeros(shape)
+    std = np.zeros(shape)
+    std_by_category = np.zeros((len(dept_list) * len(month_list), uncategorized + 1))
+
+    for dept_id, month, code, duration_minutes, std_minutes in rows:
+        d, m = dept_index[dept_id], month_index[month]
+        duration[d, m] += duration_minutes
+        std[d, m] += std_minutes
+        std_by_category[
+            d * len(month_list) + m, category_index.get(code, uncategorized)
+        ] += std_minutes
+
+    return WhatIfHistory(
+        department_ids=dept_list,
+        months=month_list,
+        categories=category_list,
+        duration_minutes=duration,
+        std_minutes=std,
+        std_by_category=std_by_category,
+    )
+
+
+def get_history(
+    db: Session,
+    start: date,
+    end: date,
+    department_ids: Optional[tuple[int, ...]] = None,
+) -> WhatIfHistory:
+    """load_history välimuistin kautta"""
+    return history_cache.get_or_set(
+        (start, end, department_ids),
+        lambda: load_history(db, start, end, department_ids),
+    )
+
+
+def simulate(
+    history: WhatIfHistory,
+    current: Mapping[str, float],
+    scenarios: Sequence[tuple[str, Mapping[str, float]]],
+) -> WhatIfResponse:
+    """
+    Laske baseline (nykyiset kertoimet) ja skenaariot yhdellä matriisiajolla.
+    Skenaarion kertoimet korvaavat nykyiset vain annetuille kategorioille.
+    """
+    effective = [dict(current)] + [
+        {**current, **overrides} for _, overrides in scenarios
+    ]
+    names = ["baseline"] + [name for name, _ in scenarios]
+    total, monthly = history.evaluate(history.multiplier_matrix(effective))
+
+    results = [
+        WhatIfScenarioResult(
+            name=name,
+            multipliers={
+                code: float(multipliers.get(code, 1.0)) for code in history.categories
+            },
+            efficiency_target=to_optional_list(total[i]),
+            monthly_efficiency_target=[to_optional_list(row) for row in monthly[i]],
+        )
+        for i, (name, multipliers) in enumerate(zip(names, effective))
+    ]
+
+    return WhatIfResponse(
+        department_ids=history.department_ids,
+        months=history.months,
+        efficiency_actual=to_optional_list(history.efficiency_actual()),
+        baseline=results[0],
+        scenarios=results[1:],
+    )
@@ -0,0 +1,126 @@
+"""
+Prosessinsisäinen kortinlukukartta: employee_number -> aktiivinen työntekijä
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.employee import Employee
+
+
+@dataclass(frozen=True)
+class BadgeEntry:
+    """Kevyt kopio aktiivisesta työntekijästä (ei ORM-sidosta sessioon)"""
+
+    id: int
+    employee_number: str
+    full_name: Optional[str]
+    primary_department_id: Optional[int]
+
+    @classmethod
+    def from_employee(cls, employee: Employee) -> "BadgeEntry":
+        return cls(
+            id=employee.id,
+            employee_number=employee.employee_number,
+            full_name=employee.full_name,
+            primary_department_id=employee.primary_department_id,
+        )
+
+
+class BadgeRegistry:
+    """
+    Aktiiviset työntekijät kortinnumeron mukaan.
+
+    Luku on pelkkä dict-haku ilman lukkoa: kirjoitukset rakentavat uuden
+    sanakirjan (copy-on-write). Työntekijöiden CRUD-polut päivittävät
+    rekisterin commitin jälkeen. Koska rekisteri on prosessikohtainen,
+    se ladataan myös uudelleen kun se on vanhempi kuin
+    EMPLOYEE_BADGE_MAX_AGE_SECONDS (toisen workerin muutokset).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_number: dict[str, BadgeEntry] = {}
+        self._loaded_at: Optional[float] = None
+
+    @property
+    def is_stale(self) -> bool:
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at
+            > settings.EMPLOYEE_BADGE_MAX_AGE_SECONDS
+        )
+
+    def rebuild(self, db: Session) -> int:
+        """Lataa aktiiviset työntekijät tietokannasta"""
+        rows = (
+            db.query(Employee)
+            .filter(Employee.is_active == True, Employee.employee_number.isnot(None))
+            .all()
+        )
+        entries = {row.employee_number: BadgeEntry.from_employee(row) for row in rows}
+
+        with self._lock:
+            self._by_number = entries
+            self._loaded_at = time.monotonic()
+
+        return len(entries)
+
+    def get(self, employee_number: str) -> Optional[BadgeEntry]:
+        """Hae aktiivinen työntekijä kortinnumerolla"""
+        return self._by_number.get(employee_number)
+
+    def lookup(self, db: Session, employee_number: str) -> Optional[BadgeEntry]:
+        """
+        Kortinluku: muistista, tarvittaessa tietokannasta. Ohitus tarkistetaan
+        tietokannasta, koska työntekijä voi olla lisätty toisessa workerissa.
+        """
+        if self.is_stale:
+            self.rebuild(db)
+        entry = self.get(employee_number)
+        if entry is None:
+            employee = (
+                db.query(Employee)
+                .filter(
+                    Employee.employee_number == employee_number,
+                    Employee.is_active == True,
+                )
+                .first()
+            )
+            if employee is not None:
+                self.put(employee)
+                entry = self.get(employee_number)
+        return entry
+
+    def put(self, employee: Employee) -> None:
+        """Päivitä työntekijän rivi (poistuu jos ei aktiivinen)"""
+        with self._lock:
+            entries = {
+                number: entry
+                for number, entry in self._by_number.items()
+                if entry.id != employee.id
+            }
+            if employee.is_active and employee.employee_number:
+                entries[employee.employee_number] = BadgeEntry.from_employee(employee)
+            self._by_number = entries
+
+    def remove(self, employee_id: int) -> None:
+        """Poista työntekijä rekisteristä"""
+        with self._lock:
+            self._by_number = {
+                number: entry
+                for number, entry in self._by_number.items()
+                if entry.id != employee_id
+            }
+
+    def __len__(self) -> int:
+        return len(self._by_number)
+
+
+# Luo singleton-instanssi
+badge_registry = BadgeRegistry()
@@ -0,0 +1,128 @@
+"""
+Muutostapahtumien jakelu SSE-kuuntelijoille (tilaukset, tehtävät, tuotteet, osastot)
+"""
+
+import asyncio
+import json
+import threading
+from typing import Any, Iterable, Optional
+
+
+class Subscription:
+    """Yksittäisen kuuntelijan jono ja osastosuodatin"""
+
+    def __init__(self, department_ids: Optional[frozenset[int]], queue_size: int):
+        self.department_ids = department_ids
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=queue_size)
+
+
+class EventBroker:
+    """
+    Julkaisee kompakteja muutostapahtumia kaikille kuuntelijoille.
+
+    CRUD-polut kutsuvat publish()-metodia commitin jälkeen (myös
+    threadpoolista). Tapahtuma serialisoidaan kerran ja sama tavujono
+    jaetaan kaikkiin osuviin jonoihin yhdellä event loop -kutsulla.
+    Osastokohtaiset tapahtumat menevät vain ko. osaston tilaajille ja
+    kaikkia osastoja kuunteleville; osastottomat (esim. tuotteet) kaikille.
+    """
+
+    QUEUE_SIZE = 256
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wildcard: set[Subscription] = set()
+        self._by_department: dict[int, set[Subscription]] = {}
+        self._sequence = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            departmental = {s for subs in self._by_department.values() for s in subs}
+            return len(self._wildcard) + len(departmental)
+
+    def subscribe(self, department_ids: Optional[Iterable[int]] = None) -> Subscription:
+        """Rekisteröi kuuntelija (kutsuttava event loopista)"""
+        ids = frozenset(department_ids) if department_ids else None
+        subscription = Subscription(ids, self.QUEUE_SIZE)
+
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            if ids is None:
+                self._wildcard.add(subscription)
+            else:
+                for dept_id in ids:
+                    self._by_department.setdefault(dept_id, set()).add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Poista kuuntelija"""
+        with self._lock:
+            if subscription.department_ids is None:
+                self._wildcard.discard(subscription)
+                return
+            for dept_id in subscription.department_ids:
+                subs = self._by_department.get(dept_id)
+                if subs is not None:
+                    subs.discard(subscription)
+                    if not subs:
+                        del self._by_department[dept_id]
+
+    def publish(
+        self,
+        event_type: str,
+        data: dict[str, Any],
+        *,
+        department_ids: Iterable[Optional[int]] = (),
+    ) -> None:
+        """
+        Julkaise tapahtuma. Turvallinen kutsua mistä tahansa säikeestä.
+        department_ids: osastot joita muutos koskee (tyhjä = kaikki)
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+
+        departments = frozenset(d for d in department_ids if d is not None)
+
+        with self._lock:
+            if not self._wildcard and not self._by_department:
+                return
+            self._sequence += 1
+            sequence = self._sequence
+
+        payload = json.dumps(
+            {"type": event_type, "departments": sorted(departments), **data},
+            default=str,
+            separators=(",", ":"),
+        )
+        message = f"id: {sequence}\nevent: {event_type}\ndata: {payload}\n\n".encode()
+
+        loop.call_soon_threadsafe(self._fan_out, departments, message)
+
+    def _fan_out(self, departments: frozenset[int], message: bytes) -> None:
+        # Ajetaan event loopissa
+        with self._lock:
+            if departments:
+                targets = set(self._wildcard)
+                for dept_id in departments:
+                    targets.update(self._by_department.get(dept_id, ()))
+            else:
+                targets = set(self._wildcard)
+                for subs in self._by_department.values():
+                    targets.update(subs)
+
+        for subscription in targets:
+            try:
+                subscription.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Hidas kuuntelija: tyhjennä jono ja pyydä hakemaan tila uudelleen
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(b"event: resync\ndata: {}\n\n")
+
+
+# Luo singleton-instanssi
+event_broker = EventBroker()
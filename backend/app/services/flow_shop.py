@@ -0,0 +1,201 @@
+"""
+Permutation flow shop -sekvensointi (NEH + iterated greedy)
+
+Tilaukset kulkevat osastojen läpi samassa järjestyksessä (display_order),
+joten planned_sequence on permutaatio jonka makespan minimoidaan.
+Käsittelyajat annetaan matriisina p[tilaus, osasto] (minuutteja).
+
+- NEH: tilaukset kokonaisajan mukaan laskevasti, kukin lisätään
+  parhaaseen kohtaan. Kohdan valinta käyttää Taillardin kiihdytystä
+  (heads/tails), joten yksi lisäys maksaa O(n * m) eikä O(n^2 * m).
+- Iterated greedy (Ruiz & Stützle): poistetaan muutama satunnainen
+  tilaus, lisätään takaisin parhaisiin kohtiin ja ajetaan insertion-
+  paikallishaku. Jatketaan kunnes aikabudjetti loppuu.
+
+Tasatilanteessa pienempi osastojen yhteenlaskettu odotusaika voittaa.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Montako tilausta poistetaan kerralla iterated greedy -vaiheessa
+DESTRUCTION_SIZE = 4
+
+_EPSILON = 1e-9
+
+
+@dataclass
+class Schedule:
+    """Sekvenssi ja sen tunnusluvut"""
+
+    sequence: list[int]
+    makespan: float
+    idle: np.ndarray  # odotusaika osastoittain ensimmäisen aloituksen jälkeen
+
+    @property
+    def total_idle(self) -> float:
+        return float(self.idle.sum())
+
+
+def completion_times(p: np.ndarray) -> np.ndarray:
+    """
+    Valmistumisajat C[i, j] kun tilaukset ajetaan p:n rivijärjestyksessä.
+    C[i, j] = max(C[i-1, j], C[i, j-1]) + p[i, j] lasketaan osasto kerrallaan
+    max-plus -kumulatiivisena summana koko sarakkeelle.
+    """
+    n, m = p.shape
+    completion = np.empty((n, m))
+    previous = np.zeros(n)
+    for j in range(m):
+        cumulative = np.cumsum(p[:, j])
+        completion[:, j] = cumulative + np.maximum.accumulate(
+            previous - (cumulative - p[:, j])
+        )
+        previous = completion[:, j]
+    return completion
+
+
+def _tails(p: np.ndarray) -> np.ndarray:
+    """Aika tilauksen i aloituksesta osastolla j loppuun (käänteinen ongelma)"""
+    return completion_times(p[::-1, ::-1])[::-1, ::-1]
+
+
+def evaluate(p: np.ndarray, sequence: Sequence[int]) -> Schedule:
+    """Laske sekvenssin makespan ja osastojen odotusajat"""
+    ordered = p[list(sequence)]
+    completion = completion_times(ordered)
+    first_start = completion[0] - ordered[0]
+    idle = completion[-1] - first_start - ordered.sum(axis=0)
+    return Schedule(list(sequence), float(completion[-1, -1]), idle)
+
+
+def best_insertion(ordered: np.ndarray, job: np.ndarray) -> tuple[int, float]:
+    """
+    Paras kohta lisätä tilaus (ajat job[m]) sekvenssiin (ajat ordered[i, m]).
+    Palauttaa: (kohta 0..i, makespan)
+    """
+    if not len(ordered):
+        return 0, float(job.sum())
+
+    heads = np.vstack([np.zeros(job.shape), completion_times(ordered)])
+    tails = np.vstack([_tails(ordered), np.zeros(job.shape)])
+
+    # Lisätyn tilauksen valmistumisaika jokaisessa kohdassa
+    inserted = np.zeros(len(heads))
+    makespans = np.zeros(len(heads))
+    for j in range(len(job)):
+        inserted = np.maximum(inserted, heads[:, j]) + job[j]
+        np.maximum(makespans, inserted + tails[:, j], out=makespans)
+
+    position = int(np.argmin(makespans))
+    return position, float(makespans[position])
+
+
+def neh(p: np.ndarray, deadline: Optional[float] = None) -> list[int]:
+    """
+    NEH-heuristiikka.
+    Jos deadline (time.perf_counter()) ohitetaan, loput tilaukset lisätään
+    sekvenssin loppuun kokonaisajan mukaisessa järjestyksessä.
+    """
+    order = [int(job) for job in np.argsort(-p.sum(axis=1), kind="stable")]
+    sequence: list[int] = []
+    for k, job in enumerate(order):
+        if deadline is not None and time.perf_counter() >= deadline:
+            sequence.extend(order[k:])
+            break
+        position, _ = best_insertion(p[sequence], p[job])
+        sequence.insert(position, job)
+    return sequence
+
+
+def _better(candidate: Schedule, incumbent: Schedule) -> bool:
+    if candidate.makespan < incumbent.makespan - _EPSILON:
+        return True
+    return (
+        candidate.makespan <= incumbent.makespan + _EPSILON
+        and candidate.total_idle < incumbent.total_idle - _EPSILON
+    )
+
+
+def _local_search(p: np.ndarray, schedule: Schedule, deadline: float) -> Schedule:
+    """Insertion-naapurusto: siirrä kukin tilaus parhaaseen kohtaansa"""
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for job in list(schedule.sequence):
+            if time.perf_counter() >= deadline:
+                break
+            rest = [j for j in schedule.sequence if j != job]
+            position, makespan = best_insertion(p[rest], p[job])
+            if makespan > schedule.makespan + _EPSILON:
+                continue
+            rest.insert(position, job)
+            candidate = evaluate(p, rest)
+            if _better(candidate, schedule):
+                schedule = candidate
+                improved = True
+    return schedule
+
+
+@dataclass
+class SequencingResult:
+    schedule: Schedule
+    initial: Schedule
+    iterations: int
+    duration_seconds: float
+
+
+def optimize(
+    p: np.ndarray,
+    *,
+    time_budget_seconds: float = 2.0,
+    initial: Optional[Sequence[int]] = None,
+    seed: int = 0,
+) -> SequencingResult:
+    """
+    Etsi makespanin minimoiva sekvenssi aikabudjetin sisällä.
+    initial = nykyinen sekvenssi, johon tulosta verrataan (oletuksena 0..n-1).
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget_seconds
+    n = len(p)
+    baseline = evaluate(p, initial if initial is not None else range(n))
+    if n < 2:
+        return SequencingResult(baseline, baseline, 0, 0.0)
+
+    current = evaluate(p, neh(p, deadline))
+    if _better(baseline, current):
+        current = baseline
+    current = _local_search(p, current, deadline)
+    best = current
+
+    rng = np.random.default_rng(seed)
+    iterations = 0
+    destruction = min(DESTRUCTION_SIZE, n - 1)
+    while time.perf_counter() < deadline:
+        iterations += 1
+        removed = [
+            current.sequence[i]
+            for i in rng.choice(n, size=destruction, replace=False)
+        ]
+        sequence = [j for j in current.sequence if j not in removed]
+        for job in removed:
+            position, _ = best_insertion(p[sequence], p[job])
+            sequence.insert(position, job)
+
+        candidate = _local_search(p, evaluate(p, sequence), deadline)
+        # Hyväksytään myös yhtä hyvä, jotta haku pääsee tasanteilta eteenpäin
+        if candidate.makespan <= current.makespan + _EPSILON:
+            current = candidate
+        if _better(current, best):
+            best = current
+
+    return SequencingResult(
+        schedule=best,
+        initial=baseline,
+        iterations=iterations,
+        duration_seconds=time.perf_counter() - started,
+    )
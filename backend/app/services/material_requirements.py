@@ -0,0 +1,513 @@
+"""
+Materiaalitarpeet BOM-rivien kautta
+
+    tarve(materiaali, yksikkö) = Σ tilaus.quantity * bom.quantity
+
+Viikkosuunnitelman tai toimituspäivävälin tarpeet lasketaan yhdellä
+aggregaattikyselyllä tietokannassa. What-if -laskennassa (kuvitellut
+tilausrivit) käytetään tuotekohtaista BOM-välimuistia, jolloin toistuvat
+kutsut eivät hae BOM-rivejä uudelleen. BOM-rivejä muuttavien toimintojen
+pitää kutsua invalidate_products().
+
+Monitasoinen purku (multi_level): BOM-rivin material_code joka vastaa
+tuotteen item_numberia ja jolla on omia BOM-rivejä on alikokoonpano, ja se
+korvataan rekursiivisesti omilla materiaaleillaan. Jokaisen tuotteen
+litistetty tarvevektori (lehtimateriaalit per kappale) tallennetaan
+muistiin, joten yhteiset alikokoonpanot puretaan vain kerran. Tuotteen
+BOM-muutos tyhjentää sen ja kaikkien sitä käyttävien tuotteiden vektorit.
+Kierteellinen rakenne nostaa BOMCycleError-poikkeuksen.
+
+invalidate_*() tyhjentää vain oman prosessin välimuistit. Muiden workerien
+muutokset huomataan bom_cache_versions-laskureista (triggerit kasvattavat
+niitä), jotka luetaan enintään BOM_CACHE_VERSION_CHECK_SECONDS välein.
+Laskuri on jaettu riveihin kirjoittajan backendin mukaan ja versio on
+rivien summa.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.schemas.bom_schema import MaterialRequirement, MaterialRequirements
+
+bom_cache = TTLCache(
+    "bom_products",
+    maxsize=settings.BOM_CACHE_MAXSIZE,
+    ttl_seconds=settings.BOM_CACHE_TTL_SECONDS,
+)
+
+# Tuotteen litistetty tarvevektori (monitasoinen purku)
+flattened_cache = TTLCache(
+    "bom_flattened",
+    maxsize=settings.BOM_CACHE_MAXSIZE,
+    ttl_seconds=settings.BOM_CACHE_TTL_SECONDS,
+)
+
+# material_code -> tuotteen id (None = ostettava materiaali)
+item_number_cache = TTLCache(
+    "bom_item_numbers",
+    maxsize=settings.BOM_CACHE_MAXSIZE,
+    ttl_seconds=settings.BOM_CACHE_TTL_SECONDS,
+)
+
+# Alikokoonpano -> tuotteet joiden litistetty vektori sisältää sen
+_parents: dict[int, set[int]] = defaultdict(set)
+_parents_lock = threading.Lock()
+
+_MISSING = object()
+
+# Viimeksi nähdyt bom_cache_versions-laskurit
+_versions: dict[str, int] = {}
+_versions_checked_at = float("-inf")
+_versions_lock = threading.Lock()
+
+_SELECT_CACHE_VERSIONS = """
+SELECT name, SUM(version)::bigint
+FROM bom_cache_versions
+GROUP BY name
+"""
+
+
+def _requirements(scope: str) -> str:
+    """Tarpeet rajauksen tilauksille (aina vähintään yksi rivi)"""
+    return f"""
+WITH scoped_orders AS (
+    SELECT o.id, o.product_id, o.quantity
+    FROM production_orders o
+    WHERE {scope}
+),
+totals AS (
+    SELECT
+        b.material_code,
+        MAX(b.material_name) AS material_name,
+        b.unit,
+        SUM(o.quantity * b.quantity) AS quantity,
+        COUNT(DISTINCT o.id) AS order_count
+    FROM scoped_orders o
+    JOIN bom_items b ON b.product_id = o.product_id
+    GROUP BY b.material_code, b.unit
+)
+SELECT
+    t.material_code,
+    t.material_name,
+    t.unit,
+    t.quantity,
+    t.order_count,
+    (SELECT COUNT(*) FROM scoped_orders) AS scope_orders,
+    (
+        SELECT COUNT(*) FROM scoped_orders o
+        WHERE NOT EXISTS (SELECT 1 FROM bom_items b WHERE b.product_id = o.product_id)
+    ) AS orders_without_bom
+FROM (SELECT 1) AS one
+-- Rajaus ilman BOM-rivejä palauttaa silti laskurit (t.* = NULL)
+LEFT JOIN totals t ON true
+ORDER BY t.material_code, t.unit
+"""
+
+
+def _product_quantities(scope: str) -> str:
+    """Rajauksen tilaukset tuotteittain monitasoista purkua varten"""
+    return f"""
+SELECT o.product_id, SUM(o.quantity), COUNT(*)
+FROM production_orders o
+WHERE {scope}
+GROUP BY o.product_id
+"""
+
+
+_PLAN_SCOPE = """o.id IN (
+        SELECT production_order_id FROM weekly_plan_items
+        WHERE weekly_plan_id = :weekly_plan_id
+    )"""
+
+_RANGE_SCOPE = "o.ship_date BETWEEN :start AND :end"
+
+_REQUIREMENTS_FOR_PLAN = _requirements(_PLAN_SCOPE)
+
+_REQUIREMENTS_FOR_RANGE = _requirements(_RANGE_SCOPE)
+
+_PRODUCTS_FOR_PLAN = _product_quantities(_PLAN_SCOPE)
+
+_PRODUCTS_FOR_RANGE = _product_quantities(_RANGE_SCOPE)
+
+_SELECT_ITEM_NUMBERS = """
+SELECT item_number, id
+FROM products
+WHERE item_number = ANY(CAST(:codes AS varchar[]))
+"""
+
+_SELECT_BOMS = """
+SELECT product_id, material_code, material_name, unit, quantity
+FROM bom_items
+WHERE product_id = ANY(CAST(:product_ids AS integer[]))
+ORDER BY product_id, id
+"""
+
+
+@dataclass(frozen=True)
+class BOMLine:
+    material_code: str
+    material_name: Optional[str]
+    unit: Optional[str]
+    quantity: Decimal
+
+
+class BOMCycleError(ValueError):
+    """Tuote sisältää itsensä (suoraan tai alikokoonpanojen kautta)"""
+
+    def __init__(self, path: list[str]):
+        self.path = path
+        super().__init__(f"BOM-rakenteessa on kierre: {' -> '.join(path)}")
+
+
+def _to_response(rows, **scope) -> MaterialRequirements:
+    order_count = rows[0].scope_orders if rows else 0
+    orders_without_bom = rows[0].orders_without_bom if rows else 0
+    return MaterialRequirements(
+        **scope,
+        order_count=order_count,
+        orders_without_bom=orders_without_bom,
+        items=[
+            MaterialRequirement(
+                material_code=row.material_code,
+                material_name=row.material_name,
+                unit=row.unit,
+                quantity=row.quantity,
+                order_count=row.order_count,
+            )
+            for row in rows
+            if row.material_code is not None
+        ],
+    )
+
+
+def requirements_for_plan(
+    db: Session, weekly_plan_id: int, *, multi_level: bool = False
+) -> MaterialRequirements:
+    """Viikkosuunnitelman tilausten materiaalitarpeet"""
+    if multi_level:
+        rows = db.execute(
+            text(_PRODUCTS_FOR_PLAN), {"weekly_plan_id": weekly_plan_id}
+        ).all()
+        return _aggregate(db, rows, multi_level=True, weekly_plan_id=weekly_plan_id)
+
+    rows = db.execute(
+        text(_REQUIREMENTS_FOR_PLAN), {"weekly_plan_id": weekly_plan_id}
+    ).all()
+    return _to_response(rows, weekly_plan_id=weekly_plan_id)
+
+
+def requirements_for_range(
+    db: Session, start: date, end: date, *, multi_level: bool = False
+) -> MaterialRequirements:
+    """Tilaukset joiden toimituspäivä on välillä start..end (mukaan lukien)"""
+    if multi_level:
+        rows = db.execute(
+            text(_PRODUCTS_FOR_RANGE), {"start": start, "end": end}
+        ).all()
+        return _aggregate(db, rows, multi_level=True, start=start, end=end)
+
+    rows = db.execute(text(_REQUIREMENTS_FOR_RANGE), {"start": start, "end": end}).all()
+    return _to_response(rows, start=start, end=end)
+
+
+def check_versions(db: Session) -> None:
+    """
+    Tyhjennä välimuistit jos BOM-rivit tai tuotenumerot ovat muuttuneet
+    (myös toisessa prosessissa). Laskuri luetaan ennen dataa samassa
+    sessiossa, joten välimuistiin ei tallennu laskuria vanhempaa dataa.
+    """
+    global _versions_checked_at
+    now = time.monotonic()
+    if now - _versions_checked_at < settings.BOM_CACHE_VERSION_CHECK_SECONDS:
+        return
+    versions = dict(db.execute(text(_SELECT_CACHE_VERSIONS)).all())
+    with _versions_lock:
+        _versions_checked_at = now
+        changed = {name for name in versions if _versions.get(name) != versions[name]}
+        _versions.update(versions)
+
+    if "bom" in changed:
+        invalidate_products()
+    if "item_numbers" in changed:
+        invalidate_item_numbers()
+
+
+def get_boms(db: Session, product_ids: Iterable[int]) -> dict[int, tuple[BOMLine, ...]]:
+    """
+    Tuotteiden BOM-rivit välimuistin kautta. Puuttuvat tuotteet haetaan
+    yhdellä kyselyllä; tuote ilman BOM-rivejä tallennetaan tyhjänä.
+    """
+    check_versions(db)
+    generation = bom_cache.generation
+    boms: dict[int, tuple[BOMLine, ...]] = {}
+    missing = []
+    for product_id in set(product_ids):
+        lines = bom_cache.get(product_id)
+        if lines is None:
+            missing.append(product_id)
+        else:
+            boms[product_id] = lines
+
+    if missing:
+        fetched: dict[int, list[BOMLine]] = {product_id: [] for product_id in missing}
+        for product_id, code, name, unit, quantity in db.execute(
+            text(_SELECT_BOMS), {"product_ids": missing}
+        ):
+            fetched[product_id].append(BOMLine(code, name, unit, quantity))
+        for product_id, lines in fetched.items():
+            boms[product_id] = tuple(lines)
+            bom_cache.set(product_id, boms[product_id], generation)
+
+    return boms
+
+
+def resolve_item_numbers(
+    db: Session, codes: Iterable[str]
+) -> dict[str, Optional[int]]:
+    """material_code -> tuotteen id (None jos koodi ei ole tuote)"""
+    check_versions(db)
+    generation = item_number_cache.generation
+    resolved: dict[str, Optional[int]] = {}
+    missing = []
+    for code in set(codes):
+        product_id = item_number_cache.get(code, _MISSING)
+        if product_id is _MISSING:
+            missing.append(code)
+        else:
+            resolved[code] = product_id
+
+    if missing:
+        found = dict(db.execute(text(_SELECT_ITEM_NUMBERS), {"codes": missing}).all())
+        for code in missing:
+            resolved[code] = found.get(code)
+            item_number_cache.set(code, resolved[code], generation)
+
+    return resolved
+
+
+def get_flattened(
+    db: Session, product_ids: Iterable[int]
+) -> dict[int, tuple[BOMLine, ...]]:
+    """
+    Tuotteiden litistetyt tarvevektorit (lehtimateriaalit per kappale).
+    Rakennepuuta ladataan tasoittain vain muistista puuttuvien tuotteiden
+    osalta: yksi BOM-kysely ja yksi item_number-kysely per taso.
+    """
+    check_versions(db)
+    generation = flattened_cache.generation
+    memo: dict[int, tuple[BOMLine, ...]] = {}
+    pending = set()
+    for product_id in set(product_ids):
+        lines = flattened_cache.get(product_id)
+        if lines is None:
+            pending.add(product_id)
+        else:
+            memo[product_id] = lines
+    if not pending:
+        return memo
+    roots = set(memo) | pending
+
+    boms: dict[int, tuple[BOMLine, ...]] = {}
+    resolved: dict[str, Optional[int]] = {}
+    frontier = pending
+    while frontier:
+        level = get_boms(db, frontier)
+        boms.update(level)
+        codes = {
+            line.material_code
+            for lines in level.values()
+            for line in lines
+            if line.material_code not in resolved
+        }
+        resolved.update(resolve_item_numbers(db, codes))
+
+        frontier = set()
+        for code in codes:
+            child = resolved[code]
+            if child is None or child in boms or child in memo:
+                continue
+            lines = flattened_cache.get(child)
+            if lines is None:
+                frontier.add(child)
+            else:
+                memo[child] = lines
+
+    labels = {product_id: code for code, product_id in resolved.items() if product_id}
+    path: list[int] = []
+    edges: list[tuple[int, int]] = []
+
+    def flatten(product_id: int) -> tuple[BOMLine, ...]:
+        if product_id in memo:
+            return memo[product_id]
+        if product_id in path:
+            cycle = path[path.index(product_id) :] + [product_id]
+            raise BOMCycleError([labels.get(p, str(p)) for p in cycle])
+
+        path.append(product_id)
+        quantities: dict[tuple[str, Optional[str]], Decimal] = defaultdict(Decimal)
+        names: dict[tuple[str, Optional[str]], Optional[str]] = {}
+        for line in boms[product_id]:
+            child = resolved[line.material_code]
+            parts = [(line, line.quantity)]
+            if child is not None:
+                # Myös lehtenä käytetty tuote kirjataan, jotta sen myöhemmin
+                # lisätty BOM tyhjentää tämän vektorin
+                edges.append((child, product_id))
+                sub_lines = flatten(child)
+                # Tuote ilman omia BOM-rivejä on ostettava materiaali
+                if sub_lines:
+                    parts = [(sub, line.quantity * sub.quantity) for sub in sub_lines]
+            for part, quantity in parts:
+                key = (part.material_code, part.unit)
+                quantities[key] += quantity
+                name = part.material_name
+                if name is not None and (names.get(key) is None or name > names[key]):
+                    names[key] = name
+        path.pop()
+
+        memo[product_id] = tuple(
+            BOMLine(code, names.get((code, unit)), unit, quantities[(code, unit)])
+            for code, unit in sorted(quantities, key=_material_sort_key)
+        )
+        return memo[product_id]
+
+    for product_id in pending:
+        flatten(product_id)
+
+    with _parents_lock:
+        for child, parent in edges:
+            _parents[child].add(parent)
+    for product_id in boms:
+        flattened_cache.set(product_id, memo[product_id], generation)
+
+    return {product_id: memo[product_id] for product_id in roots}
+
+
+def requirements_for_lines(
+    db: Session, lines: Iterable[tuple[int, int]], *, multi_level: bool = False
+) -> MaterialRequirements:
+    """What-if: materiaalitarpeet annetuille (product_id, quantity) -riveille"""
+    return _aggregate(
+        db, ((product_id, quantity, 1) for product_id, quantity in lines), multi_level
+    )
+
+
+def _aggregate(
+    db: Session,
+    rows: Iterable[tuple[Optional[int], int, int]],
+    multi_level: bool,
+    **scope,
+) -> MaterialRequirements:
+    """
+    Laske tarpeet (product_id, määrä, tilausrivejä) -riveistä. Rivit
+    yhdistetään ensin tuotteittain, jolloin BOM käydään läpi kerran per
+    tuote eikä kerran per tilaus.
+    """
+    product_quantities: dict[Optional[int], int] = defaultdict(int)
+    product_lines: dict[Optional[int], int] = defaultdict(int)
+    line_count = 0
+    for product_id, quantity, lines in rows:
+        product_quantities[product_id] += quantity
+        product_lines[product_id] += lines
+        line_count += lines
+
+    product_ids = [product_id for product_id in product_quantities if product_id]
+    if multi_level:
+        vectors = get_flattened(db, product_ids)
+    else:
+        vectors = get_boms(db, product_ids)
+
+    quantities: dict[tuple[str, Optional[str]], Decimal] = defaultdict(Decimal)
+    line_counts: dict[tuple[str, Optional[str]], int] = defaultdict(int)
+    names: dict[tuple[str, Optional[str]], Optional[str]] = {}
+    without_bom = 0
+    for product_id, quantity in product_quantities.items():
+        bom = vectors.get(product_id)
+        if not bom:
+            without_bom += product_lines[product_id]
+            continue
+        seen = set()
+        for line in bom:
+            key = (line.material_code, line.unit)
+            quantities[key] += quantity * line.quantity
+            if key not in seen:
+                line_counts[key] += product_lines[product_id]
+                seen.add(key)
+            # Sama valinta kuin SQL:n MAX(material_name)
+            if line.material_name is not None and (
+                names.get(key) is None or line.material_name > names[key]
+            ):
+                names[key] = line.material_name
+
+    return MaterialRequirements(
+        **scope,
+        order_count=line_count,
+        orders_without_bom=without_bom,
+        items=[
+            MaterialRequirement(
+                material_code=code,
+                material_name=names.get((code, unit)),
+                unit=unit,
+                quantity=quantities[(code, unit)],
+                order_count=line_counts[(code, unit)],
+            )
+            for code, unit in sorted(quantities, key=_material_sort_key)
+        ],
+    )
+
+
+def _material_sort_key(key: tuple[str, Optional[str]]):
+    # Sama järjestys kuin SQL:n ORDER BY material_code, unit (NULL viimeisenä)
+    code, unit = key
+    return code, unit is None, unit or ""
+
+
+def invalidate_products(product_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Tuotteiden BOM muuttui: tyhjennä niiden BOM-rivit sekä niiden ja kaikkien
+    niitä alikokoonpanona käyttävien tuotteiden litistetyt vektorit
+    (ilman argumenttia kaikki).
+    """
+    if product_ids is None:
+        bom_cache.invalidate()
+        flattened_cache.invalidate()
+        with _parents_lock:
+            _parents.clear()
+        return
+
+    product_ids = list(product_ids)
+    affected = set()
+    with _parents_lock:
+        stack = list(product_ids)
+        while stack:
+            product_id = stack.pop()
+            if product_id not in affected:
+                affected.add(product_id)
+                stack.extend(_parents.pop(product_id, ()))
+
+    for product_id in product_ids:
+        bom_cache.invalidate(product_id)
+    for product_id in affected:
+        flattened_cache.invalidate(product_id)
+
+
+def invalidate_item_numbers() -> None:
+    """
+    Tuote lisättiin, poistettiin tai sen item_number muuttui: koodien
+    tulkinta alikokoonpanoiksi voi muuttua, joten vektorit lasketaan
+    uudelleen.
+    """
+    item_number_cache.invalidate()
+    flattened_cache.invalidate()
+    with _parents_lock:
+        _parents.clear()
@@ -0,0 +1,168 @@
+"""
+Prosessinsisäinen rekisteri avoimista tuotantotehtävistä (ended_at IS NULL)
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.config import settings
+from app.models.production_task import ProductionTask
+
+
+@dataclass(frozen=True)
+class OpenTaskEntry:
+    """Kevyt kopio avoimesta tehtävästä (ei ORM-sidosta sessioon)"""
+
+    task_id: int
+    production_order_id: int
+    order_number: Optional[str]
+    employee_id: Optional[int]
+    employee_name: Optional[str]
+    department_id: Optional[int]
+    work_phase_id: Optional[int]
+    work_phase_name: Optional[str]
+    started_at: datetime
+
+    @classmethod
+    def from_task(cls, task: ProductionTask) -> "OpenTaskEntry":
+        return cls(
+            task_id=task.id,
+            production_order_id=task.production_order_id,
+            order_number=(
+                task.production_order.order_number if task.production_order else None
+            ),
+            employee_id=task.employee_id,
+            employee_name=task.employee.full_name if task.employee else None,
+            department_id=task.department_id,
+            work_phase_id=task.work_phase_id,
+            work_phase_name=task.work_phase.name if task.work_phase else None,
+            started_at=task.started_at,
+        )
+
+
+class OpenTaskRegistry:
+    """
+    Avoimet tehtävät muistissa osastoittain.
+
+    Kirjoitukset (aloitus/lopetus/poisto) päivittävät rekisterin
+    copy-on-write -periaatteella, joten lukijat eivät tarvitse lukkoa.
+    Rekisteri on prosessikohtainen: se rakennetaan käynnistyksessä
+    tietokannasta ja pidetään ajan tasalla tehtävien CRUD-poluissa. Toisen
+    workerin muutosten takia se ladataan uudelleen kun se on vanhempi kuin
+    OPEN_TASK_MAX_AGE_SECONDS.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.RLock()
+        self._tasks: dict[int, OpenTaskEntry] = {}
+        self._all: tuple[OpenTaskEntry, ...] = ()
+        self._by_department: dict[Optional[int], tuple[OpenTaskEntry, ...]] = {}
+        self._loaded_at: Optional[float] = None
+        # Latauksen aikana tulleet muutokset, sovelletaan kyselyn tuloksen päälle
+        self._journal: Optional[list[tuple[int, Optional[OpenTaskEntry]]]] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    @property
+    def is_stale(self) -> bool:
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > settings.OPEN_TASK_MAX_AGE_SECONDS
+        )
+
+    def rebuild(self, db: Session) -> int:
+        """Lataa avoimet tehtävät tietokannasta (partial index ix_production_tasks_open)"""
+        with self._rebuild_lock:
+            with self._lock:
+                self._journal = []
+            try:
+                tasks = (
+                    db.query(ProductionTask)
+                    .options(
+                        joinedload(ProductionTask.employee),
+                        joinedload(ProductionTask.production_order),
+                        joinedload(ProductionTask.work_phase),
+                    )
+                    .filter(ProductionTask.ended_at.is_(None))
+                    .all()
+                )
+                entries = {task.id: OpenTaskEntry.from_task(task) for task in tasks}
+            except Exception:
+                with self._lock:
+                    self._journal = None
+                raise
+
+            with self._lock:
+                # Kyselyn ja vaihdon välissä commitoidut aloitukset ja
+                # lopetukset eivät välttämättä näy kyselyn tuloksessa
+                for task_id, entry in self._journal:
+                    if entry is None:
+                        entries.pop(task_id, None)
+                    else:
+                        entries[task_id] = entry
+                self._journal = None
+                self._tasks = entries
+                self._publish()
+                self._loaded_at = time.monotonic()
+
+        return len(entries)
+
+    def refresh(self, db: Session) -> None:
+        """Lataa uudelleen jos vanhentunut (rinnakkaiset kutsujat odottavat yhtä)"""
+        if self.is_stale:
+            with self._rebuild_lock:
+                if self.is_stale:
+                    self.rebuild(db)
+
+    def add(self, task: ProductionTask) -> None:
+        """Lisää tai päivitä avoin tehtävä"""
+        entry = OpenTaskEntry.from_task(task)
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((entry.task_id, entry))
+            tasks = dict(self._tasks)
+            tasks[entry.task_id] = entry
+            self._tasks = tasks
+            self._publish()
+
+    def remove(self, task_id: int) -> None:
+        """Poista tehtävä (päätetty tai poistettu)"""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((task_id, None))
+            if task_id not in self._tasks:
+                return
+            tasks = dict(self._tasks)
+            del tasks[task_id]
+            self._tasks = tasks
+            self._publish()
+
+    def list(self, department_id: Optional[int] = None) -> tuple[OpenTaskEntry, ...]:
+        """Palauta avoimet tehtävät (aloitusajan mukaan), valinnaisesti osastolle"""
+        if department_id is None:
+            return self._all
+        return self._by_department.get(department_id, ())
+
+    def _publish(self) -> None:
+        # Kutsutaan lukon sisällä: rakennetaan uudet valmiiksi järjestetyt tuplet
+        ordered = tuple(sorted(self._tasks.values(), key=lambda e: e.started_at))
+        by_department: dict[Optional[int], list[OpenTaskEntry]] = {}
+        for entry in ordered:
+            by_department.setdefault(entry.department_id, []).append(entry)
+
+        self._by_department = {
+            dept_id: tuple(entries) for dept_id, entries in by_department.items()
+        }
+        self._all = ordered
+
+
+# Luo singleton-instanssi
+open_task_registry = OpenTaskRegistry()
@@ -0,0 +1,83 @@
+"""
+Tilausten työmääräarvion (production_orders.estimated_minutes) ylläpito
+
+    estimated_minutes = quantity * standard_time_minutes * efficiency_multiplier
+
+Tilauksen oma muutos (lisäys, quantity, product_id) lasketaan
+tietokantatriggerillä. Tuotteen standardiajan / kategorian tai kategorian
+kertoimen muutos päivittää kaikki tuotteen tilaukset yhdellä lauseella,
+ja muuttuneet arviot heijastetaan WeeklyPlanItem.estimated_hours -kenttään.
+Funktiot eivät committaa - kutsutaan samassa transaktiossa kuin muutos.
+"""
+
+from typing import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def _recompute(scope: str) -> str:
+    """Päivitä arviot rajaukselle ja palauta (tilaukset, suunnitelmarivit)"""
+    return f"""
+WITH estimates AS (
+    SELECT
+        o.id,
+        ROUND(
+            o.quantity * pr.standard_time_minutes
+                * COALESCE(c.efficiency_multiplier, 1),
+            2
+        ) AS estimated_minutes
+    FROM production_orders o
+    JOIN products pr ON pr.id = o.product_id
+    LEFT JOIN product_categories c ON c.code = pr.category_code
+    WHERE {scope}
+),
+updated AS (
+    UPDATE production_orders o
+    SET estimated_minutes = e.estimated_minutes
+    FROM estimates e
+    WHERE o.id = e.id
+        AND o.estimated_minutes IS DISTINCT FROM e.estimated_minutes
+    RETURNING o.id, o.estimated_minutes
+),
+plan_items AS (
+    UPDATE weekly_plan_items i
+    SET estimated_hours = ROUND(u.estimated_minutes / 60, 2)
+    FROM updated u
+    WHERE i.production_order_id = u.id
+    RETURNING i.id
+)
+SELECT (SELECT COUNT(*) FROM updated), (SELECT COUNT(*) FROM plan_items)
+"""
+
+
+_RECOMPUTE_PRODUCTS = _recompute("o.product_id = ANY(CAST(:product_ids AS integer[]))")
+
+_RECOMPUTE_CATEGORY = _recompute("pr.category_code = :category_code")
+
+_RECOMPUTE_ALL = _recompute("true")
+
+
+def recompute_for_products(
+    db: Session, product_ids: Iterable[int]
+) -> tuple[int, int]:
+    """Tuotteen standardiaika tai kategoria muuttui"""
+    return tuple(
+        db.execute(
+            text(_RECOMPUTE_PRODUCTS), {"product_ids": list(product_ids)}
+        ).one()
+    )
+
+
+def recompute_for_category(db: Session, category_code: str) -> tuple[int, int]:
+    """Kategorian efficiency_multiplier muuttui"""
+    return tuple(
+        db.execute(
+            text(_RECOMPUTE_CATEGORY), {"category_code": category_code}
+        ).one()
+    )
+
+
+def recompute_all(db: Session) -> tuple[int, int]:
+    """Korjaa kaikki arviot (esim. suoran tietokantamuutoksen jälkeen)"""
+    return tuple(db.execute(text(_RECOMPUTE_ALL)).one())
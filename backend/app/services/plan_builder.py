@@ -0,0 +1,262 @@
+"""
+Viikkosuunnitelmien automaattinen täyttö kapasiteetin mukaan
+
+Avoimet tilaukset järjestetään toimituspäivän, prioriteetin (suurin
+aiempi WeeklyPlanItem.priority) ja jonon sijainnin mukaan ja sijoitetaan
+ensimmäiselle viikolle, jolla kapasiteettia (WeeklyPlan.total_planned_hours)
+on jäljellä (first-fit). Arviona käytetään tilauksen estimated_minutes
+-kenttää (quantity * standard_time_minutes * efficiency_multiplier).
+
+Tilaus on avoin, jos se ei ole valmis viimeisellä osastolla
+(suurin display_order) eikä se ole jo suunniteltu horisontin viikoille tai
+niiden jälkeisille viikoille.
+Tilaukset ladataan yhdellä kyselyllä ja rivit kirjoitetaan bulk insertillä.
+Samanaikaiset ajot sarjallistetaan transaktiotason advisory-lukolla.
+"""
+
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.department import Department
+from app.models.weekly_plan import WeeklyPlan, WeeklyPlanItem
+
+# Kapasiteettijäännös jota pienempää ei enää yritetä täyttää
+_MIN_FREE_HOURS = 0.01
+
+# pg_advisory_xact_lock-avain: yksi täyttöajo kerrallaan
+_BUILD_LOCK_KEY = 0x5745454B  # "WEEK"
+
+_SELECT_OPEN_ORDERS = """
+SELECT
+    o.id,
+    o.ship_date,
+    COALESCE(o.estimated_minutes, 0)::float8 / 60 AS estimated_hours,
+    COALESCE(prio.priority, 0) AS priority
+FROM production_orders o
+LEFT JOIN LATERAL (
+    SELECT MAX(i.priority) AS priority
+    FROM weekly_plan_items i
+    WHERE i.production_order_id = o.id
+) prio ON true
+WHERE (
+        :replace
+        OR NOT EXISTS (
+            SELECT 1 FROM weekly_plan_items i
+            WHERE i.production_order_id = o.id
+                AND i.weekly_plan_id = ANY(CAST(:plan_ids AS integer[]))
+        )
+    )
+    -- Horisontin jälkeisille viikoille jo suunniteltuja ei siirretä
+    AND NOT EXISTS (
+        SELECT 1
+        FROM weekly_plan_items i
+        JOIN weekly_plans p ON p.id = i.weekly_plan_id
+        WHERE i.production_order_id = o.id
+            AND (p.year, p.week_number) > (:last_year, :last_week)
+    )
+    AND NOT EXISTS (
+        SELECT 1 FROM order_department_status ods
+        WHERE ods.production_order_id = o.id
+            AND ods.department_id = :last_department_id
+            AND ods.status IN ('COMPLETED', 'OVER_QUANTITY')
+    )
+ORDER BY o.ship_date NULLS LAST, priority DESC, o.queue_position, o.id
+"""
+
+_SELECT_PLAN_USAGE = """
+SELECT
+    weekly_plan_id,
+    COALESCE(SUM(estimated_hours), 0)::float8,
+    COALESCE(MAX(planned_sequence), 0)
+FROM weekly_plan_items
+WHERE weekly_plan_id = ANY(CAST(:plan_ids AS integer[]))
+GROUP BY weekly_plan_id
+"""
+
+
+@dataclass
+class WeekCapacity:
+    """Yhden viikon kapasiteetti ja täyttö"""
+
+    weekly_plan_id: int
+    year: int
+    week_number: int
+    capacity_hours: float
+    planned_hours: float = 0.0
+    next_sequence: int = 1
+    orders_added: int = 0
+
+    @property
+    def free_hours(self) -> float:
+        return self.capacity_hours - self.planned_hours
+
+
+@dataclass
+class PlanBuildResult:
+    weeks: list[WeekCapacity] = field(default_factory=list)
+    missing_weeks: list[tuple[int, int]] = field(default_factory=list)
+    planned_orders: int = 0
+    unplanned_order_ids: list[int] = field(default_factory=list)
+    duration_seconds: float = 0.0
+
+
+def horizon(start_year: int, start_week: int, weeks: int) -> list[tuple[int, int]]:
+    """(ISO-vuosi, viikko) -parit alkaen annetusta viikosta"""
+    monday = date.fromisocalendar(start_year, start_week, 1)
+    return [
+        (d.isocalendar()[0], d.isocalendar()[1])
+        for d in (monday + timedelta(weeks=i) for i in range(weeks))
+    ]
+
+
+def assign_first_fit(
+    orders: list[tuple[int, Optional[date], float, int]], weeks: list[WeekCapacity]
+) -> tuple[list[dict], list[int]]:
+    """
+    Sijoita tilaukset järjestyksessä ensimmäiselle viikolle johon ne mahtuvat.
+    Palauttaa: (lisättävät WeeklyPlanItem-rivit, sijoittamattomat tilaus-ID:t)
+    """
+    rows: list[dict] = []
+    unplanned: list[int] = []
+    # Viikot ennen tätä indeksiä ovat täynnä, niitä ei käydä enää läpi
+    first_open = 0
+
+    for order_id, _ship_date, hours, priority in orders:
+        while (
+            first_open < len(weeks) and weeks[first_open].free_hours < _MIN_FREE_HOURS
+        ):
+            first_open += 1
+
+        for week in weeks[first_open:]:
+            if hours <= week.free_hours:
+                rows.append(
+                    {
+                        "weekly_plan_id": week.weekly_plan_id,
+                        "production_order_id": order_id,
+                        "planned_sequence": week.next_sequence,
+                        "estimated_hours": round(hours, 2),
+                        "priority": priority,
+                    }
+                )
+                week.planned_hours += hours
+                week.next_sequence += 1
+                week.orders_added += 1
+                break
+        else:
+            unplanned.append(order_id)
+
+    return rows, unplanned
+
+
+def build_plans(
+    db: Session,
+    *,
+    start_year: int,
+    start_week: int,
+    weeks: int = 12,
+    replace: bool = False,
+    dry_run: bool = False,
+) -> PlanBuildResult:
+    """
+    Täytä horisontin viikkosuunnitelmat avoimilla tilauksilla.
+    replace=True poistaa ensin horisontin nykyiset rivit ja suunnittelee alusta.
+    Viikot joilla ei ole WeeklyPlan-riviä ohitetaan (missing_weeks).
+    """
+    started = time.perf_counter()
+    result = PlanBuildResult()
+
+    keys = horizon(start_year, start_week, weeks)
+    plans = {
+        (p.year, p.week_number): p
+        for p in db.query(WeeklyPlan).filter(
+            WeeklyPlan.year.in_({year for year, _ in keys}),
+            WeeklyPlan.week_number.in_({week for _, week in keys}),
+        )
+    }
+    for key in keys:
+        plan = plans.get(key)
+        if plan is None:
+            result.missing_weeks.append(key)
+            continue
+        result.weeks.append(
+            WeekCapacity(
+                weekly_plan_id=plan.id,
+                year=plan.year,
+                week_number=plan.week_number,
+                capacity_hours=float(plan.total_planned_hours or 0),
+            )
+        )
+
+    plan_ids = [w.weekly_plan_id for w in result.weeks]
+    if not plan_ids:
+        result.duration_seconds = time.perf_counter() - started
+        return result
+
+    try:
+        # Rinnakkainen ajo lukisi samat avoimet tilaukset ja törmäisi
+        # uq_plan_order-rajoitteeseen; lukko vapautuu commitissa/rollbackissa
+        db.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"), {"key": _BUILD_LOCK_KEY}
+        )
+
+        last_department_id = (
+            db.query(Department.id)
+            .filter(Department.is_active == True)
+            .order_by(Department.display_order.desc().nullslast())
+            .limit(1)
+            .scalar()
+        )
+
+        # Tilaukset haetaan ennen poistoa, jotta aiemmat prioriteetit säilyvät
+        orders = db.execute(
+            text(_SELECT_OPEN_ORDERS),
+            {
+                "plan_ids": plan_ids,
+                "last_department_id": last_department_id,
+                "replace": replace,
+                "last_year": keys[-1][0],
+                "last_week": keys[-1][1],
+            },
+        ).all()
+
+        if replace:
+            db.execute(
+                delete(WeeklyPlanItem).where(
+                    WeeklyPlanItem.weekly_plan_id.in_(plan_ids)
+                )
+            )
+        else:
+            by_id = {w.weekly_plan_id: w for w in result.weeks}
+            for plan_id, used_hours, max_sequence in db.execute(
+                text(_SELECT_PLAN_USAGE), {"plan_ids": plan_ids}
+            ):
+                by_id[plan_id].planned_hours = used_hours
+                by_id[plan_id].next_sequence = max_sequence + 1
+
+        rows, result.unplanned_order_ids = assign_first_fit(orders, result.weeks)
+        result.planned_orders = len(rows)
+
+        if dry_run:
+            db.rollback()
+        else:
+            if rows:
+                # Käsin lisätty rivi voi silti ehtiä väliin lukon ohi
+                db.execute(
+                    pg_insert(WeeklyPlanItem).on_conflict_do_nothing(
+                        constraint="uq_plan_order"
+                    ),
+                    rows,
+                )
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    result.duration_seconds = time.perf_counter() - started
+    return result
@@ -0,0 +1,152 @@
+"""
+Tuottavuusraportti porautumista varten: osasto -> työvaihe -> työntekijä
+
+Kaikki hierarkiatasot (ja kokonaissumma) lasketaan yhdellä
+ROLLUP-kyselyllä; GROUPING()-bittimaski kertoo rivin tason, jolloin
+oikea NULL (esim. tehtävä ilman työvaihetta) erottuu summarivistä.
+Tunnit lasketaan samoin kuin tehokkuuden rollupissa:
+    std_hours = Σ quantity_completed * standard_time_minutes / 60
+    efficiency = std_hours / worked_hours * 100
+
+Valmis puu pidetään välimuistissa jakson mukaan, joten solmun avaaminen
+käyttöliittymässä ei tee uutta kyselyä. Välimuisti tyhjennetään kun
+rollup on laskenut uusia tehtäviä.
+"""
+
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.schemas.efficiency_schema import ProductivityNode, ProductivityReport
+
+productivity_cache = TTLCache(
+    "productivity",
+    maxsize=128,
+    ttl_seconds=settings.PRODUCTIVITY_CACHE_TTL_SECONDS,
+)
+
+# GROUPING(department_id, work_phase_id, employee_id)
+_LEVEL_TOTAL = 0b111
+_LEVEL_DEPARTMENT = 0b011
+_LEVEL_PHASE = 0b001
+_LEVEL_EMPLOYEE = 0b000
+
+# Solmun id-sarake tasoittain (kokonaissummalla ei id:tä)
+_ID_COLUMN = {
+    _LEVEL_DEPARTMENT: "department_id",
+    _LEVEL_PHASE: "work_phase_id",
+    _LEVEL_EMPLOYEE: "employee_id",
+}
+
+_SELECT_PRODUCTIVITY = """
+WITH grouped AS (
+    SELECT
+        GROUPING(t.department_id, t.work_phase_id, t.employee_id) AS level,
+        t.department_id,
+        t.work_phase_id,
+        t.employee_id,
+        COUNT(*) AS tasks,
+        COALESCE(SUM(t.quantity_completed), 0)::float8 AS quantity,
+        COALESCE(SUM(t.duration_minutes), 0)::float8 / 60 AS worked_hours,
+        COALESCE(
+            SUM(t.quantity_completed * pr.standard_time_minutes), 0
+        )::float8 / 60 AS std_hours
+    FROM production_tasks t
+    JOIN production_orders o ON o.id = t.production_order_id
+    LEFT JOIN products pr ON pr.id = o.product_id
+    WHERE t.ended_at >= (CAST(:start AS date)::timestamp AT TIME ZONE :tz)
+        AND t.ended_at < ((CAST(:end AS date) + 1)::timestamp AT TIME ZONE :tz)
+        AND t.department_id IS NOT NULL
+    GROUP BY ROLLUP (t.department_id, t.work_phase_id, t.employee_id)
+)
+SELECT
+    g.level,
+    g.department_id,
+    g.work_phase_id,
+    g.employee_id,
+    -- level: 3 = osasto, 1 = työvaihe, 0 = työntekijä
+    COALESCE(
+        CASE g.level
+            WHEN 3 THEN d.name
+            WHEN 1 THEN wp.name
+            WHEN 0 THEN e.full_name
+        END,
+        ''
+    ) AS name,
+    g.tasks,
+    g.quantity,
+    g.worked_hours,
+    g.std_hours
+FROM grouped g
+LEFT JOIN departments d ON d.id = g.department_id
+LEFT JOIN work_phases wp ON wp.id = g.work_phase_id
+LEFT JOIN employees e ON e.id = g.employee_id
+ORDER BY
+    g.level DESC,
+    d.display_order NULLS LAST,
+    g.department_id,
+    wp.display_order NULLS LAST,
+    g.work_phase_id NULLS LAST,
+    e.full_name,
+    g.employee_id
+"""
+
+
+def _node(row) -> ProductivityNode:
+    return ProductivityNode(
+        id=getattr(row, _ID_COLUMN[row.level]) if row.level in _ID_COLUMN else None,
+        name=row.name or None,
+        tasks=row.tasks,
+        quantity=round(row.quantity, 2),
+        worked_hours=round(row.worked_hours, 2),
+        std_hours=round(row.std_hours, 2),
+        efficiency=(
+            round(row.std_hours / row.worked_hours * 100, 1)
+            if row.worked_hours > 0
+            else None
+        ),
+    )
+
+
+def build_report(db: Session, start: date, end: date) -> ProductivityReport:
+    """Laske koko puu yhdellä kyselyllä"""
+    rows = db.execute(
+        text(_SELECT_PRODUCTIVITY),
+        {"start": start, "end": end, "tz": settings.TIMEZONE},
+    ).all()
+
+    total: Optional[ProductivityNode] = None
+    departments: dict[int, ProductivityNode] = {}
+    phases: dict[tuple[int, Optional[int]], ProductivityNode] = {}
+
+    # Rivit tulevat tasoittain ylhäältä alas, joten vanhempi on aina jo luotu
+    for row in rows:
+        node = _node(row)
+        if row.level == _LEVEL_TOTAL:
+            total = node
+        elif row.level == _LEVEL_DEPARTMENT:
+            departments[row.department_id] = node
+            total.children.append(node)
+        elif row.level == _LEVEL_PHASE:
+            phases[(row.department_id, row.work_phase_id)] = node
+            departments[row.department_id].children.append(node)
+        else:
+            phases[(row.department_id, row.work_phase_id)].children.append(node)
+
+    if total is None:
+        # Varmuuden vuoksi: tyhjä jakso palauttaa tyhjän puun
+        total = ProductivityNode(
+            tasks=0, quantity=0, worked_hours=0, std_hours=0, efficiency=None
+        )
+    return ProductivityReport(start=start, end=end, total=total)
+
+
+def get_report(db: Session, start: date, end: date) -> ProductivityReport:
+    """build_report välimuistin kautta (avain: jakso)"""
+    return productivity_cache.get_or_set(
+        (start, end), lambda: build_report(db, start, end)
+    )
@@ -0,0 +1,221 @@
+"""
+Viikkosuunnitelmien kuormitus osastoittain (viikot x osastot)
+
+Suunniteltu työ (WeeklyPlanItem.estimated_hours, varalla tilauksen
+estimated_minutes) jaetaan osastoille historian aikaosuuksilla: tuotteen
+omat osuudet jos tuotetta on tehty, muuten kaikkien tehtävien osuudet.
+Kapasiteetti (WeeklyPlan.total_planned_hours) jaetaan osastoille
+aktiivisten työntekijöiden pääosaston mukaan.
+
+Osastojakauma riippuu vain historiajaksosta, joten se lasketaan omalla
+kyselyllään ja pidetään välimuistissa erikseen (share_cache). Viikkovälin
+suunniteltu työ ja kapasiteetti haetaan kahdella aggregaattikyselyllä ja
+tulos pidetään välimuistissa viikkovälin mukaan. Suunnitelmarivejä
+muuttavat toiminnot tyhjentävät load_cachen.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.schemas.weekly_plan_schema import WeeklyLoadMatrix
+
+load_cache = TTLCache(
+    "weekly_plan_load",
+    maxsize=64,
+    ttl_seconds=settings.WEEKLY_LOAD_CACHE_TTL_SECONDS,
+)
+# Osastojakauma ei riipu viikkovälistä eikä suunnitelmariveistä
+share_cache = TTLCache(
+    "weekly_plan_load_shares",
+    maxsize=8,
+    ttl_seconds=settings.WEEKLY_LOAD_CACHE_TTL_SECONDS,
+)
+
+# Tehtävien kesto tuotteittain ja osastoittain osastojakaumaa varten
+_SELECT_TASK_MINUTES = """
+SELECT o.product_id, t.department_id, SUM(t.duration_minutes)::float8
+FROM production_tasks t
+JOIN production_orders o ON o.id = t.production_order_id
+JOIN departments d ON d.id = t.department_id AND d.is_active
+WHERE t.ended_at >= now() - make_interval(days => :history_days)
+    AND t.duration_minutes > 0
+GROUP BY o.product_id, t.department_id
+"""
+
+_SELECT_CAPACITY = """
+WITH plans AS (
+    SELECT id, year, week_number, COALESCE(total_planned_hours, 0) AS capacity
+    FROM weekly_plans
+    WHERE (year, week_number) >= (:from_year, :from_week)
+        AND (year, week_number) <= (:to_year, :to_week)
+),
+active_departments AS (
+    SELECT id FROM departments WHERE is_active
+),
+staff_share AS (
+    SELECT
+        e.primary_department_id AS department_id,
+        COUNT(*)::numeric / SUM(COUNT(*)) OVER () AS share
+    FROM employees e
+    JOIN active_departments d ON d.id = e.primary_department_id
+    WHERE e.is_active
+    GROUP BY e.primary_department_id
+    UNION ALL
+    SELECT id, 1.0 / COUNT(*) OVER ()
+    FROM active_departments
+    WHERE NOT EXISTS (
+        SELECT 1 FROM employees e
+        JOIN active_departments d ON d.id = e.primary_department_id
+        WHERE e.is_active
+    )
+)
+SELECT
+    p.year,
+    p.week_number,
+    d.id,
+    (p.capacity * COALESCE(st.share, 0))::float8
+FROM active_departments d
+-- Osastot palautetaan myös kun välillä ei ole suunnitelmia (p.* = NULL)
+LEFT JOIN plans p ON true
+LEFT JOIN staff_share st ON st.department_id = d.id
+"""
+
+_SELECT_PLANNED = """
+SELECT
+    p.year,
+    p.week_number,
+    o.product_id,
+    SUM(COALESCE(i.estimated_hours, o.estimated_minutes / 60, 0))::float8
+FROM weekly_plans p
+JOIN weekly_plan_items i ON i.weekly_plan_id = p.id
+JOIN production_orders o ON o.id = i.production_order_id
+WHERE (p.year, p.week_number) >= (:from_year, :from_week)
+    AND (p.year, p.week_number) <= (:to_year, :to_week)
+GROUP BY p.year, p.week_number, o.product_id
+"""
+
+
+@dataclass
+class DepartmentShares:
+    """Työn aikaosuudet osastoittain historiajaksolta"""
+
+    by_product: dict[int, dict[int, float]] = field(default_factory=dict)
+    overall: dict[int, float] = field(default_factory=dict)
+
+
+def department_shares(db: Session, history_days: int) -> DepartmentShares:
+    """Tuotekohtaiset ja kaikkien tehtävien osastojakaumat"""
+    product_minutes: dict[int, dict[int, float]] = {}
+    overall_minutes: dict[int, float] = {}
+    for product_id, dept_id, minutes in db.execute(
+        text(_SELECT_TASK_MINUTES), {"history_days": history_days}
+    ):
+        overall_minutes[dept_id] = overall_minutes.get(dept_id, 0.0) + minutes
+        if product_id is not None:
+            product_minutes.setdefault(product_id, {})[dept_id] = minutes
+
+    def normalized(minutes: dict[int, float]) -> dict[int, float]:
+        total = sum(minutes.values())
+        return {dept_id: m / total for dept_id, m in minutes.items()}
+
+    return DepartmentShares(
+        by_product={
+            product_id: normalized(minutes)
+            for product_id, minutes in product_minutes.items()
+        },
+        overall=normalized(overall_minutes),
+    )
+
+
+def week_axis(start: date, end: date) -> list[tuple[int, int]]:
+    """(ISO-vuosi, viikko) -parit päivien start..end viikoille"""
+    monday = start - timedelta(days=start.weekday())
+    weeks = []
+    while monday <= end:
+        year, week, _ = monday.isocalendar()
+        weeks.append((year, week))
+        monday += timedelta(weeks=1)
+    return weeks
+
+
+def build_load(
+    db: Session, start: date, end: date, *, history_days: int = 365
+) -> WeeklyLoadMatrix:
+    """Laske kuormitusmatriisi; osastojakauma tulee share_cachesta"""
+    weeks = week_axis(start, end)
+    params = {
+        "from_year": weeks[0][0],
+        "from_week": weeks[0][1],
+        "to_year": weeks[-1][0],
+        "to_week": weeks[-1][1],
+    }
+    capacity_rows = db.execute(text(_SELECT_CAPACITY), params).all()
+    planned_rows = db.execute(text(_SELECT_PLANNED), params).all()
+    shares = get_department_shares(db, history_days)
+
+    department_ids = sorted({row[2] for row in capacity_rows})
+    week_index = {week: i for i, week in enumerate(weeks)}
+    department_index = {dept_id: j for j, dept_id in enumerate(department_ids)}
+    # Ei historiaa lainkaan: tasajako aktiivisille osastoille
+    overall = shares.overall or {
+        dept_id: 1 / len(department_ids) for dept_id in department_ids
+    }
+
+    planned = [[0.0] * len(department_ids) for _ in weeks]
+    capacity = [[0.0] * len(department_ids) for _ in weeks]
+    # Viikkonumero jota ei ole ISO-kalenterissa (esim. 53 väärälle vuodelle)
+    # osuu väliin tuplevertailussa mutta ei akselille: ohitetaan
+    for year, week_number, dept_id, capacity_hours in capacity_rows:
+        i = week_index.get((year, week_number))
+        if i is not None:
+            capacity[i][department_index[dept_id]] = capacity_hours
+    for year, week_number, product_id, hours in planned_rows:
+        i = week_index.get((year, week_number))
+        if i is None:
+            continue
+        for dept_id, share in shares.by_product.get(product_id, overall).items():
+            j = department_index.get(dept_id)
+            if j is not None:
+                planned[i][j] += hours * share
+
+    planned = [[round(hours, 2) for hours in row] for row in planned]
+    capacity = [[round(hours, 2) for hours in row] for row in capacity]
+    utilization: list[list[Optional[float]]] = [
+        [
+            round(p / c * 100, 1) if c > 0 else None
+            for p, c in zip(planned_row, capacity_row)
+        ]
+        for planned_row, capacity_row in zip(planned, capacity)
+    ]
+
+    return WeeklyLoadMatrix(
+        weeks=[f"{year}-W{week:02d}" for year, week in weeks],
+        department_ids=department_ids,
+        planned_hours=planned,
+        capacity_hours=capacity,
+        utilization=utilization,
+    )
+
+
+def get_department_shares(db: Session, history_days: int) -> DepartmentShares:
+    """department_shares välimuistin kautta (avain: historiajakso)"""
+    return share_cache.get_or_set(
+        history_days, lambda: department_shares(db, history_days)
+    )
+
+
+def get_load(
+    db: Session, start: date, end: date, *, history_days: int = 365
+) -> WeeklyLoadMatrix:
+    """build_load välimuistin kautta (avain: viikkoväli)"""
+    weeks = week_axis(start, end)
+    return load_cache.get_or_set(
+        (weeks[0], weeks[-1], history_days),
+        lambda: build_load(db, start, end, history_days=history_days),
+    )
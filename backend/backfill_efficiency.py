@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Backfill historical efficiency summaries from production tasks (NumPy + COPY)
+"""
+import argparse
+import sys
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.models.department import Department
+from app.services.efficiency_backfill import (
+    DEFAULT_CHUNK_SIZE,
+    Partition,
+    run_backfill,
+)
+
+
+def task_year_range(db):
+    """Return (first_year, last_year) of finished tasks in local time"""
+    row = db.execute(
+        text(
+            """
+            SELECT
+                EXTRACT(YEAR FROM MIN(ended_at) AT TIME ZONE :tz)::int,
+                EXTRACT(YEAR FROM MAX(ended_at) AT TIME ZONE :tz)::int
+            FROM production_tasks
+            WHERE ended_at IS NOT NULL
+            """
+        ),
+        {"tz": settings.TIMEZONE},
+    ).one()
+    return row[0], row[1]
+
+
+def build_partitions(db, args):
+    first_year, last_year = args.from_year, args.to_year
+    if first_year is None or last_year is None:
+        found_first, found_last = task_year_range(db)
+        if found_first is None:
+            return []
+        first_year = first_year or found_first
+        last_year = last_year or found_last
+
+    if args.partition == "year":
+        return [
+            Partition(year, year + 1, args.department_id)
+            for year in range(first_year, last_year + 1)
+        ]
+
+    if args.partition == "department":
+        department_ids = (
+            [args.department_id]
+            if args.department_id
+            else [d.id for d in db.query(Department.id).order_by(Department.id)]
+        )
+        return [
+            Partition(first_year, last_year + 1, dept_id) for dept_id in department_ids
+        ]
+
+    return [Partition(first_year, last_year + 1, args.department_id)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--from-year", type=int, help="First year (default: oldest)")
+    parser.add_argument("--to-year", type=int, help="Last year, inclusive")
+    parser.add_argument("--department-id", type=int, help="Only this department")
+    parser.add_argument(
+        "--partition",
+        choices=["year", "department", "none"],
+        default="year",
+        help="Unit of work for parallel processing (default: year)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Parallel worker processes"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Rows fetched per server-side cursor round trip",
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        partitions = build_partitions(db, args)
+    finally:
+        db.close()
+
+    if not partitions:
+        print("No finished tasks found, nothing to backfill")
+        return
+
+    print(f"Backfilling {len(partitions)} partition(s) with {args.workers} worker(s)...")
+
+    try:
+        result = run_backfill(
+            partitions, workers=args.workers, chunk_size=args.chunk_size
+        )
+    except Exception as e:
+        print(f"\n❌ Error during backfill: {e}")
+        import traceback
+
+        traceback.print_exc()
+        sys.exit(1)
+
+    print("=" * 70)
+    print("✅ Efficiency backfill completed!")
+    print(f"   Tasks processed: {result.tasks}")
+    print(f"   Daily summaries written: {result.daily_rows}")
+    print(f"   Efficiency items written: {result.item_rows}")
+    print(f"   Weekly summaries derived: {result.weeks}")
+    print(f"   Monthly summaries derived: {result.months}")
+    print(f"   Duration: {result.duration_seconds:.1f}s")
+    if result.duration_seconds > 0:
+        print(f"   Throughput: {result.tasks / result.duration_seconds:,.0f} tasks/s")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
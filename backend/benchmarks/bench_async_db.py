@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Load test the sync vs. async product and department routers.
+
+Start the API once per mode (one worker, so the comparison is per process)
+and run this against each; results are appended to a JSON file so the two
+runs can be compared:
+
+    ASYNC_ENDPOINTS=false uvicorn main:app --workers 1 --port 8000
+    python -m benchmarks.bench_async_db --label sync --output async_db.json
+
+    ASYNC_ENDPOINTS=true uvicorn main:app --workers 1 --port 8000
+    python -m benchmarks.bench_async_db --label async --output async_db.json
+
+The bearer token is minted locally from SECRET_KEY for --user-id, so the
+benchmark must run with the same .env as the server.
+"""
+import argparse
+import asyncio
+import json
+import os
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from benchmarks.loadgen import Request, run_load
+
+
+def request_mix() -> list[Request]:
+    api = settings.API_V1_STR
+    return [
+        Request.get(f"{api}/products/?limit=50", name="products.list"),
+        Request.get(f"{api}/products/search?q=1&limit=10", name="products.search"),
+        Request.get(f"{api}/products/stats", name="products.stats"),
+        Request.get(f"{api}/departments/active", name="departments.active"),
+        Request.get(f"{api}/departments/?limit=50", name="departments.list"),
+    ]
+
+
+def print_results(label: str, clients: int, results: dict) -> None:
+    print("=" * 70)
+    print(f"{label}: {clients} concurrent clients")
+    print(f"   {'route':<22}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, result in results.items():
+        s = result.summary()
+        print(
+            f"   {name:<22}{s['throughput_rps']:>10,.0f}{s['p50_ms']:>10.1f}"
+            f"{s['p95_ms']:>10.1f}{s['p99_ms']:>10.1f}"
+        )
+    errors = results["all"].errors
+    if errors:
+        print(f"\n⚠️  {errors} failed requests: {results['all'].summary()['statuses']}")
+
+
+def print_comparison(runs: list[dict]) -> None:
+    print("=" * 70)
+    print("Comparison (all routes)")
+    first = runs[0]["results"]["all"]
+    for run in runs:
+        s = run["results"]["all"]
+        print(
+            f"   {run['label']:<12} clients {run['clients']:>4}  "
+            f"{s['throughput_rps']:>8,.0f} req/s "
+            f"({s['throughput_rps'] / first['throughput_rps']:.2f}x)  "
+            f"p99 {s['p99_ms']:.1f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--clients", type=int, default=250)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--user-id", type=int, default=1)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--output", help="Append the run to this JSON file")
+    args = parser.parse_args()
+
+    token = create_access_token(args.user_id)
+    results = asyncio.run(
+        run_load(
+            args.url,
+            request_mix(),
+            clients=args.clients,
+            duration_seconds=args.duration,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+    )
+    print_results(args.label, args.clients, results)
+
+    if args.output:
+        runs = []
+        if os.path.exists(args.output):
+            with open(args.output, encoding="utf-8") as f:
+                runs = json.load(f)
+        runs = [run for run in runs if run["label"] != args.label]
+        runs.append(
+            {
+                "label": args.label,
+                "clients": args.clients,
+                "results": {k: v.summary() for k, v in results.items()},
+            }
+        )
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(runs, f, indent=2)
+        if len(runs) > 1:
+            print_comparison(runs)
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-request cost of token authentication.
+
+Drives a minimal FastAPI app in-process through its ASGI interface (no
+network, no database): the same trivial route is called without and with
+the get_current_user dependency, with the user's status pre-seeded in the
+cache as it is after login. Also measures bcrypt login throughput through
+the bounded password pool.
+
+    python -m benchmarks.bench_auth --requests 20000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import Depends, FastAPI
+
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.core.security import (
+    UserStatus,
+    create_access_token,
+    decode_access_token,
+    hash_password,
+    user_status_cache,
+    verify_password_async,
+)
+
+USER_ID = 1
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/open")
+    async def open_route():
+        return {"ok": True}
+
+    @app.get("/protected", dependencies=[Depends(get_current_user)])
+    async def protected_route():
+        return {"ok": True}
+
+    return app
+
+
+async def call(app, path: str, headers: list) -> int:
+    """One GET through the ASGI interface; returns the status code"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(app, path: str, headers: list, requests: int) -> list[float]:
+    """Per-request latencies in microseconds"""
+    for _ in range(min(requests, 500)):
+        await call(app, path, headers)
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        status = await call(app, path, headers)
+        latencies.append((time.perf_counter() - started) * 1e6)
+        if status != 200:
+            raise RuntimeError(f"{path} returned {status}")
+    return latencies
+
+
+async def login_throughput(logins: int, concurrency: int) -> float:
+    """bcrypt verifications per second through the password pool"""
+    hashed = hash_password("benchmark-password")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await verify_password_async("benchmark-password", hashed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(logins)))
+    return logins / (time.perf_counter() - started)
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def run(args):
+    app = build_app()
+    token = create_access_token(USER_ID)
+    user_status_cache.set(
+        USER_ID,
+        UserStatus(
+            id=USER_ID, email="bench@example.com", is_active=True, is_superuser=False
+        ),
+    )
+    auth_headers = [(b"authorization", f"Bearer {token}".encode())]
+
+    open_latencies = await measure(app, "/open", [], args.requests)
+    protected_latencies = await measure(app, "/protected", auth_headers, args.requests)
+
+    started = time.perf_counter()
+    for _ in range(args.requests):
+        decode_access_token(token)
+    decode_us = (time.perf_counter() - started) / args.requests * 1e6
+
+    login_rate = await login_throughput(args.logins, args.concurrency)
+    return open_latencies, protected_latencies, decode_us, login_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    open_latencies, protected_latencies, decode_us, login_rate = asyncio.run(
+        run(args)
+    )
+    open_p50 = statistics.median(open_latencies)
+    protected_p50 = statistics.median(protected_latencies)
+
+    print("=" * 70)
+    print("Authentication overhead benchmark (in-process ASGI)")
+    print(f"   Requests per route: {args.requests:,}")
+    print(
+        f"   Open route:      p50 {open_p50:.0f}µs, "
+        f"p99 {percentile(open_latencies, 0.99):.0f}µs"
+    )
+    print(
+        f"   Protected route: p50 {protected_p50:.0f}µs, "
+        f"p99 {percentile(protected_latencies, 0.99):.0f}µs"
+    )
+    print(f"   Auth overhead (p50): {protected_p50 - open_p50:.0f}µs per request")
+    print(f"   Token decode alone: {decode_us:.1f}µs")
+    print(
+        f"   bcrypt logins: {login_rate:.1f}/s with "
+        f"{settings.AUTH_PASSWORD_WORKERS} password workers "
+        f"({args.concurrency} concurrent)"
+    )
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
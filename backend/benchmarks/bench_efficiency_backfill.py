@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vectorized efficiency backfill kernel on synthetic tasks.
+
+Generates task columns in chunks (as the server-side cursor would deliver
+them), aggregates them with DailyAccumulator and compares the throughput
+against a per-row Python loop on a sample.
+
+    python -m benchmarks.bench_efficiency_backfill --tasks 10000000
+"""
+import argparse
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from app.services.efficiency_kernels import (
+    DailyAccumulator,
+    TaskColumns,
+    efficiency,
+)
+
+NUM_DEPARTMENTS = 7
+NUM_EMPLOYEES = 400
+NUM_ORDERS = 500_000
+NUM_DAYS = 5 * 365
+FIRST_DAY = 19_000  # 2022-01-08
+MULTIPLIERS = np.array([1.00, 1.10, 1.20, 1.30, 1.40, 1.50, 1.60, 1.70, 0.9, 0.8])
+
+
+def synthetic_chunk(rng: np.random.Generator, size: int) -> TaskColumns:
+    """One chunk of realistic-looking finished tasks"""
+    day_offset = rng.integers(0, NUM_DAYS, size)
+    # Tilaukset etenevät ajassa: samana päivänä työstetään samoja tilauksia
+    orders_per_day = NUM_ORDERS // NUM_DAYS
+    order_ids = 1 + day_offset * orders_per_day + rng.integers(0, orders_per_day, size)
+    return TaskColumns(
+        department_id=rng.integers(1, NUM_DEPARTMENTS + 1, size),
+        day=FIRST_DAY + day_offset,
+        employee_id=rng.integers(1, NUM_EMPLOYEES + 1, size),
+        production_order_id=order_ids,
+        duration_minutes=rng.gamma(2.0, 20.0, size).round(),
+        quantity_completed=rng.integers(0, 50, size).astype(np.float64),
+        # Standardiaika ja kategoria riippuvat tilauksen tuotteesta
+        standard_time_minutes=(order_ids % 97) / 10 + 0.5,
+        efficiency_multiplier=MULTIPLIERS[order_ids % len(MULTIPLIERS)],
+    )
+
+
+def python_baseline(tasks: TaskColumns) -> float:
+    """Per-row aggregation as ORM-style code would do it; returns seconds"""
+    rows = list(
+        zip(
+            tasks.department_id.tolist(),
+            tasks.day.tolist(),
+            tasks.employee_id.tolist(),
+            tasks.production_order_id.tolist(),
+            tasks.duration_minutes.tolist(),
+            tasks.quantity_completed.tolist(),
+            tasks.standard_time_minutes.tolist(),
+            tasks.efficiency_multiplier.tolist(),
+        )
+    )
+    started = time.perf_counter()
+    daily = defaultdict(lambda: [0.0, 0.0, 0.0, set()])
+    items = defaultdict(lambda: [0.0, 0.0, 0.0])
+    for dept, day, employee, order, duration, qty, std_time, mult in rows:
+        std = qty * std_time
+        target = std * mult
+        d = daily[(dept, day)]
+        d[0] += duration
+        d[1] += std
+        d[2] += target
+        d[3].add(employee)
+        i = items[(dept, day, order)]
+        i[0] += qty
+        i[1] += std
+        i[2] += target
+    for d in daily.values():
+        if d[0] > 0:
+            min(round(d[1] / d[0] * 100, 2), 999.99)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=10_000_000)
+    parser.add_argument("--chunk-size", type=int, default=200_000)
+    parser.add_argument("--python-sample", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    accumulator = DailyAccumulator()
+
+    generate_seconds = 0.0
+    started = time.perf_counter()
+    remaining = args.tasks
+    while remaining > 0:
+        size = min(args.chunk_size, remaining)
+        t0 = time.perf_counter()
+        chunk = synthetic_chunk(rng, size)
+        generate_seconds += time.perf_counter() - t0
+        accumulator.add(chunk)
+        remaining -= size
+
+    daily = accumulator.daily()
+    items = accumulator.items()
+    efficiency(daily.std_hours, daily.actual_hours)
+    efficiency(daily.target_hours, daily.actual_hours)
+    kernel_seconds = time.perf_counter() - started - generate_seconds
+
+    sample = synthetic_chunk(np.random.default_rng(args.seed), args.python_sample)
+    python_seconds = python_baseline(sample)
+    python_rate = args.python_sample / python_seconds
+    numpy_rate = args.tasks / kernel_seconds
+
+    print("=" * 70)
+    print("Efficiency backfill kernel benchmark")
+    print(f"   Tasks: {args.tasks:,} in chunks of {args.chunk_size:,}")
+    print(f"   Daily rows: {len(daily.day):,}, item rows: {len(items.day):,}")
+    print(f"   NumPy kernel: {kernel_seconds:.2f}s ({numpy_rate:,.0f} tasks/s)")
+    print(
+        f"   Python loop ({args.python_sample:,} sample): "
+        f"{python_rate:,.0f} tasks/s -> "
+        f"~{args.tasks / python_rate:.0f}s for {args.tasks:,}"
+    )
+    print(f"   Speedup: {numpy_rate / python_rate:.1f}x")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Measure API cold start: import time, lifespan startup and first-request
+latencies in a fresh interpreter.
+
+Each repeat runs in a new subprocess so module caches do not carry over.
+Requests are sent straight to the ASGI app (no server, no sockets), so the
+numbers are the application's own cost. Compare deferred and eager route
+loading:
+
+    DEFER_API_ROUTES=true python -m benchmarks.bench_startup \\
+        --label deferred --output startup.json
+    DEFER_API_ROUTES=false python -m benchmarks.bench_startup \\
+        --label eager --output startup.json
+
+The API request is unauthenticated (401), so it measures route loading and
+dependency resolution, not the endpoint itself. Without a reachable database
+the registry rebuild fails fast and is logged; timings are otherwise valid.
+In deferred mode /health answers 503 until the routes are loaded.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PHASES = ("import", "startup", "health", "api", "api_again", "openapi")
+
+
+async def _request(app, path: str) -> tuple[int, float]:
+    status = 0
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 80),
+    }
+    started = time.perf_counter()
+    await app(scope, receive, send)
+    return status, time.perf_counter() - started
+
+
+async def _measure(app) -> dict:
+    from app.core.config import settings
+
+    api = settings.API_V1_STR
+    timings = {}
+    statuses = {}
+    started = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        timings["startup"] = time.perf_counter() - started
+        for phase, path in (
+            ("health", "/health"),
+            ("api", f"{api}/products/"),
+            ("api_again", f"{api}/products/"),
+            ("openapi", f"{api}/openapi.json"),
+        ):
+            statuses[phase], timings[phase] = await _request(app, path)
+        loader = app.state.api_loader
+        if loader is not None:
+            timings["loader"] = loader.duration_seconds
+    return {"timings": timings, "statuses": statuses}
+
+
+def child() -> None:
+    """One cold start; prints the measurements as JSON on the last line"""
+    started = time.perf_counter()
+    import main
+
+    import_seconds = time.perf_counter() - started
+    result = asyncio.run(_measure(main.app))
+    result["timings"]["import"] = import_seconds
+    print(json.dumps(result))
+
+
+def run_once() -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def print_results(label: str, summary: dict, statuses: dict) -> None:
+    print("=" * 70)
+    print(f"{label}: cold start (median of {summary['repeats']} runs)")
+    print(f"   {'phase':<14}{'p50 ms':>10}{'min ms':>10}{'max ms':>10}  status")
+    for phase in PHASES + ("loader",):
+        if phase not in summary["phases"]:
+            continue
+        s = summary["phases"][phase]
+        print(
+            f"   {phase:<14}{s['p50_ms']:>10.1f}{s['min_ms']:>10.1f}"
+            f"{s['max_ms']:>10.1f}  {statuses.get(phase, '')}"
+        )
+
+
+def print_comparison(runs: list[dict]) -> None:
+    print("=" * 70)
+    print("Comparison (p50 ms)")
+    phases = ("import", "startup", "health", "api", "openapi")
+    print(f"   {'label':<12}" + "".join(f"{p:>10}" for p in phases))
+    for run in runs:
+        cells = "".join(
+            f"{run['phases'].get(p, {}).get('p50_ms', float('nan')):>10.1f}"
+            for p in phases
+        )
+        print(f"   {run['label']:<12}{cells}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--output", help="Append the run to this JSON file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    samples: dict[str, list[float]] = {}
+    statuses = {}
+    for i in range(args.repeats):
+        result = run_once()
+        for phase, seconds in result["timings"].items():
+            samples.setdefault(phase, []).append(seconds * 1000)
+        statuses = result["statuses"]
+        print(f"   run {i + 1}/{args.repeats}: import {samples['import'][-1]:.0f}ms")
+
+    summary = {
+        "label": args.label,
+        "repeats": args.repeats,
+        "defer_api_routes": os.environ.get("DEFER_API_ROUTES", "default"),
+        "phases": {
+            phase: {
+                "p50_ms": round(statistics.median(values), 2),
+                "min_ms": round(min(values), 2),
+                "max_ms": round(max(values), 2),
+            }
+            for phase, values in samples.items()
+        },
+    }
+    print_results(args.label, summary, statuses)
+
+    if args.output:
+        runs = []
+        if os.path.exists(args.output):
+            with open(args.output, encoding="utf-8") as f:
+                runs = json.load(f)
+        runs = [run for run in runs if run["label"] != args.label]
+        runs.append(summary)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(runs, f, indent=2)
+        if len(runs) > 1:
+            print_comparison(runs)
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Minimal asyncio HTTP/1.1 load generator (keep-alive, no dependencies).
+
+Each simulated client owns one connection and issues requests back to back,
+so `clients` is the number of requests in flight. Latency is measured from
+writing the request to reading the full response body.
+"""
+import asyncio
+import itertools
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+
+@dataclass(frozen=True)
+class Request:
+    method: str
+    path: str
+    body: Optional[bytes] = None
+    name: Optional[str] = None
+    # Kutsutaan joka pyynnöllä, kun runko ei saa toistua (yksilölliset avaimet)
+    factory: Optional[Callable[[], object]] = None
+
+    @classmethod
+    def get(cls, path: str, name: Optional[str] = None) -> "Request":
+        return cls("GET", path, name=name)
+
+    @classmethod
+    def json(cls, method: str, path: str, payload, name: Optional[str] = None):
+        return cls(method, path, json.dumps(payload).encode(), name=name)
+
+    @classmethod
+    def json_factory(
+        cls, method: str, path: str, factory: Callable[[], object], name=None
+    ) -> "Request":
+        return cls(method, path, name=name, factory=factory)
+
+    def payload(self) -> Optional[bytes]:
+        if self.factory is not None:
+            return json.dumps(self.factory()).encode()
+        return self.body
+
+
+@dataclass
+class LoadResult:
+    requests: int = 0
+    errors: int = 0
+    duration_seconds: float = 0.0
+    latencies: list = field(default_factory=list)
+    statuses: dict = field(default_factory=dict)
+
+    @property
+    def successes(self) -> int:
+        return self.requests - self.errors
+
+    @property
+    def throughput(self) -> float:
+        """Successful requests per second (fast 4xx/5xx responses do not count)"""
+        return self.successes / self.duration_seconds if self.duration_seconds else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Latency percentile in milliseconds (p in 0..100)"""
+        if not self.latencies:
+            return 0.0
+        values = sorted(self.latencies)
+        index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+        return values[index] * 1000
+
+    def summary(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "throughput_rps": round(self.throughput, 1),
+            "p50_ms": round(self.percentile(50), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "p99_ms": round(self.percentile(99), 2),
+            "max_ms": round(self.percentile(100), 2),
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+        }
+
+
+class _Connection:
+    def __init__(self, host: str, port: int, headers: dict):
+        self.host, self.port = host, port
+        self.base_headers = "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+        self.reader = self.writer = None
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+    async def request(self, request: Request) -> int:
+        if self.writer is None:
+            await self.open()
+        head = (
+            f"{request.method} {request.path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n{self.base_headers}"
+        )
+        body = request.payload()
+        if body is not None:
+            head += (
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+            )
+        self.writer.write(head.encode() + b"\r\n" + (body or b""))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        status = int(status_line.split()[1])
+        length, chunked, keep_alive = 0, False, True
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name, value = name.strip().lower(), value.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding" and "chunked" in value:
+                chunked = True
+            elif name == "connection" and value == "close":
+                keep_alive = False
+
+        if chunked:
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif length:
+            await self.reader.readexactly(length)
+
+        if not keep_alive:
+            self.close()
+        return status
+
+
+async def run_load(
+    base_url: str,
+    requests: list[Request],
+    *,
+    clients: int,
+    duration_seconds: float,
+    headers: Optional[dict] = None,
+    warmup_seconds: float = 1.0,
+) -> dict[str, LoadResult]:
+    """
+    Drive the request mix round-robin from `clients` concurrent connections.
+    Returns results per request name plus "all".
+    """
+    url = urlsplit(base_url)
+    host, port = url.hostname, url.port or 80
+    headers = {"Accept": "application/json", **(headers or {})}
+    results = {"all": LoadResult()}
+    for request in requests:
+        results.setdefault(request.name or request.path, LoadResult())
+
+    started = time.perf_counter()
+    measure_from = started + warmup_seconds
+    deadline = measure_from + duration_seconds
+
+    async def client(offset: int):
+        connection = _Connection(host, port, headers)
+        mix = itertools.islice(itertools.cycle(requests), offset, None)
+        try:
+            for request in mix:
+                t0 = time.perf_counter()
+                if t0 >= deadline:
+                    break
+                try:
+                    status = await connection.request(request)
+                except (ConnectionError, OSError, asyncio.IncompleteReadError):
+                    connection.close()
+                    status = None
+                t1 = time.perf_counter()
+                if t0 < measure_from:
+                    continue
+                for key in ("all", request.name or request.path):
+                    result = results[key]
+                    result.requests += 1
+                    result.statuses[status] = result.statuses.get(status, 0) + 1
+                    if status is None or status >= 400:
+                        result.errors += 1
+                    else:
+                        result.latencies.append(t1 - t0)
+        finally:
+            connection.close()
+
+    # Asiakkaat aloittavat tasavälein kierrosta: vierekkäiset aloituskohdat
+    # toistaisivat toistensa pyynnöt heti perään (välimuistiosumia)
+    await asyncio.gather(
+        *(client(i * len(requests) // clients) for i in range(clients))
+    )
+    for result in results.values():
+        result.duration_seconds = duration_seconds
+    return results
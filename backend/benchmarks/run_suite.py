@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Load and latency benchmark suite (list, search, lookup, create, bulk, report).
+
+Drives the real API over HTTP with concurrent keep-alive clients, one
+scenario at a time, and records p50/p95/p99 and throughput per scenario.
+Seed the database first (python -m benchmarks.seed), then either point the
+suite at a running server or let it start one:
+
+    python -m benchmarks.run_suite --spawn --workers 2 --save main
+    python -m benchmarks.run_suite --spawn --workers 2 --compare main
+
+--save writes benchmarks/baselines/NAME.json. --compare runs the suite and
+flags scenarios whose p95/p99 grew or throughput dropped by more than
+--threshold percent (exit code 1), so it can gate a change. Compare runs
+made on the same machine, data scale and settings; the metadata block of
+each result records them.
+
+Any failed request (status >= 400 or a dropped connection) fails the run
+with exit code 1, and such a run is not saved as a baseline. Throughput
+counts successful requests only.
+
+The bearer token is minted locally from SECRET_KEY for the user that
+benchmarks.seed creates (or --user-id), so the suite must run with the same
+.env as the server.
+"""
+import argparse
+import asyncio
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.crud import user as crud_user
+from app.db.base import SessionLocal
+from benchmarks.loadgen import run_load
+from benchmarks.scenarios import build_scenarios, cleanup
+from benchmarks.seed import BENCH_USER_EMAIL
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+COUNTED_TABLES = (
+    "products",
+    "bom_items",
+    "employees",
+    "production_orders",
+    "order_phase_values",
+    "production_tasks",
+)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def row_counts(db) -> dict:
+    # Suunnittelijan arvio riittää mittakaavan tunnistamiseen
+    return {
+        table: int(
+            db.execute(
+                text("SELECT reltuples FROM pg_class WHERE relname = :table"),
+                {"table": table},
+            ).scalar()
+            or 0
+        )
+        for table in COUNTED_TABLES
+    }
+
+
+def benchmark_user(db, user_id: Optional[int]) -> int:
+    """The token's user must exist and be active, or every call is a fast 401"""
+    if user_id is None:
+        user = crud_user.get_by_email(db, BENCH_USER_EMAIL)
+    else:
+        user = crud_user.get(db, user_id)
+    if user is None or not user.is_active:
+        raise SystemExit(
+            f"❌ Benchmark user {user_id or BENCH_USER_EMAIL} not found or inactive "
+            "(run python -m benchmarks.seed or pass --user-id)"
+        )
+    return user.id
+
+
+def spawn_server(port: int, workers: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ]
+    )
+    url = f"http://127.0.0.1:{port}/health"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"❌ Server exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("❌ Server did not become healthy within 60s")
+
+
+def selected(scenario, patterns) -> bool:
+    if not patterns:
+        return True
+    return any(
+        fnmatch.fnmatch(scenario.name, p) or scenario.group == p for p in patterns
+    )
+
+
+def print_results(results: dict) -> None:
+    print(
+        f"   {'scenario':<26}{'clients':>8}{'req/s':>10}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}"
+    )
+    for name, s in results.items():
+        print(
+            f"   {name:<26}{s['clients']:>8}{s['throughput_rps']:>10,.1f}"
+            f"{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['p99_ms']:>10.1f}"
+            f"{s['errors']:>8}"
+        )
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_delta_ms: float):
+    """Regressions as (scenario, metric, baseline, current, change %)"""
+    regressions = []
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            old, new = before[metric], now[metric]
+            if old and new - old > min_delta_ms:
+                change = (new - old) / old * 100
+                if change > threshold:
+                    regressions.append((name, metric, old, new, change))
+        old, new = before["throughput_rps"], now["throughput_rps"]
+        if old:
+            change = (new - old) / old * 100
+            if change < -threshold:
+                regressions.append((name, "throughput_rps", old, new, change))
+    return regressions
+
+
+async def run_scenarios(url: str, scenarios, args, headers: dict) -> dict:
+    results = {}
+    for scenario in scenarios:
+        clients = min(args.clients, scenario.max_clients or args.clients)
+        print(f"   ⏱  {scenario.name} ({clients} clients, {args.duration:.0f}s)")
+        measured = await run_load(
+            url,
+            scenario.requests,
+            clients=clients,
+            duration_seconds=args.duration,
+            headers=headers,
+            warmup_seconds=args.warmup,
+        )
+        results[scenario.name] = {
+            "group": scenario.group,
+            "clients": clients,
+            **measured["all"].summary(),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument(
+        "--spawn",
+        action="store_true",
+        help="Start uvicorn for the run (on the --url port)",
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        help="Scenario name (glob) or group; repeatable (default: all)",
+    )
+    parser.add_argument(
+        "--user-id",
+        type=int,
+        help="Token user (default: the user created by benchmarks.seed)",
+    )
+    parser.add_argument("--output", help="Write the result JSON to this file")
+    parser.add_argument("--save", metavar="NAME", help="Save as baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="Compare to a baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="Regression threshold in %%"
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=1.0,
+        help="Ignore latency increases smaller than this (timer noise)",
+    )
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(BASELINE_DIR / f"{args.compare}.json", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    run_id = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    db = SessionLocal()
+    try:
+        scenarios = [
+            s
+            for s in build_scenarios(db, settings.API_V1_STR, run_id)
+            if selected(s, args.scenario)
+        ]
+        counts = row_counts(db)
+        user_id = benchmark_user(db, args.user_id)
+    finally:
+        db.close()
+    if not scenarios:
+        raise SystemExit("❌ No scenarios match --scenario")
+
+    print("=" * 70)
+    print(f"Benchmark suite: {len(scenarios)} scenarios against {args.url}")
+    server = None
+    if args.spawn:
+        port = int(args.url.rsplit(":", 1)[-1].split("/")[0])
+        server = spawn_server(port, args.workers)
+    token = create_access_token(user_id)
+    try:
+        results = asyncio.run(
+            run_scenarios(
+                args.url, scenarios, args, {"Authorization": f"Bearer {token}"}
+            )
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        db = SessionLocal()
+        try:
+            removed = cleanup(db, run_id)
+        finally:
+            db.close()
+
+    run = {
+        "metadata": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "workers": args.workers if args.spawn else None,
+            "clients": args.clients,
+            "duration_seconds": args.duration,
+            "rows": counts,
+            "settings": {
+                "ASYNC_ENDPOINTS": settings.ASYNC_ENDPOINTS,
+                "SQL_INSTRUMENTATION": settings.SQL_INSTRUMENTATION,
+                "METRICS_ENABLED": settings.METRICS_ENABLED,
+                "DB_POOL_SIZE": settings.DB_POOL_SIZE,
+                "DB_MAX_OVERFLOW": settings.DB_MAX_OVERFLOW,
+                "replicas": len(
+                    [u for u in settings.DATABASE_REPLICA_URLS.split(",") if u.strip()]
+                ),
+            },
+        },
+        "results": results,
+    }
+
+    print("=" * 70)
+    print_results(results)
+    if removed:
+        print(f"\n   Removed {removed} products created by products.create")
+
+    failed = {name: s for name, s in results.items() if s["errors"]}
+    for name, s in failed.items():
+        print(f"\n❌ {name}: {s['errors']} failed requests {s['statuses']}")
+    if failed and args.save:
+        print(f"⚠️  Not saving baseline {args.save}: the run had failed requests")
+
+    for path in filter(
+        None,
+        [args.output, args.save and not failed and BASELINE_DIR / f"{args.save}.json"],
+    ):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+        print(f"\n✅ Results written to {path}")
+
+    if baseline is not None:
+        regressions = compare(baseline, run, args.threshold, args.min_delta_ms)
+        print("=" * 70)
+        print(
+            f"Compared to {args.compare} "
+            f"(commit {baseline['metadata']['commit']}, threshold {args.threshold}%)"
+        )
+        if baseline["metadata"]["rows"] != counts:
+            print("⚠️  Row counts differ from the baseline: data scale changed?")
+        for name, metric, old, new, change in regressions:
+            print(f"   ❌ {name} {metric}: {old} -> {new} ({change:+.1f}%)")
+        if regressions:
+            print("=" * 70)
+            sys.exit(1)
+        print("   ✅ No regressions")
+    print("=" * 70)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
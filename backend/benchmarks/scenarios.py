@@ -0,0 +1,229 @@
+"""
+Kuormitustestin skenaariot run_suite.py:lle.
+
+Jokainen skenaario ajaa yhtä endpoint-perhettä erikseen, jotta sen
+persentiilit eivät sekoitu muihin. Pyyntöjen parametrit poimitaan
+siemennetystä tietokannasta kiinteässä järjestyksessä (avaimen md5), joten
+kaksi ajoa samalla datalla tekee samat pyynnöt.
+
+Välimuistilliset raportit ajetaan kahdesti: .cold vaihtaa jakson (tai
+historiajakson) joka pyynnöllä, joten vastaukset lasketaan, ja .warm toistaa
+yhtä URLia, joten se mittaa välimuistiosumaa.
+"""
+import itertools
+import random
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Optional
+from urllib.parse import quote, urlencode
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from benchmarks.loadgen import Request
+
+# Tuotteet joita products.create luo; poistetaan ajon jälkeen
+CREATED_PREFIX = "BENCH-"
+
+SAMPLE_SIZE = 200
+WHAT_IF_LINES = 1_000
+
+# Eri jaksoja .cold-skenaariossa; oltava suurempi kuin raporttivälimuistien
+# maxsize (suurin 256), jotta kierroksen alku on poistunut ennen toistoa
+COLD_PERIODS = 512
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    group: str
+    requests: list[Request]
+    # Raskaat raportit: rajoita samanaikaisia asiakkaita
+    max_clients: Optional[int] = None
+
+
+def _sample(db: Session, sql: str, limit: int = SAMPLE_SIZE) -> list:
+    """Ensimmäinen sarake kyselyn riveistä"""
+    return list(db.execute(text(sql), {"limit": limit}).scalars())
+
+
+def build_scenarios(db: Session, api: str, run_id: str) -> list[Scenario]:
+    """Skenaariot tietokannassa olevalle datalle (api = esim. /api/v1)"""
+    rng = random.Random(0)
+    item_numbers = _sample(
+        db,
+        "SELECT item_number FROM products WHERE is_active "
+        "ORDER BY md5(item_number) LIMIT :limit",
+    )
+    product_ids = _sample(
+        db, "SELECT id FROM products ORDER BY md5(id::text) LIMIT :limit", 5_000
+    )
+    employee_numbers = _sample(
+        db,
+        "SELECT employee_number FROM employees WHERE is_active "
+        "ORDER BY md5(employee_number) LIMIT :limit",
+    )
+    last_names = _sample(
+        db,
+        "SELECT DISTINCT last_name FROM employees WHERE length(last_name) >= 3 "
+        "ORDER BY last_name LIMIT :limit",
+    )
+    order_numbers = _sample(
+        db,
+        "SELECT order_number FROM production_orders "
+        "ORDER BY md5(order_number) LIMIT :limit",
+    )
+    last_day = db.execute(
+        text("SELECT max(ended_at)::date FROM production_tasks")
+    ).scalar()
+    if not item_numbers or not employee_numbers or last_day is None:
+        raise SystemExit("❌ No benchmark data: run python -m benchmarks.seed first")
+
+    quarter = {"start": last_day - timedelta(days=90), "end": last_day}
+    window = {"from": last_day - timedelta(days=28), "to": last_day}
+
+    # Noin neljännesvuoden jaksoja: loppupäivä siirtyy 0..63 päivää taaksepäin
+    # ja pituus kasvaa päivällä joka 64. jaksolla, joten kaikki ovat erilaisia
+    quarters = [
+        {
+            "start": last_day - timedelta(days=k % 64 + 90 + k // 64),
+            "end": last_day - timedelta(days=k % 64),
+        }
+        for k in range(COLD_PERIODS)
+    ]
+    # Kuormitusnäkymän avain on viikkoväli ja historiajakso
+    load_windows = [{**window, "history_days": 365 + k} for k in range(COLD_PERIODS)]
+
+    def report(name: str, path: str, cold: list[dict], warm: dict) -> list[Scenario]:
+        return [
+            Scenario(
+                f"{name}.cold",
+                "report",
+                [Request.get(f"{path}?{urlencode(params)}") for params in cold],
+                max_clients=4,
+            ),
+            Scenario(
+                f"{name}.warm",
+                "report",
+                [Request.get(f"{path}?{urlencode(warm)}")],
+                max_clients=4,
+            ),
+        ]
+
+    counter = itertools.count()
+
+    def new_product():
+        return {
+            "item_number": f"{CREATED_PREFIX}{run_id}-{next(counter):07d}",
+            "description": "Benchmark product",
+            "category_code": rng.choice(["A", "B", "C", "D", "E", "F"]),
+            "standard_time_minutes": "5.00",
+        }
+
+    what_if = {
+        "lines": [
+            {"product_id": rng.choice(product_ids), "quantity": rng.randint(1, 500)}
+            for _ in range(WHAT_IF_LINES)
+        ]
+    }
+
+    return [
+        # Listat
+        Scenario(
+            "products.list",
+            "list",
+            [
+                Request.get(f"{api}/products/?skip={skip}&limit=100")
+                for skip in (0, 100, 1_000, 5_000)
+            ],
+        ),
+        Scenario(
+            "orders.list",
+            "list",
+            [
+                Request.get(f"{api}/orders/?skip={skip}&limit=100")
+                for skip in (0, 100, 1_000, 5_000)
+            ],
+        ),
+        # Haut
+        Scenario(
+            "products.search",
+            "search",
+            [
+                Request.get(f"{api}/products/search?q={quote(number[:-2])}")
+                for number in item_numbers
+            ],
+        ),
+        Scenario(
+            "orders.search",
+            "search",
+            [
+                Request.get(f"{api}/orders/?search={quote(number[:-1])}&limit=20")
+                for number in order_numbers
+            ],
+        ),
+        Scenario(
+            "employees.search",
+            "search",
+            [
+                Request.get(f"{api}/employees/?search={quote(name)}&limit=20")
+                for name in last_names
+            ],
+        ),
+        # Haku numerolla
+        Scenario(
+            "products.by_number",
+            "lookup",
+            [
+                Request.get(f"{api}/products/by-number/{quote(number, safe='')}")
+                for number in item_numbers
+            ],
+        ),
+        Scenario(
+            "employees.badge",
+            "lookup",
+            [
+                Request.get(f"{api}/employees/badge/{quote(number, safe='')}")
+                for number in employee_numbers
+            ],
+        ),
+        # Kirjoitus
+        Scenario(
+            "products.create",
+            "create",
+            [Request.json_factory("POST", f"{api}/products/", new_product)],
+        ),
+        # Massaoperaatio
+        Scenario(
+            "materials.what_if",
+            "bulk",
+            [Request.json("POST", f"{api}/materials/requirements/what-if", what_if)],
+            max_clients=4,
+        ),
+        # Raportit
+        *report(
+            "efficiency.productivity",
+            f"{api}/efficiency/productivity",
+            quarters,
+            quarter,
+        ),
+        *report("efficiency.series", f"{api}/efficiency/series", quarters, quarter),
+        *report("weekly_plans.load", f"{api}/weekly-plans/load", load_windows, window),
+        # Ei välimuistia: lasketaan tietokannassa joka pyynnöllä
+        Scenario(
+            "materials.requirements",
+            "report",
+            [Request.get(f"{api}/materials/requirements?{urlencode(window)}")],
+            max_clients=4,
+        ),
+    ]
+
+
+def cleanup(db: Session, run_id: str) -> int:
+    """Poista tämän ajon products.create-skenaarion luomat tuotteet"""
+    result = db.execute(
+        text("DELETE FROM products WHERE item_number LIKE :pattern"),
+        {"pattern": f"{CREATED_PREFIX}{run_id}-%"},
+    )
+    db.commit()
+    return result.rowcount
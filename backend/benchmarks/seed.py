@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Seed a benchmark database at a configurable scale (deterministic per seed).
+
+Scale presets for the benchmark suite on top of the synthetic data
+generator (app.services.data_generator, also available as generate_data.py):
+
+    python -m benchmarks.seed --scale small --as-of 2026-01-30
+    python -m benchmarks.seed --scale medium --reset --workers 4
+
+Keep --as-of fixed between runs whose results are compared. --reset
+TRUNCATES orders, tasks, plans, efficiency summaries, products and
+employees first: only use it on a dedicated benchmark database. The
+efficiency backfill is run afterwards so the report scenarios have data.
+
+Also creates (or re-activates) the API user bench@example.com that
+benchmarks.run_suite signs its token for. Its password is random: the suite
+never logs in.
+"""
+import argparse
+import secrets
+import sys
+from datetime import date
+
+from app.crud import user as crud_user
+from app.db.base import SessionLocal
+from app.schemas.auth_schema import UserCreate
+from app.services.data_generator import (
+    GeneratorConfig,
+    GeneratorError,
+    generate,
+    reset_tables,
+)
+from app.services.efficiency_backfill import Partition, run_backfill
+
+SCALES = {
+    "small": dict(products=2_000, employees=100, orders=20_000),
+    "medium": dict(products=20_000, employees=300, orders=200_000),
+    "large": dict(products=200_000, employees=1_000, orders=1_000_000),
+}
+
+PREFIX = "BM"
+
+BENCH_USER_EMAIL = "bench@example.com"
+
+
+def ensure_bench_user() -> int:
+    """Create or re-activate the benchmark user; returns its id"""
+    db = SessionLocal()
+    try:
+        user = crud_user.get_by_email(db, BENCH_USER_EMAIL)
+        if user is None:
+            user = crud_user.create(
+                db,
+                obj_in=UserCreate(
+                    email=BENCH_USER_EMAIL,
+                    password=secrets.token_urlsafe(24),
+                    full_name="Benchmark",
+                ),
+            )
+        elif not user.is_active:
+            user = crud_user.set_active(db, db_obj=user, is_active=True)
+        return user.id
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--products", type=int)
+    parser.add_argument("--employees", type=int)
+    parser.add_argument("--orders", type=int)
+    parser.add_argument("--years", type=float, default=3.0)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--reset", action="store_true", help="TRUNCATE benchmark tables first"
+    )
+    args = parser.parse_args()
+    counts = {
+        key: getattr(args, key) if getattr(args, key) is not None else value
+        for key, value in SCALES[args.scale].items()
+    }
+    config = GeneratorConfig(
+        as_of=args.as_of, seed=args.seed, years=args.years, prefix=PREFIX, **counts
+    )
+
+    if args.reset:
+        reset_tables()
+    print(f"Seeding benchmark data (scale {args.scale}, seed {args.seed})...")
+    try:
+        result = generate(config, workers=args.workers)
+    except GeneratorError as e:
+        print(f"❌ {e} (use --reset)")
+        sys.exit(1)
+
+    first_year = args.as_of.year - int(args.years) - 1
+    backfill = run_backfill(
+        [Partition(year, year + 1) for year in range(first_year, args.as_of.year + 1)],
+        workers=args.workers,
+    )
+    user_id = ensure_bench_user()
+
+    print("=" * 70)
+    print("✅ Benchmark data seeded")
+    for table, count in result.rows.items():
+        print(f"   {table}: {count:,}")
+    print(f"   Daily efficiency summaries: {backfill.daily_rows:,}")
+    print(f"   Benchmark user: {BENCH_USER_EMAIL} (id {user_id})")
+    duration = result.duration_seconds + backfill.duration_seconds
+    print(f"   Duration: {duration:.1f}s")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
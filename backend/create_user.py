@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Create an API user (or reset the password of an existing one)
+
+    python create_user.py admin@example.com --superuser
+"""
+import argparse
+import getpass
+import sys
+
+from pydantic import ValidationError
+
+from app.crud import user as crud_user
+from app.db.base import SessionLocal
+from app.schemas.auth_schema import UserCreate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("email", help="Login e-mail address")
+    parser.add_argument("--full-name", help="Display name")
+    parser.add_argument(
+        "--superuser", action="store_true", help="Grant superuser rights"
+    )
+    parser.add_argument(
+        "--reset-password",
+        action="store_true",
+        help="Set a new password if the user already exists",
+    )
+    args = parser.parse_args()
+
+    password = getpass.getpass("Password: ")
+    if password != getpass.getpass("Password (again): "):
+        print("\n❌ Passwords do not match")
+        sys.exit(1)
+
+    try:
+        user_in = UserCreate(
+            email=args.email,
+            password=password,
+            full_name=args.full_name,
+            is_superuser=args.superuser,
+        )
+    except ValidationError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+
+    db = SessionLocal()
+    try:
+        existing = crud_user.get_by_email(db, user_in.email)
+        if existing is not None:
+            if not args.reset_password:
+                print(f"\n❌ User {existing.email} already exists (--reset-password)")
+                sys.exit(1)
+            crud_user.set_password(db, db_obj=existing, password=password)
+            print(f"✅ Password updated for {existing.email}")
+            return
+
+        db_user = crud_user.create(db, obj_in=user_in)
+        role = "superuser" if db_user.is_superuser else "user"
+        print(f"✅ Created {role} {db_user.email} (id {db_user.id})")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
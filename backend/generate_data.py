@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic factory data for capacity testing (deterministic per seed)
+
+Products across categories A-H/AA/AAA with BOMs, employees, production orders
+over several years with per-department status and phase values, and finished
+production tasks, written with parallel COPY. Identifiers use --prefix
+(PREFIX-P0000001, PREFIX-O00000001, PREFIX-E00001), so a second run needs a
+new prefix or --reset.
+
+Run it against a dedicated database: --reset TRUNCATES products, orders,
+tasks, plans, efficiency summaries and employees. Afterwards run
+backfill_efficiency.py for the efficiency reports.
+"""
+import argparse
+import sys
+from datetime import date
+
+from app.services.data_generator import (
+    GeneratorConfig,
+    GeneratorError,
+    generate,
+    reset_tables,
+)
+
+
+def main():
+    defaults = GeneratorConfig(as_of=date.today())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--products", type=int, default=defaults.products)
+    parser.add_argument("--employees", type=int, default=defaults.employees)
+    parser.add_argument("--orders", type=int, default=defaults.orders)
+    parser.add_argument(
+        "--years", type=float, default=defaults.years, help="Ship date history"
+    )
+    parser.add_argument(
+        "--tasks-per-department",
+        type=float,
+        default=defaults.tasks_per_department,
+        help="Mean tasks per finished department (7 departments: ~10 per order)",
+    )
+    parser.add_argument(
+        "--as-of",
+        type=date.fromisoformat,
+        default=defaults.as_of,
+        help="Data is generated as seen on this day (fix it for identical data)",
+    )
+    parser.add_argument("--prefix", default=defaults.prefix)
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Parallel worker processes"
+    )
+    parser.add_argument(
+        "--reset", action="store_true", help="TRUNCATE generated tables first"
+    )
+    args = parser.parse_args()
+
+    config = GeneratorConfig(
+        as_of=args.as_of,
+        seed=args.seed,
+        products=args.products,
+        employees=args.employees,
+        orders=args.orders,
+        years=args.years,
+        tasks_per_department=args.tasks_per_department,
+        prefix=args.prefix,
+    )
+
+    if args.reset:
+        print("Truncating generated tables...")
+        reset_tables()
+
+    print(
+        f"Generating {config.products:,} products and {config.orders:,} orders "
+        f"(seed {config.seed}) with {args.workers} worker(s)..."
+    )
+    try:
+        result = generate(config, workers=args.workers)
+    except GeneratorError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error during generation: {e}")
+        import traceback
+
+        traceback.print_exc()
+        sys.exit(1)
+
+    print("=" * 70)
+    print("✅ Synthetic data generated!")
+    for table, count in result.rows.items():
+        print(f"   {table}: {count:,}")
+    print(f"   Duration: {result.duration_seconds:.1f}s")
+    tasks = result.rows.get("production_tasks", 0)
+    if result.duration_seconds > 0:
+        print(f"   Throughput: {tasks / result.duration_seconds:,.0f} tasks/s")
+    print("   Next: python backfill_efficiency.py --workers 4")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Import BOM lines from a CSV or xlsx file (streaming, COPY-based)
+
+Columns: item_number, material_code, material_name, quantity, unit.
+Each product in the file gets its BOM replaced; other products are untouched.
+Running API processes pick up the change when their BOM cache expires
+(BOM_CACHE_TTL_SECONDS); upload through POST /materials/bom/import to
+invalidate immediately.
+"""
+import argparse
+import csv
+import sys
+
+from app.services.bom_import import DEFAULT_CHUNK_SIZE, BOMImportError, import_bom
+
+
+def write_report(path, diffs):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            [
+                "product_id",
+                "item_number",
+                "added",
+                "removed",
+                "changed",
+                "old_lines",
+                "new_lines",
+            ]
+        )
+        for d in diffs:
+            writer.writerow(
+                [
+                    d.product_id,
+                    d.item_number,
+                    d.added,
+                    d.removed,
+                    d.changed,
+                    d.old_lines,
+                    d.new_lines,
+                ]
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", help="CSV or xlsx file")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Compute diffs and roll back"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Rows per COPY round trip",
+    )
+    parser.add_argument("--report", help="Write per-product diffs to this CSV file")
+    args = parser.parse_args()
+
+    print(f"Importing BOM lines from {args.path}...")
+
+    try:
+        with open(args.path, "rb") as f:
+            result = import_bom(
+                f, args.path, dry_run=args.dry_run, chunk_size=args.chunk_size
+            )
+    except BOMImportError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error during import: {e}")
+        import traceback
+
+        traceback.print_exc()
+        sys.exit(1)
+
+    if args.report:
+        write_report(args.report, result.diffs)
+
+    print("=" * 70)
+    if result.dry_run:
+        print("✅ BOM import dry run completed (nothing written)")
+    else:
+        print("✅ BOM import completed!")
+    print(f"   Lines read: {result.lines}")
+    print(f"   Lines imported: {result.imported_lines}")
+    print(f"   Lines skipped: {result.skipped_lines}")
+    print(f"   Unknown item numbers: {result.unknown_item_numbers}")
+    print(f"   Products in file: {result.products}")
+    print(f"   Products changed: {result.products_changed}")
+    print(f"   BOM lines deleted: {result.deleted_lines}")
+    print(f"   BOM lines inserted: {result.inserted_lines}")
+    print(f"   Duration: {result.duration_seconds:.1f}s")
+    if result.duration_seconds > 0:
+        print(f"   Throughput: {result.lines / result.duration_seconds:,.0f} lines/s")
+    if result.errors:
+        print(f"\n⚠️  First {len(result.errors)} rejected lines:")
+        for error in result.errors[:20]:
+            print(f"   {error}")
+    if args.report:
+        print(f"\n📄 Per-product diffs written to {args.report}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ import json
 import sys
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from app.db.base import engine, SessionLocal
+from app.db.base import SessionLocal
 from app.models.product import Product
 
 
@@ -1,32 +1,129 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.exc import SQLAlchemyError
 from app.core.config import settings
-from app.api.api import api_router
-from app.db.base import Base, engine
+from app.api.deferred import DeferredLoader, DeferredRoutesMiddleware, warm_up
+from app.core import metrics
+from app.db.instrumentation import SQLInstrumentationMiddleware
+
+logger = logging.getLogger(__name__)
+
+# Epäonnistunut viivästetty lataus yritetään rollupia varten uudelleen
+LOAD_RETRY_SECONDS = 10
 
 # Luo tietokantataulut (kehityksessä, tuotannossa käytä Alembic migraatioita)
-# Base.metadata.create_all(bind=engine)
+# Base.metadata.create_all(bind=get_engine())
+
+
+def include_api(app: FastAPI) -> None:
+    """
+    Tuo endpoint-moduulit, rekisteröi API-reitit ja lämmitä ne.
+    Idempotentti: DeferredLoader ajaa latauksen uudelleen, jos sen
+    myöhempi vaihe (rekisterit) epäonnistui, eikä reittejä saa tulla kahdesti.
+    """
+    if getattr(app.state, "api_included", False):
+        return
+    from app.api.api import api_router
+
+    app.include_router(api_router, prefix=settings.API_V1_STR)
+    app.state.api_included = True
+    warm_up(app)
+
+
+def rebuild_registries() -> None:
+    """Rakenna avoimien tehtävien rekisteri ja kortinlukukartta tietokannasta"""
+    from app.db.base import SessionLocal
+    from app.services.employee_badges import badge_registry
+    from app.services.open_task_registry import open_task_registry
+
+    db = SessionLocal()
+    try:
+        count = open_task_registry.rebuild(db)
+        logger.info("Avoimien tehtävien rekisteri ladattu (%d tehtävää)", count)
+        count = badge_registry.rebuild(db)
+        logger.info("Kortinlukukartta ladattu (%d työntekijää)", count)
+    except SQLAlchemyError:
+        # Rekisterit ladataan ensimmäisellä /tasks/open- tai kortinlukukutsulla
+        logger.warning("Muistirekisterien lataus epäonnistui", exc_info=True)
+    finally:
+        db.close()
+
+
+async def _load_api(loader: DeferredLoader) -> None:
+    try:
+        await loader.wait()
+    except Exception:
+        # API-pyynnöt yrittävät latausta uudelleen
+        logger.exception("API-reittien lataus epäonnistui")
+
+
+async def _rollup(loader: DeferredLoader | None) -> None:
+    # Rollup tarvitsee ladatut moduulit; ilman API-pyyntöjä kukaan muu ei
+    # yrittäisi epäonnistunutta latausta uudelleen
+    while loader is not None and not loader.loaded:
+        try:
+            await loader.wait()
+        except Exception:
+            logger.warning(
+                "API-reittien lataus epäonnistui, uusi yritys %ds päästä",
+                LOAD_RETRY_SECONDS,
+                exc_info=True,
+            )
+            await asyncio.sleep(LOAD_RETRY_SECONDS)
+    from app.services.efficiency_rollup import rollup_loop
+
+    await rollup_loop(settings.EFFICIENCY_ROLLUP_INTERVAL_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    loader = app.state.api_loader
+    load_task = None
+    if loader is None:
+        rebuild_registries()
+    else:
+        # Palvelin vastaa heti; reitit ja rekisterit ladataan taustalla
+        load_task = asyncio.create_task(_load_api(loader))
+
+    # Tehokkuusyhteenvetojen inkrementaalinen rollup taustalla
+    rollup_task = None
+    if settings.EFFICIENCY_ROLLUP_INTERVAL_SECONDS > 0:
+        rollup_task = asyncio.create_task(_rollup(loader))
+
+    # Moniprosessiajossa mittarit kootaan workerien tilannekuvista
+    flush_task = None
+    if settings.METRICS_ENABLED and settings.METRICS_MULTIPROC_DIR:
+        flush_task = asyncio.create_task(
+            metrics.flush_loop(settings.METRICS_FLUSH_SECONDS)
+        )
+
+    yield
 
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json",
-)
+    if load_task is not None:
+        load_task.cancel()
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Tuotannossa määritä tarkemmat originsit
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    if rollup_task is not None:
+        rollup_task.cancel()
 
-# API router
-app.include_router(api_router, prefix=settings.API_V1_STR)
+    if flush_task is not None:
+        flush_task.cancel()
+        metrics.write_snapshot()
 
+    if settings.ASYNC_ENDPOINTS:
+        from app.db.async_base import async_engine
 
-@app.get("/")
+        await async_engine.dispose()
+
+
+router = APIRouter()
+
+
+@router.get("/")
 def root():
     """API root endpoint"""
     return {
@@ -36,12 +133,88 @@ def root():
     }
 
 
-@app.get("/health")
-def health_check():
-    """Health check endpoint"""
+@router.get("/health")
+def health_check(request: Request, response: Response):
+    """
+    Health check endpoint.
+    Viivästetyssä latauksessa 503 kunnes API-reitit on ladattu, jotta
+    kuormantasaaja ei ohjaa liikennettä vielä käynnistyvään prosessiin.
+    """
+    loader = request.app.state.api_loader
+    if loader is not None and not loader.loaded:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "starting"}
     return {"status": "healthy"}
 
 
+def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+def create_app() -> FastAPI:
+    """
+    Sovellustehdas (uvicorn main:app tai uvicorn main:create_app --factory).
+
+    Luonti ei avaa tietokantayhteyksiä. DEFER_API_ROUTES: API-reitit
+    ladataan käynnistyksen jälkeen taustalla, muuten heti. OpenAPI-skeema
+    rakennetaan ensimmäisellä haulla.
+    """
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        version=settings.VERSION,
+        openapi_url=f"{settings.API_V1_STR}/openapi.json",
+        lifespan=lifespan,
+    )
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Tuotannossa määritä tarkemmat originsit
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # API-pyynnöt odottavat reittien latausta (mittareiden sisällä, jotta
+    # odotus näkyy latenssissa)
+    if settings.DEFER_API_ROUTES:
+        app.state.api_loader = DeferredLoader(
+            lambda: (include_api(app), rebuild_registries())
+        )
+        app.add_middleware(
+            DeferredRoutesMiddleware,
+            loader=app.state.api_loader,
+            prefix=settings.API_V1_STR,
+        )
+    else:
+        app.state.api_loader = None
+
+    # Latenssi ja kyselymäärät reiteittäin (/metrics); SQL-middlewaren sisällä,
+    # jotta pyynnön kyselytilastot ovat luettavissa
+    if settings.METRICS_ENABLED:
+        app.add_middleware(metrics.MetricsMiddleware)
+
+    # Kyselymäärät ja -ajat pyynnöittäin (Server-Timing)
+    if settings.SQL_INSTRUMENTATION:
+        app.add_middleware(SQLInstrumentationMiddleware)
+
+    app.include_router(router)
+    if settings.METRICS_ENABLED:
+        app.add_api_route("/metrics", prometheus_metrics, include_in_schema=False)
+
+    # API router
+    if settings.DEFER_API_ROUTES:
+        warm_up(app)
+    else:
+        include_api(app)
+
+    return app
+
+
+app = create_app()
+
+
 if __name__ == "__main__":
     import uvicorn
 
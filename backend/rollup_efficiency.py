@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Recompute efficiency summaries for changed (department, day) pairs
+"""
+import argparse
+import sys
+from datetime import date
+
+from app.db.base import SessionLocal
+from app.services.efficiency_rollup import mark_all_dirty, run_rollup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Mark every day with finished tasks as changed (full rebuild)",
+    )
+    parser.add_argument(
+        "--since",
+        type=date.fromisoformat,
+        help="With --all: only rebuild days from this date (YYYY-MM-DD)",
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.all:
+            marked = mark_all_dirty(db, since=args.since)
+            print(f"Marked {marked} (department, day) pairs for recompute")
+
+        result = run_rollup(db)
+
+        print("=" * 70)
+        print("✅ Efficiency rollup completed!")
+        print(f"   Daily summaries recomputed: {result.days}")
+        print(f"   Weekly summaries recomputed: {result.weeks}")
+        print(f"   Monthly summaries recomputed: {result.months}")
+        print(f"   Duration: {result.duration_seconds:.2f}s")
+        print("=" * 70)
+
+    except Exception as e:
+        print(f"\n❌ Error during rollup: {e}")
+        import traceback
+
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
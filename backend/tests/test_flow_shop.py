@@ -0,0 +1,118 @@
+import itertools
+import time
+
+import numpy as np
+import pytest
+
+from app.services import flow_shop
+
+
+def _brute_force_makespan(p: np.ndarray) -> float:
+    return min(
+        flow_shop.evaluate(p, sequence).makespan
+        for sequence in itertools.permutations(range(len(p)))
+    )
+
+
+def _reference_makespan(p: np.ndarray, sequence) -> float:
+    """Valmistumisaikojen rekursio suoraan määritelmän mukaan"""
+    n, m = len(sequence), p.shape[1]
+    completion = np.zeros((n + 1, m + 1))
+    for i, job in enumerate(sequence, start=1):
+        for j in range(1, m + 1):
+            completion[i, j] = (
+                max(completion[i - 1, j], completion[i, j - 1]) + p[job, j - 1]
+            )
+    return float(completion[n, m])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_completion_times_match_recurrence(seed):
+    rng = np.random.default_rng(seed)
+    p = rng.integers(0, 20, size=(7, 4)).astype(float)
+    sequence = list(rng.permutation(7))
+
+    assert flow_shop.evaluate(p, sequence).makespan == pytest.approx(
+        _reference_makespan(p, sequence)
+    )
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_best_insertion_matches_exhaustive(seed):
+    rng = np.random.default_rng(seed)
+    p = rng.integers(1, 20, size=(6, 3)).astype(float)
+    sequence, job = [0, 1, 2, 3, 4], 5
+
+    expected = min(
+        _reference_makespan(p, sequence[:k] + [job] + sequence[k:])
+        for k in range(len(sequence) + 1)
+    )
+    position, makespan = flow_shop.best_insertion(p[sequence], p[job])
+
+    assert makespan == pytest.approx(expected)
+    assert _reference_makespan(
+        p, sequence[:position] + [job] + sequence[position:]
+    ) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_neh_returns_permutation_close_to_optimum(seed):
+    rng = np.random.default_rng(seed)
+    p = rng.integers(1, 30, size=(6, 3)).astype(float)
+
+    sequence = flow_shop.neh(p)
+
+    assert sorted(sequence) == list(range(6))
+    # NEH on heuristiikka: pienillä tapauksilla se on lähellä optimia
+    assert flow_shop.evaluate(p, sequence).makespan <= 1.2 * _brute_force_makespan(p)
+
+
+def test_neh_past_deadline_appends_remaining_jobs():
+    p = np.array([[1.0, 2.0], [5.0, 5.0], [3.0, 1.0]])
+
+    assert flow_shop.neh(p, deadline=time.perf_counter() - 1) == [1, 2, 0]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_optimize_finds_brute_force_optimum(seed):
+    rng = np.random.default_rng(seed)
+    # Tällä koolla optimi löytyy muutamassa kierroksessa; budjetissa on varaa
+    # hitaallekin koneelle
+    p = rng.integers(1, 30, size=(6, 4)).astype(float)
+
+    result = flow_shop.optimize(p, time_budget_seconds=0.2, seed=seed)
+
+    assert sorted(result.schedule.sequence) == list(range(6))
+    assert result.schedule.makespan == pytest.approx(_brute_force_makespan(p))
+    assert result.schedule.makespan <= result.initial.makespan
+
+
+def test_optimize_keeps_initial_baseline():
+    p = np.array([[3.0, 1.0], [1.0, 3.0]])
+
+    result = flow_shop.optimize(p, time_budget_seconds=0.05, initial=[1, 0])
+
+    assert result.initial.sequence == [1, 0]
+    assert result.schedule.makespan == pytest.approx(5.0)
+
+
+def test_optimize_single_order():
+    p = np.array([[2.0, 3.0]])
+
+    result = flow_shop.optimize(p, time_budget_seconds=1.0)
+
+    assert result.schedule.sequence == [0]
+    assert result.schedule.makespan == 5.0
+    assert result.iterations == 0
+
+
+def test_optimize_respects_time_budget():
+    rng = np.random.default_rng(0)
+    p = rng.integers(1, 100, size=(2000, 8)).astype(float)
+
+    started = time.perf_counter()
+    result = flow_shop.optimize(p, time_budget_seconds=0.05)
+
+    assert sorted(result.schedule.sequence) == list(range(2000))
+    # NEH yksinään kestäisi tällä koolla selvästi budjettia pidempään
+    assert time.perf_counter() - started < 0.5
@@ -0,0 +1,28 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.metrics import route_template
+
+
+@pytest.mark.parametrize(
+    "path, template, expected",
+    [
+        ("/api/v1/products/5", "/api/v1/products/{product_id}", None),
+        ("/api/v1/products/", "/api/v1/products/", None),
+        # Sama arvo kahdessa parametrissa ja staattisessa segmentissä
+        ("/api/v1/orders/5/phases/5", "/api/v1/orders/{id}/phases/{phase}", None),
+        ("/api/v1/departments/5/5", "/api/v1/departments/{id}/{order}", None),
+        # Mountin etuliite säilyy, vain reitin osa korvataan
+        ("/sub/api/x/5", "/x/{id}", "/sub/api/x/{id}"),
+        ("/files/a/b", "/files/{name:path}", None),
+    ],
+)
+def test_route_template(path, template, expected):
+    scope = {"path": path, "route": SimpleNamespace(path=template)}
+
+    assert route_template(scope) == (expected or template)
+
+
+def test_route_template_unmatched():
+    assert route_template({"path": "/missing"}) == "unmatched"
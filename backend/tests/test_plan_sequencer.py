@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services import plan_sequencer
+
+
+class FakeSession:
+    """Palauttaa kyselykohtaiset rivit processing_times-funktion kyselyille"""
+
+    def __init__(self, ratios, product_minutes):
+        self.rows = {
+            plan_sequencer._SELECT_DEPARTMENT_RATIOS: ratios,
+            plan_sequencer._SELECT_PRODUCT_MINUTES: product_minutes,
+        }
+        self.params = []
+
+    def execute(self, statement, params):
+        self.params.append(params)
+        return iter(self.rows[statement.text])
+
+
+def _item(product_id, quantity, standard_time_minutes):
+    return SimpleNamespace(
+        product_id=product_id,
+        quantity=quantity,
+        standard_time_minutes=standard_time_minutes,
+    )
+
+
+def test_processing_times_without_history_splits_standard_time_evenly():
+    db = FakeSession(ratios=[], product_minutes=[])
+    items = [_item(1, 10, 6.0), _item(None, 2, 3.0)]
+
+    p = plan_sequencer.processing_times(db, items, [10, 20, 30])
+
+    np.testing.assert_allclose(p, [[20.0, 20.0, 20.0], [2.0, 2.0, 2.0]])
+    assert db.params[1]["product_ids"] == [1]
+
+
+def test_processing_times_uses_department_ratios():
+    # Osasto 30 ilman historiaa saa tasajaon, tuntematon osasto 99 ohitetaan
+    db = FakeSession(ratios=[(10, 0.5), (20, None), (99, 2.0)], product_minutes=[])
+
+    p = plan_sequencer.processing_times(db, [_item(1, 4, 3.0)], [10, 20, 30])
+
+    np.testing.assert_allclose(p, [[6.0, 4.0, 4.0]])
+
+
+def test_processing_times_prefers_product_history():
+    db = FakeSession(
+        ratios=[(10, 1.0), (20, 1.0)],
+        product_minutes=[(1, 10, 2.5), (1, 99, 7.0)],
+    )
+    items = [_item(1, 4, 100.0), _item(2, 1, 8.0)]
+
+    p = plan_sequencer.processing_times(db, items, [10, 20])
+
+    # Tuotteella 1 ei ole historiaa osastolla 20: aika 0
+    np.testing.assert_allclose(p, [[10.0, 0.0], [8.0, 8.0]])
+
+
+def test_processing_times_without_items():
+    db = FakeSession(ratios=[], product_minutes=[])
+
+    p = plan_sequencer.processing_times(db, [], [10, 20])
+
+    assert p.shape == (0, 2)
+    assert db.params[1]["min_samples"] == plan_sequencer.MIN_PRODUCT_SAMPLES
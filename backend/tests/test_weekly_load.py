@@ -0,0 +1,89 @@
+from datetime import date
+
+import pytest
+
+from app.services import weekly_load
+
+
+class FakeSession:
+    """Palauttaa kyselykohtaiset rivit build_load-funktion kyselyille"""
+
+    def __init__(self, capacity, planned, task_minutes):
+        self.rows = {
+            weekly_load._SELECT_CAPACITY: capacity,
+            weekly_load._SELECT_PLANNED: planned,
+            weekly_load._SELECT_TASK_MINUTES: task_minutes,
+        }
+        self.queries = []
+
+    def execute(self, statement, params):
+        self.queries.append(statement.text)
+        return FakeResult(self.rows[statement.text])
+
+
+class FakeResult(list):
+    def all(self):
+        return list(self)
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    weekly_load.load_cache.invalidate()
+    weekly_load.share_cache.invalidate()
+
+
+def test_build_load_splits_planned_hours_by_history():
+    db = FakeSession(
+        capacity=[(2026, 2, 1, 30.0), (2026, 2, 2, 10.0)],
+        planned=[(2026, 2, 7, 8.0), (2026, 2, None, 4.0)],
+        task_minutes=[(7, 1, 30.0), (7, 2, 10.0), (8, 2, 60.0)],
+    )
+
+    matrix = weekly_load.build_load(db, date(2026, 1, 5), date(2026, 1, 11))
+
+    assert matrix.weeks == ["2026-W02"]
+    assert matrix.department_ids == [1, 2]
+    # Tuote 7 omilla osuuksillaan, tuotteeton rivi kaikkien tehtävien osuuksilla
+    assert matrix.planned_hours == [[6.0 + 4.0 * 0.3, 2.0 + 4.0 * 0.7]]
+    assert matrix.capacity_hours == [[30.0, 10.0]]
+    assert matrix.utilization == [[24.0, 48.0]]
+
+
+def test_build_load_without_history_splits_evenly():
+    db = FakeSession(
+        capacity=[(None, None, 1, None), (None, None, 2, None)],
+        planned=[(2026, 2, 7, 8.0)],
+        task_minutes=[],
+    )
+
+    matrix = weekly_load.build_load(db, date(2026, 1, 5), date(2026, 1, 11))
+
+    assert matrix.planned_hours == [[4.0, 4.0]]
+    assert matrix.capacity_hours == [[0.0, 0.0]]
+    assert matrix.utilization == [[None, None]]
+
+
+def test_build_load_skips_weeks_missing_from_the_iso_calendar():
+    # Vuodessa 2025 ei ole viikkoa 53, mutta (2025, 53) osuu väliin
+    # tuplevertailussa
+    db = FakeSession(
+        capacity=[(2025, 52, 1, 10.0), (2025, 53, 1, 99.0)],
+        planned=[(2025, 53, None, 5.0)],
+        task_minutes=[(None, 1, 10.0)],
+    )
+
+    matrix = weekly_load.build_load(db, date(2025, 12, 22), date(2025, 12, 28))
+
+    assert matrix.weeks == ["2025-W52"]
+    assert matrix.planned_hours == [[0.0]]
+    assert matrix.capacity_hours == [[10.0]]
+
+
+def test_department_shares_are_cached_per_history_days():
+    db = FakeSession(capacity=[], planned=[], task_minutes=[(7, 1, 5.0)])
+
+    weekly_load.build_load(db, date(2026, 1, 5), date(2026, 1, 11))
+    weekly_load.build_load(db, date(2026, 3, 2), date(2026, 3, 8))
+    weekly_load.build_load(db, date(2026, 3, 2), date(2026, 3, 8), history_days=30)
+
+    assert db.queries.count(weekly_load._SELECT_TASK_MINUTES) == 2
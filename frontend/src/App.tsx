@@ -2,9 +2,12 @@ import { QueryClient, QueryClientProvider } from '@tanstack/react-query';
 import { ReactQueryDevtools } from '@tanstack/react-query-devtools';
 import { BrowserRouter, Routes, Route, Link, useLocation } from 'react-router-dom';
 import { Toaster } from 'sonner';
+import { authApi } from './api/auth';
+import { LoginPage, RequireAuth } from './features/auth';
 import { DepartmentsPage } from './features/departments';
 import { ProductsPage } from './features/products';
 import { OrdersPage } from './features/orders';
+import { useLiveEvents } from './hooks/useLiveEvents';
 
 const queryClient = new QueryClient({
   defaultOptions: {
@@ -16,6 +19,11 @@ const queryClient = new QueryClient({
   },
 });
 
+function LiveEvents() {
+  useLiveEvents();
+  return null;
+}
+
 function Navigation() {
   const location = useLocation();
   const isActive = (path: string) => location.pathname === path;
@@ -83,6 +91,9 @@ function Navigation() {
           <div className="flex items-center gap-3">
             <span className="status-active"></span>
             <span className="text-sm text-accon-300 font-medium">Järjestelmä aktiivinen</span>
+            <button onClick={authApi.logout} className="btn-secondary ml-4">
+              Kirjaudu ulos
+            </button>
           </div>
         </div>
       </div>
@@ -93,18 +104,29 @@ function Navigation() {
 function App() {
   return (
     <QueryClientProvider client={queryClient}>
+      <LiveEvents />
       <BrowserRouter>
         <div className="min-h-screen bg-background">
-          <Navigation />
-          
-          <main className="min-h-[calc(100vh-4rem)]">
-            <Routes>
-              <Route path="/" element={<DashboardPage />} />
-              <Route path="/departments" element={<DepartmentsPage />} />
-              <Route path="/products" element={<ProductsPage />} />
-              <Route path="/orders" element={<OrdersPage />} />
-            </Routes>
-          </main>
+          <Routes>
+            <Route path="/login" element={<LoginPage />} />
+            <Route
+              path="*"
+              element={
+                <RequireAuth>
+                  <Navigation />
+
+                  <main className="min-h-[calc(100vh-4rem)]">
+                    <Routes>
+                      <Route path="/" element={<DashboardPage />} />
+                      <Route path="/departments" element={<DepartmentsPage />} />
+                      <Route path="/products" element={<ProductsPage />} />
+                      <Route path="/orders" element={<OrdersPage />} />
+                    </Routes>
+                  </main>
+                </RequireAuth>
+              }
+            />
+          </Routes>
         </div>
 
         <Toaster 
@@ -0,0 +1,24 @@
+import apiClient, { setAuthToken } from './client';
+import type { AuthToken } from '../types';
+
+const AUTH_ENDPOINT = '/auth';
+
+export const authApi = {
+  // Log in with email and password; the token is stored for later requests
+  login: async (email: string, password: string) => {
+    // OAuth2PasswordRequestForm expects form fields, not JSON
+    const form = new URLSearchParams({ username: email, password });
+    const response = await apiClient.post<AuthToken>(
+      `${AUTH_ENDPOINT}/login`,
+      form,
+      { headers: { 'Content-Type': 'application/x-www-form-urlencoded' } }
+    );
+    setAuthToken(response.data.access_token);
+    return response.data;
+  },
+
+  // Forget the token; closes token-bound connections (SSE)
+  logout: () => {
+    setAuthToken(null);
+  },
+};
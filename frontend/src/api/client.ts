@@ -3,6 +3,37 @@ import axios from 'axios';
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
 const API = `${API_BASE_URL}/api`;
 
+const AUTH_TOKEN_KEY = 'authToken';
+const AUTH_TOKEN_EVENT = 'authtokenchange';
+
+export const getAuthToken = () => localStorage.getItem(AUTH_TOKEN_KEY);
+
+// Kirjautuminen ja uloskirjautuminen (null) kulkevat tätä kautta, jotta
+// tokenia käyttävät yhteydet (SSE) avataan uudelleen tai suljetaan
+export const setAuthToken = (token: string | null) => {
+    if (token) {
+        localStorage.setItem(AUTH_TOKEN_KEY, token);
+    } else {
+        localStorage.removeItem(AUTH_TOKEN_KEY);
+    }
+    window.dispatchEvent(new Event(AUTH_TOKEN_EVENT));
+};
+
+// Tokenin muutokset tässä ja muissa välilehdissä; palauttaa peruutuksen
+export const onAuthTokenChange = (listener: () => void) => {
+    const onStorage = (event: StorageEvent) => {
+        if (event.key === AUTH_TOKEN_KEY || event.key === null) {
+            listener();
+        }
+    };
+    window.addEventListener(AUTH_TOKEN_EVENT, listener);
+    window.addEventListener('storage', onStorage);
+    return () => {
+        window.removeEventListener(AUTH_TOKEN_EVENT, listener);
+        window.removeEventListener('storage', onStorage);
+    };
+};
+
 export const apiClient = axios.create({
     baseURL: API,
     headers: {
@@ -13,7 +44,7 @@ export const apiClient = axios.create({
 
 apiClient.interceptors.request.use(
     (config) => {
-        const token = localStorage.getItem('authToken');
+        const token = getAuthToken();
         if (token) {
             config.headers.Authorization = `Bearer ${token}`;
         }
@@ -28,9 +59,9 @@ apiClient.interceptors.response.use(
         if (error.response) {
             // Handle specific status codes if needed
             if (error.response.status === 401) {
-                // Optionally handle unauthorized errors (e.g., redirect to login)
-                localStorage.removeItem('authToken');
-                window.location.href = '/login';
+                // Vanhentunut tai puuttuva token: RequireAuth ohjaa
+                // kirjautumissivulle tokenin muutostapahtumasta
+                setAuthToken(null);
             }
         } else if (error.request) {
             console.error('No response received from server:', error.request);
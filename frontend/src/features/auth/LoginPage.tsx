@@ -0,0 +1,89 @@
+import { useState } from 'react';
+import { useLocation, useNavigate } from 'react-router-dom';
+import { isAxiosError } from 'axios';
+import { authApi } from '../../api/auth';
+import type { ApiError } from '../../types';
+
+export const LoginPage = () => {
+  const navigate = useNavigate();
+  const location = useLocation();
+  const [email, setEmail] = useState('');
+  const [password, setPassword] = useState('');
+  const [error, setError] = useState<string | null>(null);
+  const [isPending, setIsPending] = useState(false);
+
+  // Palataan sivulle jolta kirjautumiseen ohjattiin
+  const from = (location.state as { from?: string } | null)?.from ?? '/';
+
+  const handleSubmit = async (e: React.FormEvent) => {
+    e.preventDefault();
+    setError(null);
+    setIsPending(true);
+
+    try {
+      await authApi.login(email, password);
+      navigate(from === '/login' ? '/' : from, { replace: true });
+    } catch (err) {
+      setError(
+        isAxiosError<ApiError>(err) && err.response?.data?.detail
+          ? err.response.data.detail
+          : 'Kirjautuminen epäonnistui'
+      );
+    } finally {
+      setIsPending(false);
+    }
+  };
+
+  return (
+    <div className="container mx-auto px-4 py-16 max-w-md">
+      <div className="card">
+        <div className="card-header">
+          <h1 className="text-2xl font-bold text-gradient-accon">Kirjaudu sisään</h1>
+        </div>
+        <div className="card-body">
+          <form onSubmit={handleSubmit} className="space-y-6">
+            <div>
+              <label htmlFor="email" className="label">
+                Sähköposti
+              </label>
+              <input
+                type="email"
+                id="email"
+                name="email"
+                value={email}
+                onChange={(e) => setEmail(e.target.value)}
+                required
+                autoComplete="username"
+                disabled={isPending}
+                className="input"
+              />
+            </div>
+
+            <div>
+              <label htmlFor="password" className="label">
+                Salasana
+              </label>
+              <input
+                type="password"
+                id="password"
+                name="password"
+                value={password}
+                onChange={(e) => setPassword(e.target.value)}
+                required
+                autoComplete="current-password"
+                disabled={isPending}
+                className="input"
+              />
+            </div>
+
+            {error && <p className="text-sm text-danger-400">{error}</p>}
+
+            <button type="submit" disabled={isPending} className="btn-primary w-full">
+              {isPending ? 'Kirjaudutaan...' : 'Kirjaudu'}
+            </button>
+          </form>
+        </div>
+      </div>
+    </div>
+  );
+};
@@ -0,0 +1,16 @@
+import { useEffect, useState, type ReactNode } from 'react';
+import { Navigate, useLocation } from 'react-router-dom';
+import { getAuthToken, onAuthTokenChange } from '../../api/client';
+
+// Ohjaa kirjautumissivulle jos tokenia ei ole (myös uloskirjautuessa)
+export const RequireAuth = ({ children }: { children: ReactNode }) => {
+  const location = useLocation();
+  const [token, setToken] = useState(getAuthToken);
+
+  useEffect(() => onAuthTokenChange(() => setToken(getAuthToken())), []);
+
+  if (!token) {
+    return <Navigate to="/login" replace state={{ from: location.pathname }} />;
+  }
+  return <>{children}</>;
+};
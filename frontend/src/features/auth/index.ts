@@ -0,0 +1,2 @@
+export { LoginPage } from './LoginPage';
+export { RequireAuth } from './RequireAuth';
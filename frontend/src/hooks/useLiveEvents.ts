@@ -0,0 +1,75 @@
+import { useEffect, useState } from 'react';
+import { useQueryClient } from '@tanstack/react-query';
+import apiClient, { getAuthToken, onAuthTokenChange } from '../api/client';
+import { departmentKeys } from './useDepartments';
+import { orderKeys } from './useOrders';
+import { productKeys } from './useProducts';
+
+// Palvelimen lähettämät muutostapahtumat (SSE)
+const EVENTS_ENDPOINT = '/events/stream';
+
+const ORDER_EVENTS = [
+  'order.status',
+  'order.moved',
+  'task.started',
+  'task.ended',
+  'task.deleted',
+];
+const PRODUCT_EVENTS = [
+  'product.created',
+  'product.updated',
+  'product.deleted',
+  'product_category.created',
+  'product_category.updated',
+  'product_category.deleted',
+];
+const DEPARTMENT_EVENTS = [
+  'department.created',
+  'department.updated',
+  'department.deleted',
+  'department.reordered',
+];
+
+// Kuuntele muutoksia ja mitätöi vain muuttuneet kyselyt (ei pollausta).
+// Virta vaatii tokenin: se avataan uudelleen kun token vaihtuu ja suljetaan
+// uloskirjautuessa.
+export const useLiveEvents = (departmentIds?: number[]) => {
+  const queryClient = useQueryClient();
+  const departmentKey = departmentIds?.join(',') ?? '';
+  const [token, setToken] = useState(getAuthToken);
+
+  useEffect(() => onAuthTokenChange(() => setToken(getAuthToken())), []);
+
+  useEffect(() => {
+    if (!token) return;
+
+    // EventSource ei voi asettaa otsakkeita, joten token kulkee parametrina
+    const params = new URLSearchParams();
+    departmentIds?.forEach((id) => params.append('department_id', String(id)));
+    params.append('access_token', token);
+    const source = new EventSource(
+      `${apiClient.defaults.baseURL}${EVENTS_ENDPOINT}?${params.toString()}`
+    );
+
+    const invalidateOrders = () =>
+      queryClient.invalidateQueries({ queryKey: orderKeys.all });
+    const invalidateProducts = () =>
+      queryClient.invalidateQueries({ queryKey: productKeys.all });
+    const invalidateDepartments = () =>
+      queryClient.invalidateQueries({ queryKey: departmentKeys.all });
+
+    ORDER_EVENTS.forEach((type) => source.addEventListener(type, invalidateOrders));
+    PRODUCT_EVENTS.forEach((type) =>
+      source.addEventListener(type, invalidateProducts)
+    );
+    DEPARTMENT_EVENTS.forEach((type) =>
+      source.addEventListener(type, invalidateDepartments)
+    );
+
+    // Palvelin pyytää hakemaan kaiken uudelleen (jono täyttyi)
+    source.addEventListener('resync', () => queryClient.invalidateQueries());
+
+    return () => source.close();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [queryClient, departmentKey, token]);
+};
@@ -181,6 +181,16 @@ export interface OrderWithDetails extends Order {
   department: Department;
 }
 
+// ============================================================================
+// Auth Types
+// ============================================================================
+
+export interface AuthToken {
+  access_token: string;
+  token_type: string;
+  expires_in: number;
+}
+
 // ============================================================================
 // Common Types
 // ============================================================================